@@ -5,6 +5,7 @@ from .architecture import create_architecture_agent
 from .architecture_diagram import create_architecture_diagram_agent
 from .dataflow import create_dataflow_agent
 from .dataflow_diagram import create_dataflow_diagram_agent
+from .deduplication import create_deduplication_node
 from .mitigations import create_mitigations_agent
 from .threat_model import create_threat_model_agent
 from .threats import create_threats_agent
@@ -17,5 +18,6 @@ __all__ = [
     "create_dataflow_diagram_agent",
     "create_threats_agent",
     "create_mitigations_agent",
+    "create_deduplication_node",
     "create_threat_model_agent",
 ]
@@ -25,7 +25,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
-    generate_required_inputs_section,
+    generate_run_context_section,
 )
 
 # Agent configuration
@@ -41,14 +41,13 @@ def get_input_files(config: AppConfig) -> list[str]:
 
 def create_system_prompt(config: AppConfig):
     """Create the system prompt with caching enabled"""
-    dynamic_inputs = generate_required_inputs_section(config, get_input_files(config))
 
     prompt_text = f"""# System Prompt: Architecture Diagram Generator using diagrams library
 
 ## Role
 You are an expert software architect and technical diagramming specialist. Your task is to convert textual descriptions of software system architectures into clear, professional architecture diagrams using the Python diagrams library.
 
-{dynamic_inputs}
+REQUIRED INPUTS: the files listed under RUN CONTEXT
 
 ## REQUIRED TOOLS:
 1. ${get_tool_name(threat_composer_workdir_file_read)}: Read files from the working directory
@@ -116,7 +115,10 @@ Before finalizing:
 FINAL RESPONSE:
 1. Your final response must be a single line. No formatting."""
 
-    return create_cached_system_prompt(prompt_text)
+    run_context = generate_run_context_section(
+        config, get_input_files(config), ai_generated_tag=False
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_architecture_diagram_agent(
@@ -16,43 +16,17 @@ from typing import Any
 
 from botocore.config import Config as BotocoreConfig
 from strands.agent.conversation_manager import SummarizingConversationManager
-from strands.models import BedrockModel
+from strands.models import BedrockModel, CacheConfig
 from strands.types.content import SystemContentBlock
 
 from ..config import AppConfig
 from ..logging import create_strands_rich_handler
 from ..tools import threat_composer_list_workdir_files_gitignore_filtered
-from ..tools.threat_composer_generate_uuid4 import (
-    threat_composer_generate_uuid4,
-)
 from ..utils.relative_path_helper import create_prompt_path_from_config
 from ..utils.tool_helpers import get_tool_name
 
-
-def format_preloaded_uuids_section(uuids: list[str]) -> str:
-    """Format pre-loaded UUIDs into a system prompt section.
-
-    Args:
-        uuids: List of UUID strings to format
-
-    Returns:
-        Formatted string for inclusion in system prompts
-    """
-    if not uuids:
-        return ""
-
-    uuid_lines = [f"{i}. {uuid_str}" for i, uuid_str in enumerate(uuids, 1)]
-
-    return f"""PRE-LOADED UUIDs:
-Here are {len(uuids)} pre-generated UUIDs to use as needed for your outputs:
-{chr(10).join(uuid_lines)}
-
-IMPORTANT UUID USAGE:
-- Use these UUIDs in sequential order for your outputs (use UUID #1 first, then #2, etc.)
-- Each UUID should only be used once
-- If you need more than {len(uuids)} UUIDs, use the {get_tool_name(threat_composer_generate_uuid4)} tool to generate additional ones
-- Do NOT generate your own UUIDs manually - always use the pre-loaded ones first, then the tool if needed
-"""
+# Stands in for config.ai_generated_tag in the cached part of system prompts
+AI_GENERATED_TAG_PLACEHOLDER = "<AI_GENERATED_TAG>"
 
 
 def generate_required_inputs_section(config: AppConfig, input_files: list[str]) -> str:
@@ -79,6 +53,42 @@ def generate_required_inputs_section(config: AppConfig, input_files: list[str])
     return "REQUIRED INPUTS:\n" + "\n".join(inputs_list)
 
 
+def generate_run_context_section(
+    config: AppConfig,
+    input_files: list[str] | None = None,
+    paths: dict[str, str] | None = None,
+    ai_generated_tag: bool = True,
+) -> str:
+    """Generate RUN CONTEXT section with the values that change between runs.
+
+    Paths include the session's output directory and the AI generated tag is
+    configurable, so prompts refer to them by name and this section, placed
+    after the prompt's cache point, provides them.
+
+    Args:
+        config: AppConfig instance
+        input_files: List of input files the agent reads
+        paths: Path names, as the prompt refers to them, and paths
+        ai_generated_tag: Include the value of AI_GENERATED_TAG_PLACEHOLDER
+
+    Returns:
+        Formatted RUN CONTEXT section for system prompt
+    """
+    sections = ["RUN CONTEXT (values for this run):"]
+    if input_files:
+        sections.append(generate_required_inputs_section(config, input_files))
+    if paths:
+        sections.append(
+            "PATHS:\n" + "\n".join(f"- {name}: {path}" for name, path in paths.items())
+        )
+    if ai_generated_tag:
+        sections.append(
+            f'AI GENERATED TAG: use "{config.ai_generated_tag}" wherever the '
+            f"instructions show {AI_GENERATED_TAG_PLACEHOLDER}"
+        )
+    return "\n\n".join(sections)
+
+
 def hash_file(file_path: str) -> str:
     """Calculate SHA256 hash of a file."""
     try:
@@ -171,23 +181,37 @@ def copy_output_from_previous_session(
             )
 
 
-def create_cached_system_prompt(prompt: str) -> list[SystemContentBlock]:
+def create_cached_system_prompt(
+    prompt: str, run_context: str | None = None
+) -> list[SystemContentBlock]:
     """
     Convert a string system prompt to SystemContentBlock array with caching.
 
     This enables prompt caching using the provider-agnostic approach recommended
     by Strands Agents, replacing the deprecated cache_prompt parameter.
 
+    The prompt must be the same in every run, so its cache entry is reused
+    across runs. Values that change between runs go in run_context, which
+    gets its own cache point so it is still cached across the agent's model
+    calls within a run.
+
     Args:
-        prompt: The system prompt string
+        prompt: The static system prompt string
+        run_context: Run specific section, e.g. from generate_run_context_section
 
     Returns:
-        List of SystemContentBlock with cache point
+        List of SystemContentBlock with cache points
     """
-    return [
+    blocks = [
         SystemContentBlock(text=prompt),
         SystemContentBlock(cachePoint={"type": "default"}),
     ]
+    if run_context:
+        blocks += [
+            SystemContentBlock(text=run_context),
+            SystemContentBlock(cachePoint={"type": "default"}),
+        ]
+    return blocks
 
 
 def create_no_action_system_prompt(agent_name: str) -> list[SystemContentBlock]:
@@ -327,9 +351,11 @@ def create_default_bedrock_model(
 
     # Build model parameters conditionally
     # When boto_session is provided, don't pass region_name (they're mutually exclusive)
+    # Cache points after the tools and the latest message, in addition to the
+    # system prompt's own (see create_cached_system_prompt)
     model_params = {
         "model_id": resolved_model_id,
-        "cache_tools": "default",
+        "cache_config": CacheConfig(strategy="auto", tools_ttl=True),
         "boto_client_config": create_enhanced_boto_config(),
         "max_tokens": max_tokens,
     }
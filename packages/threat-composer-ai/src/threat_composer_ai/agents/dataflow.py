@@ -10,8 +10,6 @@ from strands import Agent
 
 from ..config import AppConfig
 from ..tools import (
-    threat_composer_generate_uuid4,
-    threat_composer_generate_uuid4_with_guidance,
     threat_composer_list_workdir_files_gitignore_filtered,
     threat_composer_validate_tc_v1_schema,
     threat_composer_workdir_file_read,
@@ -20,6 +18,7 @@ from ..tools import (
 from ..utils import get_tool_name
 from ..utils.relative_path_helper import create_prompt_path_from_config
 from .common import (
+    AI_GENERATED_TAG_PLACEHOLDER,
     CODE_ANALYSIS_PROMPT_SNIPPET,
     any_input_files_changed,
     copy_output_from_previous_session,
@@ -28,7 +27,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
-    generate_required_inputs_section,
+    generate_run_context_section,
 )
 
 # Agent configuration
@@ -46,8 +45,10 @@ def get_input_files(config: AppConfig) -> list[str]:
 def create_system_prompt(config: AppConfig):
     """Create the system prompt with caching enabled"""
 
-    # Build the tags example with the configurable AI generated tag
-    tags_example = f'["tag1", "tag2", "{config.ai_generated_tag}"] (each tag ≤30 chars)'
+    # Build the tags example; the AI generated tag is given in the run context
+    tags_example = (
+        f'["tag1", "tag2", "{AI_GENERATED_TAG_PLACEHOLDER}"] (each tag ≤30 chars)'
+    )
 
     output_format = (
         """{
@@ -79,7 +80,7 @@ def create_system_prompt(config: AppConfig):
         },
         "assumptions": [
           {
-            "id": "Use available un-used UUID, or call tool to get more",
+            "id": "placeholder key, unique within this file",
             "numericId": 1,
             "content": "[Brief assumption - single line - <= 200 chars]",
             "tags": """
@@ -102,12 +103,9 @@ def create_system_prompt(config: AppConfig):
       }"""
     )
 
-    # Get dynamic input dependencies using the new helper function
-    dynamic_inputs = generate_required_inputs_section(config, get_input_files(config))
-
     prompt_text = f"""You are a agent specializing in understanding software systems for threat modeling purposes based on provided context, and by reviewing application source code.
 
-   {dynamic_inputs}
+   REQUIRED INPUTS: the files listed under RUN CONTEXT
 
    Your focus is determining the elements and flows of this application.
 
@@ -127,24 +125,33 @@ def create_system_prompt(config: AppConfig):
     2. You must use {get_tool_name(threat_composer_workdir_file_write)} tool to create your outputs.
     3. You must use {get_tool_name(threat_composer_validate_tc_v1_schema)} to validate your output.
 
-    You have been provided with a set if pre-generated UUIDs to use for your outputs
-
-    IMPORTANT UUID USAGE:
-    - Use these UUIDs in sequential order for your outputs (use UUID #1 first, then #2, etc.)
-    - Each UUID should only be used once
-    - If you need more UUIDs than provided, use the {get_tool_name(threat_composer_generate_uuid4)} tool to generate additional ones
-    - Do NOT generate your own UUIDs manually - always use the pre-loaded ones first, then the tool if needed
+    IMPORTANT ID USAGE:
+    - Give each new entity a short placeholder "id" that is unique within your output file (e.g. "A1" for assumptions, "T1" for threats, "M1" for mitigations)
+    - Use the same placeholders in assumptionLinks and mitigationLinks
+    - When referring to entities from your input files, use their existing UUIDs
+    - Do NOT generate UUIDs - UUIDs and numericIds are assigned automatically when the file is written
 
     REQUIRED FILE OUTPUTS:
 
-   1. Write to "{create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.dataflow_description_filename)}" with the following structure {output_format}
+   1. Write to the "dataflow description output" path listed under RUN CONTEXT with the following structure {output_format}
 
    Remember: Be explicit about what you're assuming vs. what you can definitively determine from the code.
 
    FINAL RESPONSE:
    1. Your final reponse must be a single line. No formatting."""
 
-    return create_cached_system_prompt(prompt_text)
+    run_context = generate_run_context_section(
+        config,
+        get_input_files(config),
+        {
+            "dataflow description output": create_prompt_path_from_config(
+                "output_directory",
+                "components_output_sub_dir",
+                config.dataflow_description_filename,
+            )
+        },
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_dataflow_agent(
@@ -192,8 +199,6 @@ def create_dataflow_agent(
             "path": os.path.join(tools_dir, "threat_composer_workdir_file_write.py"),
         },
         threat_composer_list_workdir_files_gitignore_filtered,
-        threat_composer_generate_uuid4,
-        threat_composer_generate_uuid4_with_guidance,
         threat_composer_validate_tc_v1_schema,
     ]
 
@@ -206,7 +211,4 @@ def create_dataflow_agent(
         tools=tools_list,
     )
 
-    # Proactively seed the agent with a batch of UUIDs
-    agent.tool.threat_composer_generate_uuid4_with_guidance(batch_size=20)
-
     return agent
@@ -19,7 +19,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
-    generate_required_inputs_section,
+    generate_run_context_section,
 )
 
 # Agent configuration
@@ -36,14 +36,13 @@ def get_input_files(config: AppConfig) -> list[str]:
 def create_system_prompt(config: AppConfig):
     """Create the system prompt with caching enabled"""
     # Get dynamic input dependencies using the new helper function
-    dynamic_inputs = generate_required_inputs_section(config, get_input_files(config))
 
     prompt_text = f"""# System Prompt: Data Flow Diagram Generator
 
 ## Role
 You are a system analyst creating Data Flow Diagrams (DFDs) from existing textual dataflow descriptions. You generate Python code using for use by the diagrams library with custom DFD node classes to visualize how data moves between system components.
 
-{dynamic_inputs}
+REQUIRED INPUTS: the files listed under RUN CONTEXT
 
 ## REQUIRED TOOLS:
 1. Use ${get_tool_name(threat_composer_workdir_file_read)} to read the dataflow description input file
@@ -170,7 +169,10 @@ with Diagram("My System DFD", direction="LR"):
 
 **Key Principle:** DF identifiers are non-negotiable. Every Edge must be traceable to source documentation for threat modeling."""
 
-    return create_cached_system_prompt(prompt_text)
+    run_context = generate_run_context_section(
+        config, get_input_files(config), ai_generated_tag=False
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_dataflow_diagram_agent(
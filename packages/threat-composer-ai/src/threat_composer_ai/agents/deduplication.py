@@ -0,0 +1,165 @@
+"""
+Near-Duplicate Merge Node - Between Mitigation Planning and Output Generation
+
+Deterministic (non-LLM) graph node that merges paraphrased duplicate threats
+and mitigations in the component files and rewrites the links that pointed
+at them, before the threat model is assembled.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from strands.agent import AgentResult
+from strands.multiagent.base import MultiAgentBase, MultiAgentResult, NodeResult, Status
+from strands.telemetry.metrics import EventLoopMetrics
+
+from ..config import AppConfig
+from ..logging import log_debug, log_success, log_warning
+from ..tools.threat_composer_dia_common import write_hash_file
+from ..tools.threat_composer_near_duplicates import (
+    DeduplicationResult,
+    deduplicate_documents,
+    format_deduplication_summary,
+)
+from ..utils.json_output import json_dump_options
+
+# Node configuration
+AGENT_NAME = "deduplicate"
+
+
+def get_input_files(config: AppConfig) -> list[Path]:
+    """Get the component files whose threats, mitigations and links are merged."""
+    components_dir = config.output_directory / config.components_output_sub_dir
+    return [
+        components_dir / config.threats_filename,
+        components_dir / config.mitigations_filename,
+    ]
+
+
+def merge_near_duplicate_components(config: AppConfig) -> str:
+    """
+    Merge near-duplicate threats and mitigations in the component files.
+
+    Only files that change are rewritten, and their hash files are updated so
+    incremental reruns compare against the merged content. Each merge is
+    logged and appended to the merge record in the components directory, so
+    it can be reviewed and undone.
+
+    Args:
+        config: AppConfig instance
+
+    Returns:
+        Summary of the merged entities
+    """
+    documents: dict[str, dict[str, Any]] = {}
+    paths = {}
+    for path in get_input_files(config):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log_debug(f"{AGENT_NAME}: Skipping {path.name}: {e}")
+            continue
+        if isinstance(data, dict):
+            documents[path.name] = data
+            paths[path.name] = path
+
+    result = deduplicate_documents(documents, config.near_duplicate_threshold)
+
+    pretty = not config.compact_json_output
+    for name, document in result.documents.items():
+        if document == documents[name]:
+            continue
+        paths[name].write_text(
+            json.dumps(document, **json_dump_options(pretty)), encoding="utf-8"
+        )
+        write_hash_file(paths[name])
+        log_debug(f"{AGENT_NAME}: Rewrote {name}")
+
+    if result.merges:
+        for merge in result.merges:
+            log_warning(
+                f"{AGENT_NAME}: Merged {merge.section} {merge.removed_id} into "
+                f"{merge.kept_id} (similarity {merge.similarity:.2f})"
+            )
+        _record_merges(config, result)
+
+    return format_deduplication_summary(result)
+
+
+def _record_merges(config: AppConfig, result: DeduplicationResult) -> None:
+    """Append the merges made to the merge record of the session."""
+    path = (
+        config.output_directory
+        / config.components_output_sub_dir
+        / config.near_duplicate_merges_filename
+    )
+    records: list[Any] = []
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(existing, list):
+            records = existing
+    except (OSError, ValueError):
+        pass
+    records.extend(merge.to_dict() for merge in result.merges)
+    path.write_text(json.dumps(records, **json_dump_options(True)), encoding="utf-8")
+
+
+class DeduplicationNode(MultiAgentBase):
+    """
+    Graph node that merges near-duplicate threats and mitigations.
+
+    Runs without a model: the merge is computed from the component files, so
+    the same inputs always give the same output. Its summary is passed to the
+    next node like an agent response.
+    """
+
+    def __init__(self, config: AppConfig):
+        super().__init__()
+        self.id = AGENT_NAME
+        self.config = config
+
+    async def invoke_async(
+        self,
+        task: Any,
+        invocation_state: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> MultiAgentResult:
+        start_time = time.time()
+        try:
+            summary = await asyncio.to_thread(
+                merge_near_duplicate_components, self.config
+            )
+            log_success(f"{AGENT_NAME}: {summary.splitlines()[0]}")
+        except Exception as e:
+            # Merging is an optimization; the unmerged files are still valid
+            summary = f"Near-duplicate merge skipped: {e}"
+            log_warning(f"{AGENT_NAME}: {summary}")
+
+        execution_time = round((time.time() - start_time) * 1000)
+        agent_result = AgentResult(
+            stop_reason="end_turn",
+            message={"role": "assistant", "content": [{"text": summary}]},
+            metrics=EventLoopMetrics(),
+            state={},
+        )
+        return MultiAgentResult(
+            status=Status.COMPLETED,
+            results={
+                AGENT_NAME: NodeResult(
+                    result=agent_result,
+                    execution_time=execution_time,
+                    status=Status.COMPLETED,
+                    execution_count=1,
+                )
+            },
+            execution_count=1,
+            execution_time=execution_time,
+        )
+
+
+def create_deduplication_node(config: AppConfig) -> DeduplicationNode:
+    """Create the node merging near-duplicate threats and mitigations."""
+    return DeduplicationNode(config)
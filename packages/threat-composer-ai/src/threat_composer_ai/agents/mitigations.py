@@ -10,8 +10,6 @@ from strands import Agent
 
 from ..config import AppConfig
 from ..tools import (
-    threat_composer_generate_uuid4,
-    threat_composer_generate_uuid4_with_guidance,
     threat_composer_validate_tc_v1_schema,
     threat_composer_workdir_file_read,
     threat_composer_workdir_file_write,
@@ -19,6 +17,7 @@ from ..tools import (
 from ..utils import get_tool_name
 from ..utils.relative_path_helper import create_prompt_path_from_config
 from .common import (
+    AI_GENERATED_TAG_PLACEHOLDER,
     any_input_files_changed,
     copy_output_from_previous_session,
     create_agent_model,
@@ -26,7 +25,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
-    generate_required_inputs_section,
+    generate_run_context_section,
 )
 
 # Agent configuration
@@ -46,11 +45,8 @@ def get_input_files(config: AppConfig) -> list[str]:
 def create_system_prompt(config: AppConfig):
     """Create the system prompt with caching enabled"""
 
-    # Get dynamic input dependencies using the new helper function
-    dynamic_inputs = generate_required_inputs_section(config, get_input_files(config))
-
-    # Build the tags example with the configurable AI generated tag
-    mitigation_tags_example = f'[Consider tags such as "Preventative", "Detective" and mitigation types like "Authentication", "{config.ai_generated_tag}"] (each tag ≤30 chars)'
+    # Build the tags example; the AI generated tag is given in the run context
+    mitigation_tags_example = f'[Consider tags such as "Preventative", "Detective" and mitigation types like "Authentication", "{AI_GENERATED_TAG_PLACEHOLDER}"] (each tag ≤30 chars)'
 
     output_format = (
         """
@@ -64,7 +60,7 @@ def create_system_prompt(config: AppConfig):
      "threats": [#Empty],
      "mitigations": [
         {
-        "id": "Use available un-used UUID, or call tool to get more",
+        "id": "placeholder key, unique within this file",
         "numericId": 1,
         "content": "mitigation content (≤1000 chars)",
         "tags": """
@@ -83,7 +79,7 @@ def create_system_prompt(config: AppConfig):
      ],
      "mitigationLinks": [
         {
-        "mitigationId": "mitigation-uuid",
+        "mitigationId": "mitigation placeholder",
         "linkedId": "existing-threat-uuid"
         }
      ]
@@ -111,7 +107,7 @@ def create_system_prompt(config: AppConfig):
     2. You must use {get_tool_name(threat_composer_workdir_file_write)} tool to create your outputs.
     3. You must use {get_tool_name(threat_composer_validate_tc_v1_schema)} to validate your output.
 
-    {dynamic_inputs}
+    REQUIRED INPUTS: the files listed under RUN CONTEXT
 
     MITIGATION SELECTION STRATEGY:
     For each threat in the threats file, consider:
@@ -131,16 +127,14 @@ def create_system_prompt(config: AppConfig):
     - Detective: Controls that identify threats in progress
     - Corrective: Controls that limit damage when threats succeed
 
-    You have been provided with a set if pre-generated UUIDs to use for your outputs
-
-    IMPORTANT UUID USAGE:
-    - Use these UUIDs in sequential order for your outputs (use UUID #1 first, then #2, etc.)
-    - Each UUID should only be used once
-    - If you need more UUIDs than provided, use the {get_tool_name(threat_composer_generate_uuid4)} tool to generate additional ones
-    - Do NOT generate your own UUIDs manually - always use the pre-loaded ones first, then the tool if needed
+    IMPORTANT ID USAGE:
+    - Give each new entity a short placeholder "id" that is unique within your output file (e.g. "A1" for assumptions, "T1" for threats, "M1" for mitigations)
+    - Use the same placeholders in assumptionLinks and mitigationLinks
+    - When referring to entities from your input files, use their existing UUIDs
+    - Do NOT generate UUIDs - UUIDs and numericIds are assigned automatically when the file is written
 
     REQUIRED FILE OUTPUTS:
-    1. Write to "{create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.mitigations_filename)}" with the following structure {output_format}
+    1. Write to the "mitigations output" path listed under RUN CONTEXT with the following structure {output_format}
 
     Remember: Document all assumptions you make during analysis. Be explicit about what you're assuming vs. what you can definitively determine from the code.
 
@@ -148,7 +142,18 @@ def create_system_prompt(config: AppConfig):
    1. Your final reponse must be a single line. No formatting.
     """
 
-    return create_cached_system_prompt(prompt_text)
+    run_context = generate_run_context_section(
+        config,
+        get_input_files(config),
+        {
+            "mitigations output": create_prompt_path_from_config(
+                "output_directory",
+                "components_output_sub_dir",
+                config.mitigations_filename,
+            )
+        },
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_mitigations_agent(
@@ -195,8 +200,6 @@ def create_mitigations_agent(
             "name": "threat_composer_workdir_file_write",
             "path": os.path.join(tools_dir, "threat_composer_workdir_file_write.py"),
         },
-        threat_composer_generate_uuid4,
-        threat_composer_generate_uuid4_with_guidance,
         threat_composer_validate_tc_v1_schema,
     ]
 
@@ -209,7 +212,4 @@ def create_mitigations_agent(
         tools=tools_list,
     )
 
-    # Proactively seed the agent with a batch of UUIDs
-    agent.tool.threat_composer_generate_uuid4_with_guidance(batch_size=40)
-
     return agent
@@ -20,6 +20,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
+    generate_run_context_section,
     get_tool_name,
 )
 
@@ -51,22 +52,35 @@ def create_system_prompt(config: AppConfig):
     - You must use {get_tool_name(threat_composer_validate_tc_v1_schema)} for validation operations.
 
     Your responsibilities:
-    1. Use the {get_tool_name(threat_composer_assemble_tc_v1_model)} tool providing the following parameters
-        - application_info_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.application_info_filename)}
-        - architecture_description_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.architecture_description_filename)}
-        - architecture_diagram_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.architecture_diagram_filename)}
-        - dataflow_description_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.dataflow_description_filename)}
-        - dataflow_diagram_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.dataflow_diagram_filename)}
-        - threats_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.threats_filename)}
-        - mitigations_path: {create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.mitigations_filename)}
-        - output_path: {create_prompt_path_from_config("output_directory", None, config.threat_composer_filename)}
+    1. Use the {get_tool_name(threat_composer_assemble_tc_v1_model)} tool providing the parameters listed under RUN CONTEXT (application_info_path, architecture_description_path, architecture_diagram_path, dataflow_description_path, dataflow_diagram_path, threats_path, mitigations_path and output_path)
     2. Use {get_tool_name(threat_composer_validate_tc_v1_schema)} to validate the file created.
 
     FINAL RESPONSE:
     1. Your final reponse must be a single line. No formatting.
     """
 
-    return create_cached_system_prompt(prompt_text)
+    components = {
+        "application_info_path": config.application_info_filename,
+        "architecture_description_path": config.architecture_description_filename,
+        "architecture_diagram_path": config.architecture_diagram_filename,
+        "dataflow_description_path": config.dataflow_description_filename,
+        "dataflow_diagram_path": config.dataflow_diagram_filename,
+        "threats_path": config.threats_filename,
+        "mitigations_path": config.mitigations_filename,
+    }
+    paths = {
+        name: create_prompt_path_from_config(
+            "output_directory", "components_output_sub_dir", filename
+        )
+        for name, filename in components.items()
+    }
+    paths["output_path"] = create_prompt_path_from_config(
+        "output_directory", None, config.threat_composer_filename
+    )
+    run_context = generate_run_context_section(
+        config, paths=paths, ai_generated_tag=False
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_threat_model_agent(
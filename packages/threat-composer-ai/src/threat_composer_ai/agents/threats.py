@@ -10,8 +10,6 @@ from strands import Agent
 
 from ..config import AppConfig
 from ..tools import (
-    threat_composer_generate_uuid4,
-    threat_composer_generate_uuid4_with_guidance,
     threat_composer_validate_tc_v1_schema,
     threat_composer_workdir_file_read,
     threat_composer_workdir_file_write,
@@ -19,6 +17,7 @@ from ..tools import (
 from ..utils import get_tool_name
 from ..utils.relative_path_helper import create_prompt_path_from_config
 from .common import (
+    AI_GENERATED_TAG_PLACEHOLDER,
     any_input_files_changed,
     copy_output_from_previous_session,
     create_agent_model,
@@ -26,7 +25,7 @@ from .common import (
     create_default_callback_handler,
     create_default_conversation_manager,
     create_no_action_system_prompt,
-    generate_required_inputs_section,
+    generate_run_context_section,
 )
 
 # Agent configuration
@@ -45,13 +44,10 @@ def get_input_files(config: AppConfig) -> list[str]:
 def create_system_prompt(config: AppConfig):
     """Create the system prompt with caching enabled"""
 
-    # Get dynamic input dependencies using the new helper function
-    dynamic_inputs = generate_required_inputs_section(config, get_input_files(config))
-
-    # Build the tags examples with the configurable AI generated tag
-    threat_tags_example = f'[Dataflow element(s) this threat is associated with (comma delimited), "{config.ai_generated_tag}"] (each tag ≤30 chars)'
+    # Build the tags examples; the AI generated tag is given in the run context
+    threat_tags_example = f'[Dataflow element(s) this threat is associated with (comma delimited), "{AI_GENERATED_TAG_PLACEHOLDER}"] (each tag ≤30 chars)'
     assumption_tags_example = (
-        f'["tag1", "tag2", "{config.ai_generated_tag}"] (each tag ≤30 chars)'
+        f'["tag1", "tag2", "{AI_GENERATED_TAG_PLACEHOLDER}"] (each tag ≤30 chars)'
     )
 
     output_format = (
@@ -62,7 +58,7 @@ def create_system_prompt(config: AppConfig):
         "dataflow": { #Empty },
         "threats": [
           {
-            "id": "Use available un-used UUID, or call tool to get more",
+            "id": "placeholder key, unique within this file",
             "numericId": 1,
             "threatSource": "threat source. the entity taking action. For example: actor (a useful default), internet-based actor, internal or external actor. lower case (≤200 chars)",
             "prerequisites": "prerequisites. conditions or requirements that must be met for a threat source's action to be viable. For example: -with access to another user's token. -who has administrator access -with user permissions - in a mitm position -with a network path to the API. If no prerequistes known return empty string, if know return but first word must be lower case (≤200 chars)",
@@ -96,7 +92,7 @@ def create_system_prompt(config: AppConfig):
         ],
         "assumptions": [
           {
-            "id": "Use available un-used UUID, or call tool to get more",
+            "id": "placeholder key, unique within this file",
             "numericId": 1,
             "content": "assumption title (from header) (≤1000 chars)",
             "tags": """
@@ -115,8 +111,8 @@ def create_system_prompt(config: AppConfig):
         "assumptionLinks": [
         {
             "type": "Threat",
-            "assumptionId": "assumption-uuid",
-            "linkedId": "threat-uuid"
+            "assumptionId": "assumption placeholder",
+            "linkedId": "threat placeholder"
         },
         "mitigations": [#Empty],
         "mitigationLinks": [#Empty],
@@ -137,7 +133,7 @@ def create_system_prompt(config: AppConfig):
     2. You must use {get_tool_name(threat_composer_workdir_file_write)} tool to create your outputs.
     3. You must use {get_tool_name(threat_composer_validate_tc_v1_schema)} to validate your output.
 
-    {dynamic_inputs}
+    REQUIRED INPUTS: the files listed under RUN CONTEXT
 
     STRIDE APPLICATION STRATEGY:
     1. For each dataflow element, apply only the MOST RELEVANT STRIDE categories
@@ -161,16 +157,14 @@ def create_system_prompt(config: AppConfig):
     - Assign STRIDE categories and priority levels
     - Consider both expected and unexpected interactions
 
-    You have been provided with a set if pre-generated UUIDs to use for your outputs
-
-    IMPORTANT UUID USAGE:
-    - Use these UUIDs in sequential order for your outputs (use UUID #1 first, then #2, etc.)
-    - Each UUID should only be used once
-    - If you need more UUIDs than provided, use the {get_tool_name(threat_composer_generate_uuid4)} tool to generate additional ones
-    - Do NOT generate your own UUIDs manually - always use the pre-loaded ones first, then the tool if needed
+    IMPORTANT ID USAGE:
+    - Give each new entity a short placeholder "id" that is unique within your output file (e.g. "A1" for assumptions, "T1" for threats, "M1" for mitigations)
+    - Use the same placeholders in assumptionLinks and mitigationLinks
+    - When referring to entities from your input files, use their existing UUIDs
+    - Do NOT generate UUIDs - UUIDs and numericIds are assigned automatically when the file is written
 
     REQUIRED FILE OUTPUTS:
-    1. Write to "{create_prompt_path_from_config("output_directory", "components_output_sub_dir", config.threats_filename)}" with the following structure {output_format}
+    1. Write to the "threats output" path listed under RUN CONTEXT with the following structure {output_format}
 
     Remember: Document all assumptions you make during analysis. Be explicit about what you're assuming vs. what you can definitively determine from the code.
 
@@ -178,7 +172,16 @@ def create_system_prompt(config: AppConfig):
     1. Your final reponse must be a single line. No formatting.
     """
 
-    return create_cached_system_prompt(prompt_text)
+    run_context = generate_run_context_section(
+        config,
+        get_input_files(config),
+        {
+            "threats output": create_prompt_path_from_config(
+                "output_directory", "components_output_sub_dir", config.threats_filename
+            )
+        },
+    )
+    return create_cached_system_prompt(prompt_text, run_context)
 
 
 def create_threats_agent(
@@ -225,8 +228,6 @@ def create_threats_agent(
             "name": "threat_composer_workdir_file_write",
             "path": os.path.join(tools_dir, "threat_composer_workdir_file_write.py"),
         },
-        threat_composer_generate_uuid4,
-        threat_composer_generate_uuid4_with_guidance,
         threat_composer_validate_tc_v1_schema,
     ]
 
@@ -239,7 +240,4 @@ def create_threats_agent(
         tools=tools_list,
     )
 
-    # Proactively seed the agent with a batch of UUIDs
-    agent.tool.threat_composer_generate_uuid4_with_guidance(batch_size=40)
-
     return agent
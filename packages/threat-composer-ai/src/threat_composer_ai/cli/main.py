@@ -1,5 +1,6 @@
 """Main CLI entry point for threat_composer_ai module."""
 
+import json
 import os
 import signal
 import sys
@@ -8,7 +9,13 @@ from pathlib import Path
 
 import click
 
-from ..core import WorkflowRunner
+from ..config import AppConfig
+from ..core import (
+    WorkflowRunner,
+    format_telemetry_summary,
+    iter_otlp_spans,
+    summarize_spans,
+)
 from ..logging import (
     log_debug,
     log_error,
@@ -16,13 +23,46 @@ from ..logging import (
     log_success,
 )
 from ..utils import create_signal_handler
+from ..validation.bulk_validator import (
+    build_json_report,
+    build_sarif_report,
+    collect_tc_files,
+    validate_tc_files,
+)
 
 # Global shutdown flag and workflow reference for signal handling
 _shutdown_event = threading.Event()
 _active_workflow_ref = {"workflow": None}
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """
+    Click group that runs a default command when no subcommand is given.
+
+    Keeps `threat-composer-ai-cli /path/to/code` working alongside
+    subcommands such as `threat-composer-ai-cli validate`.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or (args[0] not in self.commands and args[0] != "--help"):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultCommandGroup, default_command="analyze")
+def main():
+    """
+    AI-powered automated threat modeling for codebases.
+
+    Runs `analyze` when no command is given.
+    """
+
+
+@main.command()
 @click.argument(
     "directory_path",
     type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
@@ -55,14 +95,14 @@ _active_workflow_ref = {"workflow": None}
 @click.option(
     "--enable-telemetry",
     is_flag=True,
-    help="Enable Jaeger telemetry tracing (disabled by default)",
+    help="Enable telemetry tracing to Jaeger, or to files in the logs directory with THREAT_COMPOSER_TELEMETRY_EXPORTER=file (disabled by default)",
 )
 @click.option(
     "--rerun-from",
     type=click.Path(exists=True, path_type=Path),
     help="Rerun from previous session directory (incremental execution)",
 )
-def main(
+def analyze(
     directory_path: Path,
     verbose: bool,
     output_dir: Path | None,
@@ -76,7 +116,7 @@ def main(
     rerun_from: Path | None,
 ):
     """
-    AI-powered automated threat modeling for codebases.
+    Analyze a codebase and generate a threat model.
 
     DIRECTORY_PATH: Path to the directory you want to analyze for threats.
     """
@@ -121,7 +161,12 @@ def main(
         log_debug(f"AWS region: {runner.config.aws_region}")
         log_debug(f"Log level: {runner.config.get_log_level_name()}")
         if runner.config.enable_telemetry:
-            log_debug("Telemetry enabled - traces will be sent to Jaeger")
+            destination = (
+                "written to the logs directory"
+                if runner.config.telemetry_exporter == "file"
+                else "sent to Jaeger"
+            )
+            log_debug(f"Telemetry enabled - traces will be {destination}")
         else:
             log_debug(
                 "Telemetry disabled (use --enable-telemetry or THREAT_COMPOSER_ENABLE_TELEMETRY=true to enable)"
@@ -220,5 +265,112 @@ def main(
         sys.exit(1)
 
 
+@main.command()
+@click.argument(
+    "paths",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, path_type=Path),
+)
+@click.option(
+    "--format",
+    "report_format",
+    type=click.Choice(["json", "sarif"]),
+    default="json",
+    show_default=True,
+    help="Report format",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the report to this file instead of standard output",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Number of worker processes (defaults to the CPU count)",
+)
+@click.option(
+    "--strict-references",
+    is_flag=True,
+    help="Report links to missing entities as errors instead of warnings",
+)
+def validate(
+    paths: tuple[Path, ...],
+    report_format: str,
+    output: Path | None,
+    workers: int | None,
+    strict_references: bool,
+):
+    """
+    Validate Threat Composer files against the v1 schema.
+
+    PATHS: Files or directories; directories are searched recursively for
+    *.tc.json files. Exits with status 1 if any file is invalid.
+    """
+    files = collect_tc_files(paths)
+    report = validate_tc_files(
+        files, max_workers=workers, strict_references=strict_references
+    )
+
+    base = Path.cwd()
+    if report_format == "sarif":
+        document = build_sarif_report(report, base)
+    else:
+        document = build_json_report(report, base)
+    text = json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+
+    if output:
+        output.write_text(text, encoding="utf-8")
+    else:
+        click.echo(text, nl=False)
+
+    click.echo(
+        f"Validated {len(report.results)} file(s): "
+        f"{len(report.invalid_files)} invalid, "
+        f"{report.error_count} error(s), {report.warning_count} warning(s)",
+        err=True,
+    )
+    sys.exit(0 if report.is_valid else 1)
+
+
+@main.command()
+@click.argument(
+    "path",
+    type=click.Path(exists=True, path_type=Path),
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of slowest tool calls to show",
+)
+def profile(path: Path, top: int):
+    """
+    Summarize the telemetry of a run written with the file exporter.
+
+    PATH: Session output directory, its logs directory or its span file.
+    Prints the critical path, the slowest tool calls and token usage.
+    """
+    spans_file = path
+    if (path / AppConfig.logs_output_sub_dir).is_dir():
+        path = path / AppConfig.logs_output_sub_dir
+    if path.is_dir():
+        spans_file = path / AppConfig.telemetry_spans_filename
+    if not spans_file.is_file():
+        click.echo(
+            f"No span file found at {spans_file}. Run with --enable-telemetry "
+            "and THREAT_COMPOSER_TELEMETRY_EXPORTER=file to write one.",
+            err=True,
+        )
+        sys.exit(1)
+
+    summary = summarize_spans(list(iter_otlp_spans(spans_file)), top=top)
+    click.echo(format_telemetry_summary(summary))
+
+
 if __name__ == "__main__":
     main()
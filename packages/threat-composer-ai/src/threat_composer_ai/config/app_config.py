@@ -37,6 +37,11 @@ class AppConfig:
     mitigations_filename: str = "mitigations.tc.json"
     threat_composer_filename: str = "threatmodel.tc.json"
     log_filename: str = "threat-composer.log"
+    event_log_filename: str = "events.jsonl"
+    run_report_filename: str = "run-report.json"
+    near_duplicate_merges_filename: str = "near-duplicate-merges.json"
+    telemetry_spans_filename: str = "spans.otlp.jsonl"
+    telemetry_metrics_filename: str = "metrics.otlp.jsonl"
 
     # Logging configuration
     log_level: int = logging.INFO
@@ -47,6 +52,9 @@ class AppConfig:
     telemetry_endpoint_host: str = "localhost"
     telemetry_endpoint_port: int = 4318
     telemetry_service_name: str = "threat-composer-ai"
+    # "otlp" sends to the endpoint above; "file" writes OTLP-JSON files to
+    # the session's logs directory
+    telemetry_exporter: str = "otlp"
 
     # Rich display configuration
     show_assistant_messages: bool = True
@@ -66,12 +74,32 @@ class AppConfig:
     # AI Generated content tagging
     ai_generated_tag: str = "AI Generated"
 
+    # Optional diagram icon optimization: downscale embedded icons to their
+    # rendered size and recompress them ("png" or "webp"). Off by default, as
+    # it changes the embedded images
+    optimize_diagram_icons: bool = False
+    diagram_icon_format: str = "png"
+
+    # Threat model output: compact JSON unless disabled, and optionally a
+    # gzip compressed copy (.tc.json.gz) next to the assembled model
+    compact_json_output: bool = True
+    gzip_threat_model: bool = False
+
+    # Merge paraphrased duplicate threats and mitigations before assembly
+    # (opt-in); threshold is the minimum Jaccard similarity of word shingles
+    merge_near_duplicates: bool = False
+    near_duplicate_threshold: float = 0.9
+
     # UUID batch size for pre-loading
     uuid_batch_size: int = 100
 
     # Invocation source tracking
     invocation_source: str = "UNKNOWN"  # "CLI" or "MCP"
 
+    # Session an incremental rerun starts from; component files written in
+    # this session are merged with their previous versions to keep IDs stable
+    previous_session_path: Path | None = None
+
     @classmethod
     def create(
         cls,
@@ -87,6 +115,7 @@ class AppConfig:
         ai_generated_tag: str | None = None,
         uuid_batch_size: int | None = None,
         invocation_source: str = "UNKNOWN",
+        previous_session_path: str | Path | None = None,
     ) -> "AppConfig":
         """
         Create AppConfig with proper precedence: CLI args → Environment vars → Defaults.
@@ -102,6 +131,7 @@ class AppConfig:
             node_timeout: Optional node timeout override
             ai_generated_tag: Optional AI generated content tag override
             uuid_batch_size: Optional UUID batch size override
+            previous_session_path: Optional previous session for incremental reruns
 
         Returns:
             AppConfig instance with merged configuration
@@ -117,6 +147,19 @@ class AppConfig:
         env_node_timeout = cls._get_env_float("THREAT_COMPOSER_NODE_TIMEOUT")
         env_ai_generated_tag = os.getenv("THREAT_COMPOSER_AI_GENERATED_TAG")
         env_uuid_batch_size = cls._get_env_int("THREAT_COMPOSER_UUID_BATCH_SIZE")
+        env_optimize_diagram_icons = cls._get_env_bool(
+            "THREAT_COMPOSER_OPTIMIZE_DIAGRAM_ICONS"
+        )
+        env_diagram_icon_format = os.getenv("THREAT_COMPOSER_DIAGRAM_ICON_FORMAT")
+        env_telemetry_exporter = os.getenv("THREAT_COMPOSER_TELEMETRY_EXPORTER")
+        env_compact_json_output = cls._get_env_bool("THREAT_COMPOSER_COMPACT_JSON")
+        env_gzip_threat_model = cls._get_env_bool("THREAT_COMPOSER_GZIP_THREAT_MODEL")
+        env_merge_near_duplicates = cls._get_env_bool(
+            "THREAT_COMPOSER_MERGE_NEAR_DUPLICATES"
+        )
+        env_near_duplicate_threshold = cls._get_env_float(
+            "THREAT_COMPOSER_NEAR_DUPLICATE_THRESHOLD"
+        )
 
         # Determine base output directory with precedence: CLI args → Environment vars → Class defaults
         base_output_dir = (
@@ -154,7 +197,31 @@ class AppConfig:
             uuid_batch_size=uuid_batch_size
             if uuid_batch_size is not None
             else (env_uuid_batch_size if env_uuid_batch_size is not None else 100),
+            optimize_diagram_icons=env_optimize_diagram_icons
+            if env_optimize_diagram_icons is not None
+            else cls.optimize_diagram_icons,
+            diagram_icon_format=(env_diagram_icon_format or cls.diagram_icon_format)
+            .strip()
+            .lower(),
+            telemetry_exporter=(env_telemetry_exporter or cls.telemetry_exporter)
+            .strip()
+            .lower(),
+            compact_json_output=env_compact_json_output
+            if env_compact_json_output is not None
+            else cls.compact_json_output,
+            gzip_threat_model=env_gzip_threat_model
+            if env_gzip_threat_model is not None
+            else cls.gzip_threat_model,
+            merge_near_duplicates=env_merge_near_duplicates
+            if env_merge_near_duplicates is not None
+            else cls.merge_near_duplicates,
+            near_duplicate_threshold=env_near_duplicate_threshold
+            if env_near_duplicate_threshold is not None
+            else cls.near_duplicate_threshold,
             invocation_source=invocation_source,
+            previous_session_path=Path(previous_session_path)
+            if previous_session_path
+            else None,
         )
 
     @staticmethod
@@ -295,6 +362,7 @@ class AppConfig:
             "logging": {
                 "verbose": self.verbose,
                 "enable_telemetry": self.enable_telemetry,
+                "telemetry_exporter": self.telemetry_exporter,
             },
             "features": {
                 "show_assistant_messages": self.show_assistant_messages,
@@ -378,7 +446,7 @@ class AppConfig:
     ) -> None:
         """Update run metadata with completion information and token usage."""
         from ..logging import log_success
-        from ..utils import format_utc_timestamp, parse_utc_timestamp
+        from ..utils import cache_hit_rate, format_utc_timestamp, parse_utc_timestamp
 
         config_dir = self.output_directory / self.config_output_sub_dir
         metadata_file = config_dir / "run-metadata.json"
@@ -400,17 +468,29 @@ class AppConfig:
                 input_tokens = accumulated_usage.get("inputTokens", 0)
                 output_tokens = accumulated_usage.get("outputTokens", 0)
                 total_tokens = accumulated_usage.get("totalTokens", 0)
+                cache_read_tokens = accumulated_usage.get("cacheReadInputTokens", 0)
+                cache_write_tokens = accumulated_usage.get("cacheWriteInputTokens", 0)
+                hit_rate = cache_hit_rate(
+                    input_tokens, cache_read_tokens, cache_write_tokens
+                )
 
                 metadata["token_usage"] = {
                     "input_tokens": input_tokens,
                     "output_tokens": output_tokens,
                     "total_tokens": total_tokens,
+                    "cache_read_input_tokens": cache_read_tokens,
+                    "cache_write_input_tokens": cache_write_tokens,
+                    "cache_hit_rate": hit_rate,
                 }
 
                 # Log token usage summary
                 log_success(
                     f"Token usage: {input_tokens:,} input + {output_tokens:,} output = {total_tokens:,} total"
                 )
+                if hit_rate is not None:
+                    log_success(
+                        f"Prompt cache: {cache_read_tokens:,} read, {cache_write_tokens:,} written ({hit_rate:.1%} of input served from cache)"
+                    )
 
             # Write the updated metadata back to the file
             with open(metadata_file, "w", encoding="utf-8") as f:
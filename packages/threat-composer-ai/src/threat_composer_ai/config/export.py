@@ -1,5 +1,6 @@
 """Configuration export utilities for threat-composer-ai."""
 
+import json
 from datetime import datetime, timezone
 from typing import Any
 
@@ -30,3 +31,15 @@ def update_run_completion_info(
         log_debug("Run completion information updated")
     except Exception as e:
         log_error(f"Failed to update run completion info: {str(e)}")
+
+
+def export_run_report(config: AppConfig, report: dict[str, Any]) -> None:
+    """Write the run's per-node and per-tool report to the config directory."""
+    try:
+        config_dir = config.output_directory / config.config_output_sub_dir
+        config_dir.mkdir(parents=True, exist_ok=True)
+        with open(config_dir / config.run_report_filename, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        log_debug(f"Run report written to: {config_dir / config.run_report_filename}")
+    except Exception as e:
+        log_error(f"Failed to export run report: {str(e)}")
@@ -1,5 +1,6 @@
 """Global configuration registry for secure tool access."""
 
+from contextvars import ContextVar
 from threading import Lock
 from typing import Optional
 
@@ -12,6 +13,11 @@ class GlobalConfigRegistry:
 
     This registry ensures that tools can only access the configured working directory
     and prevents AI agents from manipulating file access paths for security.
+
+    A registered configuration also applies to the current context (thread or
+    asyncio task), so workflows running concurrently in one process (e.g. in
+    the MCP server) each see their own configuration. Code running outside
+    any such context sees the most recently registered configuration.
     """
 
     _instance: Optional["GlobalConfigRegistry"] = None
@@ -20,6 +26,9 @@ class GlobalConfigRegistry:
     def __init__(self):
         self._config: AppConfig | None = None
         self._config_lock = Lock()
+        self._context_config: ContextVar[AppConfig | None] = ContextVar(
+            "threat_composer_config", default=None
+        )
 
     @classmethod
     def get_instance(cls) -> "GlobalConfigRegistry":
@@ -39,6 +48,7 @@ class GlobalConfigRegistry:
         """
         with self._config_lock:
             self._config = config
+        self._context_config.set(config)
 
     def get_config(self) -> AppConfig | None:
         """
@@ -47,6 +57,9 @@ class GlobalConfigRegistry:
         Returns:
             The registered AppConfig instance, or None if not registered
         """
+        config = self._context_config.get()
+        if config is not None:
+            return config
         with self._config_lock:
             return self._config
 
@@ -1,12 +1,24 @@
 """Core shared logic for CLI and MCP interfaces."""
 
+from .instrumentation import WorkflowInstrumentation
 from .runner import WorkflowRunner
+from .session_catalog import SessionCatalog
 from .session_discovery import SessionDiscovery, SessionInfo
+from .telemetry_summary import (
+    format_telemetry_summary,
+    iter_otlp_spans,
+    summarize_spans,
+)
 from .workflow_lock import WorkflowLock
 
 __all__ = [
     "WorkflowRunner",
+    "WorkflowInstrumentation",
+    "SessionCatalog",
     "SessionDiscovery",
     "SessionInfo",
+    "iter_otlp_spans",
+    "summarize_spans",
+    "format_telemetry_summary",
     "WorkflowLock",
 ]
@@ -0,0 +1,413 @@
+"""
+Per-node and per-tool instrumentation of workflow runs.
+
+WorkflowInstrumentation is a strands hook provider attached to the workflow
+graph and to each agent node. It records, for every node execution and
+every tool call:
+- Wall time, and queue time: how long a node waited after its last
+  dependency finished, or a tool call after the model response that
+  requested it
+- Model calls, and input, output, cache read and cache write tokens
+- Retries of failed model calls and of tool calls
+
+The records are written to the event log as they happen, as OpenTelemetry
+spans and metrics (exported when telemetry is enabled), and at the end of
+the run as a JSON report in the config directory (see report()).
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from opentelemetry import metrics, trace
+from strands import Agent
+from strands.hooks import (
+    AfterModelCallEvent,
+    AfterNodeCallEvent,
+    AfterToolCallEvent,
+    BeforeModelCallEvent,
+    BeforeMultiAgentInvocationEvent,
+    BeforeNodeCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+
+from ..logging import log_event
+from ..utils import cache_hit_rate
+
+# Name of the OpenTelemetry tracer and meter
+INSTRUMENTATION_NAME = "threat_composer_ai"
+
+# Strands usage keys of the token counts recorded per node
+_USAGE_KEYS = {
+    "input_tokens": "inputTokens",
+    "output_tokens": "outputTokens",
+    "cache_read_tokens": "cacheReadInputTokens",
+    "cache_write_tokens": "cacheWriteInputTokens",
+    "total_tokens": "totalTokens",
+}
+
+
+def _elapsed_ms(start: float, end: float) -> int:
+    return round((end - start) * 1000)
+
+
+@dataclass
+class NodeRecord:
+    """Timings and usage of one execution of a workflow node."""
+
+    node_id: str
+    # Milliseconds from the start of the run
+    start_ms: int
+    queue_ms: int
+    duration_ms: int | None = None
+    status: str = "running"
+    model_calls: int = 0
+    model_retries: int = 0
+    model_latency_ms: int = 0
+    tool_calls: int = 0
+    tool_retries: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    total_tokens: int = 0
+
+    def add_usage(self, usage: dict) -> None:
+        """Add a strands token usage dictionary to the node's totals."""
+        for field, key in _USAGE_KEYS.items():
+            setattr(self, field, getattr(self, field) + usage.get(key, 0))
+
+    def token_fields(self) -> dict[str, int]:
+        return {field: getattr(self, field) for field in _USAGE_KEYS}
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        return cache_hit_rate(
+            self.input_tokens, self.cache_read_tokens, self.cache_write_tokens
+        )
+
+
+@dataclass
+class ToolCallRecord:
+    """Timings of a tool call, including its retries."""
+
+    node_id: str
+    tool: str
+    tool_use_id: str
+    # Milliseconds from the start of the run
+    start_ms: int
+    queue_ms: int
+    duration_ms: int | None = None
+    status: str = "running"
+    retries: int = 0
+
+
+class WorkflowInstrumentation(HookProvider):
+    """Hook provider recording node, model call and tool call metrics."""
+
+    def __init__(self):
+        """Initialize workflow instrumentation."""
+        self.nodes: list[NodeRecord] = []
+        self.tools: list[ToolCallRecord] = []
+        self._lock = threading.Lock()
+        self._started: float | None = None
+        self._graph: Any = None
+        # Node ID of each agent attached with attach()
+        self._agent_nodes: dict[int, str] = {}
+        # Running nodes, and the monotonic time each node last finished
+        self._active_nodes: dict[str, tuple[NodeRecord, float]] = {}
+        self._node_ends: dict[str, float] = {}
+        # Per node: end of the last model call, and whether it failed
+        self._model_ends: dict[str, float] = {}
+        self._model_failed: set[str] = set()
+        # Tool calls by tool use ID, with the start of their current attempt
+        self._tool_calls: dict[str, tuple[ToolCallRecord, float]] = {}
+        self._spans: dict[Any, trace.Span] = {}
+
+        self._tracer = trace.get_tracer(INSTRUMENTATION_NAME)
+        meter = metrics.get_meter(INSTRUMENTATION_NAME)
+        self._node_duration = meter.create_histogram(
+            "threat_composer.node.duration", unit="ms"
+        )
+        self._node_queue_time = meter.create_histogram(
+            "threat_composer.node.queue_time", unit="ms"
+        )
+        self._tool_duration = meter.create_histogram(
+            "threat_composer.tool.duration", unit="ms"
+        )
+        self._tool_queue_time = meter.create_histogram(
+            "threat_composer.tool.queue_time", unit="ms"
+        )
+        self._tokens = meter.create_counter("threat_composer.tokens", unit="{token}")
+        self._retries = meter.create_counter("threat_composer.retries")
+
+    def attach(self, graph: Any) -> None:
+        """
+        Register the hooks on a workflow graph and its agent nodes.
+
+        Args:
+            graph: Graph built with strands' GraphBuilder
+        """
+        self._graph = graph
+        graph.hooks.add_hook(self)
+        for node_id, node in graph.nodes.items():
+            if isinstance(node.executor, Agent):
+                self._agent_nodes[id(node.executor)] = node_id
+                node.executor.hooks.add_hook(self)
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeMultiAgentInvocationEvent, self._on_run_start)
+        registry.add_callback(BeforeNodeCallEvent, self._on_node_start)
+        registry.add_callback(AfterNodeCallEvent, self._on_node_stop)
+        registry.add_callback(BeforeModelCallEvent, self._on_model_start)
+        registry.add_callback(AfterModelCallEvent, self._on_model_stop)
+        registry.add_callback(BeforeToolCallEvent, self._on_tool_start)
+        registry.add_callback(AfterToolCallEvent, self._on_tool_stop)
+
+    def _offset_ms(self, now: float) -> int:
+        if self._started is None:
+            self._started = now
+        return _elapsed_ms(self._started, now)
+
+    def _node_of(self, agent: Agent) -> str:
+        return self._agent_nodes.get(id(agent), agent.name)
+
+    def _on_run_start(self, event: BeforeMultiAgentInvocationEvent) -> None:
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+
+    def _on_node_start(self, event: BeforeNodeCallEvent) -> None:
+        now = time.monotonic()
+        with self._lock:
+            start_ms = self._offset_ms(now)
+            # A node is ready once its last finished dependency finished
+            ready = self._started
+            node = self._graph.nodes.get(event.node_id) if self._graph else None
+            for dependency in node.dependencies if node else ():
+                ready = max(ready, self._node_ends.get(dependency.node_id, ready))
+            record = NodeRecord(
+                node_id=event.node_id,
+                start_ms=start_ms,
+                queue_ms=_elapsed_ms(ready, now),
+            )
+            self.nodes.append(record)
+            self._active_nodes[event.node_id] = (record, now)
+            self._spans[event.node_id] = self._tracer.start_span(
+                f"node {event.node_id}",
+                attributes={
+                    "threat_composer.node_id": event.node_id,
+                    # Lets a trace's critical path be followed across nodes
+                    "threat_composer.dependencies": [
+                        dependency.node_id
+                        for dependency in (node.dependencies if node else ())
+                    ],
+                },
+            )
+        log_event("node_start", agent=event.node_id, queue_ms=record.queue_ms)
+
+    def _on_node_stop(self, event: AfterNodeCallEvent) -> None:
+        now = time.monotonic()
+        with self._lock:
+            record, started = self._active_nodes.pop(event.node_id, (None, now))
+            if record is None:
+                return
+            self._node_ends[event.node_id] = now
+            record.duration_ms = _elapsed_ms(started, now)
+            result = event.source.state.results.get(event.node_id)
+            status = getattr(result, "status", None)
+            record.status = getattr(status, "value", None) or "unknown"
+            if record.model_calls == 0 and result is not None:
+                # Not an agent node (e.g. deduplication); use its reported usage
+                record.add_usage(result.accumulated_usage or {})
+            span = self._spans.pop(event.node_id, None)
+
+        attributes = {"threat_composer.node_id": record.node_id}
+        self._node_duration.record(
+            record.duration_ms, {**attributes, "status": record.status}
+        )
+        self._node_queue_time.record(record.queue_ms, attributes)
+        for field in _USAGE_KEYS:
+            if field != "total_tokens" and getattr(record, field):
+                self._tokens.add(
+                    getattr(record, field),
+                    {**attributes, "token_type": field.removesuffix("_tokens")},
+                )
+        if span is not None:
+            span.set_attributes(
+                {
+                    f"threat_composer.{key}": value
+                    for key, value in asdict(record).items()
+                }
+            )
+            span.end()
+        log_event(
+            "node_stop",
+            agent=record.node_id,
+            status=record.status,
+            duration_ms=record.duration_ms,
+            model_calls=record.model_calls,
+            model_retries=record.model_retries,
+            tool_calls=record.tool_calls,
+            cache_hit_rate=record.cache_hit_rate,
+            **record.token_fields(),
+        )
+
+    def _on_model_start(self, event: BeforeModelCallEvent) -> None:
+        node_id = self._node_of(event.agent)
+        with self._lock:
+            if node_id in self._model_failed:
+                self._model_failed.discard(node_id)
+                record = self._active_node(node_id)
+                if record is not None:
+                    record.model_retries += 1
+                self._retries.add(
+                    1, {"threat_composer.node_id": node_id, "kind": "model"}
+                )
+
+    def _on_model_stop(self, event: AfterModelCallEvent) -> None:
+        node_id = self._node_of(event.agent)
+        with self._lock:
+            self._model_ends[node_id] = time.monotonic()
+            record = self._active_node(node_id)
+            if event.exception is not None:
+                self._model_failed.add(node_id)
+                return
+            if record is None or event.stop_response is None:
+                return
+            metadata = event.stop_response.message.get("metadata", {})
+            record.model_calls += 1
+            record.model_latency_ms += metadata.get("metrics", {}).get("latencyMs", 0)
+            record.add_usage(metadata.get("usage", {}))
+
+    def _on_tool_start(self, event: BeforeToolCallEvent) -> None:
+        now = time.monotonic()
+        node_id = self._node_of(event.agent)
+        tool_use_id = event.tool_use["toolUseId"]
+        with self._lock:
+            if tool_use_id in self._tool_calls:
+                # The same tool use is run again
+                call, _ = self._tool_calls[tool_use_id]
+                call.retries += 1
+                self._tool_calls[tool_use_id] = (call, now)
+                record = self._active_node(node_id)
+                if record is not None:
+                    record.tool_retries += 1
+                self._retries.add(
+                    1, {"threat_composer.node_id": node_id, "kind": "tool"}
+                )
+                return
+            call = ToolCallRecord(
+                node_id=node_id,
+                tool=event.tool_use["name"],
+                tool_use_id=tool_use_id,
+                start_ms=self._offset_ms(now),
+                queue_ms=_elapsed_ms(self._model_ends.get(node_id, now), now),
+            )
+            self.tools.append(call)
+            self._tool_calls[tool_use_id] = (call, now)
+            record = self._active_node(node_id)
+            if record is not None:
+                record.tool_calls += 1
+            self._spans[tool_use_id] = self._tracer.start_span(
+                f"tool {call.tool}",
+                attributes={
+                    "threat_composer.node_id": node_id,
+                    "threat_composer.tool": call.tool,
+                    "threat_composer.tool_use_id": tool_use_id,
+                },
+            )
+
+    def _on_tool_stop(self, event: AfterToolCallEvent) -> None:
+        now = time.monotonic()
+        tool_use_id = event.tool_use["toolUseId"]
+        with self._lock:
+            call, started = self._tool_calls.get(tool_use_id, (None, now))
+            if call is None:
+                return
+            call.duration_ms = _elapsed_ms(started, now)
+            if event.cancel_message is not None:
+                call.status = "cancelled"
+            elif event.exception is not None:
+                call.status = "error"
+            else:
+                call.status = event.result.get("status", "unknown")
+            # Ended after the last attempt; a retry restarts the span's clock
+            span = None if event.retry else self._spans.pop(tool_use_id, None)
+
+        attributes = {
+            "threat_composer.node_id": call.node_id,
+            "threat_composer.tool": call.tool,
+        }
+        self._tool_duration.record(
+            call.duration_ms, {**attributes, "status": call.status}
+        )
+        self._tool_queue_time.record(call.queue_ms, attributes)
+        if span is not None:
+            span.set_attributes(
+                {
+                    "threat_composer.status": call.status,
+                    "threat_composer.queue_ms": call.queue_ms,
+                    "threat_composer.retries": call.retries,
+                }
+            )
+            span.end()
+        log_event(
+            "tool_result",
+            agent=call.node_id,
+            tool=call.tool,
+            tool_use_id=tool_use_id,
+            status=call.status,
+            duration_ms=call.duration_ms,
+            queue_ms=call.queue_ms,
+            retries=call.retries or None,
+        )
+
+    def _active_node(self, node_id: str) -> NodeRecord | None:
+        active = self._active_nodes.get(node_id)
+        return active[0] if active else None
+
+    def report(self) -> dict[str, Any]:
+        """
+        Build the run report.
+
+        Returns:
+            Dictionary with totals, one entry per node execution in start
+            order, and one entry per tool call
+        """
+        with self._lock:
+            nodes = [
+                {**asdict(record), "cache_hit_rate": record.cache_hit_rate}
+                for record in self.nodes
+            ]
+            tools = [asdict(call) for call in self.tools]
+            duration_ms = (
+                self._offset_ms(time.monotonic()) if self._started is not None else 0
+            )
+
+        totals: dict[str, int | float | None] = {
+            key: sum(node[key] for node in nodes)
+            for key in (
+                "model_calls",
+                "model_retries",
+                "tool_calls",
+                "tool_retries",
+                *_USAGE_KEYS,
+            )
+        }
+        totals["cache_hit_rate"] = cache_hit_rate(
+            totals["input_tokens"],
+            totals["cache_read_tokens"],
+            totals["cache_write_tokens"],
+        )
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": duration_ms,
+            "totals": totals,
+            "nodes": nodes,
+            "tools": tools,
+        }
@@ -1,14 +1,24 @@
 """Shared workflow execution logic for CLI and MCP."""
 
 import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from strands.session import FileSessionManager
+from strands.session.file_session_manager import SESSION_PREFIX
 
 from ..config import AppConfig
-from ..config.export import export_run_configuration, update_run_completion_info
+from ..config.export import (
+    export_run_configuration,
+    export_run_report,
+    update_run_completion_info,
+)
+from ..logging import log_event
+from ..utils import finish_file_telemetry
 from ..utils.relative_path_helper import make_relative_to_working_dir
 from ..validation import (
     validate_aws_bedrock_access,
@@ -18,6 +28,25 @@ from ..validation import (
 from ..workflows.baseline_threat_modeling import (
     create_baseline_threat_modeling_workflow,
 )
+from .instrumentation import WorkflowInstrumentation
+from .session_catalog import SessionCatalog, find_enclosing_catalogs
+
+# Graph events reported to execute_async's on_node_event callback
+_NODE_EVENT_TYPES = {
+    "multiagent_node_start": "start",
+    "multiagent_node_stop": "stop",
+}
+
+
+def _usage_fields(usage: dict | None) -> dict[str, int]:
+    """Event fields for a strands token usage dictionary."""
+    if not usage:
+        return {}
+    return {
+        "input_tokens": usage.get("inputTokens", 0),
+        "output_tokens": usage.get("outputTokens", 0),
+        "total_tokens": usage.get("totalTokens", 0),
+    }
 
 
 class WorkflowRunner:
@@ -41,6 +70,8 @@ class WorkflowRunner:
         self.session_manager = session_manager
         self.previous_session_path = previous_session_path
         self.workflow = None
+        self.accumulated_usage: dict | None = None
+        self.instrumentation = WorkflowInstrumentation()
 
     @classmethod
     def create_from_params(
@@ -96,6 +127,7 @@ class WorkflowRunner:
             execution_timeout=execution_timeout,
             node_timeout=node_timeout,
             invocation_source=invocation_source,
+            previous_session_path=previous_session_path,
         )
 
         # 2. Register global config
@@ -112,6 +144,7 @@ class WorkflowRunner:
                 config.log_level,
                 log_file_path=logs_dir,
                 log_filename=config.log_filename,
+                event_log_filename=config.event_log_filename,
             )
 
             # Log startup banner with all configuration details
@@ -129,7 +162,17 @@ class WorkflowRunner:
             log_startup_banner(config, sources)
 
         # 4. Setup telemetry (if enabled)
-        if config.enable_telemetry:
+        if config.enable_telemetry and config.telemetry_exporter == "file":
+            from ..utils import setup_file_telemetry
+
+            setup_file_telemetry(
+                session_dir=config.output_directory,
+                logs_dir=config.output_directory / config.logs_output_sub_dir,
+                service_name=config.telemetry_service_name,
+                spans_filename=config.telemetry_spans_filename,
+                metrics_filename=config.telemetry_metrics_filename,
+            )
+        elif config.enable_telemetry:
             from ..utils import setup_local_telemetry
 
             setup_local_telemetry(
@@ -197,10 +240,14 @@ class WorkflowRunner:
                 session_manager=self.session_manager,
                 previous_session_path=self.previous_session_path,
             )
+            self.instrumentation.attach(self.workflow)
 
             # 5. Set BYPASS_TOOL_CONSENT
             os.environ["BYPASS_TOOL_CONSENT"] = "true"
 
+            # 6. Record the session so it can be listed without a scan
+            self._record_session("running")
+
             return True, None
 
         except SystemExit:
@@ -226,8 +273,55 @@ class WorkflowRunner:
 
     def _update_completion(self, accumulated_usage: dict | None = None) -> None:
         """Update run completion information."""
+        self.accumulated_usage = accumulated_usage
         update_run_completion_info(self.config, accumulated_usage)
 
+    def _record_session(self, status: str) -> None:
+        """
+        Record the session's status in its output directory's catalog.
+
+        The session is also recorded in the catalogs of the directories
+        containing the output directory, so it is listed when they are searched.
+        """
+        session_id = self.session_manager.session_id
+        session_dir = Path(self.session_manager.storage_dir) / (
+            f"{SESSION_PREFIX}{session_id}"
+        )
+        storage_dir = self.config.output_directory.parent
+        SessionCatalog(storage_dir).record(session_id, session_dir, status)
+        for catalog in find_enclosing_catalogs(storage_dir):
+            catalog.record(session_id, session_dir.resolve(), status)
+
+    @contextmanager
+    def _track_session(self) -> Iterator[None]:
+        """Record whether the workflow completed, failed or was interrupted."""
+        started = time.monotonic()
+        log_event("workflow_start", agent="system")
+
+        def finish(status: str) -> None:
+            self._record_session(status)
+            export_run_report(self.config, self.instrumentation.report())
+            if self.config.enable_telemetry:
+                finish_file_telemetry(self.config.output_directory)
+            log_event(
+                "workflow_end",
+                agent="system",
+                status=status,
+                duration_ms=round((time.monotonic() - started) * 1000),
+                **_usage_fields(self.accumulated_usage),
+            )
+
+        try:
+            yield
+        except Exception:
+            finish("failed")
+            raise
+        except BaseException:
+            # KeyboardInterrupt (CLI) or task cancellation (MCP)
+            finish("cancelled")
+            raise
+        finish("completed")
+
     def execute_sync(self) -> Any:
         """
         Execute workflow synchronously (for CLI).
@@ -236,24 +330,45 @@ class WorkflowRunner:
             Workflow execution result
         """
         workflow_input = self._prepare_workflow_input()
-        result = self.workflow(workflow_input)
-        accumulated_usage = getattr(result, "accumulated_usage", None)
-        self._update_completion(accumulated_usage)
+        with self._track_session():
+            result = self.workflow(workflow_input)
+            accumulated_usage = getattr(result, "accumulated_usage", None)
+            self._update_completion(accumulated_usage)
         return result
 
-    async def execute_async(self) -> Any:
+    async def execute_async(
+        self, on_node_event: Callable[[str, str], None] | None = None
+    ) -> Any:
         """
         Execute workflow asynchronously (for MCP).
 
+        Args:
+            on_node_event: Optional callback called with ("start" or "stop",
+                node ID) when a workflow node starts or stops
+
         Returns:
             Workflow execution result
         """
         workflow_input = self._prepare_workflow_input()
-        result = await self.workflow.invoke_async(workflow_input)
-        accumulated_usage = getattr(result, "accumulated_usage", None)
-        self._update_completion(accumulated_usage)
+        with self._track_session():
+            result = None
+            async for event in self.workflow.stream_async(workflow_input):
+                event_type = event.get("type")
+                if event_type in _NODE_EVENT_TYPES and on_node_event is not None:
+                    on_node_event(_NODE_EVENT_TYPES[event_type], event["node_id"])
+                elif "result" in event:
+                    result = event["result"]
+            if result is None:
+                raise ValueError("Workflow completed without producing a result")
+            accumulated_usage = getattr(result, "accumulated_usage", None)
+            self._update_completion(accumulated_usage)
         return result
 
+    @property
+    def node_count(self) -> int:
+        """Number of nodes in the workflow, or 0 before setup()."""
+        return len(self.workflow.nodes) if self.workflow is not None else 0
+
     def get_relative_working_dir(self) -> str:
         """
         Get relative path for workflow input.
@@ -0,0 +1,210 @@
+"""
+Catalog of the workflow sessions stored in an output directory.
+
+Each run writes its session below <storage dir>/<session ID>/session_<session
+ID>. The runner appends an entry to the storage directory's catalog when a
+session starts and finishes, so SessionDiscovery can look sessions up
+without scanning the directory tree, and does not have to read every session
+it finds to validate it. Sessions are also recorded in the existing catalogs
+of directories containing the storage directory, so searching those lists
+sessions of nested output directories too. The catalog is an append-only
+JSONL file where the last entry for a session wins; it is rebuilt from a
+shallow scan of the storage directory when missing.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from strands.session.file_session_manager import SESSION_PREFIX
+
+from ..logging import log_debug, log_warning
+
+CATALOG_FILENAME = "session-catalog.jsonl"
+
+# Output directory used when none is configured, relative to the analyzed
+# directory (see AppConfig.create)
+DEFAULT_OUTPUT_DIR_NAME = ".threat-composer"
+
+# Status recorded for sessions found by a scan rather than by the runner
+UNKNOWN_STATUS = "unknown"
+
+
+@dataclass
+class CatalogEntry:
+    """Model for a session recorded in a catalog."""
+
+    session_id: str
+    session_path: Path
+    status: str
+    recorded_at: str
+
+    def to_json(self, storage_dir: Path) -> str:
+        """Serialize the entry with its path relative to the storage directory."""
+        try:
+            session_path = self.session_path.relative_to(storage_dir)
+        except ValueError:
+            session_path = self.session_path
+        return json.dumps(
+            {
+                "session_id": self.session_id,
+                "session_path": session_path.as_posix(),
+                "status": self.status,
+                "recorded_at": self.recorded_at,
+            }
+        )
+
+
+class SessionCatalog:
+    """Append-only JSONL index of the sessions in a storage directory."""
+
+    def __init__(self, storage_dir: Path):
+        """
+        Initialize session catalog.
+
+        Args:
+            storage_dir: Directory containing one output directory per session
+        """
+        self.storage_dir = storage_dir
+        self.path = storage_dir / CATALOG_FILENAME
+
+    def exists(self) -> bool:
+        """Check whether the catalog file exists."""
+        return self.path.is_file()
+
+    def record(self, session_id: str, session_dir: Path, status: str) -> None:
+        """
+        Append an entry for a session, creating the catalog if needed.
+
+        A new catalog is first rebuilt from the storage directory, so sessions
+        run before it existed are kept. Failures are logged, not raised, so
+        cataloging never fails a workflow.
+
+        Args:
+            session_id: Session ID
+            session_dir: The session_<session ID> directory
+            status: Session status, e.g. "running" or "completed"
+        """
+        entry = CatalogEntry(
+            session_id=session_id,
+            session_path=session_dir,
+            status=status,
+            recorded_at=datetime.now(timezone.utc).isoformat(),
+        )
+        try:
+            if not self.exists():
+                self.rebuild()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(entry.to_json(self.storage_dir) + "\n")
+        except OSError as e:
+            log_warning(f"Failed to update session catalog {self.path}: {e}")
+
+    def read(self) -> dict[str, CatalogEntry]:
+        """
+        Read the latest entry for each session.
+
+        Malformed lines, e.g. from an interrupted write, are skipped.
+
+        Returns:
+            Entries keyed by session ID, in the order sessions were first recorded
+        """
+        entries: dict[str, CatalogEntry] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        data = json.loads(line)
+                        entry = CatalogEntry(
+                            session_id=data["session_id"],
+                            session_path=self.storage_dir / data["session_path"],
+                            status=data.get("status", UNKNOWN_STATUS),
+                            recorded_at=data.get("recorded_at", ""),
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    entries[entry.session_id] = entry
+        except OSError:
+            return {}
+        return entries
+
+    def scan(self) -> list[Path]:
+        """
+        Find the session directories in the storage directory.
+
+        Only <storage dir>/*/session_* is searched, not the whole tree.
+
+        Returns:
+            Paths of session directories containing a session.json
+        """
+        return sorted(
+            path.parent
+            for path in self.storage_dir.glob(f"*/{SESSION_PREFIX}*/session.json")
+        )
+
+    def rebuild(self, session_dirs: Iterable[Path] | None = None) -> None:
+        """
+        Rewrite the catalog from the session directories present on disk.
+
+        Statuses of sessions already in the catalog are kept; sessions no
+        longer on disk are dropped. Sessions recorded from nested output
+        directories, which a scan does not find, are kept while on disk.
+
+        Args:
+            session_dirs: Session directories in this storage directory
+                (default: found with scan())
+        """
+        if session_dirs is None:
+            session_dirs = self.scan()
+        existing = self.read()
+        lines = []
+        session_dirs = list(session_dirs)
+        scanned = {session_dir.name for session_dir in session_dirs}
+        session_dirs += [
+            entry.session_path
+            for entry in existing.values()
+            if entry.session_path.name not in scanned
+            and entry.session_path.parent.parent != self.storage_dir
+            and (entry.session_path / "session.json").is_file()
+        ]
+        for session_dir in session_dirs:
+            session_id = session_dir.name.removeprefix(SESSION_PREFIX)
+            entry = existing.get(session_id) or CatalogEntry(
+                session_id=session_id,
+                session_path=session_dir,
+                status=UNKNOWN_STATUS,
+                recorded_at=datetime.now(timezone.utc).isoformat(),
+            )
+            entry.session_path = session_dir
+            lines.append(entry.to_json(self.storage_dir) + "\n")
+
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text("".join(lines), encoding="utf-8")
+        os.replace(temp_path, self.path)
+        log_debug(f"Rebuilt session catalog {self.path} ({len(lines)} sessions)")
+
+
+def find_enclosing_catalogs(storage_dir: Path) -> list[SessionCatalog]:
+    """
+    Find the existing catalogs of the directories containing a storage directory.
+
+    These are the catalogs SessionDiscovery lists sessions from when searching
+    a parent of the storage directory.
+
+    Args:
+        storage_dir: Directory containing one output directory per session
+
+    Returns:
+        Catalogs of the parent directories and their default output directories
+    """
+    storage_dir = storage_dir.resolve()
+    catalogs = []
+    for search_dir in storage_dir.parents:
+        for candidate in (search_dir, search_dir / DEFAULT_OUTPUT_DIR_NAME):
+            catalog = SessionCatalog(candidate)
+            if candidate != storage_dir and catalog.exists():
+                catalogs.append(catalog)
+    return catalogs
@@ -1,10 +1,30 @@
 """Session discovery and listing using FileSessionManager."""
 
+import dataclasses
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import TypeVar
 
 from strands.session import FileSessionManager
+from strands.session.file_session_manager import MULTI_AGENT_PREFIX, SESSION_PREFIX
+
+from ..logging import log_debug
+from .session_catalog import DEFAULT_OUTPUT_DIR_NAME, SessionCatalog
+
+# Multi-agent state saved by the workflow graph
+MULTI_AGENT_ID = "default_graph"
+
+# Threads used to read session files concurrently
+MAX_LOAD_WORKERS = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 @dataclass
@@ -24,6 +44,32 @@ class SessionInfo:
     total_execution_time: float | None = None
 
 
+# Session info by session directory, with the modification times of
+# session.json and the multi-agent state it was read from. Shared by all
+# SessionDiscovery instances, since MCP clients poll session listings.
+_info_cache: dict[Path, tuple[tuple[int, int | None], "SessionInfo | None"]] = {}
+_info_cache_lock = threading.Lock()
+
+
+def _parse_timestamp(value: datetime | str) -> datetime:
+    """Parse an ISO 8601 timestamp from session data."""
+    if isinstance(value, datetime):
+        return value
+    # fromisoformat() only accepts a "Z" suffix from Python 3.11
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _map_concurrently(func: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    """Apply func to items on a thread pool, keeping their order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
 class SessionDiscovery:
     """Discover and query workflow sessions using FileSessionManager."""
 
@@ -31,8 +77,14 @@ class SessionDiscovery:
         """
         Initialize session discovery.
 
+        The search directory is searched recursively for session folders.
+        Sessions recorded in the catalog of their output directory are not
+        validated again, and catalogs are written for output directories
+        that have none.
+
         Args:
-            base_search_dir: Directory to recursively search for session_ folders
+            base_search_dir: Directory to recursively search for session_
+                folders
         """
         self.base_search_dir = base_search_dir
 
@@ -40,15 +92,88 @@ class SessionDiscovery:
         """
         Recursively find all directories starting with 'session_'.
 
+        Session directories are not searched, as they only hold session files.
+
         Returns:
             List of paths to potential session directories
         """
         session_dirs = []
-        for path in self.base_search_dir.rglob("session_*"):
-            if path.is_dir():
-                session_dirs.append(path)
+        for root, dirs, _files in os.walk(self.base_search_dir):
+            found = [name for name in dirs if name.startswith(SESSION_PREFIX)]
+            session_dirs.extend(Path(root, name) for name in found)
+            dirs[:] = [name for name in dirs if not name.startswith(SESSION_PREFIX)]
         return session_dirs
 
+    def find_catalogs(self) -> list[SessionCatalog]:
+        """
+        Find session catalogs for the search directory without scanning it.
+
+        Returns:
+            Catalogs of the search directory and its default output directory
+        """
+        candidates = [
+            SessionCatalog(self.base_search_dir),
+            SessionCatalog(self.base_search_dir / DEFAULT_OUTPUT_DIR_NAME),
+        ]
+        return [catalog for catalog in candidates if catalog.exists()]
+
+    def discover_sessions(self) -> dict[str, Path]:
+        """
+        Recursively find valid sessions, using catalogs where they exist.
+
+        Sessions in a catalog are taken as valid; others, e.g. copied in from
+        elsewhere, are validated. Catalogs are only written for output
+        directories without one, since the runner appends to existing
+        catalogs while sessions run.
+
+        Returns:
+            Session directories found, keyed by session ID
+        """
+        by_storage_dir: dict[Path, list[Path]] = defaultdict(list)
+        for session_dir in self.find_session_directories():
+            by_storage_dir[session_dir.parent.parent].append(session_dir)
+
+        sessions: dict[str, Path] = {}
+        unchecked: list[Path] = []
+        uncataloged: set[Path] = set()
+        for storage_dir, session_dirs in by_storage_dir.items():
+            catalog = SessionCatalog(storage_dir)
+            if not catalog.exists():
+                uncataloged.add(storage_dir)
+                unchecked.extend(session_dirs)
+                continue
+            entries = catalog.read()
+            for session_dir in session_dirs:
+                entry = entries.get(session_dir.name.removeprefix(SESSION_PREFIX))
+                if entry is not None and entry.session_path == session_dir:
+                    sessions[entry.session_id] = session_dir
+                else:
+                    unchecked.append(session_dir)
+
+        valid: dict[Path, list[Path]] = defaultdict(list)
+        results = _map_concurrently(self.validate_session, unchecked)
+        for session_dir, (is_valid, session_id) in zip(unchecked, results, strict=True):
+            if is_valid and session_id:
+                sessions[session_id] = session_dir
+                valid[session_dir.parent.parent].append(session_dir)
+
+        for storage_dir in uncataloged:
+            try:
+                SessionCatalog(storage_dir).rebuild(valid[storage_dir])
+            except OSError as e:
+                log_debug(f"Could not write session catalog in {storage_dir}: {e}")
+        return sessions
+
+    def _catalog_sessions(self) -> dict[str, Path]:
+        """Session directories from the catalogs of the search directory."""
+        sessions = {}
+        for catalog in self.find_catalogs():
+            for session_id, entry in catalog.read().items():
+                # Deleted sessions stay in the catalog until it is rebuilt
+                if (entry.session_path / "session.json").is_file():
+                    sessions[session_id] = entry.session_path
+        return sessions
+
     def validate_session(self, session_dir: Path) -> tuple[bool, str | None]:
         """
         Validate session directory using FileSessionManager.
@@ -93,6 +218,9 @@ class SessionDiscovery:
         """
         Get detailed session information using FileSessionManager.
 
+        Session files are only reread when session.json or the multi-agent
+        state changed since the last call; age_seconds is always current.
+
         Args:
             session_dir: Path to session directory
             session_id: Session ID
@@ -100,6 +228,43 @@ class SessionDiscovery:
         Returns:
             SessionInfo object or None if unable to read
         """
+        multi_agent_file = (
+            session_dir
+            / "multi_agents"
+            / f"{MULTI_AGENT_PREFIX}{MULTI_AGENT_ID}"
+            / "multi_agent.json"
+        )
+        try:
+            session_mtime = (session_dir / "session.json").stat().st_mtime_ns
+        except OSError:
+            return None
+        try:
+            multi_agent_mtime = multi_agent_file.stat().st_mtime_ns
+        except OSError:
+            multi_agent_mtime = None
+        cache_key = (session_mtime, multi_agent_mtime)
+
+        with _info_cache_lock:
+            cached = _info_cache.get(session_dir)
+        if cached is not None and cached[0] == cache_key:
+            session_info = cached[1]
+        else:
+            session_info = self._read_session_info(session_dir, session_id)
+            with _info_cache_lock:
+                _info_cache[session_dir] = (cache_key, session_info)
+
+        if session_info is None:
+            return None
+        now = datetime.now(session_info.created_at.tzinfo)
+        return dataclasses.replace(
+            session_info,
+            age_seconds=(now - session_info.created_at).total_seconds(),
+        )
+
+    def _read_session_info(
+        self, session_dir: Path, session_id: str
+    ) -> SessionInfo | None:
+        """Read session information from the session files."""
         try:
             storage_dir = str(session_dir.parent)
             sm = FileSessionManager(session_id=session_id, storage_dir=storage_dir)
@@ -112,7 +277,7 @@ class SessionDiscovery:
             # Read multi-agent data (if available)
             multi_agent_data = None
             try:
-                multi_agent_data = sm.read_multi_agent(session_id, "default_graph")
+                multi_agent_data = sm.read_multi_agent(session_id, MULTI_AGENT_ID)
             except Exception:
                 pass  # Multi-agent data may not exist yet
 
@@ -138,22 +303,9 @@ class SessionDiscovery:
                         / 1000.0
                     )  # Convert ms to seconds
 
-            # Parse timestamps - they may be datetime objects or ISO strings
-            created_at = session_data.created_at
-            updated_at = session_data.updated_at
-
-            if isinstance(created_at, str):
-                from dateutil import parser
-
-                created_at = parser.isoparse(created_at)
-            if isinstance(updated_at, str):
-                from dateutil import parser
-
-                updated_at = parser.isoparse(updated_at)
-
-            # Calculate age
-            now = datetime.now(created_at.tzinfo)
-            age_seconds = (now - created_at).total_seconds()
+            # Timestamps may be datetime objects or ISO strings
+            created_at = _parse_timestamp(session_data.created_at)
+            updated_at = _parse_timestamp(session_data.updated_at)
 
             return SessionInfo(
                 session_id=session_id,
@@ -162,7 +314,7 @@ class SessionDiscovery:
                 created_at=created_at,
                 updated_at=updated_at,
                 status=status,
-                age_seconds=age_seconds,
+                age_seconds=0.0,  # Set by get_session_info()
                 completed_nodes=completed_nodes,
                 failed_nodes=failed_nodes,
                 total_execution_time=total_execution_time,
@@ -177,6 +329,9 @@ class SessionDiscovery:
         """
         List all valid sessions in the search directory.
 
+        Sessions are listed from the search directory's catalogs where they
+        exist; without one, every output directory below it is searched.
+
         Args:
             limit: Maximum number of sessions to return
             sort_by: Sort field - "created_at", "updated_at", or "session_id"
@@ -184,18 +339,21 @@ class SessionDiscovery:
         Returns:
             List of SessionInfo objects, sorted and limited
         """
-        sessions = []
-
-        # Find all potential session directories
-        session_dirs = self.find_session_directories()
-
-        # Validate and collect session info
-        for session_dir in session_dirs:
-            is_valid, session_id = self.validate_session(session_dir)
-            if is_valid and session_id:
-                session_info = self.get_session_info(session_dir, session_id)
-                if session_info:
-                    sessions.append(session_info)
+        # The runner records sessions in the catalogs of the directories
+        # containing its output directory, so the tree is only searched when
+        # the search directory has no catalog. get_session_info() skips
+        # sessions that can no longer be read.
+        if self.find_catalogs():
+            session_dirs = self._catalog_sessions()
+        else:
+            session_dirs = self.discover_sessions()
+
+        # Read sessions concurrently; unchanged sessions come from the cache
+        results = _map_concurrently(
+            lambda item: self.get_session_info(item[1], item[0]),
+            session_dirs.items(),
+        )
+        sessions = [session_info for session_info in results if session_info]
 
         # Sort sessions
         if sort_by == "created_at":
@@ -212,17 +370,18 @@ class SessionDiscovery:
         """
         Get full path to session directory by session_id.
 
+        The catalogs of the search directory are checked first; sessions
+        missing from them, e.g. in nested output directories or copied in
+        from elsewhere, are found by searching the directory.
+
         Args:
             session_id: Session ID to find
 
         Returns:
             Path to session directory or None if not found
         """
-        session_dirs = self.find_session_directories()
-
-        for session_dir in session_dirs:
-            is_valid, found_id = self.validate_session(session_dir)
-            if is_valid and found_id == session_id:
-                return session_dir
+        session_dir = self._catalog_sessions().get(session_id)
+        if session_dir is not None:
+            return session_dir
 
-        return None
+        return self.discover_sessions().get(session_id)
@@ -0,0 +1,253 @@
+"""
+Summaries of the spans written by file telemetry.
+
+Reads a session's OTLP-JSON span file (see utils.telemetry_files) and
+reports, from the node and tool spans of WorkflowInstrumentation:
+- The critical path: the chain of node executions, ending with the last
+  node to finish, where each node waited on the dependency that finished
+  last before it started
+- The slowest tool calls
+- Token usage per node
+"""
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..utils import cache_hit_rate
+
+_ATTRIBUTE_PREFIX = "threat_composer."
+_TOKEN_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+    "total_tokens",
+)
+
+
+def _attribute_value(value: dict[str, Any]) -> Any:
+    if "arrayValue" in value:
+        return [
+            _attribute_value(item) for item in value["arrayValue"].get("values", [])
+        ]
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("stringValue", "doubleValue", "boolValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+@dataclass
+class SpanRecord:
+    """A span read from an OTLP-JSON file."""
+
+    name: str
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get a threat_composer.* attribute by its unprefixed name."""
+        return self.attributes.get(_ATTRIBUTE_PREFIX + name, default)
+
+
+def iter_otlp_spans(path: Path) -> Iterator[SpanRecord]:
+    """
+    Read spans from an OTLP-JSON file, skipping malformed lines.
+
+    Args:
+        path: File with one ExportTraceServiceRequest per line
+
+    Yields:
+        Spans in the order they were written
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            for resource_spans in request.get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for span in scope_spans.get("spans", []):
+                        yield SpanRecord(
+                            name=span.get("name", ""),
+                            start_ns=int(span.get("startTimeUnixNano", 0)),
+                            end_ns=int(span.get("endTimeUnixNano", 0)),
+                            attributes={
+                                attribute["key"]: _attribute_value(
+                                    attribute.get("value", {})
+                                )
+                                for attribute in span.get("attributes", [])
+                            },
+                        )
+
+
+@dataclass
+class CriticalPathStep:
+    """A node execution on the critical path."""
+
+    node_id: str
+    # Milliseconds from the start of the run
+    start_ms: float
+    # Milliseconds since the previous step (or the run) finished
+    wait_ms: float
+    duration_ms: float
+
+
+@dataclass
+class TelemetrySummary:
+    """Critical path, slowest tool calls and token usage of a run."""
+
+    duration_ms: float
+    node_count: int
+    tool_count: int
+    critical_path: list[CriticalPathStep]
+    slowest_tools: list[SpanRecord]
+    # Token counts per node ID
+    tokens: dict[str, dict[str, int]]
+
+    @property
+    def critical_path_ms(self) -> float:
+        return sum(step.wait_ms + step.duration_ms for step in self.critical_path)
+
+    @property
+    def total_tokens(self) -> dict[str, int]:
+        return {
+            key: sum(usage[key] for usage in self.tokens.values())
+            for key in _TOKEN_FIELDS
+        }
+
+
+def _critical_path(nodes: list[SpanRecord], run_start: int) -> list[CriticalPathStep]:
+    if not nodes:
+        return []
+    current = max(nodes, key=lambda span: span.end_ns)
+    path = [current]
+    while True:
+        dependencies = set(current.get("dependencies") or ())
+        candidates = [
+            span
+            for span in nodes
+            if span.get("node_id") in dependencies and span.end_ns <= current.start_ns
+        ]
+        if not candidates:
+            break
+        current = max(candidates, key=lambda span: span.end_ns)
+        path.append(current)
+    path.reverse()
+
+    steps = []
+    previous_end = run_start
+    for span in path:
+        steps.append(
+            CriticalPathStep(
+                node_id=span.get("node_id"),
+                start_ms=(span.start_ns - run_start) / 1e6,
+                wait_ms=max(0, span.start_ns - previous_end) / 1e6,
+                duration_ms=span.duration_ms,
+            )
+        )
+        previous_end = span.end_ns
+    return steps
+
+
+def summarize_spans(spans: list[SpanRecord], top: int = 10) -> TelemetrySummary:
+    """
+    Summarize the workflow spans of a run.
+
+    Args:
+        spans: Spans of the run, e.g. from iter_otlp_spans()
+        top: Number of slowest tool calls to report
+
+    Returns:
+        Summary of the node and tool spans
+    """
+    nodes = [
+        span for span in spans if span.get("node_id") and span.name.startswith("node ")
+    ]
+    tools = [
+        span for span in spans if span.get("tool") and span.name.startswith("tool ")
+    ]
+    run_start = min((span.start_ns for span in spans), default=0)
+    run_end = max((span.end_ns for span in spans), default=0)
+
+    tokens: dict[str, dict[str, int]] = {}
+    for span in sorted(nodes, key=lambda span: span.start_ns):
+        usage = tokens.setdefault(span.get("node_id"), dict.fromkeys(_TOKEN_FIELDS, 0))
+        for key in _TOKEN_FIELDS:
+            usage[key] += span.get(key, 0)
+
+    slowest_tools = sorted(tools, key=lambda span: span.duration_ms, reverse=True)
+    return TelemetrySummary(
+        duration_ms=(run_end - run_start) / 1e6,
+        node_count=len(nodes),
+        tool_count=len(tools),
+        critical_path=_critical_path(nodes, run_start),
+        slowest_tools=slowest_tools[:top],
+        tokens=tokens,
+    )
+
+
+def _format_ms(ms: float) -> str:
+    return f"{ms:.0f}ms" if ms < 1000 else f"{ms / 1000:.1f}s"
+
+
+def _format_hit_rate(usage: dict[str, int]) -> str:
+    rate = cache_hit_rate(
+        usage["input_tokens"], usage["cache_read_tokens"], usage["cache_write_tokens"]
+    )
+    return "-" if rate is None else f"{rate:.1%}"
+
+
+def format_telemetry_summary(summary: TelemetrySummary) -> str:
+    """Format a telemetry summary as plain text tables."""
+    lines = [
+        f"Run: {_format_ms(summary.duration_ms)}, "
+        f"{summary.node_count} node execution(s), {summary.tool_count} tool call(s)",
+        "",
+        f"Critical path ({_format_ms(summary.critical_path_ms)}):",
+        f"  {'node':<28} {'start':>9} {'wait':>9} {'duration':>9}",
+    ]
+    for step in summary.critical_path:
+        lines.append(
+            f"  {step.node_id:<28} {_format_ms(step.start_ms):>9} "
+            f"{_format_ms(step.wait_ms):>9} {_format_ms(step.duration_ms):>9}"
+        )
+
+    lines += [
+        "",
+        "Slowest tool calls:",
+        f"  {'tool':<40} {'node':<28} {'duration':>9} {'queue':>9} {'status':<9}",
+    ]
+    for span in summary.slowest_tools:
+        lines.append(
+            f"  {span.get('tool'):<40} {span.get('node_id'):<28} "
+            f"{_format_ms(span.duration_ms):>9} "
+            f"{_format_ms(span.get('queue_ms', 0)):>9} {span.get('status', ''):<9}"
+        )
+
+    lines += [
+        "",
+        "Token usage:",
+        f"  {'node':<28} {'input':>10} {'output':>10} {'cache read':>11} "
+        f"{'cache write':>11} {'total':>10} {'cache hit':>9}",
+    ]
+    for node_id, usage in [*summary.tokens.items(), ("total", summary.total_tokens)]:
+        lines.append(
+            f"  {node_id:<28} {usage['input_tokens']:>10,} "
+            f"{usage['output_tokens']:>10,} {usage['cache_read_tokens']:>11,} "
+            f"{usage['cache_write_tokens']:>11,} {usage['total_tokens']:>10,} "
+            f"{_format_hit_rate(usage):>9}"
+        )
+    return "\n".join(lines)
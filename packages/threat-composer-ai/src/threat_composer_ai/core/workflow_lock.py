@@ -1,6 +1,7 @@
 """Workflow execution lock to prevent concurrent runs."""
 
 import fcntl
+import hashlib
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -43,13 +44,9 @@ class WorkflowLock:
             try:
                 fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
             except BlockingIOError as e:
-                # Lazy import to get tool name dynamically
-                from ..agents.common import get_tool_name
-                from ..mcp.tools import threat_modeling_list_workflow_sessions
-
                 raise RuntimeError(
-                    f"Another workflow is currently running. "
-                    f"Please wait for it to complete or check running workflows with {get_tool_name(threat_modeling_list_workflow_sessions)}."
+                    "Another workflow is currently running. "
+                    "Please wait for it to complete."
                 ) from e
 
             yield
@@ -72,3 +69,20 @@ class WorkflowLock:
             Path to default lock file
         """
         return Path.home() / ".threat-composer-ai" / "workflow.lock"
+
+    @staticmethod
+    def get_directory_lock_path(working_directory: Path) -> Path:
+        """
+        Get the lock file path for workflows analyzing a working directory.
+
+        Workflows on different directories use different lock files and can
+        run at the same time; workflows on the same directory cannot.
+
+        Args:
+            working_directory: Directory analyzed by the workflow
+
+        Returns:
+            Path to the directory's lock file
+        """
+        digest = hashlib.sha256(str(working_directory.resolve()).encode()).hexdigest()
+        return Path.home() / ".threat-composer-ai" / "locks" / f"{digest[:16]}.lock"
@@ -1,7 +1,22 @@
 """Logging module for threat-composer-ai."""
 
+from .event_log import (
+    EVENT_LOGGER_NAME,
+    JsonlEventHandler,
+    iter_events,
+    log_event,
+)
+from .log_reader import LogChunk, LogFilter, read_log, tail_log
+from .pipeline import (
+    AsyncHandler,
+    BufferedFileHandler,
+    LogPipeline,
+    flush_logging,
+)
 from .rich_logger import (
     clear_agent_context,
+    close_log_file,
+    get_agent_context,
     get_logger,
     log_agent_message,
     log_agent_tool_use,
@@ -22,9 +37,11 @@ from .strands_handler import (
 
 __all__ = [
     "setup_rich_logging",
+    "close_log_file",
     "get_logger",
     "set_agent_context",
     "clear_agent_context",
+    "get_agent_context",
     "log_workflow_step",
     "log_agent_message",
     "log_agent_tool_use",
@@ -36,4 +53,16 @@ __all__ = [
     "log_startup_banner",
     "StrandsRichHandler",
     "create_strands_rich_handler",
+    "EVENT_LOGGER_NAME",
+    "JsonlEventHandler",
+    "iter_events",
+    "log_event",
+    "LogChunk",
+    "LogFilter",
+    "read_log",
+    "tail_log",
+    "AsyncHandler",
+    "BufferedFileHandler",
+    "LogPipeline",
+    "flush_logging",
 ]
@@ -0,0 +1,131 @@
+"""
+Structured JSONL event log written alongside the text log.
+
+The text log is meant for people. Dashboards, polling tools and metrics
+need fields, not formatted lines, so workflow events (agent messages, tool
+uses, model usage, node and workflow timings) are also written as one JSON
+object per line to <logs dir>/events.jsonl:
+
+    {"timestamp": "...", "level": "INFO", "session_id": "...",
+     "agent": "threat_agent", "event": "tool_use", "tool": "file_read"}
+
+Events are logged with log_event() on the "threat_composer_ai.events"
+logger, which does not propagate to the console or text log. Writes are
+buffered (see BufferedFileHandler).
+"""
+
+import json
+import logging
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .pipeline import BufferedFileHandler
+
+EVENT_LOGGER_NAME = "threat_composer_ai.events"
+
+# Record attributes set by log_event()
+_EVENT_TYPE_ATTR = "event_type"
+_EVENT_FIELDS_ATTR = "event_fields"
+
+_event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+_event_logger.propagate = False
+_event_logger.setLevel(logging.INFO)
+
+
+def get_event_logger() -> logging.Logger:
+    """Get the logger events are written to."""
+    return _event_logger
+
+
+def log_event(
+    event_type: str,
+    agent: str | None = None,
+    level: int = logging.INFO,
+    **fields: Any,
+) -> None:
+    """
+    Write a structured event to the active workflow's event log.
+
+    Args:
+        event_type: Event name, e.g. "tool_use" or "node_stop"
+        agent: Agent the event belongs to (default: the current agent context)
+        level: Logging level of the event
+        **fields: JSON-serializable event fields, e.g. tool, duration_ms,
+            input_tokens
+    """
+    if not _event_logger.isEnabledFor(level):
+        return
+    if agent is None:
+        from .rich_logger import get_agent_context
+
+        agent = get_agent_context()
+    _event_logger.log(
+        level,
+        event_type,
+        extra={
+            _EVENT_TYPE_ATTR: event_type,
+            _EVENT_FIELDS_ATTR: {"agent": agent, **fields},
+        },
+    )
+
+
+class JsonlEventFormatter(logging.Formatter):
+    """Format event records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        from ..config import get_global_config
+
+        # Records from AsyncHandler carry the session ID of the logging thread
+        session_id = getattr(record, "session_id", None)
+        if session_id is None:
+            config = get_global_config()
+            session_id = config.output_directory.name if config else None
+        event = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "session_id": session_id,
+            "event": getattr(record, _EVENT_TYPE_ATTR, record.getMessage()),
+        }
+        for key, value in getattr(record, _EVENT_FIELDS_ATTR, {}).items():
+            if value is not None:
+                event[key] = value
+        return json.dumps(event, default=str, ensure_ascii=False)
+
+
+class JsonlEventHandler(BufferedFileHandler):
+    """Buffered file handler writing event records as JSONL."""
+
+    def __init__(self, path: Path, **kwargs: Any):
+        """
+        Initialize JSONL event handler.
+
+        Args:
+            path: Event log file, truncated when opened
+            **kwargs: Buffering options of BufferedFileHandler
+        """
+        super().__init__(path, mode="w", **kwargs)
+        self.setFormatter(JsonlEventFormatter())
+
+
+def iter_events(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Read events from an event log, skipping malformed lines.
+
+    Args:
+        path: Event log file
+
+    Yields:
+        Event dictionaries in the order they were written
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                yield event
@@ -0,0 +1,270 @@
+"""
+Reading workflow log files for clients that poll them.
+
+Log files of long runs grow to several MB, so clients should not read them
+whole on every poll:
+- tail_log() seeks backwards from the end of the file and reads only the
+  blocks needed for the requested number of lines
+- read_log() returns the complete lines written after a byte offset
+  (cursor), so a client following a running workflow receives each line
+  once
+
+Both return the cursor to pass to the next read_log() call, and can filter
+records by minimum level and by agent. A record is a line in the log format
+followed by the lines continuing it, such as a traceback, which are kept or
+dropped with it. They read the JSONL event log (see event_log) the same way
+as the text log.
+"""
+
+import json
+import logging
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# Maximum bytes returned by one read_log() call
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+_BLOCK_SIZE = 64 * 1024
+
+# Lines written by setup_rich_logging's file handler, e.g.
+# "2025-01-02 03:04:05,678 - INFO - 🤖 THREAT_AGENT | message"
+_LOG_LINE_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})? - (?P<level>[A-Z]+) - "
+    r"(?:🔧 SYSTEM|🤖 (?P<agent>[^|]+?)) \|"
+)
+
+
+@dataclass
+class LogChunk:
+    """Lines read from a log file."""
+
+    lines: list[str]
+    # Byte offset after the last complete line read; pass to read_log()
+    cursor: int
+    # True if more complete lines were available than returned
+    more: bool = False
+
+    @property
+    def text(self) -> str:
+        return "".join(f"{line}\n" for line in self.lines)
+
+
+class LogFilter:
+    """Match log lines by minimum level and agent."""
+
+    def __init__(self, level: str | None = None, agent: str | None = None):
+        """
+        Initialize log filter.
+
+        Args:
+            level: Minimum level name, e.g. "WARNING" (optional)
+            agent: Agent name, or "system" for workflow messages (optional)
+
+        Raises:
+            ValueError: If level is not a logging level name
+        """
+        self.min_level = None
+        if level:
+            min_level = logging.getLevelName(level.upper())
+            if not isinstance(min_level, int):
+                raise ValueError(f"Unknown log level: {level}")
+            self.min_level = min_level
+        self.agent = agent.upper() if agent else None
+
+    @property
+    def active(self) -> bool:
+        return self.min_level is not None or self.agent is not None
+
+    def matches(self, line: str) -> bool:
+        """
+        Check whether a line passes the filter.
+
+        Lines not in the text or event log format (e.g. written by older
+        versions without a level, or continuing a record) only pass when no
+        filter is set.
+        """
+        if not self.active:
+            return True
+        return self._matches_fields(_parse_line(line))
+
+    def select(self, lines: list[str], continued: bool = False) -> list[str]:
+        """
+        Return the lines of the records that pass the filter.
+
+        Args:
+            lines: Consecutive log lines
+            continued: Whether the record continued by any lines before the
+                first record in lines passes the filter
+
+        Returns:
+            Lines of the matching records, in order
+        """
+        if not self.active:
+            return lines
+        selected = []
+        keep = continued
+        for line in lines:
+            fields = _parse_line(line)
+            if fields is not None:
+                keep = self._matches_fields(fields)
+            if keep:
+                selected.append(line)
+        return selected
+
+    def _matches_fields(self, fields: tuple[str, str] | None) -> bool:
+        if fields is None:
+            return False
+        level_name, agent = fields
+        if self.min_level is not None:
+            level = logging.getLevelName(level_name)
+            if not isinstance(level, int) or level < self.min_level:
+                return False
+        if self.agent is not None:
+            return agent.upper() == self.agent
+        return True
+
+
+def _parse_line(line: str) -> tuple[str, str] | None:
+    """Get the level name and agent of a text or event log line."""
+    if line.startswith("{"):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(event, dict):
+            return None
+        return str(event.get("level", "")), str(event.get("agent") or "system")
+    match = _LOG_LINE_PATTERN.match(line)
+    if match is None:
+        return None
+    return match["level"], match["agent"] or "SYSTEM"
+
+
+def _reversed_lines(f: BinaryIO, end: int) -> Iterator[bytes]:
+    """
+    Yield the lines before byte offset end, last line first.
+
+    The first item is the text after the last newline: empty if the file
+    ends with a newline, otherwise a line still being written.
+    """
+    position = end
+    remainder = b""
+    while position > 0:
+        size = min(_BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + remainder).split(b"\n")
+        remainder = lines.pop(0)
+        yield from reversed(lines)
+    yield remainder
+
+
+def _record_start_before(f: BinaryIO, end: int) -> str | None:
+    """Get the last line in the log format before byte offset end."""
+    for raw_line in _reversed_lines(f, end):
+        line = _decode(raw_line)
+        if _parse_line(line) is not None:
+            return line
+    return None
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def tail_log(path: Path, lines: int, log_filter: LogFilter | None = None) -> LogChunk:
+    """
+    Read the last lines of a log file by seeking backwards from its end.
+
+    With a filter, matching records are returned whole, so a record
+    continued over several lines can take the result past the number of
+    lines requested.
+
+    Args:
+        path: Log file
+        lines: Number of lines to return
+        log_filter: Only count and return lines of matching records
+            (optional)
+
+    Returns:
+        The last complete matching lines, and the end of the last complete
+        line as cursor
+    """
+    log_filter = log_filter or LogFilter()
+    selected: list[str] = []
+    # Lines read since the last record start, last line first
+    pending: list[str] = []
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        reversed_lines = _reversed_lines(f, size)
+        partial = next(reversed_lines)
+        cursor = size - len(partial)
+        if cursor == 0:
+            # No complete line yet; partial was the file's only text
+            return LogChunk([], 0)
+        for raw_line in reversed_lines:
+            if len(selected) >= lines:
+                break
+            line = _decode(raw_line)
+            pending.append(line)
+            if not log_filter.active or _parse_line(line) is not None:
+                if log_filter.matches(line):
+                    selected.extend(pending)
+                pending = []
+    selected.reverse()
+    return LogChunk(selected, cursor)
+
+
+def read_log(
+    path: Path,
+    cursor: int = 0,
+    log_filter: LogFilter | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> LogChunk:
+    """
+    Read the complete lines written to a log file after a cursor.
+
+    A line still being written is left for the next call. If the file is
+    smaller than the cursor it was rewritten, and is read from the start.
+
+    Args:
+        path: Log file
+        cursor: Byte offset returned by a previous call (default: start)
+        log_filter: Only return matching lines (optional)
+        max_bytes: Maximum bytes to read; check LogChunk.more and call again
+            with the returned cursor for the rest
+
+    Returns:
+        Lines of matching records and the cursor for the next call
+    """
+    log_filter = log_filter or LogFilter()
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if cursor > size:
+            cursor = 0
+        f.seek(cursor)
+        data = f.read(max_bytes)
+
+        end = data.rfind(b"\n") + 1
+        if end == 0 and len(data) == max_bytes:
+            # A single line longer than max_bytes; return it in pieces
+            end = len(data)
+        lines = [_decode(raw_line) for raw_line in data[:end].splitlines()]
+
+        # Lines continuing a record written before the cursor are kept if
+        # that record matches
+        continued = False
+        if log_filter.active and lines and _parse_line(lines[0]) is None:
+            record_start = _record_start_before(f, cursor)
+            continued = record_start is not None and log_filter.matches(record_start)
+
+    next_cursor = cursor + end
+    return LogChunk(
+        log_filter.select(lines, continued),
+        next_cursor,
+        more=len(data) == max_bytes and next_cursor < size,
+    )
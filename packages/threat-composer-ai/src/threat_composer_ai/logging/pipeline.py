@@ -0,0 +1,296 @@
+"""
+Background log writing for the handlers set up by setup_rich_logging.
+
+Rendering Rich output and writing log files on the thread that logs stalls
+model streaming whenever the terminal or disk is slow, which is noticeable
+in verbose mode. Instead, each console and file handler is wrapped in an
+AsyncHandler: logging threads only prepare the record and put it on a
+queue, and a single writer thread (LogPipeline) hands records to the real
+handlers in batches:
+- Console output of a batch is rendered in one write
+- File handlers (BufferedFileHandler) are flushed at most once per batch
+  rather than per record
+- Records are written in the order they were logged, across all handlers
+
+Anything that depends on the logging thread is resolved before queueing:
+filters (e.g. routing to the active workflow's log file) run on the
+AsyncHandler, and the agent context and session ID are stored on the
+record.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from rich.console import Console
+
+# Records handled per batch before flushing
+DEFAULT_BATCH_SIZE = 256
+
+# Seconds between flushes of buffered handlers while no records arrive
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Seconds to wait for queued records when flushing
+_FLUSH_TIMEOUT = 5.0
+
+_STOP = object()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler whose writes are buffered and flushed periodically."""
+
+    def __init__(
+        self,
+        filename: Path,
+        mode: str = "a",
+        encoding: str = "utf-8",
+        flush_records: int = 50,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        buffer_size: int = 64 * 1024,
+    ):
+        """
+        Initialize buffered file handler.
+
+        Records are flushed every flush_records records, once the last flush
+        is older than flush_interval seconds, on warnings and errors, by
+        flush_buffer() and when the file is closed.
+
+        Args:
+            filename: Log file
+            mode: File open mode
+            encoding: File encoding
+            flush_records: Flush after this many buffered records
+            flush_interval: Flush when the last flush is older than this
+                many seconds
+            buffer_size: Size of the file write buffer in bytes
+        """
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._force_flush = False
+        super().__init__(filename, mode=mode, encoding=encoding)
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # StreamHandler.emit() writes the record and then calls flush()
+        self._pending += 1
+        self._force_flush = record.levelno >= logging.WARNING
+        super().emit(record)
+
+    def flush(self) -> None:
+        """Flush when enough records are buffered or the buffer is stale."""
+        if (
+            self._force_flush
+            or self._pending >= self.flush_records
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush_buffer()
+
+    def flush_buffer(self) -> None:
+        """Write buffered records to the file now."""
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._force_flush = False
+
+
+class LogPipeline:
+    """Writer thread that passes queued records to their handlers in batches."""
+
+    def __init__(
+        self,
+        console: Console | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize log pipeline.
+
+        Args:
+            console: Rich console whose output is buffered per batch (optional)
+            batch_size: Maximum records handled before flushing
+            flush_interval: Seconds between flushes while idle
+        """
+        self.console = console
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._handlers: set[logging.Handler] = set()
+
+    def put(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        """Queue a record for a handler, starting the writer thread if needed."""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="log-writer", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put((handler, record))
+
+    def flush(self, timeout: float = _FLUSH_TIMEOUT) -> None:
+        """
+        Wait until queued records are written, then flush all buffers.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            if threading.current_thread() is not self._thread:
+                done = threading.Event()
+                self._queue.put((None, done))
+                done.wait(timeout)
+        self._flush_handlers(force=True)
+
+    def stop(self) -> None:
+        """Write queued records and stop the writer thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((None, _STOP))
+            self._thread.join(_FLUSH_TIMEOUT)
+        self._flush_handlers(force=True)
+
+    def discard(self, handler: logging.Handler) -> None:
+        """Stop flushing a handler, e.g. after it was closed."""
+        self._handlers.discard(handler)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._flush_handlers()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._handle_batch(batch):
+                return
+
+    def _handle_batch(self, batch: list) -> bool:
+        """Handle a batch of records; returns False when asked to stop."""
+        keep_running = True
+        waiters = []
+        # Render the batch's console output in one write
+        with self.console if self.console is not None else nullcontext():
+            for handler, item in batch:
+                if handler is None:
+                    if item is _STOP:
+                        keep_running = False
+                    else:
+                        waiters.append(item)
+                    continue
+                self._handlers.add(handler)
+                try:
+                    handler.handle(item)
+                except Exception:
+                    handler.handleError(item)
+        self._flush_handlers()
+        for waiter in waiters:
+            waiter.set()
+        return keep_running
+
+    def _flush_handlers(self, force: bool = False) -> None:
+        for handler in list(self._handlers):
+            try:
+                if force and isinstance(handler, BufferedFileHandler):
+                    handler.flush_buffer()
+                else:
+                    handler.flush()
+            except Exception:
+                pass
+
+
+class AsyncHandler(logging.Handler):
+    """Handler that writes records through a LogPipeline."""
+
+    def __init__(self, target: logging.Handler, pipeline: LogPipeline):
+        """
+        Initialize async handler.
+
+        Args:
+            target: Handler that formats and writes the records
+            pipeline: Pipeline whose writer thread calls the target
+        """
+        super().__init__(target.level)
+        self.target = target
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Copy a record with everything resolved that depends on this thread.
+
+        The message is merged with its arguments, so later changes to the
+        arguments do not affect it. Exception info is kept for Rich
+        tracebacks.
+        """
+        from ..config import get_global_config
+        from .rich_logger import apply_agent_context
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        apply_agent_context(record)
+        if not hasattr(record, "session_id"):
+            config = get_global_config()
+            record.session_id = config.output_directory.name if config else None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.pipeline.put(self.target, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.pipeline.flush()
+
+    def close(self) -> None:
+        self.pipeline.flush()
+        self.pipeline.discard(self.target)
+        self.target.close()
+        super().close()
+
+
+_pipeline: LogPipeline | None = None
+_pipeline_lock = threading.Lock()
+
+
+def get_log_pipeline(console: Console | None = None) -> LogPipeline:
+    """Get the process-wide log pipeline, creating it on first use."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline(console=console)
+            # Registered after logging's own atexit hook, so this runs first
+            atexit.register(_pipeline.stop)
+        return _pipeline
+
+
+def flush_logging() -> None:
+    """Write all queued log records, e.g. before the process exits abruptly."""
+    if _pipeline is not None:
+        _pipeline.flush()
+
+
+def unwrap_handler(handler: logging.Handler) -> logging.Handler:
+    """Get the handler that writes the records of a possibly wrapped handler."""
+    return handler.target if isinstance(handler, AsyncHandler) else handler
@@ -1,6 +1,8 @@
 """Rich-based colorful logging for threat-composer-ai."""
 
 import logging
+import os
+from contextvars import ContextVar
 from pathlib import Path
 
 from rich.console import Console
@@ -8,6 +10,14 @@ from rich.logging import RichHandler
 from rich.markup import escape as _rich_escape
 from rich.theme import Theme
 
+from .event_log import JsonlEventHandler, get_event_logger
+from .pipeline import (
+    AsyncHandler,
+    BufferedFileHandler,
+    get_log_pipeline,
+    unwrap_handler,
+)
+
 
 def rich_escape(value) -> str:
     """Safely escape a value for Rich markup, handling None and non-string types."""
@@ -35,6 +45,12 @@ THREAT_COMPOSER_THEME = Theme(
 # Global console instance
 console = Console(theme=THREAT_COMPOSER_THEME)
 
+# Agent whose messages are being logged. Kept per thread and asyncio task, so
+# workflows running concurrently in one process label their own messages.
+_agent_context: ContextVar[str | None] = ContextVar(
+    "threat_composer_agent", default=None
+)
+
 
 class AgentAwareFormatter(logging.Formatter):
     """Custom formatter that adds agent context and rich formatting.
@@ -44,25 +60,34 @@ class AgentAwareFormatter(logging.Formatter):
     logs containing square brackets) does not get misinterpreted as Rich tags.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.agent_context = None
+    @property
+    def agent_context(self) -> str | None:
+        """Agent context of the current thread or asyncio task."""
+        return _agent_context.get()
 
     def set_agent_context(self, agent_name: str):
-        """Set the current agent context."""
-        self.agent_context = agent_name
+        """Set the agent context of the current thread or asyncio task."""
+        _agent_context.set(agent_name)
 
     def clear_agent_context(self):
-        """Clear the current agent context."""
-        self.agent_context = None
+        """Clear the agent context of the current thread or asyncio task."""
+        _agent_context.set(None)
 
-    def format(self, record):
-        """Format log record with agent context."""
-        # Add agent context to the record if available
+    def apply_agent_context(self, record):
+        """Add the current agent context to a record, once."""
+        if getattr(record, "_agent_context_applied", False):
+            return
         if self.agent_context:
             record.agent = self.agent_context
         elif not hasattr(record, "agent"):
             record.agent = "system"
+        record._agent_context_applied = True
+
+    def format(self, record):
+        """Format log record with agent context."""
+        # Add agent context to the record if available; records written by
+        # the log pipeline already got it on the thread that logged them
+        self.apply_agent_context(record)
 
         # If the message was pre-formatted with Rich markup by our helpers,
         # use it as-is. Otherwise escape to prevent markup injection from
@@ -86,6 +111,69 @@ class AgentAwareFormatter(logging.Formatter):
 # Global formatter instance
 _formatter = AgentAwareFormatter()
 
+# Loggers that get their own handlers instead of propagating to the root logger
+_THIRD_PARTY_LOGGERS = ("botocore", "boto3", "urllib3", "s3transfer")
+
+
+class _ActiveLogFileFilter(logging.Filter):
+    """
+    Pass records only while the log file belongs to the active configuration.
+
+    Several workflows can run in one process (e.g. in the MCP server), each
+    with its own log file. Records are emitted in the thread or task that
+    logs them, where the workflow's configuration is registered, so each
+    record is written to the log file of the workflow that produced it.
+    """
+
+    def __init__(self, log_file: Path):
+        super().__init__()
+        self.log_file = log_file
+
+    def filter(self, record):
+        from ..config import get_global_config
+
+        config = get_global_config()
+        if config is None:
+            return True
+        # Compare directories, so the text and event logs of a workflow both pass
+        log_dir = config.output_directory / config.logs_output_sub_dir
+        return log_dir == self.log_file.parent
+
+
+def _is_other_log_file(handler: logging.Handler, log_file: Path | None) -> bool:
+    """Check whether a handler writes to a log file other than log_file."""
+    handler = unwrap_handler(handler)
+    return (
+        isinstance(handler, logging.FileHandler)
+        and log_file is not None
+        and handler.baseFilename != os.path.abspath(log_file)
+    )
+
+
+def close_log_file(log_file: Path) -> None:
+    """
+    Detach and close the handlers writing to a log file.
+
+    Used when a workflow finishes while the process keeps running, so log
+    files of finished workflows are not kept open.
+
+    Args:
+        log_file: Path of the log file set up by setup_rich_logging
+    """
+    target = os.path.abspath(log_file)
+    loggers = [logging.getLogger(), logging.getLogger("strands"), get_event_logger()]
+    loggers += [logging.getLogger(name) for name in _THIRD_PARTY_LOGGERS]
+    for logger in loggers:
+        for handler in logger.handlers[:]:
+            file_handler = unwrap_handler(handler)
+            if (
+                isinstance(file_handler, logging.FileHandler)
+                and file_handler.baseFilename == target
+            ):
+                logger.removeHandler(handler)
+                # Closing the AsyncHandler first writes its queued records
+                handler.close()
+
 
 def setup_rich_logging(
     log_level: int = logging.INFO,
@@ -93,8 +181,18 @@ def setup_rich_logging(
     show_path: bool = False,
     log_file_path: Path | None = None,
     log_filename: str | None = None,
+    event_log_filename: str | None = None,
 ) -> None:
-    """Set up rich logging with custom formatting and optional file logging."""
+    """Set up rich logging with custom formatting and optional file logging.
+
+    If event_log_filename is given with log_file_path, events logged with
+    log_event() are written to that JSONL file in the same directory.
+
+    Console and file handlers are wrapped in AsyncHandler, so records are
+    written by the log pipeline's background thread instead of the thread
+    that logs them.
+    """
+    pipeline = get_log_pipeline(console)
 
     # Create rich handler for console output - markup=True is safe because
     # AgentAwareFormatter escapes raw messages before wrapping in markup tags
@@ -111,26 +209,29 @@ def setup_rich_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # Remove existing handlers
+    log_file = log_file_path / log_filename if log_file_path and log_filename else None
+
+    # Remove existing handlers, keeping log files of other workflows that are
+    # still running in this process
     for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+        if not _is_other_log_file(handler, log_file):
+            root_logger.removeHandler(handler)
 
     # Add rich handler for console
-    root_logger.addHandler(rich_handler)
+    root_logger.addHandler(AsyncHandler(rich_handler, pipeline))
 
     # Set custom formatter for rich handler
     rich_handler.setFormatter(_formatter)
 
     # Add file handler if log_file_path is provided
-    if log_file_path and log_filename:
+    if log_file:
         import re
 
         # Ensure logs directory exists
         log_file_path.mkdir(parents=True, exist_ok=True)
 
         # Create file handler that captures everything going to console
-        log_file = log_file_path / log_filename
-        file_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+        file_handler = BufferedFileHandler(log_file, mode="w", encoding="utf-8")
         file_handler.setLevel(log_level)
 
         # Custom formatter that strips rich markup for clean file output
@@ -142,10 +243,21 @@ def setup_rich_logging(
                 clean_message = re.sub(r"\[/?[^\]]*\]", "", formatted_message)
                 # Clean up extra spaces
                 clean_message = " ".join(clean_message.split())
-                return f"{self.formatTime(record)} - {clean_message}"
+                line = (
+                    f"{self.formatTime(record)} - {record.levelname} - {clean_message}"
+                )
+                # Tracebacks follow on their own lines; log_reader keeps them
+                # with the line above
+                if record.exc_info:
+                    line += "\n" + self.formatException(record.exc_info)
+                return line
 
         file_handler.setFormatter(PlainTextFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
-        root_logger.addHandler(file_handler)
+        # Shared by all loggers; the filter must run on the logging thread,
+        # so it is added to the wrapper rather than the file handler
+        async_file_handler = AsyncHandler(file_handler, pipeline)
+        async_file_handler.addFilter(_ActiveLogFileFilter(log_file))
+        root_logger.addHandler(async_file_handler)
 
     # Configure strands logger specifically with markup=False to prevent
     # Rich from parsing raw request/response data as markup tags (e.g., [/-])
@@ -173,12 +285,18 @@ def setup_rich_logging(
 
     strands_logger.setLevel(log_level)
     strands_logger.propagate = False
-    strands_logger.addHandler(strands_rich_handler)
+    for handler in strands_logger.handlers[:]:
+        if not _is_other_log_file(handler, log_file):
+            strands_logger.removeHandler(handler)
+    strands_logger.addHandler(AsyncHandler(strands_rich_handler, pipeline))
 
     # Prevent botocore and other third-party loggers from propagating
     # bracket-heavy content through the root handler's markup parser
-    for third_party in ("botocore", "boto3", "urllib3", "s3transfer"):
+    for third_party in _THIRD_PARTY_LOGGERS:
         tp_logger = logging.getLogger(third_party)
+        for handler in tp_logger.handlers[:]:
+            if not _is_other_log_file(handler, log_file):
+                tp_logger.removeHandler(handler)
         tp_handler = RichHandler(
             console=console,
             show_time=show_time,
@@ -187,13 +305,30 @@ def setup_rich_logging(
             rich_tracebacks=True,
         )
         tp_logger.propagate = False
-        tp_logger.addHandler(tp_handler)
-        if log_file_path and log_filename:
-            tp_logger.addHandler(file_handler)
+        tp_logger.addHandler(AsyncHandler(tp_handler, pipeline))
+        if log_file:
+            tp_logger.addHandler(async_file_handler)
 
     # Add file handler to strands logger if available
-    if log_file_path and log_filename:
-        strands_logger.addHandler(file_handler)
+    if log_file:
+        strands_logger.addHandler(async_file_handler)
+
+    # Structured events go only to the JSONL event log
+    event_logger = get_event_logger()
+    event_log_file = (
+        log_file_path / event_log_filename
+        if log_file_path and event_log_filename
+        else None
+    )
+    for handler in event_logger.handlers[:]:
+        if not _is_other_log_file(handler, event_log_file):
+            event_logger.removeHandler(handler)
+            handler.close()
+    if event_log_file:
+        log_file_path.mkdir(parents=True, exist_ok=True)
+        event_handler = AsyncHandler(JsonlEventHandler(event_log_file), pipeline)
+        event_handler.addFilter(_ActiveLogFileFilter(event_log_file))
+        event_logger.addHandler(event_handler)
 
 
 def get_logger(name: str, agent_name: str | None = None) -> logging.Logger:
@@ -212,15 +347,25 @@ def get_logger(name: str, agent_name: str | None = None) -> logging.Logger:
 
 
 def set_agent_context(agent_name: str) -> None:
-    """Set the global agent context for all subsequent log messages."""
+    """Set the agent context for subsequent log messages of this thread or task."""
     _formatter.set_agent_context(agent_name)
 
 
 def clear_agent_context() -> None:
-    """Clear the global agent context."""
+    """Clear the agent context of this thread or task."""
     _formatter.clear_agent_context()
 
 
+def get_agent_context() -> str | None:
+    """Get the agent context of this thread or task, if any."""
+    return _formatter.agent_context
+
+
+def apply_agent_context(record: logging.LogRecord) -> None:
+    """Add the current agent context to a record before it is queued."""
+    _formatter.apply_agent_context(record)
+
+
 def _log_markup(logger, level, message):
     """Log a message that contains pre-escaped Rich markup tags."""
     if not logger.isEnabledFor(level):
@@ -2,7 +2,10 @@
 
 from ..config import AppConfig
 from ..utils import format_path_for_display
+from ..utils.token_usage import cache_hit_rate
+from .event_log import log_event
 from .rich_logger import (
+    get_agent_context,
     log_agent_message,
     log_agent_tool_use,
     log_debug,
@@ -48,13 +51,29 @@ class StrandsRichHandler:
         """
         Handle strands callback events with rich formatting.
         """
+        # The agent context is kept per thread and task; callbacks run in
+        # the agent's own, so its messages are labeled even when agents or
+        # workflows run concurrently
+        if self.auto_context and self.agent_name:
+            if get_agent_context() != self.agent_name:
+                set_agent_context(self.agent_name)
         try:
+            # Model usage is reported in the metadata event of each model call
+            event = kwargs.get("event")
+            if isinstance(event, dict) and "metadata" in event:
+                self._log_model_usage(event["metadata"])
+
             # When a new message is created from the assistant, print its content
             if "message" in kwargs and kwargs["message"].get("role") == "assistant":
                 # Process each content item in the message
                 for content_item in kwargs["message"]["content"]:
                     # 1. If there is a message (text), output the text via log_agent_message
                     if "text" in content_item:
+                        log_event(
+                            "agent_message",
+                            agent=self.agent_name,
+                            characters=len(content_item["text"]),
+                        )
                         if self.show_assistant_messages:
                             log_agent_message(
                                 self.agent_name or "agent", content_item["text"]
@@ -62,6 +81,16 @@ class StrandsRichHandler:
 
                     # 2. If there is toolUse, output the name, mode and path via log_agent_tool_use
                     if "toolUse" in content_item:
+                        tool_use = content_item["toolUse"]
+                        tool_input = tool_use.get("input", {})
+                        log_event(
+                            "tool_use",
+                            agent=self.agent_name,
+                            tool=tool_use.get("name", "unknown"),
+                            tool_use_id=tool_use.get("toolUseId"),
+                            mode=tool_input.get("mode"),
+                            path=tool_input.get("path"),
+                        )
                         if self.show_tool_use:
                             tool_use = content_item["toolUse"]
                             tool_name = tool_use.get("name", "unknown")
@@ -102,6 +131,26 @@ class StrandsRichHandler:
             # Ensure callback errors don't break agent execution
             log_debug(f"Error in strands callback handler for {self.agent_name}: {e}")
 
+    def _log_model_usage(self, metadata: dict) -> None:
+        """Write token counts and latency of a model call to the event log."""
+        usage = metadata.get("usage", {})
+        metrics = metadata.get("metrics", {})
+        cache_read_tokens = usage.get("cacheReadInputTokens", 0)
+        cache_write_tokens = usage.get("cacheWriteInputTokens", 0)
+        log_event(
+            "model_usage",
+            agent=self.agent_name,
+            input_tokens=usage.get("inputTokens"),
+            output_tokens=usage.get("outputTokens"),
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            cache_hit_rate=cache_hit_rate(
+                usage.get("inputTokens", 0), cache_read_tokens, cache_write_tokens
+            ),
+            total_tokens=usage.get("totalTokens"),
+            latency_ms=metrics.get("latencyMs"),
+        )
+
 
 def create_strands_rich_handler(
     agent_name: str | None = None,
@@ -0,0 +1,344 @@
+"""
+Job manager for workflows started through the MCP server.
+
+A shared MCP server is used by several people at once, so workflows are run
+as jobs instead of one at a time per machine:
+- At most max_concurrent jobs run at the same time; further jobs wait in a
+  FIFO queue
+- Jobs analyzing the same working directory never run at the same time. A
+  queued job whose directory is busy is skipped, without blocking later jobs
+  on other directories. The directory is also locked on disk, so separate
+  server processes do not run workflows on it concurrently either.
+- Queued and running jobs can be cancelled, and their status and progress
+  queried, by a job ID generated by the manager. Session IDs are not used,
+  since they are only unique within an output directory.
+
+Jobs run as tasks on the server's event loop, so the manager must be used
+from that loop. Blocking work (runner setup, AWS validation) is offloaded to
+a shared thread pool with run_blocking() instead of a thread per job. Each
+job task registers its own configuration (see GlobalConfigRegistry), so
+concurrent jobs keep their own working directory, output directory and log
+file.
+"""
+
+import asyncio
+import contextvars
+import os
+import uuid
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..config import register_global_config
+from ..core import WorkflowLock, WorkflowRunner
+from ..logging import close_log_file, log_error, log_success
+
+# Jobs running at the same time unless THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS
+# is set
+DEFAULT_MAX_CONCURRENT_WORKFLOWS = 2
+
+# Threads shared by all jobs for blocking setup work
+BLOCKING_WORKERS = 4
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = frozenset({COMPLETED, FAILED, CANCELLED})
+
+T = TypeVar("T")
+
+
+@dataclass
+class WorkflowJob:
+    """Model for a workflow submitted to the job manager."""
+
+    job_id: str
+    session_id: str
+    runner: WorkflowRunner
+    status: str = QUEUED
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    cancel_requested: bool = False
+    # Workflow nodes finished so far, out of total_nodes
+    completed_nodes: int = 0
+    total_nodes: int = 0
+    progress_message: str | None = None
+    # Task running the workflow, set while it runs
+    _task: asyncio.Task | None = field(default=None, repr=False)
+    # Set and replaced whenever status or progress changes
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def working_directory(self) -> Path:
+        return self.runner.config.working_directory.resolve()
+
+    @property
+    def output_directory(self) -> Path:
+        return self.runner.config.output_directory
+
+    @property
+    def log_file(self) -> Path:
+        config = self.runner.config
+        return (
+            config.output_directory / config.logs_output_sub_dir / config.log_filename
+        )
+
+    @property
+    def event_log_file(self) -> Path:
+        config = self.runner.config
+        return (
+            config.output_directory
+            / config.logs_output_sub_dir
+            / config.event_log_filename
+        )
+
+    def to_dict(self, queue_position: int | None = None) -> dict[str, Any]:
+        """Job details for tool responses."""
+
+        def format_timestamp(timestamp: datetime | None) -> str | None:
+            return timestamp.isoformat() if timestamp else None
+
+        details = {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "working_directory": str(self.working_directory),
+            "output_directory": str(self.output_directory),
+            "submitted_at": format_timestamp(self.submitted_at),
+            "started_at": format_timestamp(self.started_at),
+            "finished_at": format_timestamp(self.finished_at),
+        }
+        if queue_position is not None:
+            details["queue_position"] = queue_position
+        if self.total_nodes:
+            details["progress"] = {
+                "completed_nodes": self.completed_nodes,
+                "total_nodes": self.total_nodes,
+                "message": self.progress_message,
+            }
+        if self.cancel_requested and self.status == RUNNING:
+            details["cancel_requested"] = True
+        if self.error:
+            details["error"] = self.error
+        return details
+
+
+class JobManager:
+    """Runs workflow jobs with a concurrency limit and per-directory locking."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_WORKFLOWS):
+        """
+        Initialize job manager.
+
+        Args:
+            max_concurrent: Maximum number of jobs running at the same time
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self._jobs: dict[str, WorkflowJob] = {}
+        self._queue: deque[WorkflowJob] = deque()
+        self._busy_directories: set[Path] = set()
+        self._running_count = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=BLOCKING_WORKERS, thread_name_prefix="workflow-blocking"
+        )
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        """Create a job manager limited by THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS."""
+        value = os.getenv("THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS")
+        try:
+            max_concurrent = int(value) if value else DEFAULT_MAX_CONCURRENT_WORKFLOWS
+        except ValueError:
+            max_concurrent = DEFAULT_MAX_CONCURRENT_WORKFLOWS
+        return cls(max_concurrent)
+
+    async def run_blocking(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking call in the shared thread pool.
+
+        The call runs in a copy of the caller's context, so configuration
+        registered by the caller is visible to it.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for func
+
+        Returns:
+            The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor, partial(context.run, func, *args)
+        )
+
+    def submit(self, runner: WorkflowRunner) -> WorkflowJob:
+        """
+        Queue a workflow whose runner is already set up, and start it if possible.
+
+        Must be called from the event loop that runs the jobs.
+
+        Args:
+            runner: WorkflowRunner after a successful setup()
+
+        Returns:
+            The job, running or queued
+        """
+        job = WorkflowJob(
+            job_id=uuid.uuid4().hex,
+            session_id=runner.session_manager.session_id,
+            runner=runner,
+            total_nodes=runner.node_count,
+        )
+        self._jobs[job.job_id] = job
+        self._queue.append(job)
+        self._start_ready_jobs()
+        return job
+
+    def get(self, job_id: str) -> WorkflowJob | None:
+        """Get a job by its job ID."""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[WorkflowJob]:
+        """Get all jobs in submission order."""
+        return list(self._jobs.values())
+
+    def queue_position(self, job: WorkflowJob) -> int | None:
+        """Get the 1-based position of a queued job, or None if not queued."""
+        for position, queued in enumerate(self._queue, 1):
+            if queued is job:
+                return position
+        return None
+
+    def cancel(self, job_id: str) -> WorkflowJob | None:
+        """
+        Cancel a queued or running job.
+
+        Queued jobs are removed from the queue immediately. Running jobs are
+        cancelled at their next await and reported as cancelled once stopped.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            The job, or None if no job has that ID
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+
+        if job.status == QUEUED:
+            self._queue.remove(job)
+            job.status = CANCELLED
+            job.finished_at = datetime.now(timezone.utc)
+            self._notify(job)
+            return job
+
+        job.cancel_requested = True
+        if job._task is not None:
+            job._task.cancel()
+        self._notify(job)
+        return job
+
+    async def wait_for_update(self, job: WorkflowJob, timeout: float) -> bool:
+        """
+        Wait until a job's status or progress changes.
+
+        Args:
+            job: Job to watch
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the job changed, False if the timeout expired first
+        """
+        if job.status in FINISHED_STATUSES:
+            return True
+        try:
+            await asyncio.wait_for(job._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _notify(self, job: WorkflowJob) -> None:
+        """Wake tasks waiting for a job to change."""
+        job._changed.set()
+        job._changed = asyncio.Event()
+
+    def _start_ready_jobs(self) -> None:
+        """Start queued jobs in FIFO order while slots are free."""
+        for job in list(self._queue):
+            if self._running_count >= self.max_concurrent:
+                return
+            if job.working_directory in self._busy_directories:
+                continue
+
+            self._queue.remove(job)
+            self._busy_directories.add(job.working_directory)
+            self._running_count += 1
+            job.status = RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            job._task = asyncio.create_task(
+                self._run(job), name=f"workflow-{job.job_id}"
+            )
+            # Bookkeeping runs even if the task is cancelled before it starts
+            job._task.add_done_callback(partial(self._finish, job))
+            self._notify(job)
+
+    async def _run(self, job: WorkflowJob) -> None:
+        """Run a job as a task on the event loop."""
+        # Tools and log handlers running for this job resolve its configuration.
+        # The task runs in its own copy of the context, so this does not leak
+        # into other jobs.
+        register_global_config(job.runner.config)
+
+        lock = WorkflowLock(WorkflowLock.get_directory_lock_path(job.working_directory))
+        try:
+            with lock.acquire():
+                await job.runner.execute_async(
+                    on_node_event=partial(self._on_node_event, job)
+                )
+            log_success(f"Workflow {job.job_id} completed")
+        except asyncio.CancelledError:
+            log_error(f"Workflow {job.job_id} cancelled")
+            raise
+        except Exception as e:
+            log_error(f"Workflow {job.job_id} failed: {e}")
+            raise
+
+    def _finish(self, job: WorkflowJob, task: asyncio.Task) -> None:
+        """Record a finished job and start the next queued jobs."""
+        if task.cancelled():
+            job.status = CANCELLED
+        elif task.exception() is not None:
+            job.status = FAILED
+            job.error = str(task.exception())
+        else:
+            job.status = COMPLETED
+        close_log_file(job.log_file)
+        close_log_file(job.event_log_file)
+        job.finished_at = datetime.now(timezone.utc)
+        job._task = None
+        self._busy_directories.discard(job.working_directory)
+        self._running_count -= 1
+        self._notify(job)
+        self._start_ready_jobs()
+
+    def _on_node_event(self, job: WorkflowJob, event: str, node_id: str) -> None:
+        """Record workflow node progress reported by the runner."""
+        if event == "start":
+            job.progress_message = f"Running {node_id}"
+        else:
+            job.completed_nodes += 1
+            job.progress_message = f"Finished {node_id}"
+        self._notify(job)
@@ -45,9 +45,12 @@ def main() -> None:
 
     1. threat_modeling_start_workflow - Start or re-run threat modeling workflows
     2. threat_modeling_get_workflow_logs - Get logs of running/completed workflows
-    3. threat_modeling_list_workflow_sessions - List available workflow sessions
-    4. threat_modeling_validate_tc_schema - Validates JSON data against the Threat Composer v1 schema
-    5. threat_modeling_get_tc_schema - Returns the Threat Composer v1 schema JSON content
+    3. threat_modeling_get_workflow_status - Get the status of queued/running/finished workflows
+    4. threat_modeling_cancel_workflow - Cancel a queued or running workflow
+    5. threat_modeling_wait_for_workflow - Wait for a workflow to finish, reporting progress
+    6. threat_modeling_list_workflow_sessions - List available workflow sessions
+    7. threat_modeling_validate_tc_schema - Validates JSON data against the Threat Composer v1 schema
+    8. threat_modeling_get_tc_schema - Returns the Threat Composer v1 schema JSON content
 
     Usage:
         threat-composer-ai-mcp
@@ -63,6 +66,15 @@ def main() -> None:
         print(
             "  - threat_modeling_get_workflow_logs: Get logs for a running or completed workflow session"
         )
+        print(
+            "  - threat_modeling_get_workflow_status: Get the status of workflows started by this server"
+        )
+        print(
+            "  - threat_modeling_cancel_workflow: Cancel a queued or running workflow"
+        )
+        print(
+            "  - threat_modeling_wait_for_workflow: Wait for a workflow to finish, reporting progress"
+        )
         print(
             "  - threat_modeling_list_workflow_sessions: List available workflow sessions in a directory"
         )
@@ -1,16 +1,17 @@
 """All MCP tools for threat-composer-ai."""
 
-import asyncio
 import json
-import threading
+import time
 from pathlib import Path
 from typing import Any
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 
-from ..core import SessionDiscovery, WorkflowLock, WorkflowRunner
+from ..core import SessionDiscovery, WorkflowRunner
+from ..logging import LogFilter, read_log, tail_log
 from ..models import ThreatComposerV1Model
-from ..tools.threat_composer_validate_tc_v1_schema import validate_tc_data_pydantic
+from ..tools.threat_composer_validate_tc_v1_schema import validate_tc_json_pydantic
+from .job_manager import FINISHED_STATUSES, QUEUED, JobManager
 
 
 def get_tool_name(tool_func) -> str:
@@ -34,8 +35,17 @@ def get_tool_name(tool_func) -> str:
         return str(tool_func)
 
 
-def register_tools(mcp: FastMCP) -> None:
-    """Register all MCP tools with the FastMCP server."""
+def register_tools(mcp: FastMCP, job_manager: JobManager | None = None) -> None:
+    """
+    Register all MCP tools with the FastMCP server.
+
+    Args:
+        mcp: FastMCP server instance
+        job_manager: Job manager running workflows; created from environment
+            variables if not provided
+    """
+    if job_manager is None:
+        job_manager = JobManager.from_env()
 
     # ============================================================================
     # SCHEMA VALIDATION TOOLS
@@ -76,21 +86,15 @@ def register_tools(mcp: FastMCP) -> None:
                     return f"❌ File not found: {file_path}"
 
                 try:
-                    with open(file_path_obj, encoding="utf-8") as f:
-                        json_data = json.load(f)
-                except json.JSONDecodeError as e:
-                    return f"❌ Invalid JSON format in file '{file_path}': {str(e)}"
+                    content = file_path_obj.read_bytes()
                 except Exception as e:
                     return f"❌ Error reading file '{file_path}': {str(e)}"
             else:
                 # Handle raw JSON data validation
-                try:
-                    json_data = json.loads(data)
-                except json.JSONDecodeError as e:
-                    return f"❌ Invalid JSON format in data: {str(e)}"
+                content = data.encode("utf-8")
 
-            # Validate using the existing validation function
-            is_valid, error_message = validate_tc_data_pydantic(json_data)
+            # Parse and validate the raw JSON in one step
+            is_valid, error_message = validate_tc_json_pydantic(content)
 
             if is_valid:
                 return "✅ Validation successful! The data conforms to the Threat Composer v1 schema."
@@ -126,7 +130,7 @@ def register_tools(mcp: FastMCP) -> None:
     # ============================================================================
 
     @mcp.tool()
-    def threat_modeling_start_workflow(
+    async def threat_modeling_start_workflow(
         directory_path: str,
         rerun_from_session_id: str = None,
         search_directory: str = None,
@@ -134,8 +138,11 @@ def register_tools(mcp: FastMCP) -> None:
         """
         Start a new threat modeling workflow or re-run from previous session.
 
-        Validates AWS credentials and inference before starting. Prevents
-        concurrent workflow execution.
+        Validates AWS credentials and inference before starting. Workflows run
+        as jobs: a limited number run at the same time and the rest wait in a
+        FIFO queue, and workflows on the same directory never run concurrently.
+        Jobs run as tasks on the server's event loop; follow their progress
+        with threat_modeling_wait_for_workflow().
 
         **Logging & Output:**
         - Comprehensive startup banner logged to /logs/ directory
@@ -154,6 +161,14 @@ def register_tools(mcp: FastMCP) -> None:
         - THREAT_COMPOSER_AWS_MODEL_ID: AWS Bedrock model ID
         - THREAT_COMPOSER_EXECUTION_TIMEOUT: Execution timeout in seconds
         - THREAT_COMPOSER_NODE_TIMEOUT: Node timeout in seconds
+        - THREAT_COMPOSER_OPTIMIZE_DIAGRAM_ICONS: Downscale diagram icons (true/false, default false)
+        - THREAT_COMPOSER_DIAGRAM_ICON_FORMAT: Embedded icon format (png/webp)
+        - THREAT_COMPOSER_COMPACT_JSON: Write compact JSON outputs (true/false)
+        - THREAT_COMPOSER_GZIP_THREAT_MODEL: Also write a .tc.json.gz copy (true/false)
+        - THREAT_COMPOSER_MERGE_NEAR_DUPLICATES: Merge duplicate threats/mitigations (true/false)
+        - THREAT_COMPOSER_NEAR_DUPLICATE_THRESHOLD: Similarity needed to merge (0-1)
+        - THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS: Workflows run at the same time
+          by the server (read at server start)
 
         Args:
             directory_path: Path to directory to analyze (required)
@@ -161,7 +176,11 @@ def register_tools(mcp: FastMCP) -> None:
             search_directory: Directory to search for rerun session (required if rerun_from_session_id provided)
 
         Returns:
-            JSON with session_id, output_directory, and status. Use threat_modeling_get_workflow_logs() to monitor progress.
+            JSON with job_id, session_id, output_directory, and status
+            ("started" or "queued", with queue_position). Use
+            threat_modeling_get_workflow_logs() to monitor progress, and pass
+            the job_id to threat_modeling_get_workflow_status() to check the
+            job and threat_modeling_wait_for_workflow() to wait for it.
         """
         try:
             # Validate directory
@@ -201,70 +220,168 @@ def register_tools(mcp: FastMCP) -> None:
 
             # Create runner with full initialization using factory method
             # All configuration comes from environment variables or defaults
-            runner = WorkflowRunner.create_from_params(
-                working_directory=dir_path,
-                previous_session_path=previous_session_path,
-                invocation_source="MCP",
-                setup_logging=True,
-            )
+            # Creation and AWS validation block, so they run in the job
+            # manager's thread pool instead of on the server's event loop
+            def create_runner() -> WorkflowRunner:
+                return WorkflowRunner.create_from_params(
+                    working_directory=dir_path,
+                    previous_session_path=previous_session_path,
+                    invocation_source="MCP",
+                    setup_logging=True,
+                )
 
-            # Validate AWS credentials BEFORE starting background thread
+            runner = await job_manager.run_blocking(create_runner)
+
+            # Validate AWS credentials BEFORE submitting the job
             invocation_args = {
                 "directory_path": str(directory_path),
                 "rerun_from_session_id": rerun_from_session_id,
             }
 
-            success, error = runner.setup(
-                invocation_args=invocation_args,
-                skip_validation=False,  # Always validate
-            )
+            def setup_runner() -> tuple[bool, str | None]:
+                return runner.setup(
+                    invocation_args=invocation_args,
+                    skip_validation=False,  # Always validate
+                )
+
+            success, error = await job_manager.run_blocking(setup_runner)
 
             if not success:
                 return json.dumps(
                     {"status": "error", "message": f"Setup failed: {error}"}
                 )
 
-            # Acquire workflow lock
-            lock = WorkflowLock(WorkflowLock.get_default_lock_path())
+            job = job_manager.submit(runner)
+            session_id = job.session_id
+
+            response = {
+                "status": "started",
+                "job_id": job.job_id,
+                "session_id": session_id,
+                "output_directory": str(runner.config.output_directory),
+                "message": "Workflow started successfully",
+            }
+            if job.status == QUEUED:
+                response["status"] = "queued"
+                response["queue_position"] = job_manager.queue_position(job)
+                response["message"] = "Workflow queued; it starts when a slot is free"
+            response["instructions"] = (
+                f"Use {get_tool_name(threat_modeling_get_workflow_logs)}"
+                f"(session_id='{session_id}', output_directory='{runner.config.output_directory}') "
+                "to get logs of progress and use to create a summary, and "
+                f"{get_tool_name(threat_modeling_wait_for_workflow)}"
+                f"(job_id='{job.job_id}') to wait for it to finish"
+            )
+            return json.dumps(response)
+
+        except Exception as e:
+            return json.dumps(
+                {"status": "error", "message": f"Failed to start workflow: {str(e)}"}
+            )
 
-            def run_workflow_thread():
-                """Run workflow in background thread."""
+    @mcp.tool()
+    async def threat_modeling_get_workflow_status(job_id: str = None) -> str:
+        """
+        Get the status of workflows started by this server.
+
+        Args:
+            job_id: Job ID returned by start_workflow (optional). If
+                omitted, all workflows known to the server are listed.
 
-                async def run_workflow():
-                    try:
-                        with lock.acquire():
-                            # Execute workflow (setup already done)
-                            await runner.execute_async()
+        Returns:
+            JSON with the workflow's status ("queued", "running", "completed",
+            "failed" or "cancelled"), timestamps, queue position, node progress
+            and error, or {"workflows": [...]} when no job_id is given
+        """
+        if job_id:
+            job = job_manager.get(job_id)
+            if job is None:
+                return json.dumps(
+                    {"status": "error", "message": f"Workflow not found: {job_id}"}
+                )
+            return json.dumps(job.to_dict(job_manager.queue_position(job)))
+
+        return json.dumps(
+            {
+                "max_concurrent_workflows": job_manager.max_concurrent,
+                "workflows": [
+                    job.to_dict(job_manager.queue_position(job))
+                    for job in job_manager.list_jobs()
+                ],
+            }
+        )
 
-                    except RuntimeError as e:
-                        print(f"Workflow lock error: {e}")
-                    except Exception as e:
-                        print(f"Workflow execution error: {e}")
+    @mcp.tool()
+    async def threat_modeling_cancel_workflow(job_id: str) -> str:
+        """
+        Cancel a queued or running workflow started by this server.
 
-                asyncio.run(run_workflow())
+        Queued workflows are removed from the queue. Running workflows stop at
+        their next step; check threat_modeling_get_workflow_status() to see
+        when they are cancelled.
 
-            # Start workflow thread
-            workflow_thread = threading.Thread(target=run_workflow_thread, daemon=True)
-            workflow_thread.start()
+        Args:
+            job_id: Job ID returned by start_workflow
 
+        Returns:
+            JSON with the workflow's status after the cancellation request
+        """
+        job = job_manager.cancel(job_id)
+        if job is None:
             return json.dumps(
-                {
-                    "status": "started",
-                    "session_id": runner.session_manager.session_id,
-                    "output_directory": str(runner.config.output_directory),
-                    "message": "Workflow started successfully",
-                    "instructions": f"Use {get_tool_name(threat_modeling_get_workflow_logs)}(session_id='{runner.session_manager.session_id}', output_directory='{runner.config.output_directory}') to get logs of progress and use to create a summary",
-                }
+                {"status": "error", "message": f"Workflow not found: {job_id}"}
             )
+        return json.dumps(job.to_dict())
 
-        except Exception as e:
+    @mcp.tool()
+    async def threat_modeling_wait_for_workflow(
+        job_id: str, ctx: Context, timeout_seconds: float = 300
+    ) -> str:
+        """
+        Wait for a workflow started by this server to finish, reporting progress.
+
+        While waiting, progress notifications are sent with the number of
+        workflow nodes finished out of the total and the node currently
+        running, if the client requested progress for this call. The workflow
+        keeps running if the wait times out; call this tool again to keep
+        waiting.
+
+        Args:
+            job_id: Job ID returned by start_workflow
+            timeout_seconds: Maximum time to wait in seconds (default: 300)
+
+        Returns:
+            JSON with the workflow's status after it finished or the wait timed
+            out, as returned by threat_modeling_get_workflow_status()
+        """
+        job = job_manager.get(job_id)
+        if job is None:
             return json.dumps(
-                {"status": "error", "message": f"Failed to start workflow: {str(e)}"}
+                {"status": "error", "message": f"Workflow not found: {job_id}"}
+            )
+
+        deadline = time.monotonic() + timeout_seconds
+        while job.status not in FINISHED_STATUSES:
+            await ctx.report_progress(
+                job.completed_nodes,
+                job.total_nodes or None,
+                job.progress_message or job.status,
             )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not await job_manager.wait_for_update(job, remaining):
+                break
+
+        return json.dumps(job.to_dict(job_manager.queue_position(job)))
 
     @mcp.tool()
     def threat_modeling_get_workflow_logs(
-        session_id: str, output_directory: str, tail_lines: int = None
+        session_id: str,
+        output_directory: str,
+        tail_lines: int = None,
+        cursor: int = None,
+        level: str = None,
+        agent: str = None,
+        events: bool = False,
     ) -> str:
         """
         Get the workflow logs for a running or completed session.
@@ -272,10 +389,22 @@ def register_tools(mcp: FastMCP) -> None:
         Retrieves log content from the logs subdirectory of the workflow output directory.
         Returns the raw log content as plaintext.
 
+        To follow a running workflow, call once (e.g. with tail_lines), then
+        pass the "Next cursor" from the header as cursor on each later call to
+        get only the lines written since.
+
         Args:
             session_id: The session ID returned by start_workflow
             output_directory: The output directory path returned by start_workflow
             tail_lines: Optional number of lines to return from end of log (default: all lines)
+            cursor: Optional "Next cursor" value from a previous call; only lines
+                written after it are returned
+            level: Optional minimum level, e.g. "WARNING" or "ERROR"
+            agent: Optional agent name to show only its lines ("system" for
+                workflow messages)
+            events: Return the structured JSONL event log (one JSON object per
+                line with timestamp, agent, event type, tool, duration and
+                token fields) instead of the text log
 
         Returns:
             Log content as plaintext string, or error message if logs cannot be retrieved
@@ -291,7 +420,8 @@ def register_tools(mcp: FastMCP) -> None:
                 return f"❌ Error: Logs directory not found: {logs_dir}"
 
             # Find log files in the logs directory
-            log_files = list(logs_dir.glob("*.log"))
+            pattern = AppConfig.event_log_filename if events else "*.log"
+            log_files = list(logs_dir.glob(pattern))
 
             if not log_files:
                 return f"❌ Error: No log files found in {logs_dir}"
@@ -301,25 +431,39 @@ def register_tools(mcp: FastMCP) -> None:
                 0
             ]
 
-            # Read log content
-            with open(log_file, encoding="utf-8") as f:
+            try:
+                log_filter = LogFilter(level=level, agent=agent)
+            except ValueError as e:
+                return f"❌ Error: {str(e)}"
+
+            # Read only the requested part of the log
+            if cursor is not None:
+                chunk = read_log(log_file, cursor, log_filter)
                 if tail_lines:
-                    # Read all lines and return last N lines
-                    lines = f.readlines()
-                    log_content = "".join(lines[-tail_lines:])
-                else:
-                    # Return entire log
-                    log_content = f.read()
+                    chunk.lines = chunk.lines[-tail_lines:]
+            elif tail_lines:
+                chunk = tail_log(log_file, tail_lines, log_filter)
+            else:
+                chunk = read_log(log_file, 0, log_filter)
 
             # Return plaintext with header
             header = f"=== Workflow Logs for Session: {session_id} ===\n"
             header += f"Log file: {log_file.name}\n"
             header += f"Log path: {log_file}\n"
-            if tail_lines:
+            if cursor is not None:
+                header += f"Showing lines written after cursor {cursor}\n"
+            elif tail_lines:
                 header += f"Showing last {tail_lines} lines\n"
+            if log_filter.active:
+                header += f"Filters: level={level or 'any'}, agent={agent or 'any'}\n"
+            header += f"Next cursor: {chunk.cursor}\n"
+            if chunk.more:
+                header += (
+                    "More log output is available; call again with the next cursor\n"
+                )
             header += "=" * 60 + "\n\n"
 
-            return header + log_content
+            return header + chunk.text
 
         except Exception as e:
             return f"❌ Error: Failed to retrieve logs: {str(e)}"
@@ -16,10 +16,19 @@ Usage:
     print(threat_model.applicationInfo.name if threat_model.applicationInfo else None)
 """
 
-from typing import Literal
+from functools import reduce
+from operator import or_
+from typing import Annotated, Any, Literal, get_args, get_origin
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Discriminator,
+    Field,
+    Tag,
+    field_validator,
+)
 
 
 class MetadataItem(BaseModel):
@@ -147,6 +156,82 @@ class ThreatPackMitigationCandidateIdMetadata(MetadataItem):
     )
 
 
+# Prefix of the keys of custom metadata items
+CUSTOM_METADATA_PREFIX = "custom:"
+
+
+def _metadata_union(*models: type[MetadataItem]) -> Any:
+    """
+    Build a union of metadata item models discriminated by their key.
+
+    The item's key selects the single model it is validated against, so an
+    invalid item produces the errors of that model only instead of one set
+    per union member. Each member is tagged with its class name, which keeps
+    error locations such as ("metadata", 0, "PriorityMetadata", "value").
+    Keys that match no member are reported as one "metadata_key_invalid"
+    error listing the accepted keys.
+    """
+    tags_by_key: dict[str, str] = {}
+    custom_tag = None
+    for model in models:
+        key_annotation = model.model_fields["key"].annotation
+        if get_origin(key_annotation) is Literal:
+            for key in get_args(key_annotation):
+                tags_by_key[key] = model.__name__
+        else:
+            custom_tag = model.__name__
+
+    def metadata_tag(value: Any) -> str | None:
+        key = (
+            value.get("key") if isinstance(value, dict) else getattr(value, "key", None)
+        )
+        if not isinstance(key, str):
+            return None
+        if key in tags_by_key:
+            return tags_by_key[key]
+        if custom_tag is not None and key.startswith(CUSTOM_METADATA_PREFIX):
+            return custom_tag
+        return None
+
+    accepted = [repr(key) for key in tags_by_key]
+    if custom_tag is not None:
+        accepted.append(f"a key starting with {CUSTOM_METADATA_PREFIX!r}")
+
+    return Annotated[
+        reduce(or_, (Annotated[model, Tag(model.__name__)] for model in models)),
+        Discriminator(
+            metadata_tag,
+            custom_error_type="metadata_key_invalid",
+            custom_error_message="Metadata key must be one of: " + ", ".join(accepted),
+        ),
+    ]
+
+
+AssumptionMetadata = _metadata_union(CommentsMetadata, CustomMetadata)
+
+MitigationMetadata = _metadata_union(
+    CommentsMetadata,
+    CustomMetadata,
+    SourceMetadata,
+    MitigationPackIdMetadata,
+    MitigationPackMitigationIdMetadata,
+)
+
+ThreatMetadata = _metadata_union(
+    CommentsMetadata,
+    CustomMetadata,
+    SourceMetadata,
+    StrideMetadata,
+    PriorityMetadata,
+    ThreatPackIdMetadata,
+    ThreatPackThreatIdMetadata,
+    ThreatPackMitigationCandidateIdMetadata,
+)
+
+# Class names of the metadata models, used as union tags in error locations
+METADATA_TAGS = frozenset(cls.__name__ for cls in MetadataItem.__subclasses__())
+
+
 class BaseEntity(BaseModel):
     """Base class for entities with common fields."""
 
@@ -238,7 +323,7 @@ class Dataflow(BaseModel):
 class Assumption(TaggedEntity):
     """Assumptions about the design, threats and mitigations of the application being threat modeled."""
 
-    metadata: list[CommentsMetadata | CustomMetadata] | None = Field(
+    metadata: list[AssumptionMetadata] | None = Field(
         None, description="Additional metadata as key-value pairs"
     )
     content: str = Field(..., max_length=1000, description="Assumption. Plain-text")
@@ -249,16 +334,7 @@ class Assumption(TaggedEntity):
 class Mitigation(TaggedEntity):
     """Mitigations for the application being threat modeled."""
 
-    metadata: (
-        list[
-            CommentsMetadata
-            | CustomMetadata
-            | SourceMetadata
-            | MitigationPackIdMetadata
-            | MitigationPackMitigationIdMetadata
-        ]
-        | None
-    ) = Field(
+    metadata: list[MitigationMetadata] | None = Field(
         None, description="Additional metadata as key-value pairs for mitigations"
     )
     content: str = Field(..., max_length=1000, description="Mitigation. Plain-text")
@@ -286,19 +362,9 @@ class Mitigation(TaggedEntity):
 class Threat(TaggedEntity):
     """Threats for the application being threat modeled."""
 
-    metadata: (
-        list[
-            CommentsMetadata
-            | CustomMetadata
-            | SourceMetadata
-            | StrideMetadata
-            | PriorityMetadata
-            | ThreatPackIdMetadata
-            | ThreatPackThreatIdMetadata
-            | ThreatPackMitigationCandidateIdMetadata
-        ]
-        | None
-    ) = Field(None, description="Additional metadata as key-value pairs for threats")
+    metadata: list[ThreatMetadata] | None = Field(
+        None, description="Additional metadata as key-value pairs for threats"
+    )
     threatSource: str | None = Field(
         None,
         max_length=200,
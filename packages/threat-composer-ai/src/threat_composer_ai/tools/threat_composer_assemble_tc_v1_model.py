@@ -5,25 +5,64 @@ This tool takes individual threat model component files (applicationInfo, archit
 dataflow, threats, mitigations) and assembles them into a complete threat model following
 the Threat Composer v1 schema with specific construction rules.
 
+The output is written section by section: each top-level section is serialized,
+validated and written before the next one is built, and diagram images are
+loaded only when their section is written. Peak memory is therefore bounded by
+the component data and the largest single section rather than by the whole
+document and its serialized copy. Output is compact JSON unless pretty printing
+is requested (per call, or with THREAT_COMPOSER_COMPACT_JSON=false), and is
+written to a temporary file that replaces the output path only once every
+section has passed validation. A gzip compressed copy can be written next to
+the output with THREAT_COMPOSER_GZIP_THREAT_MODEL=true, and the result reports
+how many bytes each section takes up.
+
 This tool is restricted to reading and writing files from the output directory only.
 """
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 from strands import tool
 
+from ..config import get_global_config
 from ..tools.path_validation import (
     create_path_validation_error_message,
     validate_output_directory_path,
 )
+from ..utils.json_output import (
+    format_size_report,
+    json_dump_options,
+    write_gzip_sidecar,
+)
 from ..utils.relative_path_helper import (
     make_relative_to_working_dir,
     resolve_relative_path,
 )
-from .threat_composer_svg_to_data_url import threat_composer_svg_to_data_url
-from .threat_composer_validate_tc_v1_schema import validate_tc_data_pydantic
+from ..validation import check_reference_integrity, format_reference_issues
+from .threat_composer_svg_to_data_url import (
+    minify_svg,
+    svg_size_report,
+    threat_composer_svg_to_data_url,
+)
+from .threat_composer_validate_tc_v1_schema import validate_tc_section_pydantic
+
+# Top-level sections in the order they are written
+SECTION_ORDER = (
+    "schema",
+    "applicationInfo",
+    "architecture",
+    "dataflow",
+    "assumptions",
+    "mitigations",
+    "assumptionLinks",
+    "mitigationLinks",
+    "threats",
+)
+
+# Sections whose diagram image is loaded only when the section is written
+_DIAGRAM_SECTIONS = ("architecture", "dataflow")
 
 
 @tool(
@@ -39,6 +78,7 @@ def threat_composer_assemble_tc_v1_model(
     threats_path: str,
     mitigations_path: str,
     output_path: str,
+    pretty_print: bool | None = None,
 ) -> str:
     """
     Assemble a complete threat model from individual component files.
@@ -71,6 +111,8 @@ def threat_composer_assemble_tc_v1_model(
         threats_path: Path to threats.tc.json file
         mitigations_path: Path to mitigations.tc.json file
         output_path: Path where the assembled threat model will be saved
+        pretty_print: Indent the output for readability. Defaults to the
+            configured output format (compact JSON unless disabled)
 
     Returns:
         Success message with validation results, or detailed error information if assembly fails.
@@ -129,39 +171,57 @@ def threat_composer_assemble_tc_v1_model(
             except Exception as e:
                 return f"❌ Error reading file '{display_path}': {str(e)}"
 
-        # Assemble the complete threat model
-        assembled_model = _assemble_components(
-            components, architecture_diagram_path, dataflow_diagram_path
+        # Assemble everything except the diagram images, which are loaded
+        # one at a time while writing
+        assembled_model = _assemble_components(components)
+        del components
+
+        # Every section is present once assembled, so all links are checked,
+        # and a link to a missing entity is a mistake in the agents' output
+        references = check_reference_integrity(
+            assembled_model, complete=True, strict_references=True
         )
+        if not references.is_valid:
+            error_messages = format_reference_issues(references.errors)
+            return "❌ Assembled model failed reference integrity check:\n" + "\n".join(
+                f"{i}. {msg}" for i, msg in enumerate(error_messages, 1)
+            )
 
-        # Validate the assembled model
-        is_valid, error_message = validate_tc_data_pydantic(assembled_model)
-        if not is_valid:
-            return f"❌ Assembled model failed validation:\n{error_message}"
+        # Resolve relative output path to absolute path for file operations
+        resolved_output_path = resolve_relative_path(output_path)
 
-        # Write the assembled model to output file
+        # Validate that the output path is within the output directory
         try:
-            # Resolve relative output path to absolute path for file operations
-            resolved_output_path = resolve_relative_path(output_path)
-
-            # Validate that the output path is within the output directory
-            try:
-                validate_output_directory_path(resolved_output_path, operation="write")
-            except ValueError as e:
-                error_msg = create_path_validation_error_message(str(e))
-                return f"❌ {error_msg}"
+            validate_output_directory_path(resolved_output_path, operation="write")
+        except ValueError as e:
+            error_msg = create_path_validation_error_message(str(e))
+            return f"❌ {error_msg}"
 
+        # Validate and write the assembled model section by section
+        try:
             output_path_obj = Path(resolved_output_path)
             output_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_path_obj, "w", encoding="utf-8") as f:
-                json.dump(assembled_model, f, indent=2, ensure_ascii=False)
+            config = get_global_config()
+            if pretty_print is None:
+                pretty_print = config is not None and not config.compact_json_output
+
+            sections = _iter_sections(
+                assembled_model, architecture_diagram_path, dataflow_diagram_path
+            )
+            error_message, section_sizes = _write_sections(
+                output_path_obj, sections, pretty_print
+            )
+            if error_message:
+                return f"❌ Assembled model failed validation:\n{error_message}"
+
+            gzip_bytes = None
+            if config is not None and config.gzip_threat_model:
+                gzip_bytes = write_gzip_sidecar(output_path_obj).stat().st_size
 
         except Exception as e:
             # Convert path back to relative for user-friendly messages
-            display_output_path = make_relative_to_working_dir(
-                resolve_relative_path(output_path)
-            )
+            display_output_path = make_relative_to_working_dir(resolved_output_path)
             return f"❌ Error writing output file '{display_output_path}': {str(e)}"
 
         # Generate success summary with relative path
@@ -172,27 +232,33 @@ def threat_composer_assemble_tc_v1_model(
         display_output_path = make_relative_to_working_dir(
             resolve_relative_path(output_path)
         )
-        return f"✅ Successfully assembled threat model with {threat_count} threats, {mitigation_count} mitigations, and {assumption_count} assumptions. Validation passed. Output saved to: {display_output_path}"
+        summary = f"✅ Successfully assembled threat model with {threat_count} threats, {mitigation_count} mitigations, and {assumption_count} assumptions. Validation passed. Output saved to: {display_output_path}"
+        if references.warnings:
+            warning_messages = format_reference_issues(references.warnings)
+            summary += f"\n⚠️ {len(warning_messages)} warning(s):\n" + "\n".join(
+                f"{i}. {msg}" for i, msg in enumerate(warning_messages, 1)
+            )
+        summary += "\n" + format_size_report(
+            section_sizes, output_path_obj.stat().st_size, gzip_bytes
+        )
+        return summary
 
     except Exception as e:
         return f"❌ Assembly error: {str(e)}"
 
 
-def _assemble_components(
-    components: dict[str, dict[str, Any]],
-    architecture_diagram_path: str,
-    dataflow_diagram_path: str,
-) -> dict[str, Any]:
+def _assemble_components(components: dict[str, dict[str, Any]]) -> dict[str, Any]:
     """
     Assemble the threat model components according to the construction rules.
 
+    Diagram images are not included; _iter_sections loads them when the
+    architecture and dataflow sections are written.
+
     Args:
         components: Dictionary containing loaded component data
-        architecture_diagram_path: Path to architecture diagram SVG file
-        dataflow_diagram_path: Path to dataflow diagram SVG file
 
     Returns:
-        Complete assembled threat model dictionary
+        Assembled threat model dictionary without diagram images
     """
     assembled = {"schema": 1}
 
@@ -203,21 +269,13 @@ def _assemble_components(
         "description": app_info.get("description", ""),
     }
 
-    # Extract architecture description and load diagram image
+    # Extract architecture description
     arch_info = components["architecture_description"].get("architecture", {})
-    arch_image = _load_diagram_image(architecture_diagram_path)
-    assembled["architecture"] = {
-        "description": arch_info.get("description", ""),
-        "image": arch_image,
-    }
+    assembled["architecture"] = {"description": arch_info.get("description", "")}
 
-    # Extract dataflow description and load diagram image
+    # Extract dataflow description
     dataflow_info = components["dataflow_description"].get("dataflow", {})
-    dataflow_image = _load_diagram_image(dataflow_diagram_path)
-    assembled["dataflow"] = {
-        "description": dataflow_info.get("description", ""),
-        "image": dataflow_image,
-    }
+    assembled["dataflow"] = {"description": dataflow_info.get("description", "")}
 
     # Collect assumptions from all files in specified order and reassign numericId
     all_assumptions = []
@@ -254,9 +312,95 @@ def _assemble_components(
     return assembled
 
 
+def _iter_sections(
+    assembled: dict[str, Any],
+    architecture_diagram_path: str,
+    dataflow_diagram_path: str,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yield the top-level sections of the threat model in output order.
+
+    The architecture and dataflow sections get their diagram image only as
+    they are yielded, so at most one encoded diagram is held at a time.
+
+    Args:
+        assembled: Model returned by _assemble_components
+        architecture_diagram_path: Path to architecture diagram SVG file
+        dataflow_diagram_path: Path to dataflow diagram SVG file
+
+    Yields:
+        Tuples of (section name, section value)
+    """
+    diagram_paths = {
+        "architecture": architecture_diagram_path,
+        "dataflow": dataflow_diagram_path,
+    }
+    for section in SECTION_ORDER:
+        value = assembled[section]
+        if section in _DIAGRAM_SECTIONS:
+            value = {**value, "image": _load_diagram_image(diagram_paths[section])}
+        yield section, value
+
+
+def _write_sections(
+    output_path: Path, sections: Iterator[tuple[str, Any]], pretty_print: bool
+) -> tuple[str, dict[str, int]]:
+    """
+    Validate and write top-level sections as a single JSON object.
+
+    Each section is serialized and validated on its own and written before
+    the next one is requested. The result is identical to serializing the
+    whole object with json.dumps (compact, or indent=2 when pretty printing).
+    The output path is only replaced once every section has been written.
+
+    Args:
+        output_path: File to write
+        sections: Iterator of (section name, section value) tuples
+        pretty_print: Indent the output instead of writing compact JSON
+
+    Returns:
+        Tuple of (error_message, section_sizes)
+        - error_message: Empty string on success, or the validation error
+          message of the first invalid section
+        - section_sizes: Bytes written for each section, including its key
+    """
+    dump_options = json_dump_options(pretty_print)
+    key_separator = dump_options["separators"][1]
+    section_sizes: dict[str, int] = {}
+    temp_path = output_path.with_name(f".{output_path.name}.tmp")
+
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(b"{")
+            for index, (section, value) in enumerate(sections):
+                content = json.dumps(value, **dump_options).encode("utf-8")
+                is_valid, error_message = validate_tc_section_pydantic(section, content)
+                if not is_valid:
+                    return error_message, section_sizes
+
+                member = json.dumps(section) + key_separator
+                if pretty_print:
+                    # Nest the section one level deeper; strings in JSON never
+                    # contain raw newlines, so only structural lines move
+                    content = content.replace(b"\n", b"\n  ")
+                    member = "\n  " + member
+                if index:
+                    f.write(b",")
+                member_bytes = member.encode("utf-8")
+                f.write(member_bytes)
+                f.write(content)
+                section_sizes[section] = len(member_bytes) + len(content)
+            f.write(b"\n}" if pretty_print else b"}")
+
+        temp_path.replace(output_path)
+        return "", section_sizes
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
 def _load_diagram_image(diagram_path: str) -> str:
     """
-    Load an SVG diagram file and convert it to a data URL.
+    Load an SVG diagram file, minify it and convert it to a data URL.
 
     Args:
         diagram_path: Path to the SVG diagram file (can be relative or absolute)
@@ -295,15 +439,26 @@ def _load_diagram_image(diagram_path: str) -> str:
 
         log_debug(f"SVG content length: {len(svg_content)} chars")
 
+        # Minify before encoding; base64 inflates every remaining byte by 33%
+        minified_svg = minify_svg(svg_content)
+
         # Convert SVG to data URL using the utility function
-        data_url = threat_composer_svg_to_data_url(svg_content)
+        data_url = threat_composer_svg_to_data_url(minified_svg)
 
         # Check if the conversion was successful (utility returns error messages starting with ❌)
         if data_url.startswith("❌"):
             log_warning(f"SVG to data URL conversion failed: {data_url}")
             return ""
 
-        log_debug(f"Successfully converted diagram to data URL ({len(data_url)} chars)")
+        report = svg_size_report(svg_content, minified_svg, data_url)
+        log_debug(
+            f"Diagram size for {diagram_path_obj.name}: "
+            f"original {report['original_bytes']} B, "
+            f"minified {report['minified_bytes']} B "
+            f"(-{report['minified_reduction_pct']}%), "
+            f"data URL {report['data_url_bytes']} B, "
+            f"gzip estimate {report['gzip_estimate_bytes']} B"
+        )
         return data_url
 
     except Exception as e:
@@ -6,14 +6,18 @@ Shared code between architecture diagram and DFD diagram tools.
 
 import base64
 import hashlib
+import io
 import json
+import math
 import re
 import signal
 import tempfile
+import xml.sax
 from pathlib import Path
+from threading import Lock
 from typing import Any
 
-from diagrams import Cluster, Diagram, Edge
+from diagrams import Cluster, Edge
 from rich import box
 from rich.panel import Panel
 from rich.text import Text
@@ -22,6 +26,8 @@ from strands_tools.utils import console_util
 
 from threat_composer_ai.config import get_global_config
 from threat_composer_ai.logging import log_debug, log_error, log_success
+from threat_composer_ai.tools.threat_composer_dia_render import InProcessDiagram
+from threat_composer_ai.tools.threat_composer_dia_svg import rewrite_diagram_svg
 from threat_composer_ai.utils import now_utc_timestamp
 from threat_composer_ai.validation import scan_diagram_code
 
@@ -29,6 +35,216 @@ from threat_composer_ai.validation import scan_diagram_code
 DIAGRAM_EXECUTION_TIMEOUT = 60
 
 
+# Process-wide cache of base64-encoded icon files. The diagrams library reuses
+# the same handful of PNG icons across every node and every diagram, so each
+# icon only needs to be read and encoded once per process. Entries are keyed
+# by path plus (mtime, size) so a changed icon file is picked up again.
+_icon_base64_cache: dict[tuple[str, int, int], str] = {}
+_icon_base64_cache_lock = Lock()
+
+# Process-wide cache of icon data URIs after optimization, keyed by path,
+# (mtime, size), target pixel size and output format
+_icon_data_uri_cache: dict[tuple[str, int, int, int, int, str], str] = {}
+
+# Icons are rasterized at this multiple of their rendered size so they stay
+# sharp on high-DPI displays
+ICON_RENDER_SCALE = 2
+
+# Output formats supported by the icon optimizer, mapped to MIME types
+ICON_FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+# Multipliers converting Graphviz SVG length units to CSS pixels
+_LENGTH_UNITS_TO_PX = {"": 1.0, "px": 1.0, "pt": 4 / 3, "in": 96.0}
+_LENGTH_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([a-z]*)\s*$")
+
+# Matches <image> elements that reference a PNG file on disk (diagrams output)
+_IMAGE_FILE_PATTERN = re.compile(
+    r"<image\s"
+    r"([^>]*?)"
+    r'xlink:href="([^"]+\.png)"'
+    r"([^>]*?)"
+    r"/?>",
+    re.DOTALL,
+)
+
+_SVG_OPEN_TAG_PATTERN = re.compile(r"<svg[^>]*>")
+
+
+def load_icon_base64(file_path: str) -> str | None:
+    """
+    Load a PNG icon as a base64 string, using the process-wide icon cache.
+
+    Args:
+        file_path: Path to the PNG file referenced by the SVG
+
+    Returns:
+        Base64-encoded file content, or None if the file cannot be embedded
+    """
+    path = Path(file_path)
+    if path.suffix.lower() != ".png":
+        return None
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _icon_base64_cache_lock:
+        cached = _icon_base64_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("utf-8")
+    except OSError:
+        return None
+
+    with _icon_base64_cache_lock:
+        _icon_base64_cache[cache_key] = encoded
+    return encoded
+
+
+def clear_icon_cache() -> None:
+    """Clear the process-wide icon caches."""
+    with _icon_base64_cache_lock:
+        _icon_base64_cache.clear()
+        _icon_data_uri_cache.clear()
+
+
+def _length_to_px(value: str | None) -> float | None:
+    """Convert an SVG length such as "72px" or "1in" to pixels."""
+    if not value:
+        return None
+    match = _LENGTH_PATTERN.match(value)
+    if not match or match.group(2) not in _LENGTH_UNITS_TO_PX:
+        return None
+    return float(match.group(1)) * _LENGTH_UNITS_TO_PX[match.group(2)]
+
+
+def optimize_icon(
+    data: bytes, target_width: int, target_height: int, image_format: str = "png"
+) -> bytes | None:
+    """
+    Downscale an icon to fit the target size and recompress it.
+
+    Pillow is used when available; it is not a hard dependency, so this
+    returns None when it is missing, when the image cannot be decoded, or
+    when the result would not be smaller than the original.
+
+    Args:
+        data: Original image bytes
+        target_width: Maximum width in pixels
+        target_height: Maximum height in pixels
+        image_format: Output format, one of ICON_FORMATS
+
+    Returns:
+        Optimized image bytes, or None to keep the original
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA")
+            if image.width > target_width or image.height > target_height:
+                image.thumbnail((target_width, target_height), Image.LANCZOS)
+
+            out = io.BytesIO()
+            if image_format == "webp":
+                image.save(out, format="WEBP", quality=90, method=6)
+            else:
+                image.save(out, format="PNG", optimize=True)
+    except (OSError, ValueError) as e:
+        log_debug(f"Icon optimization skipped: {e}")
+        return None
+
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(data) else None
+
+
+def load_icon_data_uri(
+    file_path: str, width: str | None = None, height: str | None = None
+) -> str | None:
+    """
+    Load a PNG icon as a data URI, optimized for its rendered size.
+
+    When icon optimization is enabled in the global configuration and the
+    rendered width and height are known, the icon is downscaled to
+    ICON_RENDER_SCALE times that size and recompressed. Results are cached
+    per icon, size and format, so each distinct icon is processed once.
+
+    Args:
+        file_path: Path to the PNG file referenced by the SVG
+        width: Rendered width attribute of the <image> element
+        height: Rendered height attribute of the <image> element
+
+    Returns:
+        Data URI for the icon, or None if the file cannot be embedded
+    """
+    encoded = load_icon_base64(file_path)
+    if encoded is None:
+        return None
+    original_uri = f"data:image/png;base64,{encoded}"
+
+    config = get_global_config()
+    if config is None or not config.optimize_diagram_icons:
+        return original_uri
+
+    width_px = _length_to_px(width)
+    height_px = _length_to_px(height)
+    if not width_px or not height_px:
+        return original_uri
+
+    image_format = config.diagram_icon_format
+    if image_format not in ICON_FORMATS:
+        image_format = "png"
+    target_width = math.ceil(width_px * ICON_RENDER_SCALE)
+    target_height = math.ceil(height_px * ICON_RENDER_SCALE)
+
+    try:
+        stat = Path(file_path).stat()
+    except OSError:
+        return original_uri
+
+    cache_key = (
+        str(Path(file_path)),
+        stat.st_mtime_ns,
+        stat.st_size,
+        target_width,
+        target_height,
+        image_format,
+    )
+    with _icon_base64_cache_lock:
+        cached = _icon_data_uri_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    optimized = optimize_icon(
+        base64.b64decode(encoded), target_width, target_height, image_format
+    )
+    if optimized is None:
+        data_uri = original_uri
+    else:
+        optimized_b64 = base64.b64encode(optimized).decode("utf-8")
+        data_uri = f"data:{ICON_FORMATS[image_format]};base64,{optimized_b64}"
+
+    with _icon_base64_cache_lock:
+        _icon_data_uri_cache[cache_key] = data_uri
+    return data_uri
+
+
+def _find_attr(attrs: str, attr_name: str) -> str | None:
+    """Return the value of an attribute from a raw attribute string."""
+    match = re.search(rf'(?<![\w:-]){attr_name}="([^"]*)"', attrs)
+    return match.group(1) if match else None
+
+
 def embed_images_as_base64(svg_content: str) -> str:
     """
     Embed external image references as base64 data URIs.
@@ -41,25 +257,133 @@ def embed_images_as_base64(svg_content: str) -> str:
         full_match = match.group(0)
         file_path = match.group(1)
 
-        try:
-            path = Path(file_path)
-            if path.exists() and path.suffix.lower() == ".png":
-                with open(path, "rb") as f:
-                    image_data = base64.b64encode(f.read()).decode("utf-8")
-                return full_match.replace(
-                    f'xlink:href="{file_path}"',
-                    f'xlink:href="data:image/png;base64,{image_data}"',
-                )
-        except Exception:
-            pass  # Keep original reference if embedding fails
+        image_data = load_icon_base64(file_path)
+        if image_data is None:
+            # Keep original reference if embedding fails
+            return full_match
 
-        return full_match
+        return full_match.replace(
+            f'xlink:href="{file_path}"',
+            f'xlink:href="data:image/png;base64,{image_data}"',
+        )
 
     # Match xlink:href="..." attributes pointing to files
     pattern = r'xlink:href="([^"]+\.png)"'
     return re.sub(pattern, replace_image_href, svg_content)
 
 
+def embed_images_as_shared_defs(svg_content: str) -> str:
+    """
+    Embed image file references, sharing repeated icons via <defs>/<use>.
+
+    Equivalent to embed_images_as_base64 followed by deduplicate_embedded_images,
+    but works on the file paths in the raw Graphviz output instead of the
+    encoded data. Each icon is encoded once (via the icon cache) and the SVG is
+    rebuilt in a single pass, so the cost is linear in the number of <image>
+    references rather than in the size of the embedded data.
+
+    Args:
+        svg_content: Raw SVG string with <image> elements referencing PNG files
+
+    Returns:
+        Self-contained SVG string with repeated icons defined once in <defs>
+    """
+    matches = list(_IMAGE_FILE_PATTERN.finditer(svg_content))
+    if not matches:
+        return svg_content
+
+    # Count references per icon path and load each icon once
+    path_counts: dict[str, int] = {}
+    for m in matches:
+        path_counts[m.group(2)] = path_counts.get(m.group(2), 0) + 1
+
+    icon_data: dict[str, str] = {}
+    for file_path in path_counts:
+        encoded = load_icon_base64(file_path)
+        if encoded is not None:
+            icon_data[file_path] = encoded
+
+    # Shared definitions for icons referenced more than once, in order of first use
+    path_to_def_id: dict[str, str] = {}
+    defs_entries = []
+    for m in matches:
+        file_path = m.group(2)
+        if (
+            file_path in path_to_def_id
+            or file_path not in icon_data
+            or path_counts[file_path] < 2
+        ):
+            continue
+        def_id = f"dedup-img-{len(path_to_def_id)}"
+        path_to_def_id[file_path] = def_id
+
+        all_attrs = m.group(1) + " " + m.group(3)
+        def_attrs = [
+            f'id="{def_id}"',
+            f'xlink:href="data:image/png;base64,{icon_data[file_path]}"',
+        ]
+        for attr_name in ("width", "height"):
+            value = _find_attr(all_attrs, attr_name)
+            if value is not None:
+                def_attrs.append(f'{attr_name}="{value}"')
+        defs_entries.append(f"<image {' '.join(def_attrs)}/>")
+
+    parts: list[str] = []
+    pos = 0
+
+    # Insert the <defs> block right after the opening <svg ...> tag
+    svg_open = _SVG_OPEN_TAG_PATTERN.search(svg_content, 0, matches[0].start())
+    if defs_entries and svg_open:
+        parts.append(svg_content[: svg_open.end()])
+        parts.append("\n<defs>\n" + "\n".join(defs_entries) + "\n</defs>\n")
+        pos = svg_open.end()
+
+    for m in matches:
+        parts.append(svg_content[pos : m.start()])
+        file_path = m.group(2)
+        all_attrs = m.group(1) + " " + m.group(3)
+
+        if file_path in path_to_def_id:
+            # Preserve position and per-instance size attributes
+            preserved = []
+            for attr_name in ("x", "y", "transform", "width", "height"):
+                value = _find_attr(all_attrs, attr_name)
+                if value is not None:
+                    preserved.append(f'{attr_name}="{value}"')
+            parts.append(
+                f'<use xlink:href="#{path_to_def_id[file_path]}" {" ".join(preserved)}/>'
+            )
+        elif file_path in icon_data:
+            parts.append(
+                m.group(0).replace(
+                    f'xlink:href="{file_path}"',
+                    f'xlink:href="data:image/png;base64,{icon_data[file_path]}"',
+                )
+            )
+        else:
+            # Keep original reference if embedding fails
+            parts.append(m.group(0))
+        pos = m.end()
+
+    parts.append(svg_content[pos:])
+    return "".join(parts)
+
+
+def finalize_diagram_svg(svg_content: str) -> str:
+    """
+    Turn raw diagrams output into a self-contained, minified SVG.
+
+    Uses the streaming rewriter, which also downsizes icons to their rendered
+    size, falling back to regex-based embedding if the SVG cannot be parsed
+    as XML.
+    """
+    try:
+        return rewrite_diagram_svg(svg_content, load_icon_data_uri)
+    except xml.sax.SAXException as e:
+        log_debug(f"Streaming SVG rewrite failed, using regex embedding: {e}")
+        return embed_images_as_shared_defs(svg_content)
+
+
 def deduplicate_embedded_images(svg_content: str) -> str:
     """
     Deduplicate base64-embedded images in SVG using <defs>/<use> references.
@@ -271,9 +595,13 @@ def get_base_builtins() -> dict[str, Any]:
 
 
 def get_core_diagram_classes() -> dict[str, Any]:
-    """Get core diagrams library classes."""
+    """
+    Get core diagrams library classes.
+
+    Diagram renders in-process through pygraphviz when it is installed.
+    """
     return {
-        "Diagram": Diagram,
+        "Diagram": InProcessDiagram,
         "Cluster": Cluster,
         "Edge": Edge,
     }
@@ -395,10 +723,9 @@ def execute_diagram_code(
                     )
                 raise ValueError("No diagram output file generated")
 
-            # Read SVG and embed images as base64 data URIs
+            # Read SVG, embed images as base64 data URIs and minify
             svg_content = svg_files[0].read_text(encoding="utf-8")
-            svg_content = embed_images_as_base64(svg_content)
-            svg_content = deduplicate_embedded_images(svg_content)
+            svg_content = finalize_diagram_svg(svg_content)
             output_path.write_text(svg_content, encoding="utf-8")
 
         log_success(f"{diagram_type} diagram generated: {output_path}")
@@ -0,0 +1,93 @@
+"""
+In-process Graphviz rendering backend for the diagrams library.
+
+The diagrams library renders through graphviz.Digraph.render(), which spawns
+a new `dot` process for every diagram. When pygraphviz is installed, the
+DOT source is laid out and rendered in-process through the Graphviz C
+libraries instead, avoiding the process spawn per diagram. Without
+pygraphviz, or if in-process rendering fails, the original subprocess path
+is used.
+
+pygraphviz is optional; install it alongside Graphviz to enable this backend:
+
+    pip install pygraphviz
+"""
+
+from functools import cache
+from types import ModuleType
+
+from diagrams import Diagram
+
+from threat_composer_ai.logging import log_debug
+
+
+@cache
+def load_pygraphviz() -> ModuleType | None:
+    """
+    Import pygraphviz once per process.
+
+    Returns:
+        The pygraphviz module, or None if it is not installed or cannot load
+        the Graphviz libraries
+    """
+    try:
+        import pygraphviz
+    except ImportError:
+        log_debug("pygraphviz not available, rendering diagrams with dot subprocess")
+        return None
+    log_debug(f"Rendering diagrams in-process with pygraphviz {pygraphviz.__version__}")
+    return pygraphviz
+
+
+def render_dot_source(source: str, output_file: str, output_format: str) -> bool:
+    """
+    Render DOT source to a file in-process.
+
+    Args:
+        source: DOT language source
+        output_file: Path of the file to write
+        output_format: Graphviz output format (e.g. "svg")
+
+    Returns:
+        True if the file was rendered, False if the caller should fall back
+        to the subprocess renderer
+    """
+    pygraphviz = load_pygraphviz()
+    if pygraphviz is None:
+        return False
+
+    try:
+        graph = pygraphviz.AGraph(string=source)
+        graph.draw(output_file, format=output_format, prog="dot")
+    except Exception as e:
+        log_debug(f"In-process rendering failed, falling back to dot subprocess: {e}")
+        return False
+    return True
+
+
+class InProcessDiagram(Diagram):
+    """
+    Diagram that renders through pygraphviz when available.
+
+    Drop-in replacement for diagrams.Diagram used in the diagram execution
+    namespace. Diagrams that should open a viewer keep the library's
+    subprocess path, since viewing is handled there.
+    """
+
+    def render(self) -> None:
+        if self.show:
+            super().render()
+            return
+
+        formats = (
+            self.outformat if isinstance(self.outformat, list) else [self.outformat]
+        )
+
+        # Diagram.__exit__ removes the DOT source file after rendering, so it
+        # must exist even when Graphviz never reads it from disk
+        self.dot.save()
+        source = self.dot.source
+        for output_format in formats:
+            output_file = f"{self.filename}.{output_format}"
+            if not render_dot_source(source, output_file, output_format):
+                self.dot.render(format=output_format, view=False, quiet=True)
@@ -0,0 +1,182 @@
+"""
+Streaming SVG post-processor for generated diagrams.
+
+Rewrites the raw Graphviz SVG produced by the diagrams library in a single
+SAX pass, writing into an in-memory buffer:
+- Embeds referenced PNG icons as data URIs (via the shared icon cache),
+  letting the loader size them for the dimensions they are rendered at
+- Defines each distinct icon once in <defs> and references it with <use>
+- Drops comments, the DOCTYPE and whitespace-only text between elements
+
+Unlike the regex-based helpers in threat_composer_dia_common, no intermediate
+copies of the document are built per replacement, so the cost stays linear in
+the size of the SVG regardless of how many nodes the diagram has.
+"""
+
+import io
+import xml.sax
+from xml.sax.handler import ContentHandler, feature_external_ges, feature_external_pes
+from xml.sax.saxutils import escape, quoteattr
+
+# Elements whose whitespace-only text content is significant when rendering
+_WHITESPACE_PRESERVING_ELEMENTS = frozenset({"text", "tspan", "textPath", "title"})
+
+# Attributes copied from an <image> instance onto its <use> reference
+_USE_INSTANCE_ATTRS = ("x", "y", "transform")
+
+# Attributes that define how an icon renders, shared by all its instances
+_DEF_SHAPE_ATTRS = ("width", "height", "preserveAspectRatio")
+
+
+class _SvgRewriter(ContentHandler):
+    """SAX handler that writes a rewritten, minified copy of an SVG document."""
+
+    def __init__(self, out: io.StringIO, load_icon):
+        super().__init__()
+        self._out = out
+        self._load_icon = load_icon
+        self._element_stack: list[str] = []
+        self._pending_text: list[str] = []
+        self._start_tag_open = False
+        self._defs: dict[tuple[str, ...], str] = {}
+        self._def_entries: list[str] = []
+
+    # -- output helpers -------------------------------------------------------
+
+    def _close_start_tag(self) -> None:
+        if self._start_tag_open:
+            self._out.write(">")
+            self._start_tag_open = False
+
+    def _flush_text(self) -> None:
+        if not self._pending_text:
+            return
+        text = "".join(self._pending_text)
+        self._pending_text.clear()
+        parent = self._element_stack[-1] if self._element_stack else ""
+        if text.strip() or parent in _WHITESPACE_PRESERVING_ELEMENTS:
+            self._close_start_tag()
+            self._out.write(escape(text))
+
+    def _write_start(self, name: str, attrs: dict[str, str]) -> None:
+        self._close_start_tag()
+        self._out.write(f"<{name}")
+        for attr_name, value in attrs.items():
+            self._out.write(f" {attr_name}={quoteattr(value)}")
+        self._start_tag_open = True
+
+    def _write_empty(self, name: str, attrs: dict[str, str]) -> None:
+        self._write_start(name, attrs)
+        self._out.write("/>")
+        self._start_tag_open = False
+
+    # -- icon handling --------------------------------------------------------
+
+    def _image_to_use(self, attrs: dict[str, str]) -> dict[str, str] | None:
+        """Register the image as a shared definition and return <use> attributes."""
+        href = attrs.get("xlink:href") or attrs.get("href") or ""
+        if href.startswith("data:"):
+            data_uri = href
+        else:
+            if not href.lower().endswith(".png"):
+                return None
+            data_uri = self._load_icon(href, attrs.get("width"), attrs.get("height"))
+            if data_uri is None:
+                return None
+
+        shape = tuple(attrs.get(name, "") for name in _DEF_SHAPE_ATTRS)
+        key = (data_uri, *shape)
+        def_id = self._defs.get(key)
+        if def_id is None:
+            def_id = f"dedup-img-{len(self._defs)}"
+            self._defs[key] = def_id
+            def_attrs = {"id": def_id, "xlink:href": data_uri}
+            for name, value in zip(_DEF_SHAPE_ATTRS, shape, strict=True):
+                if value:
+                    def_attrs[name] = value
+            self._def_entries.append(
+                "<image"
+                + "".join(f" {k}={quoteattr(v)}" for k, v in def_attrs.items())
+                + "/>"
+            )
+
+        use_attrs = {"xlink:href": f"#{def_id}"}
+        for name in _USE_INSTANCE_ATTRS:
+            if name in attrs:
+                use_attrs[name] = attrs[name]
+        return use_attrs
+
+    # -- SAX events -----------------------------------------------------------
+
+    def startElement(self, name, attrs):
+        self._flush_text()
+        attr_map = {attr_name: attrs[attr_name] for attr_name in attrs.getNames()}
+
+        if name == "image":
+            use_attrs = self._image_to_use(attr_map)
+            if use_attrs is not None:
+                # Children of <image> are not rendered; mark it as replaced
+                self._write_empty("use", use_attrs)
+                self._element_stack.append("#replaced-image")
+                return
+
+        if self._element_stack and self._element_stack[-1] == "#replaced-image":
+            self._element_stack.append("#replaced-image")
+            return
+
+        self._write_start(name, attr_map)
+        self._element_stack.append(name)
+
+    def endElement(self, name):
+        if self._element_stack[-1] == "#replaced-image":
+            self._element_stack.pop()
+            self._pending_text.clear()
+            return
+
+        self._flush_text()
+        self._element_stack.pop()
+
+        # Shared icon definitions go at the end of the root element;
+        # <use> may reference elements that appear later in the document
+        if not self._element_stack and self._def_entries:
+            self._close_start_tag()
+            self._out.write("<defs>" + "".join(self._def_entries) + "</defs>")
+
+        if self._start_tag_open:
+            self._out.write("/>")
+            self._start_tag_open = False
+        else:
+            self._out.write(f"</{name}>")
+
+    def characters(self, content):
+        if self._element_stack and self._element_stack[-1] == "#replaced-image":
+            return
+        self._pending_text.append(content)
+
+
+def rewrite_diagram_svg(svg_content: str, load_icon) -> str:
+    """
+    Embed, deduplicate and minify a Graphviz SVG in a single streaming pass.
+
+    Args:
+        svg_content: Raw SVG string produced by the diagrams library
+        load_icon: Callable mapping an icon file path and the rendered width
+            and height attributes of its <image> to a data URI, or None if
+            the icon cannot be embedded
+
+    Returns:
+        Self-contained SVG string
+
+    Raises:
+        xml.sax.SAXParseException: If the SVG is not well-formed XML
+    """
+    out = io.StringIO()
+    handler = _SvgRewriter(out, load_icon)
+
+    parser = xml.sax.make_parser()
+    parser.setFeature(feature_external_ges, False)
+    parser.setFeature(feature_external_pes, False)
+    parser.setContentHandler(handler)
+    parser.parse(io.BytesIO(svg_content.encode("utf-8")))
+
+    return out.getvalue()
@@ -0,0 +1,171 @@
+"""
+ID allocation for threat composer component files.
+
+Agents write entities with short placeholder keys (e.g. "T1", "M3") instead of
+UUIDs. Before a .tc.json file is written, the file write tool passes it
+through allocate_ids, which:
+- Replaces every placeholder ID with a UUID v4 derived from a namespace, the
+  section and the placeholder, so rewriting the same file yields the same IDs
+- Keeps IDs that are already valid UUID v4 values (e.g. existing threats
+  referenced from the mitigations file)
+- Assigns sequential numericId values per section in list order
+- Rewrites assumptionLinks and mitigationLinks to the allocated UUIDs
+
+The whole document is rewritten in memory, so the file is written once with
+entities and links consistent.
+"""
+
+import hashlib
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+# Sections whose entries carry an "id" and "numericId"
+ENTITY_SECTIONS = ("assumptions", "mitigations", "threats")
+
+# Section holding the entities referenced by each assumption link type
+_ASSUMPTION_LINK_TARGETS = {"Threat": "threats", "Mitigation": "mitigations"}
+
+# Sections a mitigation link may point at, in lookup order
+_MITIGATION_LINK_TARGETS = ("threats", "assumptions")
+
+
+@dataclass
+class IdAllocationResult:
+    """Model for the outcome of allocating IDs in a document."""
+
+    data: dict[str, Any]
+    allocated: dict[str, dict[str, str]] = field(default_factory=dict)
+    renumbered: int = 0
+
+    @property
+    def allocated_count(self) -> int:
+        return sum(len(mapping) for mapping in self.allocated.values())
+
+
+def _assumption_link_targets(link: Any) -> tuple[str, ...]:
+    """Sections an assumption link's linkedId may refer to, given its type."""
+    link_type = link.get("type") if isinstance(link, dict) else None
+    if isinstance(link_type, str) and link_type in _ASSUMPTION_LINK_TARGETS:
+        return (_ASSUMPTION_LINK_TARGETS[link_type],)
+    return ()
+
+
+def is_uuid4(value: Any) -> bool:
+    """Check whether a value is a canonical UUID v4 string."""
+    if not isinstance(value, str) or len(value) != 36:
+        return False
+    try:
+        return uuid.UUID(value).version == 4
+    except ValueError:
+        return False
+
+
+def derive_uuid4(namespace: str, section: str, placeholder: str) -> str:
+    """
+    Derive a stable UUID v4 for a placeholder key.
+
+    Args:
+        namespace: Scope the placeholder is unique in (e.g. session and file)
+        section: Entity section the placeholder belongs to
+        placeholder: Placeholder key written by the agent
+
+    Returns:
+        UUID v4 string, identical for identical inputs
+    """
+    digest = hashlib.sha256(f"{namespace}\0{section}\0{placeholder}".encode()).digest()
+    return str(uuid.UUID(bytes=digest[:16], version=4))
+
+
+def allocate_ids(data: dict[str, Any], namespace: str) -> IdAllocationResult:
+    """
+    Allocate UUIDs and numericIds for placeholder entities and rewrite links.
+
+    Args:
+        data: Parsed threat composer document; not modified
+        namespace: Scope for derived UUIDs, e.g. "<output directory>/threats.tc.json"
+
+    Returns:
+        IdAllocationResult with the rewritten document and, per section, the
+        mapping from placeholder to allocated UUID
+    """
+    result = IdAllocationResult(data=dict(data))
+
+    for section in ENTITY_SECTIONS:
+        entries = data.get(section)
+        if not isinstance(entries, list):
+            continue
+
+        mapping: dict[str, str] = {}
+        rewritten = []
+        numeric_id = 0
+        for entry in entries:
+            if not isinstance(entry, dict):
+                rewritten.append(entry)
+                continue
+            entry = dict(entry)
+
+            entity_id = entry.get("id")
+            if not is_uuid4(entity_id):
+                placeholder = str(entity_id) if entity_id not in (None, "") else None
+                if placeholder is None:
+                    placeholder = f"#{numeric_id + 1}"
+                allocated = derive_uuid4(namespace, section, placeholder)
+                mapping[placeholder] = allocated
+                entry["id"] = allocated
+
+            numeric_id += 1
+            if entry.get("numericId") != numeric_id:
+                entry["numericId"] = numeric_id
+                result.renumbered += 1
+            rewritten.append(entry)
+
+        result.data[section] = rewritten
+        if mapping:
+            result.allocated[section] = mapping
+
+    def resolve(value: Any, sections: tuple[str, ...]) -> Any:
+        if not isinstance(value, str) or is_uuid4(value):
+            return value
+        for section in sections:
+            allocated = result.allocated.get(section, {}).get(value)
+            if allocated is not None:
+                return allocated
+        return value
+
+    def rewrite_link(link: Any, targets: dict[str, tuple[str, ...]]) -> Any:
+        if not isinstance(link, dict):
+            return link
+        link = dict(link)
+        for key, sections in targets.items():
+            if key in link:
+                link[key] = resolve(link[key], sections)
+        return link
+
+    links = data.get("assumptionLinks")
+    if isinstance(links, list):
+        result.data["assumptionLinks"] = [
+            rewrite_link(
+                link,
+                {
+                    "assumptionId": ("assumptions",),
+                    "linkedId": _assumption_link_targets(link),
+                },
+            )
+            for link in links
+        ]
+
+    links = data.get("mitigationLinks")
+    if isinstance(links, list):
+        result.data["mitigationLinks"] = [
+            rewrite_link(
+                link,
+                {
+                    "mitigationId": ("mitigations",),
+                    "linkedId": _MITIGATION_LINK_TARGETS,
+                },
+            )
+            for link in links
+        ]
+
+    return result
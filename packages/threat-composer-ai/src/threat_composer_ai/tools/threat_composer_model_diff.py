@@ -0,0 +1,392 @@
+"""
+Semantic diff and merge of threat composer documents across sessions.
+
+On an incremental rerun an agent regenerates its component file from scratch,
+so every entity gets a new ID even when its content did not change, and the
+file (and its hash) differs from the previous session. merge_with_previous
+compares the new document with the previous session's version of the same
+file and:
+- Matches entities by ID first, then by identical text, then by text
+  similarity above SIMILARITY_THRESHOLD
+- Keeps the previous ID and numericId of every matched entity, and the
+  previous entry verbatim when only its ID or numericId differed
+- Gives new entities numericIds after the highest previous one
+- Orders matched entities and links as in the previous file, followed by new
+  ones, and rewrites links to the kept IDs
+- Reports added, removed, modified and unchanged entities per section
+
+When nothing changed semantically the merged document equals the previous
+one, so the file can be written byte for byte as before and downstream agents
+see unchanged inputs.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any
+
+# Sections whose entries carry an "id" and "numericId"
+ENTITY_SECTIONS = ("assumptions", "mitigations", "threats")
+
+# Link sections and the keys in their entries that hold entity IDs
+LINK_SECTIONS = {
+    "assumptionLinks": ("assumptionId", "linkedId"),
+    "mitigationLinks": ("mitigationId", "linkedId"),
+}
+
+# Minimum SequenceMatcher ratio for two entities to count as the same one
+SIMILARITY_THRESHOLD = 0.85
+
+# Threat fields describing the threat when no statement is present
+_THREAT_TEXT_FIELDS = ("threatSource", "prerequisites", "threatAction", "threatImpact")
+
+# Fields that identify an entity rather than describe it
+_IDENTITY_FIELDS = frozenset({"id", "numericId"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class SectionDiff:
+    """Model for the entity changes in one section, as lists of entity IDs."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+@dataclass
+class ModelDiff:
+    """Model for the differences between two threat composer documents."""
+
+    sections: dict[str, SectionDiff] = field(default_factory=dict)
+    links_added: int = 0
+    links_removed: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return (
+            any(diff.has_changes for diff in self.sections.values())
+            or self.links_added > 0
+            or self.links_removed > 0
+        )
+
+
+@dataclass
+class MergeResult:
+    """Model for the outcome of merging a document with its previous version."""
+
+    data: dict[str, Any]
+    diff: ModelDiff
+    # New entity ID -> previous entity ID, for entities that kept their ID
+    id_map: dict[str, str] = field(default_factory=dict)
+
+
+def entity_text(section: str, entity: dict[str, Any]) -> str:
+    """
+    Get the normalized text describing an entity, used to match entities.
+
+    Args:
+        section: Entity section the entity belongs to
+        entity: Entity dictionary
+
+    Returns:
+        Lowercase text with collapsed whitespace; empty if the entity has none
+    """
+    if section == "threats":
+        text = entity.get("statement")
+        if not isinstance(text, str) or not text.strip():
+            parts = [entity.get(name) for name in _THREAT_TEXT_FIELDS]
+            text = " ".join(part for part in parts if isinstance(part, str))
+    else:
+        text = entity.get("content")
+    if not isinstance(text, str):
+        return ""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def _entity_body(entity: dict[str, Any]) -> dict[str, Any]:
+    """Entity fields other than its ID and numericId."""
+    return {k: v for k, v in entity.items() if k not in _IDENTITY_FIELDS}
+
+
+def _link_key(link: Any) -> str:
+    """Order-independent key identifying a link."""
+    return json.dumps(link, sort_keys=True, ensure_ascii=False)
+
+
+def match_entities(
+    section: str,
+    previous: list[dict[str, Any]],
+    current: list[dict[str, Any]],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> list[tuple[int, int]]:
+    """
+    Pair entities of the previous and current versions of a section.
+
+    Entities are matched by ID, then by identical text, then greedily by
+    descending text similarity. Each entity is matched at most once.
+
+    Args:
+        section: Entity section name
+        previous: Entities of the previous version
+        current: Entities of the current version
+        threshold: Minimum similarity ratio for a content match
+
+    Returns:
+        List of (previous index, current index) pairs
+    """
+    pairs: list[tuple[int, int]] = []
+    previous_left = set(range(len(previous)))
+    current_left = set(range(len(current)))
+
+    previous_by_id = {
+        entity.get("id"): index
+        for index, entity in enumerate(previous)
+        if isinstance(entity.get("id"), str)
+    }
+    for index, entity in enumerate(current):
+        previous_index = previous_by_id.get(entity.get("id"))
+        if previous_index is not None and previous_index in previous_left:
+            pairs.append((previous_index, index))
+            previous_left.discard(previous_index)
+            current_left.discard(index)
+
+    previous_texts = {i: entity_text(section, previous[i]) for i in previous_left}
+    current_texts = {i: entity_text(section, current[i]) for i in current_left}
+
+    previous_by_text: dict[str, list[int]] = {}
+    for index in sorted(previous_left):
+        if previous_texts[index]:
+            previous_by_text.setdefault(previous_texts[index], []).append(index)
+    for index in sorted(current_left):
+        candidates = previous_by_text.get(current_texts[index])
+        if candidates:
+            previous_index = candidates.pop(0)
+            pairs.append((previous_index, index))
+            previous_left.discard(previous_index)
+            current_left.discard(index)
+
+    scored: list[tuple[float, int, int]] = []
+    for current_index in sorted(current_left):
+        current_text = current_texts[current_index]
+        if not current_text:
+            continue
+        matcher = SequenceMatcher(None, b=current_text, autojunk=False)
+        for previous_index in sorted(previous_left):
+            previous_text = previous_texts[previous_index]
+            if not previous_text:
+                continue
+            matcher.set_seq1(previous_text)
+            # Cheap upper bounds first; most pairs are far apart
+            if (
+                matcher.real_quick_ratio() < threshold
+                or matcher.quick_ratio() < threshold
+            ):
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scored.append((ratio, previous_index, current_index))
+
+    for _, previous_index, current_index in sorted(
+        scored, key=lambda item: (-item[0], item[1], item[2])
+    ):
+        if previous_index in previous_left and current_index in current_left:
+            pairs.append((previous_index, current_index))
+            previous_left.discard(previous_index)
+            current_left.discard(current_index)
+
+    return pairs
+
+
+def _merge_section(
+    section: str,
+    previous: list[Any],
+    current: list[Any],
+    threshold: float,
+    id_map: dict[str, str],
+) -> tuple[list[Any], SectionDiff]:
+    """Merge one entity section, recording changed IDs in id_map."""
+    diff = SectionDiff()
+    previous_entities = [e for e in previous if isinstance(e, dict)]
+    current_entities = [e for e in current if isinstance(e, dict)]
+    pairs = match_entities(section, previous_entities, current_entities, threshold)
+
+    matched: list[tuple[int, Any]] = []
+    matched_current = set()
+    for previous_index, current_index in pairs:
+        previous_entity = previous_entities[previous_index]
+        current_entity = current_entities[current_index]
+        matched_current.add(current_index)
+
+        previous_id = previous_entity.get("id")
+        current_id = current_entity.get("id")
+        if isinstance(current_id, str) and current_id != previous_id:
+            id_map[current_id] = previous_id
+
+        if _entity_body(previous_entity) == _entity_body(current_entity):
+            diff.unchanged.append(previous_id)
+            matched.append((previous_index, previous_entity))
+            continue
+
+        diff.modified.append(previous_id)
+        entity = dict(current_entity)
+        entity["id"] = previous_id
+        if "numericId" in previous_entity:
+            entity["numericId"] = previous_entity["numericId"]
+        matched.append((previous_index, entity))
+
+    matched_previous = {previous_index for previous_index, _ in pairs}
+    diff.removed = [
+        entity.get("id")
+        for index, entity in enumerate(previous_entities)
+        if index not in matched_previous
+    ]
+
+    numeric_ids = [
+        entity.get("numericId")
+        for entity in previous_entities
+        if isinstance(entity.get("numericId"), int)
+    ]
+    next_numeric_id = max(numeric_ids, default=0) + 1
+
+    added = []
+    for index, entity in enumerate(current_entities):
+        if index in matched_current:
+            continue
+        entity = dict(entity)
+        entity["numericId"] = next_numeric_id
+        next_numeric_id += 1
+        diff.added.append(entity.get("id"))
+        added.append(entity)
+
+    merged = [entity for _, entity in sorted(matched, key=lambda item: item[0])]
+    merged.extend(added)
+    merged.extend(entry for entry in current if not isinstance(entry, dict))
+    return merged, diff
+
+
+def _merge_links(
+    previous: list[Any], current: list[Any], keys: tuple[str, ...], id_map: dict
+) -> tuple[list[Any], int, int]:
+    """Rewrite link IDs and order links as in the previous version."""
+    rewritten = []
+    for link in current:
+        if isinstance(link, dict):
+            link = dict(link)
+            for key in keys:
+                if isinstance(link.get(key), str):
+                    link[key] = id_map.get(link[key], link[key])
+        rewritten.append(link)
+
+    previous_order = {}
+    for index, link in enumerate(previous):
+        previous_order.setdefault(_link_key(link), index)
+
+    kept = [link for link in rewritten if _link_key(link) in previous_order]
+    kept.sort(key=lambda link: previous_order[_link_key(link)])
+    added = [link for link in rewritten if _link_key(link) not in previous_order]
+
+    current_keys = {_link_key(link) for link in rewritten}
+    removed = sum(1 for key in previous_order if key not in current_keys)
+    return kept + added, len(added), removed
+
+
+def merge_with_previous(
+    previous: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> MergeResult:
+    """
+    Merge a regenerated document with its previous version, keeping IDs stable.
+
+    Only sections present in both documents are merged; other sections of the
+    current document are returned unchanged. Neither input is modified.
+
+    Args:
+        previous: Document from the previous session
+        current: Newly generated document, with IDs already allocated
+        threshold: Minimum similarity ratio for a content match
+
+    Returns:
+        MergeResult with the merged document, the diff against the previous
+        version and the IDs that were replaced by previous ones
+    """
+    result = MergeResult(data=dict(current), diff=ModelDiff())
+
+    for section in ENTITY_SECTIONS:
+        previous_entries = previous.get(section)
+        current_entries = current.get(section)
+        if not isinstance(previous_entries, list) or not isinstance(
+            current_entries, list
+        ):
+            continue
+        merged, section_diff = _merge_section(
+            section, previous_entries, current_entries, threshold, result.id_map
+        )
+        result.data[section] = merged
+        result.diff.sections[section] = section_diff
+
+    for section, keys in LINK_SECTIONS.items():
+        previous_links = previous.get(section)
+        current_links = current.get(section)
+        if not isinstance(current_links, list):
+            continue
+        if not isinstance(previous_links, list):
+            previous_links = []
+        merged, added, removed = _merge_links(
+            previous_links, current_links, keys, result.id_map
+        )
+        result.data[section] = merged
+        result.diff.links_added += added
+        result.diff.links_removed += removed
+
+    return result
+
+
+def diff_models(
+    previous: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> ModelDiff:
+    """
+    Compare two versions of a threat composer document.
+
+    Args:
+        previous: Earlier version of the document
+        current: Later version of the document
+        threshold: Minimum similarity ratio for a content match
+
+    Returns:
+        ModelDiff listing added, removed, modified and unchanged entities
+    """
+    return merge_with_previous(previous, current, threshold).diff
+
+
+def format_model_diff(diff: ModelDiff) -> str:
+    """
+    Summarize a diff in one line per section.
+
+    Args:
+        diff: Diff to summarize
+
+    Returns:
+        Multi-line summary
+    """
+    lines = []
+    for section, section_diff in diff.sections.items():
+        lines.append(
+            f"{section}: {len(section_diff.added)} added, "
+            f"{len(section_diff.removed)} removed, "
+            f"{len(section_diff.modified)} modified, "
+            f"{len(section_diff.unchanged)} unchanged"
+        )
+    if diff.links_added or diff.links_removed:
+        lines.append(f"links: {diff.links_added} added, {diff.links_removed} removed")
+    return "\n".join(lines)
@@ -0,0 +1,461 @@
+"""
+Near-duplicate detection for threats and mitigations.
+
+Agents often produce paraphrased copies of the same threat or mitigation,
+which every downstream agent then reads and reasons about again. This module
+finds and merges them deterministically:
+- Each entity's text (threat statement, mitigation content) is normalized and
+  split into overlapping word shingles
+- A MinHash signature approximates the Jaccard similarity of shingle sets,
+  and locality-sensitive hashing over signature bands proposes candidate
+  pairs without comparing every pair of entities
+- Candidates are confirmed with the exact Jaccard similarity. Each entity
+  joins the cluster of the earliest kept entity it is similar to, so entities
+  are never grouped through a chain of similar entities
+- Threats classified differently (STRIDE categories, impacted assets or
+  impacted goal) are never merged, however similar their statements are
+- Each cluster keeps its first entity; the others are removed, their tags,
+  assets, goals and metadata are merged into the kept entity, and links
+  pointing at them are rewritten. Every merge is recorded, with anything that
+  could not be carried over
+
+Signatures use fixed seeds and a stable hash, so results do not depend on
+PYTHONHASHSEED or on the process.
+"""
+
+import hashlib
+import json
+import random
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .threat_composer_model_diff import LINK_SECTIONS, entity_text
+
+# Sections checked for near-duplicates
+DEDUPLICATED_SECTIONS = ("threats", "mitigations")
+
+# Minimum Jaccard similarity of shingle sets for two entities to be merged.
+# Threat statements follow a shared grammar, and distinct threats written
+# from the same template reach 0.85, so only near-identical texts qualify.
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Words per shingle
+SHINGLE_SIZE = 2
+
+# MinHash signature length, split into LSH_BANDS bands of equal size. With 32
+# bands of 4 rows, pairs at the threshold become candidates with probability
+# above 0.99 while dissimilar pairs rarely do.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Fields that classify a threat; threats that differ in any are not merged
+_CLASSIFICATION_FIELDS = ("STRIDE", "impactedAssets", "impactedGoal")
+
+# Priority metadata values, lowest first
+_PRIORITIES = ("Low", "Medium", "High")
+
+_rng = random.Random(0x7C0DE)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+@dataclass
+class MergeRecord:
+    """Model for an entity merged into a near-duplicate of it."""
+
+    section: str
+    kept_id: str
+    removed_id: str
+    similarity: float
+    removed_text: str
+    # Values of the removed entity that the kept entity has differently
+    dropped: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "section": self.section,
+            "keptId": self.kept_id,
+            "removedId": self.removed_id,
+            "similarity": round(self.similarity, 3),
+            "removedText": self.removed_text,
+            "dropped": self.dropped,
+        }
+
+
+@dataclass
+class DeduplicationResult:
+    """Model for the outcome of merging near-duplicate entities."""
+
+    documents: dict[str, dict[str, Any]]
+    # Per section, removed entity ID -> ID of the entity it was merged into
+    merged: dict[str, dict[str, str]] = field(default_factory=dict)
+    # Every merge, in the order it was made
+    merges: list[MergeRecord] = field(default_factory=list)
+    links_removed: int = 0
+
+    @property
+    def merged_count(self) -> int:
+        return sum(len(mapping) for mapping in self.merged.values())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """
+    Split text into overlapping word shingles.
+
+    Args:
+        text: Text to split
+        size: Number of words per shingle
+
+    Returns:
+        Set of shingles; texts shorter than size give a single shingle
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _stable_hash(shingle: str) -> int:
+    """32-bit hash of a shingle that is identical across processes."""
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def minhash_signature(shingle_set: set[str]) -> tuple[int, ...]:
+    """
+    Compute the MinHash signature of a set of shingles.
+
+    Args:
+        shingle_set: Non-empty set of shingles
+
+    Returns:
+        Tuple of NUM_PERMUTATIONS minimum hash values
+    """
+    hashes = [_stable_hash(shingle) for shingle in shingle_set]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(first: set[str], second: set[str]) -> float:
+    """Exact Jaccard similarity of two sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def find_near_duplicates(
+    texts: list[str],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    compatible: Callable[[int, int], bool] | None = None,
+) -> list[list[int]]:
+    """
+    Group texts whose shingle sets are at least threshold similar.
+
+    Each text joins the cluster of the earliest text it is similar to that
+    is not itself in a cluster, so every member is similar to the cluster's
+    first text; two texts are not grouped only because a third is similar
+    to both.
+
+    Args:
+        texts: Texts to compare; empty texts are never grouped
+        threshold: Minimum Jaccard similarity of shingle sets
+        compatible: Optional check whether two texts, by index, may be
+            grouped; every pair within a cluster passes it
+
+    Returns:
+        Clusters of two or more indices, each sorted, ordered by first index
+    """
+    shingle_sets = [shingles(text) for text in texts]
+    rows = NUM_PERMUTATIONS // LSH_BANDS
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for index, shingle_set in enumerate(shingle_sets):
+        if not shingle_set:
+            continue
+        signature = minhash_signature(shingle_set)
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * rows : (band + 1) * rows])
+            buckets.setdefault(key, []).append(index)
+
+    # Earlier texts sharing a bucket with each text
+    candidates: dict[int, set[int]] = {}
+    for members in buckets.values():
+        for position, first in enumerate(members):
+            for second in members[position + 1 :]:
+                candidates.setdefault(second, set()).add(first)
+
+    clusters: dict[int, list[int]] = {}
+    grouped: set[int] = set()
+    for index in sorted(candidates):
+        for first in sorted(candidates[index]):
+            if first in grouped:
+                continue
+            if jaccard(shingle_sets[first], shingle_sets[index]) < threshold:
+                continue
+            members = clusters.get(first, [first])
+            if compatible is not None and not all(
+                compatible(member, index) for member in members
+            ):
+                continue
+            clusters[first] = [*members, index]
+            grouped.add(index)
+            break
+
+    return [clusters[first] for first in sorted(clusters)]
+
+
+def _metadata_value(entity: dict[str, Any], key: str) -> Any:
+    """Get the value of a metadata item, or None if the entity has none."""
+    metadata = entity.get("metadata")
+    if not isinstance(metadata, list):
+        return None
+    for item in metadata:
+        if isinstance(item, dict) and item.get("key") == key:
+            return item.get("value")
+    return None
+
+
+def _as_list(value: Any) -> list:
+    if isinstance(value, list):
+        return value
+    return [] if value is None else [value]
+
+
+def _classification(entity: dict[str, Any]) -> dict[str, frozenset[str]]:
+    """Get the STRIDE categories, impacted assets and goals of an entity."""
+    values = {
+        "STRIDE": _metadata_value(entity, "STRIDE"),
+        "impactedAssets": entity.get("impactedAssets"),
+        "impactedGoal": entity.get("impactedGoal"),
+    }
+    return {
+        name: frozenset(str(item).strip().lower() for item in _as_list(value))
+        for name, value in values.items()
+    }
+
+
+def _classifications_agree(
+    first: dict[str, frozenset[str]], second: dict[str, frozenset[str]]
+) -> bool:
+    """Check that two classifications agree where both are given."""
+    return all(
+        not first[name] or not second[name] or first[name] == second[name]
+        for name in _CLASSIFICATION_FIELDS
+    )
+
+
+def _classification_check(
+    entities: list[dict[str, Any]],
+) -> Callable[[int, int], bool]:
+    """Build a check whether two entities, by index, are classified alike."""
+    classifications = [_classification(entity) for entity in entities]
+
+    def compatible(first: int, second: int) -> bool:
+        return _classifications_agree(classifications[first], classifications[second])
+
+    return compatible
+
+
+def _union(first: Any, second: Any) -> list:
+    """Items of both lists, without repeats, in order."""
+    merged = list(_as_list(first))
+    merged.extend(item for item in _as_list(second) if item not in merged)
+    return merged
+
+
+def _merge_metadata(
+    kept: dict[str, Any], duplicate: dict[str, Any], dropped: dict[str, Any]
+) -> None:
+    """Merge the duplicate's metadata into the kept entity."""
+    duplicate_metadata = duplicate.get("metadata")
+    if not isinstance(duplicate_metadata, list) or not duplicate_metadata:
+        return
+    metadata = [
+        dict(item) if isinstance(item, dict) else item
+        for item in _as_list(kept.get("metadata"))
+    ]
+    by_key = {item.get("key"): item for item in metadata if isinstance(item, dict)}
+    for item in duplicate_metadata:
+        if not isinstance(item, dict):
+            continue
+        key = item.get("key")
+        current = by_key.get(key)
+        if current is None:
+            current = dict(item)
+            metadata.append(current)
+            by_key[key] = current
+        elif current.get("value") == item.get("value"):
+            continue
+        elif key == "STRIDE":
+            current["value"] = _union(current.get("value"), item.get("value"))
+        elif key == "Priority" and item.get("value") in _PRIORITIES:
+            if current.get("value") not in _PRIORITIES or _PRIORITIES.index(
+                item["value"]
+            ) > _PRIORITIES.index(current["value"]):
+                dropped[key] = current.get("value")
+                current["value"] = item["value"]
+            else:
+                dropped[key] = item["value"]
+        else:
+            dropped[key] = item.get("value")
+    if metadata != kept.get("metadata"):
+        kept["metadata"] = metadata
+
+
+def _merge_entity(kept: dict[str, Any], duplicate: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merge a duplicate into the kept entity.
+
+    Tags, impacted assets and goals are combined, metadata the kept entity
+    lacks is added, and the higher priority is kept.
+
+    Returns:
+        Values of the duplicate that were not carried over, by field
+    """
+    dropped: dict[str, Any] = {}
+    for name in ("tags", "impactedAssets", "impactedGoal"):
+        if duplicate.get(name):
+            merged = _union(kept.get(name), duplicate[name])
+            if merged != kept.get(name):
+                kept[name] = merged
+    _merge_metadata(kept, duplicate, dropped)
+    status = duplicate.get("status")
+    if status is not None and kept.get("status") is None:
+        kept["status"] = status
+    elif status is not None and status != kept.get("status"):
+        dropped["status"] = status
+    return dropped
+
+
+def deduplicate_documents(
+    documents: dict[str, dict[str, Any]],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> DeduplicationResult:
+    """
+    Merge near-duplicate threats and mitigations across component documents.
+
+    Entities are compared within their own section, and entities whose
+    STRIDE categories, impacted assets or impacted goals differ are never
+    merged. Links in every document are rewritten to the kept entities, and
+    links that become identical are dropped. Inputs are not modified.
+
+    Args:
+        documents: Component documents by name (e.g. file name)
+        threshold: Minimum Jaccard similarity of shingle sets
+
+    Returns:
+        DeduplicationResult with the rewritten documents and merges made
+    """
+    result = DeduplicationResult(documents=dict(documents))
+    id_map: dict[str, str] = {}
+
+    for name, document in documents.items():
+        for section in DEDUPLICATED_SECTIONS:
+            entries = document.get(section)
+            if not isinstance(entries, list):
+                continue
+            positions = [i for i, e in enumerate(entries) if isinstance(e, dict)]
+            texts = [entity_text(section, entries[i]) for i in positions]
+            clusters = find_near_duplicates(
+                texts,
+                threshold,
+                _classification_check([entries[i] for i in positions]),
+            )
+            if not clusters:
+                continue
+
+            rewritten = list(entries)
+            removed: set[int] = set()
+            for cluster in clusters:
+                kept_position = positions[cluster[0]]
+                kept = dict(entries[kept_position])
+                for member in cluster[1:]:
+                    duplicate = entries[positions[member]]
+                    dropped = _merge_entity(kept, duplicate)
+                    removed.add(positions[member])
+                    duplicate_id = duplicate.get("id")
+                    if isinstance(duplicate_id, str) and isinstance(
+                        kept.get("id"), str
+                    ):
+                        id_map[duplicate_id] = kept["id"]
+                        result.merged.setdefault(section, {})[duplicate_id] = kept["id"]
+                        result.merges.append(
+                            MergeRecord(
+                                section=section,
+                                kept_id=kept["id"],
+                                removed_id=duplicate_id,
+                                similarity=jaccard(
+                                    shingles(texts[cluster[0]]), shingles(texts[member])
+                                ),
+                                removed_text=texts[member],
+                                dropped=dropped,
+                            )
+                        )
+                rewritten[kept_position] = kept
+
+            result.documents[name] = {
+                **result.documents[name],
+                section: [e for i, e in enumerate(rewritten) if i not in removed],
+            }
+
+    if not id_map:
+        return result
+
+    for name, document in result.documents.items():
+        updated = dict(document)
+        for section, keys in LINK_SECTIONS.items():
+            links = document.get(section)
+            if not isinstance(links, list):
+                continue
+            seen: set[str] = set()
+            rewritten_links = []
+            for link in links:
+                if isinstance(link, dict):
+                    link = {
+                        key: id_map.get(value, value) if key in keys else value
+                        for key, value in link.items()
+                    }
+                    link_key = json.dumps(link, sort_keys=True)
+                    if link_key in seen:
+                        result.links_removed += 1
+                        continue
+                    seen.add(link_key)
+                rewritten_links.append(link)
+            updated[section] = rewritten_links
+        result.documents[name] = updated
+
+    return result
+
+
+def format_deduplication_summary(result: DeduplicationResult) -> str:
+    """
+    Summarize merged entities in one line per section.
+
+    Args:
+        result: Deduplication result to summarize
+
+    Returns:
+        Summary text
+    """
+    if not result.merged_count:
+        return "No near-duplicate threats or mitigations found."
+    lines = [
+        f"{section}: merged {len(mapping)} near-duplicate(s) "
+        + "("
+        + ", ".join(f"{removed} -> {kept}" for removed, kept in mapping.items())
+        + ")"
+        for section, mapping in result.merged.items()
+    ]
+    if result.links_removed:
+        lines.append(f"links: removed {result.links_removed} repeated link(s)")
+    return "\n".join(lines)
@@ -2,10 +2,120 @@
 Util for creating data URLs from SVG diagrams.
 
 This tool takes an SVG diagram as a string and returns a properly formatted data URL
-with base64 encoding for use in web applications and documents.
+with base64 encoding for use in web applications and documents. It also provides a
+conservative SVG minifier and a size report used before diagrams are encoded into
+the assembled threat model.
 """
 
 import base64
+import gzip
+import re
+
+# Decimal places kept for coordinates and lengths; Graphviz emits two decimals
+# but rendered output is indistinguishable at one
+SVG_NUMERIC_PRECISION = 1
+
+# Attributes whose values are purely numeric (coordinates, lengths, path data)
+_NUMERIC_ATTRS = (
+    "points",
+    "d",
+    "x",
+    "y",
+    "x1",
+    "y1",
+    "x2",
+    "y2",
+    "cx",
+    "cy",
+    "r",
+    "rx",
+    "ry",
+    "width",
+    "height",
+    "viewBox",
+    "transform",
+    "font-size",
+    "stroke-width",
+)
+
+_XML_DECLARATION_PATTERN = re.compile(r"<\?xml[^>]*\?>")
+_DOCTYPE_PATTERN = re.compile(r"<!DOCTYPE[^>]*>", re.IGNORECASE)
+_COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+# Only whitespace runs containing a newline are layout between tags; a lone
+# space between tags may be a significant text node (e.g. "<text> </text>")
+_INTER_TAG_WHITESPACE_PATTERN = re.compile(r">[ \t\r]*\n\s*<")
+_NUMERIC_ATTR_PATTERN = re.compile(
+    r"(?<=\s)(" + "|".join(re.escape(a) for a in _NUMERIC_ATTRS) + r')="([^"]*)"'
+)
+_DECIMAL_PATTERN = re.compile(r"-?\d+\.\d+")
+_CLASS_ATTR_PATTERN = re.compile(r'\sclass="[^"]*"')
+
+
+def _round_decimal(match: re.Match, precision: int) -> str:
+    """Round a decimal literal, dropping trailing zeros and negative zero."""
+    rounded = f"{float(match.group(0)):.{precision}f}".rstrip("0").rstrip(".")
+    return "0" if rounded in ("-0", "") else rounded
+
+
+def minify_svg(svg_string: str, precision: int = SVG_NUMERIC_PRECISION) -> str:
+    """
+    Minify SVG markup without changing how it renders.
+
+    Removes the XML declaration, DOCTYPE, comments and layout whitespace
+    between tags, rounds numbers in coordinate and length attributes to the
+    given precision, and drops class attributes when the document has no
+    stylesheet to match them against. Embedded data URIs are left untouched.
+
+    Args:
+        svg_string: SVG markup to minify
+        precision: Number of decimal places kept for numeric attribute values
+
+    Returns:
+        Minified SVG markup
+    """
+    svg = _XML_DECLARATION_PATTERN.sub("", svg_string)
+    svg = _DOCTYPE_PATTERN.sub("", svg)
+    svg = _COMMENT_PATTERN.sub("", svg)
+    svg = _INTER_TAG_WHITESPACE_PATTERN.sub("><", svg).strip()
+
+    def round_attr(match: re.Match) -> str:
+        value = _DECIMAL_PATTERN.sub(lambda m: _round_decimal(m, precision), match[2])
+        return f'{match[1]}="{value}"'
+
+    svg = _NUMERIC_ATTR_PATTERN.sub(round_attr, svg)
+
+    if "<style" not in svg:
+        svg = _CLASS_ATTR_PATTERN.sub("", svg)
+
+    return svg
+
+
+def svg_size_report(original_svg: str, minified_svg: str, data_url: str) -> dict:
+    """
+    Summarize the size of a diagram at each stage of encoding.
+
+    The gzip figure estimates the transfer size of the minified SVG; data URLs
+    themselves cannot carry gzip-compressed content that browsers will decode.
+
+    Args:
+        original_svg: SVG markup as read from disk
+        minified_svg: SVG markup after minify_svg
+        data_url: Final data URL
+
+    Returns:
+        Dictionary of sizes in bytes and the overall reduction percentage
+    """
+    original_bytes = len(original_svg.encode("utf-8"))
+    minified_bytes = len(minified_svg.encode("utf-8"))
+    return {
+        "original_bytes": original_bytes,
+        "minified_bytes": minified_bytes,
+        "data_url_bytes": len(data_url),
+        "gzip_estimate_bytes": len(gzip.compress(minified_svg.encode("utf-8"))),
+        "minified_reduction_pct": round(100 * (1 - minified_bytes / original_bytes), 1)
+        if original_bytes
+        else 0.0,
+    }
 
 
 def threat_composer_svg_to_data_url(svg_string: str) -> str:
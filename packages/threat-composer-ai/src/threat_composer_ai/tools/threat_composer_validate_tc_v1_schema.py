@@ -11,14 +11,11 @@ TOKEN OPTIMIZATION: Accepts relative paths (e.g., "./components/file.json") and
 relative paths in all output messages to reduce token usage.
 """
 
-import json
 from pathlib import Path
 from typing import Any
 
-from pydantic import ValidationError
 from strands import tool
 
-from ..models import ThreatComposerV1Model
 from ..tools.path_validation import (
     create_path_validation_error_message,
     validate_output_directory_path,
@@ -27,6 +24,19 @@ from ..utils.relative_path_helper import (
     make_relative_to_working_dir,
     resolve_relative_path,
 )
+from ..validation import (
+    ReferenceCheckResult,
+    check_reference_integrity_json,
+    format_error_location,
+    format_reference_issues,
+    validate_tc_data_incremental,
+    validate_tc_json_bytes,
+    validate_tc_section_json,
+)
+
+# Maximum number of fields with errors listed in a validation result; files
+# that are badly malformed would otherwise produce thousands of lines
+MAX_REPORTED_ERRORS = 50
 
 
 @tool(
@@ -89,146 +99,136 @@ def threat_composer_validate_tc_v1_schema(file_path: str) -> str:
             return f"❌ File not found: {display_path}"
 
         try:
-            with open(file_path_obj, encoding="utf-8") as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
-            return f"❌ Invalid JSON format in file '{display_path}': {str(e)}"
+            content = file_path_obj.read_bytes()
         except Exception as e:
             return f"❌ Error reading file '{display_path}': {str(e)}"
 
-        # Validate using the Pydantic model
-        try:
-            ThreatComposerV1Model(**data)
-            return "✅ Validation successful! The data conforms to the Threat Composer v1 schema."
-
-        except ValidationError as e:
-            # Format Pydantic validation errors for AI consumption
-            errors = e.errors()
-            error_messages = []
-
-            # Group errors by base path (without union type name) to deduplicate union errors
-            grouped_errors: dict[str, list[dict]] = {}
-            for error in errors:
-                loc = error.get("loc", [])
-                # Find base path by removing union type names (e.g., "CommentsMetadata", "PriorityMetadata")
-                base_path_parts = []
-                for part in loc:
-                    # Skip union type class names (they contain "Metadata" or similar patterns)
-                    if isinstance(part, str) and "Metadata" in part:
-                        continue
-                    base_path_parts.append(str(part))
-                base_path = ".".join(base_path_parts)
-                if base_path not in grouped_errors:
-                    grouped_errors[base_path] = []
-                grouped_errors[base_path].append(error)
-
-            # For each group, pick the most informative error (prefer value_error over literal_error)
-            for base_path, group in grouped_errors.items():
-                # Prioritize errors: value_error > string_pattern_mismatch > literal_error
-                best_error = None
-                for error in group:
-                    error_type = error.get("type", "")
-                    if "value_error" in error_type:
-                        best_error = error
-                        break
-                    elif "pattern" in error_type and best_error is None:
-                        best_error = error
-                    elif best_error is None:
-                        best_error = error
-
-                if best_error:
-                    field_path = base_path if base_path else "root"
-                    error_msg = best_error.get("msg", "Validation error")
-                    input_value = best_error.get("input", "")
-
-                    # Format input value for display (truncate if too long)
-                    if input_value is not None:
-                        input_str = str(input_value)
-                        if len(input_str) > 100:
-                            input_str = input_str[:97] + "..."
-                        value_info = f" (current value: {input_str})"
-                    else:
-                        value_info = ""
-
-                    formatted_error = f"Field '{field_path}' - {error_msg}{value_info}"
-                    error_messages.append(formatted_error)
-
-            result = f"❌ Validation failed with {len(error_messages)} error(s):\n"
-            result += "\n".join(
-                f"{i}. {msg}" for i, msg in enumerate(error_messages, 1)
+        # Parse and validate the raw bytes in one step; invalid files are then
+        # checked entry by entry, only rechecking entries that changed since
+        # this file was last validated
+        errors = validate_tc_json_bytes(content, cache_key=str(file_path_obj))
+        if not errors:
+            # Cached per file like the schema result, so an unchanged file is
+            # not loaded into Python objects again
+            return _reference_integrity_report(
+                check_reference_integrity_json(content, cache_key=str(file_path_obj))
             )
 
-            return result
+        json_error = _json_syntax_error(errors)
+        if json_error is not None:
+            return f"❌ Invalid JSON format in file '{display_path}': {json_error}"
+
+        # Format Pydantic validation errors for AI consumption
+        return f"❌ {_validation_failure_message(errors)}"
 
     except Exception as e:
         return f"❌ Validation error: {str(e)}"
 
 
-def _format_validation_errors(errors: list[dict]) -> list[str]:
+def _reference_integrity_report(result: ReferenceCheckResult) -> str:
     """
-    Format Pydantic validation errors, deduplicating union type errors.
+    Build the tool result for the reference check of schema-valid data.
 
-    When a union type fails validation, Pydantic reports errors for each union member.
-    This function groups errors by base path and picks the most informative error.
+    Links into sections the file does not contain are not checked, since
+    component files only hold part of the threat model. Links to missing
+    entities are warnings, as the Threat Composer app accepts them.
     """
-    error_messages = []
+    if not result.is_valid:
+        error_messages = format_reference_issues(result.errors)
+        report = (
+            "❌ Reference integrity check failed with "
+            f"{len(error_messages)} error(s):\n"
+        )
+        report += "\n".join(f"{i}. {msg}" for i, msg in enumerate(error_messages, 1))
+    else:
+        report = "✅ Validation successful! The data conforms to the Threat Composer v1 schema."
+
+    if result.warnings:
+        warning_messages = format_reference_issues(result.warnings)
+        report += f"\n⚠️ {len(warning_messages)} warning(s):\n"
+        report += "\n".join(f"{i}. {msg}" for i, msg in enumerate(warning_messages, 1))
+
+    return report
+
+
+def _json_syntax_error(errors: list[dict]) -> str | None:
+    """Return the JSON parser message if validation failed on malformed JSON."""
+    for error in errors:
+        if error.get("type") == "json_invalid":
+            return error.get("ctx", {}).get("error", error.get("msg"))
+    return None
+
+
+def _error_rank(error: dict) -> int:
+    """Rank errors by how informative they are; lower is better."""
+    error_type = error.get("type", "")
+    if "value_error" in error_type:
+        return 0
+    if "pattern" in error_type:
+        return 1
+    return 2
+
+
+def _format_validation_errors(
+    errors: list[dict], limit: int = MAX_REPORTED_ERRORS
+) -> tuple[list[str], int]:
+    """
+    Format Pydantic validation errors as one message per field.
+
+    Errors are grouped in a single pass by their dotted location, with the key
+    and value of a metadata item grouped together, and the most informative
+    error of each group is reported. Only the first `limit` groups get a
+    message; the rest are only counted.
 
-    # Group errors by base path (without union type name and final field) to deduplicate union errors
-    grouped_errors: dict[str, list[dict]] = {}
+    Returns:
+        Tuple of (messages, number of further fields with errors)
+    """
+    best_errors: dict[str, dict] = {}
+    omitted: set[str] = set()
     for error in errors:
-        loc = error.get("loc", [])
-        # Find base path by removing union type class names (e.g., "CommentsMetadata", "PriorityMetadata")
-        # and grouping at the metadata item level (e.g., "threats.2.metadata.1")
-        base_path_parts = []
-        for part in loc:
-            # Skip union type class names (they contain "Metadata" or similar patterns)
-            if isinstance(part, str) and "Metadata" in part:
+        path = format_error_location(error.get("loc", ()))
+        parent, _, last = path.rpartition(".")
+        if parent and last in ("key", "value"):
+            path = parent
+
+        current = best_errors.get(path)
+        if current is None:
+            if len(best_errors) >= limit:
+                omitted.add(path)
                 continue
-            base_path_parts.append(str(part))
+            best_errors[path] = error
+        elif _error_rank(error) < _error_rank(current):
+            best_errors[path] = error
 
-        # Group at the parent level (metadata item) not the field level (key/value)
-        # This groups "threats.2.metadata.1.key" and "threats.2.metadata.1.value" together
-        if len(base_path_parts) > 1 and base_path_parts[-1] in ("key", "value"):
-            base_path = ".".join(base_path_parts[:-1])
+    error_messages = []
+    for path, error in best_errors.items():
+        field_path = path if path else "root"
+        error_msg = error.get("msg", "Validation error")
+        input_value = error.get("input", "")
+
+        # Format input value for display (truncate if too long)
+        if input_value is not None:
+            input_str = str(input_value)
+            if len(input_str) > 100:
+                input_str = input_str[:97] + "..."
+            value_info = f" (current value: {input_str})"
         else:
-            base_path = ".".join(base_path_parts)
-
-        if base_path not in grouped_errors:
-            grouped_errors[base_path] = []
-        grouped_errors[base_path].append(error)
-
-    # For each group, pick the most informative error (prefer value_error over literal_error)
-    for base_path, group in grouped_errors.items():
-        # Prioritize errors: value_error > string_pattern_mismatch > literal_error
-        best_error = None
-        for error in group:
-            error_type = error.get("type", "")
-            if "value_error" in error_type:
-                best_error = error
-                break
-            elif "pattern" in error_type and best_error is None:
-                best_error = error
-            elif best_error is None:
-                best_error = error
-
-        if best_error:
-            field_path = base_path if base_path else "root"
-            error_msg = best_error.get("msg", "Validation error")
-            input_value = best_error.get("input", "")
-
-            # Format input value for display (truncate if too long)
-            if input_value is not None:
-                input_str = str(input_value)
-                if len(input_str) > 100:
-                    input_str = input_str[:97] + "..."
-                value_info = f" (current value: {input_str})"
-            else:
-                value_info = ""
-
-            formatted_error = f"Field '{field_path}' - {error_msg}{value_info}"
-            error_messages.append(formatted_error)
-
-    return error_messages
+            value_info = ""
+
+        error_messages.append(f"Field '{field_path}' - {error_msg}{value_info}")
+
+    return error_messages, len(omitted)
+
+
+def _validation_failure_message(errors: list[dict]) -> str:
+    """Build the numbered list of validation errors reported to the caller."""
+    error_messages, omitted = _format_validation_errors(errors)
+
+    message = f"Validation failed with {len(error_messages) + omitted} error(s):\n"
+    message += "\n".join(f"{i}. {msg}" for i, msg in enumerate(error_messages, 1))
+    if omitted:
+        message += f"\n... and {omitted} more error(s) not shown"
+    return message
 
 
 # Additional utility function for programmatic use
@@ -256,19 +256,69 @@ def validate_tc_data_pydantic(data: dict[str, Any]) -> tuple[bool, str]:
         ...     print(f"Invalid: {error_msg}")
     """
     try:
-        ThreatComposerV1Model(**data)
-        return (
-            True,
-            "",
-        )
-    except ValidationError as e:
-        error_messages = _format_validation_errors(e.errors())
+        errors = validate_tc_data_incremental(data)
+        if not errors:
+            return (
+                True,
+                "",
+            )
 
-        error_message = f"Validation failed with {len(error_messages)} error(s):\n"
-        error_message += "\n".join(
-            f"{i}. {msg}" for i, msg in enumerate(error_messages, 1)
-        )
+        return False, _validation_failure_message(errors)
+    except Exception as e:
+        return False, f"Validation error: {str(e)}"
+
+
+def validate_tc_json_pydantic(content: bytes) -> tuple[bool, str]:
+    """
+    Validate threat composer data from raw JSON bytes using Pydantic.
+
+    Parses and validates in one step without loading the JSON into Python
+    objects first, which keeps validation of large documents (e.g. with
+    embedded diagram data URLs) fast.
+
+    Args:
+        content: Raw JSON document
+
+    Returns:
+        Tuple of (is_valid, error_message)
+        - is_valid: True if validation passed, False otherwise
+        - error_message: Empty string if valid, error details if invalid
+    """
+    try:
+        errors = validate_tc_json_bytes(content)
+        if not errors:
+            return True, ""
+
+        json_error = _json_syntax_error(errors)
+        if json_error is not None:
+            return False, f"Invalid JSON format: {json_error}"
+
+        return False, _validation_failure_message(errors)
+    except Exception as e:
+        return False, f"Validation error: {str(e)}"
+
+
+def validate_tc_section_pydantic(section: str, content: bytes) -> tuple[bool, str]:
+    """
+    Validate the raw JSON value of one top-level section using Pydantic.
+
+    Used to check a document section by section while it is being written,
+    without holding the whole document in memory.
+
+    Args:
+        section: Top-level key the value is written under (e.g. "threats")
+        content: Raw JSON value of the section
+
+    Returns:
+        Tuple of (is_valid, error_message)
+        - is_valid: True if validation passed, False otherwise
+        - error_message: Empty string if valid, error details if invalid
+    """
+    try:
+        errors = validate_tc_section_json(section, content)
+        if not errors:
+            return True, ""
 
-        return False, error_message
+        return False, _validation_failure_message(errors)
     except Exception as e:
         return False, f"Validation error: {str(e)}"
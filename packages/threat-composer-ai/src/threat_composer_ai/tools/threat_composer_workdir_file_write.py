@@ -5,6 +5,13 @@ This module wraps the strands_tools file_write functionality to only allow
 writing files within the configured output directory, preventing path
 traversal attacks and ensuring agents stay within their designated output space.
 
+Threat Composer component files (*.tc.json) are post-processed before writing:
+entities written with placeholder IDs get UUIDs, numericIds are assigned
+sequentially and links are rewritten to match (see threat_composer_id_allocator).
+On incremental reruns the result is then merged with the previous session's
+version of the file, so unchanged entities keep their IDs and an unchanged
+file is written byte for byte as before (see threat_composer_model_diff).
+
 PREFERRED USAGE: Use relative paths (e.g., "./components/file.json", "./output/data.txt")
 for optimal token efficiency. Relative paths are automatically resolved to absolute
 paths internally while keeping prompts concise and readable.
@@ -31,7 +38,15 @@ from threat_composer_ai.tools.path_validation import (
     create_path_validation_error_message,
     validate_output_directory_path,
 )
-from threat_composer_ai.utils import now_utc_timestamp
+from threat_composer_ai.tools.threat_composer_id_allocator import (
+    IdAllocationResult,
+    allocate_ids,
+)
+from threat_composer_ai.tools.threat_composer_model_diff import (
+    format_model_diff,
+    merge_with_previous,
+)
+from threat_composer_ai.utils import json_dump_options, now_utc_timestamp
 from threat_composer_ai.utils.relative_path_helper import resolve_relative_path
 
 TOOL_SPEC = FILE_WRITE_TOOL_SPEC
@@ -76,6 +91,110 @@ def _write_hash_file_for_output(file_path: str, config):
         pass  # Silent failure for hash writing
 
 
+def _load_previous_component(file_path: str, config) -> tuple[str, Any] | None:
+    """Load the previous session's version of a file being written.
+
+    Args:
+        file_path: Resolved path of the file being written
+        config: AppConfig instance, or None
+
+    Returns:
+        Tuple of (raw content, parsed JSON), or None if there is no previous
+        session or the previous file is missing or not valid JSON
+    """
+    if config is None or config.previous_session_path is None:
+        return None
+    try:
+        relative_path = Path(file_path).relative_to(config.output_directory)
+        previous_content = (config.previous_session_path / relative_path).read_text(
+            encoding="utf-8"
+        )
+        return previous_content, json.loads(previous_content)
+    except (OSError, ValueError):
+        return None
+
+
+def _process_component_file(file_path: str, content: str, config) -> tuple[str, str]:
+    """Assign IDs in a Threat Composer component file and merge with its previous version.
+
+    Args:
+        file_path: Resolved path of the file being written
+        content: Content the agent asked to write
+        config: AppConfig instance, or None
+
+    Returns:
+        Tuple of (content to write, summary for the agent). The content is
+        unchanged and the summary empty if the file is not a JSON threat
+        composer document or nothing needed changing.
+    """
+    if not file_path.endswith(".tc.json"):
+        return content, ""
+
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        # Leave malformed JSON for the schema validator to report
+        return content, ""
+    if not isinstance(data, dict):
+        return content, ""
+
+    # Scope derived IDs to this session and file, so placeholders reused in
+    # other files or sessions get different UUIDs. Session IDs are minute
+    # timestamps, so the session is identified by its full output path.
+    file_name = Path(file_path).name
+    namespace = (
+        f"{config.output_directory.resolve().as_posix()}/{file_name}"
+        if config
+        else file_name
+    )
+
+    allocation = allocate_ids(data, namespace)
+    merged_data = allocation.data
+    summaries = []
+
+    previous = _load_previous_component(file_path, config)
+    if previous is not None and isinstance(previous[1], dict):
+        previous_content, previous_data = previous
+        merge = merge_with_previous(previous_data, allocation.data)
+        if merge.data == previous_data:
+            # Nothing changed semantically: keep the previous bytes so the
+            # file hash matches and downstream agents can skip their work
+            return previous_content, (
+                "No changes compared with the previous session; "
+                "previous content and IDs kept."
+            )
+
+        # Report the IDs the entities ended up with
+        for mapping in allocation.allocated.values():
+            for placeholder, allocated in mapping.items():
+                mapping[placeholder] = merge.id_map.get(allocated, allocated)
+
+        merged_data = merge.data
+        summaries.append(
+            "Compared with the previous session:\n" + format_model_diff(merge.diff)
+        )
+
+    if allocation.allocated_count or allocation.renumbered:
+        summaries.insert(0, _format_allocation_summary(allocation))
+    if merged_data == data:
+        return content, "\n".join(summaries)
+
+    pretty = config is not None and not config.compact_json_output
+    return json.dumps(merged_data, **json_dump_options(pretty)), "\n".join(summaries)
+
+
+def _format_allocation_summary(allocation: IdAllocationResult) -> str:
+    """Summarize allocated IDs for the agent, so it can refer to them later."""
+    lines = [
+        f"Assigned {allocation.allocated_count} ID(s) and renumbered "
+        f"{allocation.renumbered} numericId(s)."
+    ]
+    for section, mapping in allocation.allocated.items():
+        pairs = ", ".join(f"{key}={value}" for key, value in mapping.items())
+        lines.append(f"{section}: {pairs}")
+    return "\n".join(lines)
+
+
 def threat_composer_workdir_file_write(tool: ToolUse, **kwargs: Any) -> ToolResult:
     tool_input = tool.get("input", {})
 
@@ -92,9 +211,18 @@ def threat_composer_workdir_file_write(tool: ToolUse, **kwargs: Any) -> ToolResu
         resolved_file_path = resolve_relative_path(file_path)
         validate_output_directory_path(resolved_file_path, operation="write")
 
+        config = get_global_config()
+
+        # Allocate IDs for component files so the file is written once with
+        # entities and links consistent
+        content, summary = _process_component_file(
+            resolved_file_path, tool_input["content"], config
+        )
+
         # Update the tool input with resolved path for the original tool
         resolved_tool_input = tool_input.copy()
         resolved_tool_input["path"] = resolved_file_path
+        resolved_tool_input["content"] = content
 
         # Create a new tool structure with resolved paths
         resolved_tool = tool.copy()
@@ -105,8 +233,10 @@ def threat_composer_workdir_file_write(tool: ToolUse, **kwargs: Any) -> ToolResu
 
         # If file write was successful, write hash file immediately
         if result.get("status") != "error":
+            if summary:
+                result.setdefault("content", []).append({"text": summary})
+
             try:
-                config = get_global_config()
                 if config:
                     # Write individual hash file for this output (use resolved path)
                     _write_hash_file_for_output(resolved_file_path, config)
@@ -5,6 +5,7 @@ from .datetime_utils import (
     now_utc_timestamp,
     parse_utc_timestamp,
 )
+from .json_output import format_size_report, json_dump_options, write_gzip_sidecar
 from .path_formatter import format_path_for_display
 from .process_management import (
     create_signal_handler,
@@ -12,6 +13,12 @@ from .process_management import (
     setup_local_telemetry,
     terminate_all_threads,
 )
+from .telemetry_files import (
+    finish_file_telemetry,
+    flush_file_telemetry,
+    setup_file_telemetry,
+)
+from .token_usage import cache_hit_rate
 from .tool_helpers import get_tool_name
 
 __all__ = [
@@ -20,8 +27,15 @@ __all__ = [
     "terminate_all_threads",
     "create_signal_handler",
     "setup_local_telemetry",
+    "setup_file_telemetry",
+    "finish_file_telemetry",
+    "flush_file_telemetry",
     "format_utc_timestamp",
     "parse_utc_timestamp",
     "now_utc_timestamp",
     "get_tool_name",
+    "cache_hit_rate",
+    "json_dump_options",
+    "write_gzip_sidecar",
+    "format_size_report",
 ]
@@ -0,0 +1,72 @@
+"""JSON serialization options and size reporting for threat model outputs."""
+
+import gzip
+import shutil
+from pathlib import Path
+from typing import Any
+
+# Separators without the spaces json.dumps adds by default
+COMPACT_SEPARATORS = (",", ":")
+
+# json.dumps uses these separators whenever an indent is given
+PRETTY_SEPARATORS = (",", ": ")
+
+
+def json_dump_options(pretty: bool) -> dict[str, Any]:
+    """
+    Get json.dump/json.dumps keyword arguments for threat model outputs.
+
+    Args:
+        pretty: Indent with two spaces instead of writing compact JSON
+
+    Returns:
+        Keyword arguments for json.dumps
+    """
+    if pretty:
+        return {"indent": 2, "separators": PRETTY_SEPARATORS, "ensure_ascii": False}
+    return {"indent": None, "separators": COMPACT_SEPARATORS, "ensure_ascii": False}
+
+
+def write_gzip_sidecar(path: Path) -> Path:
+    """
+    Write a gzip compressed copy of a file next to it.
+
+    The file is streamed through the compressor, so it is never held in
+    memory in full.
+
+    Args:
+        path: File to compress
+
+    Returns:
+        Path of the compressed copy (the file name with ".gz" appended)
+    """
+    sidecar_path = path.with_name(f"{path.name}.gz")
+    with open(path, "rb") as source, gzip.open(sidecar_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return sidecar_path
+
+
+def format_size_report(
+    section_sizes: dict[str, int], total_bytes: int, gzip_bytes: int | None = None
+) -> str:
+    """
+    Format a per-section byte breakdown, largest section first.
+
+    Args:
+        section_sizes: Serialized size of each top-level section in bytes
+        total_bytes: Size of the whole file in bytes
+        gzip_bytes: Size of the gzip sidecar in bytes, if one was written
+
+    Returns:
+        Multi-line report
+    """
+    lines = [f"📦 Output size: {total_bytes:,} B"]
+    if gzip_bytes is not None:
+        ratio = gzip_bytes / total_bytes * 100 if total_bytes else 0.0
+        lines[0] += f" (gzip {gzip_bytes:,} B, {ratio:.1f}%)"
+    for section, size in sorted(
+        section_sizes.items(), key=lambda item: item[1], reverse=True
+    ):
+        share = size / total_bytes * 100 if total_bytes else 0.0
+        lines.append(f"  - {section}: {size:,} B ({share:.1f}%)")
+    return "\n".join(lines)
@@ -5,7 +5,8 @@ import signal
 import threading
 import time
 
-from ..logging import log_debug, log_error
+from ..logging import flush_logging, log_debug, log_error
+from .telemetry_files import flush_file_telemetry
 
 
 def force_kill_all_processes():
@@ -104,6 +105,11 @@ def create_signal_handler(shutdown_event: threading.Event, active_workflow_ref:
 
         log_error("Forcing immediate process termination...")
 
+        # os._exit() skips atexit handlers, so write queued log records and
+        # telemetry first
+        flush_logging()
+        flush_file_telemetry()
+
         # Use os._exit() instead of sys.exit() to bypass cleanup and exit immediately
         os._exit(1)
 
@@ -156,6 +162,8 @@ def setup_local_telemetry(
         # Set up Strands telemetry
         strands_telemetry = StrandsTelemetry()
         strands_telemetry.setup_otlp_exporter()  # To OTLP endpoint
+        # Node and tool metrics recorded by WorkflowInstrumentation
+        strands_telemetry.setup_meter(enable_otlp_exporter=True)
         # strands_telemetry.setup_console_exporter()  # Console debug
 
         # Calculate UI port (typically OTLP port + 12268 for Jaeger)
@@ -0,0 +1,291 @@
+"""
+OpenTelemetry export to OTLP-JSON files in session log directories.
+
+setup_local_telemetry needs a collector such as Jaeger. Where there is
+nowhere to send telemetry (e.g. air-gapped CI), setup_file_telemetry
+instead appends spans and metrics to files in the session's logs
+directory, one OTLP-JSON export request per line, as written by the
+OpenTelemetry Collector's file exporter:
+
+    <logs dir>/spans.otlp.jsonl    ExportTraceServiceRequest per line
+    <logs dir>/metrics.otlp.jsonl  ExportMetricsServiceRequest per line
+
+Spans are routed to the session that started them (the output directory
+of the global config when the span started). Metrics are cumulative for the
+process, so each export is written to every session that is running.
+"""
+
+import base64
+import json
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import Message
+from opentelemetry import metrics
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.common.metrics_encoder import encode_metrics
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    MetricExporter,
+    MetricExportResult,
+    MetricsData,
+    PeriodicExportingMetricReader,
+)
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+# Span attribute with the output directory of the session that started the
+# span; session IDs are only unique within an output directory
+SESSION_ATTRIBUTE = "threat_composer.session_dir"
+
+# OTLP-JSON encodes trace and span IDs as hex rather than base64
+_ID_KEYS = {"traceId", "spanId", "parentSpanId"}
+
+
+def _hex_ids(value: object) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _ID_KEYS and isinstance(item, str):
+                value[key] = base64.b64decode(item).hex()
+            else:
+                _hex_ids(item)
+    elif isinstance(value, list):
+        for item in value:
+            _hex_ids(item)
+
+
+def to_otlp_json(message: Message) -> str:
+    """
+    Encode an OTLP protobuf message as a single line of OTLP-JSON.
+
+    Args:
+        message: OTLP export request
+
+    Returns:
+        JSON with camelCase field names, integer enums and hex IDs
+    """
+    data = MessageToDict(message, use_integers_for_enums=True)
+    _hex_ids(data)
+    return json.dumps(data, separators=(",", ":"))
+
+
+class OtlpJsonFileSink:
+    """Appends OTLP-JSON lines to the logs directories of running sessions."""
+
+    def __init__(self, spans_filename: str, metrics_filename: str):
+        """
+        Initialize file sink.
+
+        Args:
+            spans_filename: File name of the span export in a logs directory
+            metrics_filename: File name of the metrics export in a logs
+                directory
+        """
+        self.spans_filename = spans_filename
+        self.metrics_filename = metrics_filename
+        self._logs_dirs: dict[str, Path] = {}
+        self._lock = threading.Lock()
+
+    def add_session(self, session_dir: Path, logs_dir: Path) -> None:
+        """Start writing telemetry of a session to its logs directory."""
+        with self._lock:
+            self._logs_dirs[str(session_dir)] = Path(logs_dir)
+
+    def remove_session(self, session_dir: Path) -> None:
+        """Stop writing telemetry to a session's logs directory."""
+        with self._lock:
+            self._logs_dirs.pop(str(session_dir), None)
+
+    @property
+    def session_dirs(self) -> list[str]:
+        with self._lock:
+            return list(self._logs_dirs)
+
+    def write(self, session_dir: str, filename: str, line: str) -> None:
+        """Append a line to a file in a session's logs directory, if running."""
+        with self._lock:
+            logs_dir = self._logs_dirs.get(str(session_dir))
+            if logs_dir is None:
+                return
+            logs_dir.mkdir(parents=True, exist_ok=True)
+            with open(logs_dir / filename, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class SessionSpanProcessor(SpanProcessor):
+    """Tags spans with the session of the global config when they start."""
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        from ..config import get_global_config
+
+        config = get_global_config()
+        if config is not None:
+            span.set_attribute(SESSION_ATTRIBUTE, str(config.output_directory))
+
+
+class OtlpJsonFileSpanExporter(SpanExporter):
+    """Span exporter writing OTLP-JSON to the span's session."""
+
+    def __init__(self, sink: OtlpJsonFileSink):
+        """
+        Initialize span exporter.
+
+        Args:
+            sink: Sink writing to the logs directories of running sessions
+        """
+        self.sink = sink
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        by_session: dict[str, list[ReadableSpan]] = {}
+        for span in spans:
+            session_dir = (span.attributes or {}).get(SESSION_ATTRIBUTE)
+            if session_dir is not None:
+                by_session.setdefault(str(session_dir), []).append(span)
+        try:
+            for session_dir, session_spans in by_session.items():
+                self.sink.write(
+                    session_dir,
+                    self.sink.spans_filename,
+                    to_otlp_json(encode_spans(session_spans)),
+                )
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class OtlpJsonFileMetricExporter(MetricExporter):
+    """Metric exporter writing OTLP-JSON to every running session."""
+
+    def __init__(self, sink: OtlpJsonFileSink):
+        """
+        Initialize metric exporter.
+
+        Args:
+            sink: Sink writing to the logs directories of running sessions
+        """
+        super().__init__()
+        self.sink = sink
+
+    def export(
+        self, metrics_data: MetricsData, timeout_millis: float = 10_000, **kwargs
+    ) -> MetricExportResult:
+        line = to_otlp_json(encode_metrics(metrics_data))
+        try:
+            for session_dir in self.sink.session_dirs:
+                self.sink.write(session_dir, self.sink.metrics_filename, line)
+        except OSError:
+            return MetricExportResult.FAILURE
+        return MetricExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: float = 10_000) -> bool:
+        return True
+
+    def shutdown(self, timeout_millis: float = 30_000, **kwargs) -> None:
+        pass
+
+
+class _FileTelemetry:
+    """Providers and sink of the process-wide file telemetry."""
+
+    def __init__(self, sink: OtlpJsonFileSink, telemetry, meter_provider):
+        self.sink = sink
+        self.telemetry = telemetry
+        self.meter_provider = meter_provider
+
+    def flush(self) -> None:
+        self.telemetry.tracer_provider.force_flush()
+        self.meter_provider.force_flush()
+
+
+_file_telemetry: _FileTelemetry | None = None
+_file_telemetry_lock = threading.Lock()
+
+
+def setup_file_telemetry(
+    session_dir: Path,
+    logs_dir: Path,
+    service_name: str,
+    spans_filename: str,
+    metrics_filename: str,
+) -> bool:
+    """Set up local telemetry to write OTLP-JSON files to a logs directory.
+
+    The exporters are set up once per process; later calls (e.g. further MCP
+    jobs) add their session to them.
+
+    Args:
+        session_dir: Output directory of the session
+        logs_dir: Logs directory of the session
+        service_name: Service name for telemetry identification
+        spans_filename: File name of the span export
+        metrics_filename: File name of the metrics export
+
+    Returns:
+        bool: True if telemetry was successfully configured, False otherwise
+    """
+    global _file_telemetry
+    from ..logging import log_error, log_success
+
+    try:
+        with _file_telemetry_lock:
+            if _file_telemetry is None:
+                from strands.telemetry import StrandsTelemetry
+
+                os.environ["OTEL_SERVICE_NAME"] = service_name
+                sink = OtlpJsonFileSink(spans_filename, metrics_filename)
+
+                strands_telemetry = StrandsTelemetry()
+                strands_telemetry.tracer_provider.add_span_processor(
+                    SessionSpanProcessor()
+                )
+                strands_telemetry.tracer_provider.add_span_processor(
+                    BatchSpanProcessor(OtlpJsonFileSpanExporter(sink))
+                )
+                # Node and tool metrics recorded by WorkflowInstrumentation
+                meter_provider = MeterProvider(
+                    resource=strands_telemetry.resource,
+                    metric_readers=[
+                        PeriodicExportingMetricReader(OtlpJsonFileMetricExporter(sink))
+                    ],
+                )
+                metrics.set_meter_provider(meter_provider)
+                _file_telemetry = _FileTelemetry(
+                    sink, strands_telemetry, meter_provider
+                )
+            _file_telemetry.sink.add_session(session_dir, logs_dir)
+
+        log_success(f"Telemetry written to {logs_dir}")
+        return True
+    except Exception as e:
+        log_error(f"Could not set up telemetry: {e}")
+        return False
+
+
+def finish_file_telemetry(session_dir: Path) -> None:
+    """Write a session's pending telemetry and stop writing to its files."""
+    if _file_telemetry is None:
+        return
+    try:
+        _file_telemetry.flush()
+    finally:
+        _file_telemetry.sink.remove_session(session_dir)
+
+
+def flush_file_telemetry() -> None:
+    """Write pending telemetry, e.g. before the process exits abruptly."""
+    if _file_telemetry is not None:
+        _file_telemetry.flush()
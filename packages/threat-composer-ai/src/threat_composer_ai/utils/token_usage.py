@@ -0,0 +1,24 @@
+"""Token usage helpers."""
+
+
+def cache_hit_rate(
+    input_tokens: int, cache_read_tokens: int, cache_write_tokens: int
+) -> float | None:
+    """
+    Get the fraction of input tokens served from the prompt cache.
+
+    Bedrock reports cache reads and writes separately from inputTokens, so
+    all three make up the model input.
+
+    Args:
+        input_tokens: Input tokens not read from or written to the cache
+        cache_read_tokens: Input tokens read from the cache
+        cache_write_tokens: Input tokens written to the cache
+
+    Returns:
+        Fraction between 0 and 1 rounded to 4 digits, or None without input
+    """
+    total = input_tokens + cache_read_tokens + cache_write_tokens
+    if total == 0:
+        return None
+    return round(cache_read_tokens / total, 4)
@@ -1,8 +1,34 @@
 """Validation module for threat-composer-ai."""
 
 from .aws_validator import validate_aws_bedrock_access, validate_aws_bedrock_inference
+from .bulk_validator import (
+    BulkValidationReport,
+    FileIssue,
+    FileValidationResult,
+    build_json_report,
+    build_sarif_report,
+    collect_tc_files,
+    validate_tc_file,
+    validate_tc_files,
+)
 from .code_scanner import CodeScanResult, SecurityIssue, scan_diagram_code
 from .graphviz_validator import validate_graphviz_installation
+from .reference_integrity import (
+    ReferenceCheckResult,
+    ReferenceIssue,
+    check_reference_integrity,
+    check_reference_integrity_json,
+    format_reference_issues,
+)
+from .schema_validator import (
+    clear_validation_cache,
+    format_error_location,
+    get_entry_adapter,
+    get_section_adapter,
+    validate_tc_data_incremental,
+    validate_tc_json_bytes,
+    validate_tc_section_json,
+)
 
 __all__ = [
     "validate_aws_bedrock_access",
@@ -11,4 +37,24 @@ __all__ = [
     "scan_diagram_code",
     "CodeScanResult",
     "SecurityIssue",
+    "validate_tc_data_incremental",
+    "validate_tc_json_bytes",
+    "validate_tc_section_json",
+    "get_entry_adapter",
+    "get_section_adapter",
+    "clear_validation_cache",
+    "format_error_location",
+    "check_reference_integrity",
+    "check_reference_integrity_json",
+    "format_reference_issues",
+    "ReferenceCheckResult",
+    "ReferenceIssue",
+    "collect_tc_files",
+    "validate_tc_file",
+    "validate_tc_files",
+    "build_json_report",
+    "build_sarif_report",
+    "BulkValidationReport",
+    "FileIssue",
+    "FileValidationResult",
 ]
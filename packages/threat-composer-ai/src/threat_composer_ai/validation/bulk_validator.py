@@ -0,0 +1,380 @@
+"""
+Bulk validation of Threat Composer v1 files.
+
+Validates many .tc.json files at once, e.g. to gate a repository of threat
+models in CI:
+- Paths are expanded to the .tc.json files they contain, in sorted order
+- Files are validated across a process pool; each worker builds the model
+  and entry adapters once when it starts and reuses them for every file
+- Each file is schema validated from its raw bytes and, when valid, checked
+  for reference integrity; links to missing entities are warnings unless
+  strict_references is set
+- Results are reported as JSON or as a SARIF 2.1.0 log built with sarif-om
+
+Workers only return plain dataclasses, so results are cheap to pickle back to
+the parent process.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import attr
+from sarif_om import (
+    ArtifactLocation,
+    Location,
+    LogicalLocation,
+    Message,
+    MultiformatMessageString,
+    PhysicalLocation,
+    ReportingDescriptor,
+    Result,
+    Run,
+    SarifLog,
+    Tool,
+    ToolComponent,
+)
+
+from .reference_integrity import check_reference_integrity
+from .schema_validator import (
+    SECTION_MODELS,
+    format_error_location,
+    get_entry_adapter,
+    validate_tc_json_bytes,
+)
+
+# Suffix of the files collected from directories
+TC_FILE_SUFFIX = ".tc.json"
+
+# Below this many files, validating in the current process is faster than
+# starting a pool
+MIN_FILES_FOR_POOL = 16
+
+SARIF_SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+TOOL_NAME = "threat-composer-ai"
+
+# Rules reported by the validator, by ID
+RULES = {
+    "unreadable-file": "File could not be read",
+    "invalid-json": "File is not valid JSON",
+    "schema": "Value does not match the Threat Composer v1 schema",
+    "duplicate_id": "Entity ID is used more than once",
+    "dangling_reference": "Link references an entity that does not exist",
+    "link_type_mismatch": "Link references an entity of the wrong kind",
+    "duplicate_link": "Link is repeated",
+    "orphan": "Mitigation is not linked to any threat or assumption",
+}
+
+
+@dataclass
+class FileIssue:
+    """Model for a problem found in one file."""
+
+    severity: str
+    rule: str
+    location: str
+    message: str
+
+
+@dataclass
+class FileValidationResult:
+    """Model for the validation result of one file."""
+
+    path: str
+    issues: list[FileIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[FileIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> list[FileIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class BulkValidationReport:
+    """Model for the validation results of a set of files."""
+
+    results: list[FileValidationResult] = field(default_factory=list)
+
+    @property
+    def invalid_files(self) -> list[FileValidationResult]:
+        return [result for result in self.results if not result.is_valid]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.invalid_files
+
+    @property
+    def error_count(self) -> int:
+        return sum(len(result.errors) for result in self.results)
+
+    @property
+    def warning_count(self) -> int:
+        return sum(len(result.warnings) for result in self.results)
+
+
+def collect_tc_files(paths: Iterable[Path]) -> list[Path]:
+    """
+    Expand paths to the threat composer files they contain.
+
+    Args:
+        paths: Files and directories; directories are searched recursively
+            for files ending in TC_FILE_SUFFIX
+
+    Returns:
+        Sorted list of unique files
+    """
+    files: set[Path] = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(p for p in path.rglob(f"*{TC_FILE_SUFFIX}") if p.is_file())
+        else:
+            files.add(path)
+    return sorted(files)
+
+
+def _warm_up_worker() -> None:
+    """Build the entry adapters once, before the worker validates any file."""
+    for section in SECTION_MODELS:
+        get_entry_adapter(section)
+
+
+def validate_tc_file(
+    path: str, strict_references: bool = False
+) -> FileValidationResult:
+    """
+    Validate one threat composer file.
+
+    Args:
+        path: Path of the file
+        strict_references: Report links to missing entities as errors
+            rather than warnings
+
+    Returns:
+        FileValidationResult listing schema and reference issues
+    """
+    result = FileValidationResult(path=path)
+    try:
+        content = Path(path).read_bytes()
+    except OSError as e:
+        result.issues.append(
+            FileIssue("error", "unreadable-file", "(root)", f"Cannot read file: {e}")
+        )
+        return result
+
+    errors = validate_tc_json_bytes(content)
+    for error in errors:
+        rule = "invalid-json" if error["type"] == "json_invalid" else "schema"
+        result.issues.append(
+            FileIssue(
+                "error",
+                rule,
+                format_error_location(error["loc"]) or "(root)",
+                error["msg"],
+            )
+        )
+    if errors:
+        return result
+
+    references = check_reference_integrity(
+        json.loads(content), strict_references=strict_references
+    )
+    for issue in references.issues:
+        result.issues.append(
+            FileIssue(issue.severity, issue.issue_type, issue.location, issue.message)
+        )
+    return result
+
+
+def validate_tc_files(
+    files: list[Path],
+    max_workers: int | None = None,
+    strict_references: bool = False,
+) -> BulkValidationReport:
+    """
+    Validate threat composer files, across a process pool when worthwhile.
+
+    Args:
+        files: Files to validate
+        max_workers: Number of worker processes; defaults to the CPU count.
+            With 1, or fewer than MIN_FILES_FOR_POOL files, files are
+            validated in the current process.
+        strict_references: Report links to missing entities as errors
+            rather than warnings
+
+    Returns:
+        BulkValidationReport with one result per file, in input order
+    """
+    paths = [str(path) for path in files]
+    validate = partial(validate_tc_file, strict_references=strict_references)
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+
+    if workers <= 1 or len(paths) < MIN_FILES_FOR_POOL:
+        return BulkValidationReport(results=[validate(p) for p in paths])
+
+    # Several files per task keeps inter-process overhead low for small files
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_warm_up_worker
+    ) as executor:
+        results = list(executor.map(validate, paths, chunksize=chunksize))
+    return BulkValidationReport(results=results)
+
+
+def _relative_path(path: str, base: Path | None) -> str:
+    """Path relative to base when it lies below it, with forward slashes."""
+    file_path = Path(path)
+    if base is not None:
+        try:
+            file_path = file_path.resolve().relative_to(base.resolve())
+        except ValueError:
+            pass
+    return file_path.as_posix()
+
+
+def _artifact_uri(path: str, base: Path | None) -> str:
+    """
+    SARIF artifact URI of a file.
+
+    Files below base get a relative URI reference; others get an absolute
+    file:// URI, as SARIF artifact locations are URIs, not file paths.
+    """
+    file_path = Path(path).resolve()
+    if base is not None:
+        try:
+            return quote(file_path.relative_to(base.resolve()).as_posix())
+        except ValueError:
+            pass
+    return file_path.as_uri()
+
+
+def build_json_report(
+    report: BulkValidationReport, base: Path | None = None
+) -> dict[str, Any]:
+    """
+    Build the JSON report for a bulk validation.
+
+    Args:
+        report: Validation results
+        base: Directory file paths are reported relative to
+
+    Returns:
+        Dictionary with a summary and the results of every file
+    """
+    return {
+        "summary": {
+            "files": len(report.results),
+            "invalidFiles": len(report.invalid_files),
+            "errors": report.error_count,
+            "warnings": report.warning_count,
+        },
+        "files": [
+            {
+                "path": _relative_path(result.path, base),
+                "valid": result.is_valid,
+                "issues": [asdict(issue) for issue in result.issues],
+            }
+            for result in report.results
+        ],
+    }
+
+
+def _sarif_to_dict(value: Any) -> Any:
+    """
+    Convert sarif-om objects to SARIF JSON values.
+
+    Properties use their SARIF names (e.g. "ruleId"), and properties left at
+    their default are omitted.
+    """
+    if attr.has(type(value)):
+        converted = {}
+        for attribute in attr.fields(type(value)):
+            item = getattr(value, attribute.name)
+            default = attribute.default
+            if isinstance(default, attr.Factory):
+                default = default.factory()
+            if item is None or item == default:
+                continue
+            converted[attribute.metadata["schema_property_name"]] = _sarif_to_dict(item)
+        return converted
+    if isinstance(value, list):
+        return [_sarif_to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _sarif_to_dict(item) for key, item in value.items()}
+    return value
+
+
+def build_sarif_report(
+    report: BulkValidationReport, base: Path | None = None
+) -> dict[str, Any]:
+    """
+    Build a SARIF 2.1.0 log for a bulk validation.
+
+    Issues are located by artifact URI and by the dotted path of the value in
+    the document, reported as a logical location.
+
+    Args:
+        report: Validation results
+        base: Directory artifact URIs are relative to; files outside it are
+            located by absolute file URIs
+
+    Returns:
+        SARIF log as a JSON-compatible dictionary
+    """
+    rule_ids = list(RULES)
+    rules = [
+        ReportingDescriptor(
+            id=rule_id,
+            short_description=MultiformatMessageString(text=description),
+        )
+        for rule_id, description in RULES.items()
+    ]
+
+    results = []
+    for file_result in report.results:
+        uri = _artifact_uri(file_result.path, base)
+        for issue in file_result.issues:
+            results.append(
+                Result(
+                    rule_id=issue.rule,
+                    rule_index=rule_ids.index(issue.rule),
+                    level=issue.severity,
+                    message=Message(text=issue.message),
+                    locations=[
+                        Location(
+                            physical_location=PhysicalLocation(
+                                artifact_location=ArtifactLocation(uri=uri)
+                            ),
+                            logical_locations=[
+                                LogicalLocation(fully_qualified_name=issue.location)
+                            ],
+                        )
+                    ],
+                )
+            )
+
+    log = SarifLog(
+        schema_uri=SARIF_SCHEMA_URI,
+        version=SARIF_VERSION,
+        runs=[
+            Run(
+                tool=Tool(driver=ToolComponent(name=TOOL_NAME, rules=rules)),
+                results=results,
+            )
+        ],
+    )
+    return _sarif_to_dict(log)
@@ -5,12 +5,18 @@ import subprocess
 
 from ..logging import log_debug, log_error, log_success
 
+# Set once Graphviz has been validated; the installation does not change
+# during the lifetime of the process, so repeated runs (e.g. several MCP
+# workflows) skip spawning `dot -V` again
+_graphviz_validated = False
+
 
 def validate_graphviz_installation() -> bool:
     """
     Validate that Graphviz is installed and accessible.
 
     Graphviz is required for the diagrams library to generate DFD diagrams.
+    A successful check is remembered for the rest of the process.
 
     Returns:
         bool: True if Graphviz is installed, False otherwise
@@ -18,6 +24,11 @@ def validate_graphviz_installation() -> bool:
     Raises:
         SystemExit: If Graphviz is not found with installation instructions
     """
+    global _graphviz_validated
+    if _graphviz_validated:
+        log_debug("Graphviz installation already validated")
+        return True
+
     log_debug("Checking Graphviz installation")
 
     # Check if 'dot' command is available (main Graphviz executable)
@@ -55,6 +66,7 @@ def validate_graphviz_installation() -> bool:
         log_debug(f"Graphviz found at: {dot_path}")
         log_debug(f"Graphviz version: {version_output}")
         log_success("Graphviz installation validated")
+        _graphviz_validated = True
         return True
 
     except subprocess.TimeoutExpired:
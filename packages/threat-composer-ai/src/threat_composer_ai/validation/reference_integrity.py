@@ -0,0 +1,296 @@
+"""
+Cross-reference integrity checks for Threat Composer v1 data.
+
+ThreatComposerV1Model validates each entry on its own; it cannot tell whether
+the IDs used by assumptionLinks and mitigationLinks point at entities that
+exist. This module indexes entity IDs once and checks, in a single pass over
+the links:
+- Entity IDs are unique across assumptions, mitigations and threats
+- Every link references existing entities of the expected kind
+- Links are not repeated
+- Mitigations are linked to something (reported as warnings)
+
+Links to entities that do not exist are reported as warnings by default:
+the Threat Composer app loads such files without complaint, and its own
+example workspaces contain them. Pass strict_references=True to report them
+as errors, e.g. for models assembled by the workflow.
+
+Component files produced by individual agents only contain some sections
+(e.g. mitigations.tc.json links to threats that live in threats.tc.json), so
+by default links into a section that is absent or empty are not checked.
+Pass complete=True for assembled models, where every section is present.
+
+check_reference_integrity_json checks a file's raw JSON and remembers the
+result per cache key, so validating an unchanged file again does not load
+it into Python objects.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+# Entity sections whose entries have an "id"
+ENTITY_SECTIONS = ("assumptions", "mitigations", "threats")
+
+# Section holding the entities referenced by each assumption link type
+ASSUMPTION_LINK_TARGETS = {"Threat": "threats", "Mitigation": "mitigations"}
+
+# Sections a mitigation link may point at
+MITIGATION_LINK_TARGETS = ("threats", "assumptions")
+
+# Last result per cache key, with the digest and options it was checked with
+_result_cache: dict[str, tuple[tuple, "ReferenceCheckResult"]] = {}
+_result_cache_lock = Lock()
+
+
+@dataclass
+class ReferenceIssue:
+    """Model for a cross-reference problem found in threat composer data."""
+
+    severity: str
+    issue_type: str
+    location: str
+    message: str
+
+
+@dataclass
+class ReferenceCheckResult:
+    """Model for reference integrity check result."""
+
+    issues: list[ReferenceIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[ReferenceIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> list[ReferenceIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+def _entries(data: dict[str, Any], section: str) -> list[dict[str, Any]]:
+    """Return the dictionary entries of a list section."""
+    value = data.get(section)
+    if not isinstance(value, list):
+        return []
+    return [entry for entry in value if isinstance(entry, dict)]
+
+
+def check_reference_integrity(
+    data: dict[str, Any], complete: bool = False, strict_references: bool = False
+) -> ReferenceCheckResult:
+    """
+    Check that IDs are unique and links reference existing entities.
+
+    Args:
+        data: Threat composer data (already schema validated)
+        complete: True if every section is present, as in an assembled model.
+            Otherwise links into absent or empty sections are not checked.
+        strict_references: Report links to missing entities as errors
+            rather than warnings
+
+    Returns:
+        ReferenceCheckResult listing errors and warnings
+    """
+    result = ReferenceCheckResult()
+    if not isinstance(data, dict):
+        return result
+
+    # Index entity IDs once: id -> (section, index)
+    id_index: dict[str, tuple[str, int]] = {}
+    for section in ENTITY_SECTIONS:
+        for index, entry in enumerate(_entries(data, section)):
+            entity_id = entry.get("id")
+            if not isinstance(entity_id, str):
+                continue
+            if entity_id in id_index:
+                first_section, first_index = id_index[entity_id]
+                result.issues.append(
+                    ReferenceIssue(
+                        severity="error",
+                        issue_type="duplicate_id",
+                        location=f"{section}.{index}.id",
+                        message=f"ID {entity_id} is already used by "
+                        f"{first_section}.{first_index}",
+                    )
+                )
+                continue
+            id_index[entity_id] = (section, index)
+
+    checked_sections = {
+        section for section in ENTITY_SECTIONS if complete or _entries(data, section)
+    }
+    linked_mitigations: set[str] = set()
+
+    def check_target(
+        location: str, target_id: Any, expected: tuple[str, ...], description: str
+    ) -> None:
+        if not isinstance(target_id, str):
+            return
+        found = id_index.get(target_id)
+        if found is not None and found[0] in expected:
+            return
+        if found is not None:
+            result.issues.append(
+                ReferenceIssue(
+                    severity="error",
+                    issue_type="link_type_mismatch",
+                    location=location,
+                    message=f"{target_id} should be {description} but refers to "
+                    f"{found[0]}.{found[1]}",
+                )
+            )
+        elif any(section in checked_sections for section in expected):
+            result.issues.append(
+                ReferenceIssue(
+                    severity="error" if strict_references else "warning",
+                    issue_type="dangling_reference",
+                    location=location,
+                    message=f"{target_id} does not match any {description}",
+                )
+            )
+
+    seen_links: set[tuple] = set()
+
+    def check_duplicate(location: str, link: tuple) -> None:
+        if link in seen_links:
+            result.issues.append(
+                ReferenceIssue(
+                    severity="warning",
+                    issue_type="duplicate_link",
+                    location=location,
+                    message="Link is repeated",
+                )
+            )
+        seen_links.add(link)
+
+    for index, link in enumerate(_entries(data, "assumptionLinks")):
+        location = f"assumptionLinks.{index}"
+        assumption_id = link.get("assumptionId")
+        linked_id = link.get("linkedId")
+        link_type = link.get("type")
+        check_duplicate(location, ("assumption", link_type, assumption_id, linked_id))
+
+        check_target(
+            f"{location}.assumptionId", assumption_id, ("assumptions",), "assumption"
+        )
+        target_section = ASSUMPTION_LINK_TARGETS.get(link_type)
+        if target_section is not None:
+            check_target(
+                f"{location}.linkedId",
+                linked_id,
+                (target_section,),
+                link_type.lower(),
+            )
+        if link_type == "Mitigation" and isinstance(linked_id, str):
+            linked_mitigations.add(linked_id)
+
+    for index, link in enumerate(_entries(data, "mitigationLinks")):
+        location = f"mitigationLinks.{index}"
+        mitigation_id = link.get("mitigationId")
+        linked_id = link.get("linkedId")
+        check_duplicate(location, ("mitigation", mitigation_id, linked_id))
+
+        check_target(
+            f"{location}.mitigationId", mitigation_id, ("mitigations",), "mitigation"
+        )
+        check_target(
+            f"{location}.linkedId",
+            linked_id,
+            MITIGATION_LINK_TARGETS,
+            "threat or assumption",
+        )
+        if isinstance(mitigation_id, str):
+            linked_mitigations.add(mitigation_id)
+
+    # Mitigations and their links are always written to the same file
+    for index, mitigation in enumerate(_entries(data, "mitigations")):
+        mitigation_id = mitigation.get("id")
+        if isinstance(mitigation_id, str) and mitigation_id not in linked_mitigations:
+            result.issues.append(
+                ReferenceIssue(
+                    severity="warning",
+                    issue_type="orphan",
+                    location=f"mitigations.{index}",
+                    message=f"Mitigation {mitigation_id} is not linked to any "
+                    "threat or assumption",
+                )
+            )
+
+    return result
+
+
+def check_reference_integrity_json(
+    content: bytes,
+    cache_key: str | None = None,
+    complete: bool = False,
+    strict_references: bool = False,
+) -> ReferenceCheckResult:
+    """
+    Check the references of a schema-valid JSON document from its raw bytes.
+
+    The result is remembered per cache key and reused while the content and
+    options are unchanged.
+
+    Args:
+        content: Raw JSON document
+        cache_key: Optional key identifying the document across calls
+        complete: True if every section is present, as in an assembled model
+        strict_references: Report links to missing entities as errors
+            rather than warnings
+
+    Returns:
+        ReferenceCheckResult listing errors and warnings
+    """
+    if cache_key is None:
+        return check_reference_integrity(
+            json.loads(content), complete, strict_references
+        )
+
+    key = (
+        hashlib.blake2b(content, digest_size=16).digest(),
+        complete,
+        strict_references,
+    )
+    with _result_cache_lock:
+        cached = _result_cache.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    result = check_reference_integrity(json.loads(content), complete, strict_references)
+    with _result_cache_lock:
+        _result_cache[cache_key] = (key, result)
+    return result
+
+
+def clear_reference_cache(cache_key: str | None = None) -> None:
+    """
+    Forget remembered reference check results.
+
+    Args:
+        cache_key: Key to forget, or None to clear results for all documents
+    """
+    with _result_cache_lock:
+        if cache_key is None:
+            _result_cache.clear()
+        else:
+            _result_cache.pop(cache_key, None)
+
+
+def format_reference_issues(issues: list[ReferenceIssue]) -> list[str]:
+    """
+    Format reference issues as one line each, in the style of schema errors.
+
+    Args:
+        issues: Issues to format
+
+    Returns:
+        List of formatted messages
+    """
+    return [f"Field '{issue.location}' - {issue.message}" for issue in issues]
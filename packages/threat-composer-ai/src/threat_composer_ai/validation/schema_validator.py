@@ -0,0 +1,286 @@
+"""
+Incremental Threat Composer v1 schema validation.
+
+Validating a whole document through ThreatComposerV1Model rebuilds and checks
+every entry on each call. Agents validate the same component file many times
+while editing a few entries, so this module validates each list section entry
+by entry with TypeAdapters built once per process, and can remember the
+result for each entry of a file so only entries whose JSON changed since the
+last validation of that file are checked again.
+
+Validation runs in Pydantic's strict JSON mode, matching the types allowed by
+the JSON schema (e.g. "1" is not accepted for an integer field). Files can be
+validated straight from their bytes with validate_tc_json_bytes, which parses
+and validates in pydantic-core without building Python dictionaries first.
+
+Top-level sections can also be validated on their own with
+validate_tc_section_json, so a document can be checked while it is written
+section by section.
+
+Errors use the same shape and locations as ThreatComposerV1Model validation
+errors (e.g. ("threats", 3, "metadata", 0, "PriorityMetadata", "value")).
+format_error_location turns them into dotted paths without the metadata union
+tags (e.g. "threats.3.metadata.0.value").
+"""
+
+import hashlib
+import json
+from functools import cache
+from threading import Lock
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..models.threat_composer_v1 import (
+    METADATA_TAGS,
+    Assumption,
+    AssumptionLink,
+    Mitigation,
+    MitigationLink,
+    Threat,
+    ThreatComposerV1Model,
+)
+from .reference_integrity import clear_reference_cache
+
+# List sections of the document and the model each entry is validated against
+SECTION_MODELS: dict[str, type] = {
+    "assumptions": Assumption,
+    "mitigations": Mitigation,
+    "threats": Threat,
+    "assumptionLinks": AssumptionLink,
+    "mitigationLinks": MitigationLink,
+}
+
+# Per-file validation results: cache key -> section -> entry digest -> errors.
+# Each validation replaces a file's entries, so entries removed from the file
+# do not accumulate.
+_entry_error_cache: dict[str, dict[str, dict[bytes, list[dict]]]] = {}
+_entry_error_cache_lock = Lock()
+
+# Digest of the last content that passed validation, per cache key, so an
+# unchanged valid file is not validated again
+_valid_document_digests: dict[str, bytes] = {}
+
+
+@cache
+def get_entry_adapter(section: str) -> TypeAdapter:
+    """
+    Get the TypeAdapter validating a single entry of a list section.
+
+    Args:
+        section: Section name, one of SECTION_MODELS
+
+    Returns:
+        TypeAdapter for the section's entry model, built once per process
+    """
+    return TypeAdapter(SECTION_MODELS[section])
+
+
+@cache
+def get_section_adapter(section: str) -> TypeAdapter:
+    """
+    Get the TypeAdapter validating a whole top-level section.
+
+    Args:
+        section: Top-level key as written in the document (e.g. "schema",
+            "architecture", "threats")
+
+    Returns:
+        TypeAdapter for the section's field type, built once per process
+
+    Raises:
+        KeyError: If the section is not part of the v1 schema
+    """
+    for name, field in ThreatComposerV1Model.model_fields.items():
+        if (field.alias or name) == section:
+            return TypeAdapter(field.annotation)
+    raise KeyError(section)
+
+
+def format_error_location(loc: tuple) -> str:
+    """
+    Format the location of a validation error as a dotted path.
+
+    Args:
+        loc: Location of a Pydantic error
+
+    Returns:
+        Dotted path without metadata union tags, e.g. "threats.3.metadata.0.value"
+    """
+    return ".".join(str(part) for part in loc if part not in METADATA_TAGS)
+
+
+def _canonical_json(value: Any) -> bytes:
+    """Serialize a value to compact JSON with sorted keys."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def _digest(content: bytes) -> bytes:
+    """Digest used to detect changed entries and documents."""
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _validate_entry(section: str, entry_json: bytes) -> list[dict]:
+    """Validate one section entry, returning errors relative to the entry."""
+    try:
+        get_entry_adapter(section).validate_json(entry_json, strict=True)
+    except ValidationError as e:
+        return e.errors()
+    return []
+
+
+def _validate_model_json(content: bytes) -> list[dict]:
+    """Validate a JSON document against the full model."""
+    try:
+        ThreatComposerV1Model.model_validate_json(content, strict=True)
+    except ValidationError as e:
+        return e.errors()
+    return []
+
+
+def validate_tc_section_json(section: str, content: bytes) -> list[dict]:
+    """
+    Validate the JSON value of one top-level section.
+
+    Args:
+        section: Top-level key the value is written under
+        content: Raw JSON value of the section
+
+    Returns:
+        List of Pydantic error dictionaries with document-level locations;
+        empty if the section is valid. Unknown sections are reported as
+        "extra_forbidden", as ThreatComposerV1Model would.
+    """
+    if section == "schema":
+        # The version limit is enforced by a model validator, not the field type
+        return _validate_model_json(b'{"schema":' + content + b"}")
+    try:
+        adapter = get_section_adapter(section)
+    except KeyError:
+        return [
+            {
+                "type": "extra_forbidden",
+                "loc": (section,),
+                "msg": "Extra inputs are not permitted",
+                "input": None,
+            }
+        ]
+    try:
+        adapter.validate_json(content, strict=True)
+    except ValidationError as e:
+        return [{**error, "loc": (section, *error["loc"])} for error in e.errors()]
+    return []
+
+
+def validate_tc_data_incremental(data: Any, cache_key: str | None = None) -> list[dict]:
+    """
+    Validate threat composer data section by section.
+
+    Top-level fields are validated with ThreatComposerV1Model after removing
+    the list sections, and each list entry is validated on its own. When a
+    cache key (typically the resolved file path) is given, entries that are
+    unchanged since the previous validation with that key reuse its result.
+
+    Args:
+        data: Parsed JSON document to validate
+        cache_key: Optional key identifying the document across calls
+
+    Returns:
+        List of Pydantic error dictionaries with document-level locations;
+        empty if the data is valid
+    """
+    if not isinstance(data, dict):
+        return _validate_model_json(_canonical_json(data))
+
+    list_sections = {
+        section: data[section]
+        for section in SECTION_MODELS
+        if isinstance(data.get(section), list)
+    }
+
+    top_level = {k: v for k, v in data.items() if k not in list_sections}
+    errors = _validate_model_json(_canonical_json(top_level))
+
+    previous: dict[str, dict[bytes, list[dict]]] = {}
+    if cache_key is not None:
+        with _entry_error_cache_lock:
+            previous = _entry_error_cache.get(cache_key, {})
+
+    current: dict[str, dict[bytes, list[dict]]] = {}
+    for section, entries in list_sections.items():
+        previous_results = previous.get(section, {})
+        section_results = current.setdefault(section, {})
+        for index, entry in enumerate(entries):
+            entry_json = _canonical_json(entry)
+            digest = _digest(entry_json)
+            entry_errors = section_results.get(digest)
+            if entry_errors is None:
+                entry_errors = previous_results.get(digest)
+            if entry_errors is None:
+                entry_errors = _validate_entry(section, entry_json)
+            section_results[digest] = entry_errors
+
+            for error in entry_errors:
+                errors.append({**error, "loc": (section, index, *error["loc"])})
+
+    if cache_key is not None:
+        with _entry_error_cache_lock:
+            _entry_error_cache[cache_key] = current
+
+    return errors
+
+
+def validate_tc_json_bytes(content: bytes, cache_key: str | None = None) -> list[dict]:
+    """
+    Validate a threat composer JSON document from its raw bytes.
+
+    The whole document is parsed and validated in pydantic-core in one step.
+    Valid content is remembered per cache key and not validated again while
+    it is unchanged. Only when the document is invalid is it loaded into
+    Python objects and validated per entry, so repeated attempts at fixing a
+    file reuse results for the entries that did not change.
+
+    Args:
+        content: Raw JSON document
+        cache_key: Optional key identifying the document across calls
+
+    Returns:
+        List of Pydantic error dictionaries; empty if the document is valid.
+        Malformed JSON is reported as a single "json_invalid" error.
+    """
+    digest = _digest(content)
+    if cache_key is not None:
+        with _entry_error_cache_lock:
+            if _valid_document_digests.get(cache_key) == digest:
+                return []
+
+    errors = _validate_model_json(content)
+    if not errors:
+        if cache_key is not None:
+            with _entry_error_cache_lock:
+                _valid_document_digests[cache_key] = digest
+        return []
+
+    if any(error["type"] == "json_invalid" for error in errors):
+        return errors
+
+    return validate_tc_data_incremental(json.loads(content), cache_key)
+
+
+def clear_validation_cache(cache_key: str | None = None) -> None:
+    """
+    Forget remembered validation results.
+
+    Args:
+        cache_key: Key to forget, or None to clear results for all documents
+    """
+    with _entry_error_cache_lock:
+        if cache_key is None:
+            _entry_error_cache.clear()
+            _valid_document_digests.clear()
+        else:
+            _entry_error_cache.pop(cache_key, None)
+            _valid_document_digests.pop(cache_key, None)
+    clear_reference_cache(cache_key)
@@ -23,6 +23,7 @@ from ..agents import (
     create_architecture_diagram_agent,
     create_dataflow_agent,
     create_dataflow_diagram_agent,
+    create_deduplication_node,
     create_mitigations_agent,
     create_threat_model_agent,
     create_threats_agent,
@@ -119,14 +120,16 @@ def create_baseline_threat_modeling_workflow(
         - dataflow_diagram: Creates data flow diagrams
         - threats: Performs STRIDE analysis and threat identification
         - mitigations: Develops mitigation strategies for identified threats
+        - deduplicate: Merges near-duplicate threats and mitigations (no model
+          calls; skipped when merge_near_duplicates is disabled)
         - threat_model: Synthesizes results into Threat Composer schema format
 
     Execution Flow:
         application_info → architecture → dataflow → threats → mitigations
-                     ↓           ↓
-        architecture_diagram  dataflow_diagram
-                     ↓           ↓
-                  threat_model ←←←←
+                     ↓           ↓                                ↓
+        architecture_diagram  dataflow_diagram                deduplicate
+                     ↓           ↓                                ↓
+                  threat_model ←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←←
 
     Args:
         config (Optional[AppConfig]): Application configuration object containing:
@@ -168,7 +171,7 @@ def create_baseline_threat_modeling_workflow(
     Note:
         - The workflow uses conditional edges to ensure the threat_model node
           only executes after all dependencies (architecture_diagram,
-          dataflow_diagram, mitigations) are complete
+          dataflow_diagram, mitigations or deduplicate) are complete
         - Graph execution includes safeguards against infinite loops and
           timeout protection
         - Agent context is cleared before workflow-level logging to prevent
@@ -187,6 +190,11 @@ def create_baseline_threat_modeling_workflow(
     threats = create_threats_agent(config, previous_session_path)
     mitigations = create_mitigations_agent(config, previous_session_path)
     threat_model = create_threat_model_agent(config, previous_session_path)
+    deduplicate = (
+        create_deduplication_node(config)
+        if config and config.merge_near_duplicates
+        else None
+    )
 
     # Build the workflow graph
     builder = GraphBuilder()
@@ -201,10 +209,18 @@ def create_baseline_threat_modeling_workflow(
     builder.add_node(mitigations, "mitigations")
     builder.add_node(threat_model, "threat_model")
 
+    # Near-duplicates are merged after mitigations, once every file that
+    # links to threats and mitigations has been written
+    mitigations_output = "mitigations"
+    if deduplicate is not None:
+        builder.add_node(deduplicate, "deduplicate")
+        builder.add_edge("mitigations", "deduplicate")
+        mitigations_output = "deduplicate"
+
     # Create conditional dependency checker for threat_model
     # threat_model should only execute when ALL of its dependencies are complete
     threat_model_condition = create_dependency_condition(
-        ["architecture_diagram", "dataflow_diagram", "mitigations"]
+        ["architecture_diagram", "dataflow_diagram", mitigations_output]
     )
 
     # Edges for the graph
@@ -223,7 +239,9 @@ def create_baseline_threat_modeling_workflow(
     builder.add_edge(
         "architecture_diagram", "threat_model", condition=threat_model_condition
     )
-    builder.add_edge("mitigations", "threat_model", condition=threat_model_condition)
+    builder.add_edge(
+        mitigations_output, "threat_model", condition=threat_model_condition
+    )
 
     # Set entry point
     builder.set_entry_point("application_info")
@@ -0,0 +1,83 @@
+"""Tests for the cached system prompt layout."""
+
+import pytest
+
+from threat_composer_ai.agents import (
+    application_info,
+    architecture,
+    dataflow,
+    mitigations,
+    threats,
+)
+from threat_composer_ai.agents.common import (
+    AI_GENERATED_TAG_PLACEHOLDER,
+    create_cached_system_prompt,
+)
+from threat_composer_ai.config import AppConfig
+from threat_composer_ai.utils import cache_hit_rate
+
+PROMPT_MODULES = [application_info, architecture, dataflow, threats, mitigations]
+
+
+def make_config(tmp_path, name, ai_generated_tag=None):
+    working_directory = tmp_path / name
+    working_directory.mkdir()
+    return AppConfig.create(
+        working_directory=working_directory,
+        output_directory=tmp_path / name / "output",
+        ai_generated_tag=ai_generated_tag,
+    )
+
+
+class TestCachedSystemPrompt:
+    """Tests for create_cached_system_prompt."""
+
+    def test_static_prompt_only(self):
+        blocks = create_cached_system_prompt("static")
+
+        assert blocks == [{"text": "static"}, {"cachePoint": {"type": "default"}}]
+
+    def test_run_context_is_cached_separately(self):
+        blocks = create_cached_system_prompt("static", "dynamic")
+
+        assert [block.get("text") for block in blocks] == [
+            "static",
+            None,
+            "dynamic",
+            None,
+        ]
+
+
+class TestAgentPrompts:
+    """Tests for the agents' system prompts."""
+
+    @pytest.mark.parametrize("module", PROMPT_MODULES)
+    def test_static_prompt_is_the_same_across_runs(self, tmp_path, module):
+        first = module.create_system_prompt(make_config(tmp_path, "first"))
+        second = module.create_system_prompt(
+            make_config(tmp_path, "second", ai_generated_tag="Generated by a model")
+        )
+
+        assert len(first) == 4
+        assert first[0]["text"] == second[0]["text"]
+        assert first[2]["text"] != second[2]["text"]
+
+    @pytest.mark.parametrize("module", PROMPT_MODULES)
+    def test_run_values_are_in_run_context(self, tmp_path, module):
+        config = make_config(tmp_path, "run")
+        static, _, run_context, _ = module.create_system_prompt(config)
+
+        assert str(config.output_directory) not in static["text"]
+        assert AI_GENERATED_TAG_PLACEHOLDER in static["text"]
+        assert config.ai_generated_tag not in static["text"]
+        assert config.ai_generated_tag in run_context["text"]
+
+
+class TestCacheHitRate:
+    """Tests for cache_hit_rate."""
+
+    def test_fraction_of_all_input_tokens(self):
+        assert cache_hit_rate(10, 30, 10) == 0.6
+
+    def test_no_input(self):
+        assert cache_hit_rate(0, 0, 0) is None
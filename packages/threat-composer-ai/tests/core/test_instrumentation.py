@@ -0,0 +1,180 @@
+"""Tests for workflow instrumentation."""
+
+import json
+import warnings
+
+import pytest
+from strands import Agent, tool
+from strands.hooks import AfterModelCallEvent, HookProvider
+from strands.models import Model
+from strands.multiagent import GraphBuilder
+
+from threat_composer_ai.config import AppConfig
+from threat_composer_ai.config.export import export_run_report
+from threat_composer_ai.core.instrumentation import WorkflowInstrumentation
+
+USAGE = {
+    "inputTokens": 10,
+    "outputTokens": 5,
+    "totalTokens": 15,
+    "cacheReadInputTokens": 4,
+}
+
+
+class ScriptedModel(Model):
+    """Model that streams scripted responses: text, a tool use or an error."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    async def structured_output(self, output_model, prompt, **kwargs):
+        raise NotImplementedError
+        yield
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        yield {"messageStart": {"role": "assistant"}}
+        if "tool" in response:
+            tool_use = {"toolUseId": response["id"], "name": response["tool"]}
+            yield {"contentBlockStart": {"start": {"toolUse": tool_use}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": "{}"}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+        else:
+            yield {"contentBlockDelta": {"delta": {"text": response["text"]}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": USAGE, "metrics": {"latencyMs": 7}}}
+
+
+class RetryFailedModelCalls(HookProvider):
+    """Retry model calls that raised, like a retry strategy would."""
+
+    def register_hooks(self, registry, **kwargs):
+        registry.add_callback(AfterModelCallEvent, self._retry)
+
+    def _retry(self, event):
+        if event.exception is not None:
+            event.retry = True
+
+
+@tool
+def ping() -> str:
+    """Answer with pong."""
+    return "pong"
+
+
+def build_graph(first_responses, second_responses, hooks=()):
+    """Build a two node graph (first -> second) with instrumentation attached."""
+    first = Agent(
+        name="first_agent",
+        model=ScriptedModel(first_responses),
+        tools=[ping],
+        callback_handler=None,
+        hooks=list(hooks),
+    )
+    second = Agent(
+        name="second_agent",
+        model=ScriptedModel(second_responses),
+        callback_handler=None,
+    )
+    builder = GraphBuilder()
+    builder.add_node(first, "first")
+    builder.add_node(second, "second")
+    builder.add_edge("first", "second")
+    builder.set_entry_point("first")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        graph = builder.build()
+
+    instrumentation = WorkflowInstrumentation()
+    instrumentation.attach(graph)
+    return graph, instrumentation
+
+
+def run_graph(first_responses, second_responses, hooks=()):
+    """Run the graph of build_graph() and get its run report."""
+    graph, instrumentation = build_graph(first_responses, second_responses, hooks)
+    graph("Analyze")
+    return instrumentation.report()
+
+
+class TestWorkflowInstrumentation:
+    """Tests for WorkflowInstrumentation."""
+
+    def test_records_nodes_with_usage(self):
+        report = run_graph([{"text": "done"}], [{"text": "ok"}])
+
+        assert [node["node_id"] for node in report["nodes"]] == ["first", "second"]
+        first = report["nodes"][0]
+        assert first["status"] == "completed"
+        assert first["model_calls"] == 1
+        assert first["input_tokens"] == 10
+        assert first["output_tokens"] == 5
+        assert first["cache_read_tokens"] == 4
+        assert first["cache_hit_rate"] == round(4 / 14, 4)
+        assert first["model_latency_ms"] == 7
+        assert first["duration_ms"] >= 0
+        assert report["nodes"][1]["start_ms"] >= first["start_ms"]
+        assert report["totals"]["total_tokens"] == 30
+        assert report["totals"]["model_calls"] == 2
+        assert report["totals"]["cache_hit_rate"] == round(8 / 28, 4)
+
+    def test_records_tool_calls(self):
+        report = run_graph(
+            [{"tool": "ping", "id": "tool-1"}, {"text": "done"}], [{"text": "ok"}]
+        )
+
+        [call] = report["tools"]
+        assert call["node_id"] == "first"
+        assert call["tool"] == "ping"
+        assert call["tool_use_id"] == "tool-1"
+        assert call["status"] == "success"
+        assert call["queue_ms"] >= 0
+        assert report["nodes"][0]["tool_calls"] == 1
+        assert report["nodes"][0]["model_calls"] == 2
+
+    def test_counts_model_retries(self):
+        report = run_graph(
+            [RuntimeError("throttled"), {"text": "done"}],
+            [{"text": "ok"}],
+            hooks=[RetryFailedModelCalls()],
+        )
+
+        first = report["nodes"][0]
+        assert first["model_retries"] == 1
+        assert first["model_calls"] == 1
+        assert report["totals"]["model_retries"] == 1
+
+    def test_records_failed_node(self):
+        graph, instrumentation = build_graph([RuntimeError("model unavailable")], [])
+        with pytest.raises(Exception, match="model unavailable"):
+            graph("Analyze")
+
+        [node] = instrumentation.report()["nodes"]
+        assert node["node_id"] == "first"
+        assert node["status"] == "failed"
+        assert node["model_calls"] == 0
+
+
+class TestExportRunReport:
+    """Tests for export_run_report."""
+
+    def test_writes_report_to_config_directory(self, tmp_path):
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / "output"
+        )
+        export_run_report(config, WorkflowInstrumentation().report())
+
+        path = config.output_directory / config.config_output_sub_dir
+        report = json.loads((path / config.run_report_filename).read_text())
+        assert report["nodes"] == []
+        assert report["totals"]["total_tokens"] == 0
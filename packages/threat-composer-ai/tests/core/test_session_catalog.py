@@ -0,0 +1,168 @@
+"""Tests for the session catalog and catalog-based session discovery."""
+
+from pathlib import Path
+
+import pytest
+from strands.session import FileSessionManager
+
+from threat_composer_ai.core import SessionCatalog, SessionDiscovery
+from threat_composer_ai.core.session_catalog import (
+    CATALOG_FILENAME,
+    find_enclosing_catalogs,
+)
+
+
+def make_session(storage_dir: Path, session_id: str) -> Path:
+    """Create a session the way WorkflowRunner lays it out on disk."""
+    manager = FileSessionManager(
+        session_id=session_id, storage_dir=str(storage_dir / session_id)
+    )
+    return Path(manager.storage_dir) / f"session_{session_id}"
+
+
+class TestSessionCatalog:
+    """Tests for SessionCatalog."""
+
+    def test_latest_entry_wins(self, tmp_path):
+        session_dir = make_session(tmp_path, "run1")
+        catalog = SessionCatalog(tmp_path)
+        catalog.record("run1", session_dir, "running")
+        catalog.record("run1", session_dir, "completed")
+
+        entries = catalog.read()
+        assert list(entries) == ["run1"]
+        assert entries["run1"].status == "completed"
+        assert entries["run1"].session_path == session_dir
+
+    def test_paths_are_stored_relative(self, tmp_path):
+        session_dir = make_session(tmp_path, "run1")
+        SessionCatalog(tmp_path).record("run1", session_dir, "running")
+        assert '"session_path": "run1/session_run1"' in (
+            (tmp_path / CATALOG_FILENAME).read_text()
+        )
+
+    def test_malformed_lines_are_skipped(self, tmp_path):
+        session_dir = make_session(tmp_path, "run1")
+        catalog = SessionCatalog(tmp_path)
+        catalog.record("run1", session_dir, "running")
+        with open(catalog.path, "a") as f:
+            f.write('{"session_id": "run2", "sess')
+        assert list(catalog.read()) == ["run1"]
+
+    def test_new_catalog_includes_existing_sessions(self, tmp_path):
+        make_session(tmp_path, "old")
+        new_dir = make_session(tmp_path, "new")
+        SessionCatalog(tmp_path).record("new", new_dir, "running")
+
+        entries = SessionCatalog(tmp_path).read()
+        assert entries["old"].status == "unknown"
+        assert entries["new"].status == "running"
+
+
+class TestCatalogDiscovery:
+    """Tests for SessionDiscovery using catalogs."""
+
+    def test_catalog_lookup_avoids_recursive_scan(self, tmp_path, monkeypatch):
+        session_dir = make_session(tmp_path, "run1")
+        SessionCatalog(tmp_path).record("run1", session_dir, "running")
+
+        def fail_scan(self):
+            raise AssertionError("search directory was scanned")
+
+        monkeypatch.setattr(SessionDiscovery, "find_session_directories", fail_scan)
+        assert SessionDiscovery(tmp_path).get_session_path("run1") == session_dir
+
+    def test_cataloged_sessions_are_not_validated(self, tmp_path, monkeypatch):
+        session_dir = make_session(tmp_path, "run1")
+        SessionCatalog(tmp_path).record("run1", session_dir, "running")
+
+        def fail_validate(self, session_dir):
+            raise AssertionError(f"{session_dir} was validated")
+
+        monkeypatch.setattr(SessionDiscovery, "validate_session", fail_validate)
+        sessions = SessionDiscovery(tmp_path).list_sessions()
+        assert [s.session_id for s in sessions] == ["run1"]
+
+    def test_listing_with_a_catalog_avoids_recursive_scan(self, tmp_path, monkeypatch):
+        session_dir = make_session(tmp_path / ".threat-composer", "run1")
+        SessionCatalog(tmp_path / ".threat-composer").record(
+            "run1", session_dir, "running"
+        )
+
+        def fail_scan(self):
+            raise AssertionError("search directory was scanned")
+
+        monkeypatch.setattr(SessionDiscovery, "find_session_directories", fail_scan)
+        sessions = SessionDiscovery(tmp_path).list_sessions()
+        assert [s.session_id for s in sessions] == ["run1"]
+
+    def test_nested_output_directories_are_listed(self, tmp_path, monkeypatch):
+        cataloged = make_session(tmp_path / ".threat-composer", "a")
+        SessionCatalog(tmp_path / ".threat-composer").record("a", cataloged, "running")
+        nested_storage_dir = tmp_path / "svc" / ".threat-composer"
+        nested = make_session(nested_storage_dir, "b")
+        # As recorded by the runner
+        SessionCatalog(nested_storage_dir).record("b", nested, "running")
+        for catalog in find_enclosing_catalogs(nested_storage_dir):
+            catalog.record("b", nested.resolve(), "running")
+
+        def fail_scan(self):
+            raise AssertionError("search directory was scanned")
+
+        monkeypatch.setattr(SessionDiscovery, "find_session_directories", fail_scan)
+        discovery = SessionDiscovery(tmp_path)
+        sessions = discovery.list_sessions(sort_by="session_id")
+        assert [s.session_id for s in sessions] == ["a", "b"]
+        assert discovery.get_session_path("b") == nested.resolve()
+
+    def test_rebuild_keeps_sessions_of_nested_output_directories(self, tmp_path):
+        nested_storage_dir = tmp_path / "svc" / ".threat-composer"
+        nested = make_session(nested_storage_dir, "b")
+        catalog = SessionCatalog(tmp_path)
+        catalog.rebuild([])
+        catalog.record("b", nested.resolve(), "completed")
+
+        catalog.rebuild()
+        assert catalog.read()["b"].status == "completed"
+
+    def test_existing_catalogs_are_not_rewritten(self, tmp_path):
+        storage_dir = tmp_path / "project" / ".threat-composer"
+        session_dir = make_session(storage_dir, "run1")
+        catalog = SessionCatalog(storage_dir)
+        catalog.record("run1", session_dir, "running")
+        before = catalog.path.stat()
+        make_session(storage_dir, "copied")
+
+        sessions = SessionDiscovery(tmp_path).list_sessions(sort_by="session_id")
+        assert [s.session_id for s in sessions] == ["copied", "run1"]
+        after = catalog.path.stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    def test_default_output_directory_catalog_is_used(self, tmp_path):
+        storage_dir = tmp_path / ".threat-composer"
+        session_dir = make_session(storage_dir, "run1")
+        SessionCatalog(storage_dir).record("run1", session_dir, "running")
+        assert SessionDiscovery(tmp_path).get_session_path("run1") == session_dir
+
+    def test_missing_catalog_is_rebuilt_by_scan(self, tmp_path):
+        storage_dir = tmp_path / "project" / ".threat-composer"
+        make_session(storage_dir, "run1")
+
+        sessions = SessionDiscovery(tmp_path).list_sessions()
+        assert [s.session_id for s in sessions] == ["run1"]
+        assert list(SessionCatalog(storage_dir).read()) == ["run1"]
+
+    @pytest.mark.parametrize("session_id", ["copied", "unknown"])
+    def test_uncataloged_session_lookup_rescans(self, tmp_path, session_id):
+        first = make_session(tmp_path, "first")
+        SessionCatalog(tmp_path).record("first", first, "completed")
+        copied = make_session(tmp_path, "copied")
+
+        expected = copied if session_id == "copied" else None
+        assert SessionDiscovery(tmp_path).get_session_path(session_id) == expected
+
+    def test_deleted_sessions_are_not_listed(self, tmp_path):
+        session_dir = make_session(tmp_path, "run1")
+        SessionCatalog(tmp_path).record("run1", session_dir, "completed")
+        (session_dir / "session.json").unlink()
+        assert SessionDiscovery(tmp_path).list_sessions() == []
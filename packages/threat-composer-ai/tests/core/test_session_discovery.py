@@ -0,0 +1,73 @@
+"""Tests for SessionDiscovery session info loading and caching."""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from strands.session import FileSessionManager
+
+from threat_composer_ai.core import SessionDiscovery
+from threat_composer_ai.core.session_discovery import _parse_timestamp
+
+
+def make_session(storage_dir: Path, session_id: str) -> Path:
+    """Create a session the way WorkflowRunner lays it out on disk."""
+    manager = FileSessionManager(
+        session_id=session_id, storage_dir=str(storage_dir / session_id)
+    )
+    return Path(manager.storage_dir) / f"session_{session_id}"
+
+
+def write_multi_agent(session_dir: Path, status: str, mtime_offset: int) -> None:
+    """Write graph state for a session with a distinct modification time."""
+    state_dir = session_dir / "multi_agents" / "multi_agent_default_graph"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    state_file = state_dir / "multi_agent.json"
+    state_file.write_text(json.dumps({"status": status, "completed_nodes": []}))
+    stat = state_file.stat()
+    os.utime(state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+class TestSessionInfoCache:
+    """Tests for cached session info."""
+
+    def test_unchanged_sessions_are_not_reread(self, tmp_path, monkeypatch):
+        session_dir = make_session(tmp_path, "run1")
+        discovery = SessionDiscovery(tmp_path)
+        reads = []
+        original = SessionDiscovery._read_session_info
+
+        def counting_read(self, *args):
+            reads.append(args)
+            return original(self, *args)
+
+        monkeypatch.setattr(SessionDiscovery, "_read_session_info", counting_read)
+
+        first = discovery.get_session_info(session_dir, "run1")
+        second = SessionDiscovery(tmp_path).get_session_info(session_dir, "run1")
+        assert len(reads) == 1
+        assert second.created_at == first.created_at
+        assert second.age_seconds >= first.age_seconds
+
+        write_multi_agent(session_dir, "completed", mtime_offset=1_000_000_000)
+        assert discovery.get_session_info(session_dir, "run1").status == "completed"
+        assert len(reads) == 2
+
+    def test_sessions_are_listed_concurrently_in_order(self, tmp_path):
+        for i in range(12):
+            session_dir = make_session(tmp_path, f"run{i:02d}")
+            write_multi_agent(session_dir, "completed", mtime_offset=i)
+        sessions = SessionDiscovery(tmp_path).list_sessions(sort_by="session_id")
+        assert [s.session_id for s in sessions] == [f"run{i:02d}" for i in range(12)]
+        assert {s.status for s in sessions} == {"completed"}
+
+
+class TestParseTimestamp:
+    """Tests for _parse_timestamp."""
+
+    def test_offset_and_z_suffix(self):
+        expected = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        assert _parse_timestamp("2025-01-02T03:04:05+00:00") == expected
+        assert _parse_timestamp("2025-01-02T03:04:05Z") == expected
+        assert _parse_timestamp(expected) is expected
@@ -0,0 +1,153 @@
+"""Tests for file telemetry export and its summary."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from threat_composer_ai.cli.main import main
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.core import iter_otlp_spans, summarize_spans
+from threat_composer_ai.utils.telemetry_files import (
+    OtlpJsonFileMetricExporter,
+    OtlpJsonFileSink,
+    OtlpJsonFileSpanExporter,
+    SessionSpanProcessor,
+)
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig.create(
+        working_directory=tmp_path, output_directory=tmp_path / "output"
+    )
+    register_global_config(config)
+    return config
+
+
+@pytest.fixture
+def sink(config):
+    sink = OtlpJsonFileSink(
+        config.telemetry_spans_filename, config.telemetry_metrics_filename
+    )
+    sink.add_session(
+        config.output_directory, config.output_directory / config.logs_output_sub_dir
+    )
+    return sink
+
+
+@pytest.fixture
+def spans_file(config, sink):
+    """Spans of a run: a -> b, with c running alongside a."""
+    provider = TracerProvider()
+    provider.add_span_processor(SessionSpanProcessor())
+    provider.add_span_processor(SimpleSpanProcessor(OtlpJsonFileSpanExporter(sink)))
+    tracer = provider.get_tracer("test")
+
+    def span(name, start, end, **attributes):
+        tracer.start_span(
+            name,
+            start_time=start * MS,
+            attributes={f"threat_composer.{k}": v for k, v in attributes.items()},
+        ).end(end_time=end * MS)
+
+    span("node a", 1000, 1100, node_id="a", dependencies=[], input_tokens=10)
+    span("node c", 1000, 1050, node_id="c", dependencies=[], input_tokens=5)
+    span(
+        "node b",
+        1150,
+        1300,
+        node_id="b",
+        dependencies=["a", "c"],
+        input_tokens=20,
+        cache_read_tokens=30,
+    )
+    span("tool file_read", 1010, 1020, node_id="a", tool="file_read", queue_ms=2)
+    span("tool file_write", 1160, 1260, node_id="b", tool="file_write", queue_ms=1)
+    return config.output_directory / config.logs_output_sub_dir / "spans.otlp.jsonl"
+
+
+class TestFileExport:
+    """Tests for the OTLP-JSON file exporters."""
+
+    def test_spans_are_written_as_otlp_json(self, spans_file):
+        request = json.loads(spans_file.read_text().splitlines()[0])
+        [span] = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+        assert span["name"] == "node a"
+        assert len(span["traceId"]) == 32
+        assert len(span["spanId"]) == 16
+        assert span["kind"] == 1
+
+    def test_spans_of_other_sessions_are_not_written(self, tmp_path, config, sink):
+        register_global_config(
+            AppConfig.create(
+                working_directory=tmp_path, output_directory=tmp_path / "other"
+            )
+        )
+        provider = TracerProvider()
+        provider.add_span_processor(SessionSpanProcessor())
+        provider.add_span_processor(SimpleSpanProcessor(OtlpJsonFileSpanExporter(sink)))
+        provider.get_tracer("test").start_span("node x").end()
+
+        assert not (config.output_directory / config.logs_output_sub_dir).exists()
+
+    def test_metrics_are_written_to_running_sessions(self, config, sink):
+        reader = PeriodicExportingMetricReader(
+            OtlpJsonFileMetricExporter(sink), export_interval_millis=60_000
+        )
+        provider = MeterProvider(metric_readers=[reader])
+        provider.get_meter("test").create_counter("threat_composer.tokens").add(3)
+        provider.force_flush()
+        provider.shutdown()
+
+        metrics_file = (
+            config.output_directory / config.logs_output_sub_dir / "metrics.otlp.jsonl"
+        )
+        request = json.loads(metrics_file.read_text().splitlines()[0])
+        [metric] = request["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+        assert metric["name"] == "threat_composer.tokens"
+        assert metric["sum"]["dataPoints"][0]["asInt"] == "3"
+
+
+class TestSummarizeSpans:
+    """Tests for summarize_spans."""
+
+    def test_critical_path_follows_last_finished_dependency(self, spans_file):
+        summary = summarize_spans(list(iter_otlp_spans(spans_file)))
+
+        assert [step.node_id for step in summary.critical_path] == ["a", "b"]
+        assert summary.critical_path[1].wait_ms == 50
+        assert summary.critical_path_ms == 300
+        assert summary.duration_ms == 300
+
+    def test_slowest_tool_calls(self, spans_file):
+        summary = summarize_spans(list(iter_otlp_spans(spans_file)), top=1)
+
+        assert [span.get("tool") for span in summary.slowest_tools] == ["file_write"]
+        assert summary.tool_count == 2
+
+    def test_token_usage_per_node(self, spans_file):
+        summary = summarize_spans(list(iter_otlp_spans(spans_file)))
+
+        assert list(summary.tokens) == ["a", "c", "b"]
+        assert summary.tokens["b"]["cache_read_tokens"] == 30
+        assert summary.total_tokens["input_tokens"] == 35
+
+    def test_profile_command(self, config, spans_file):
+        result = CliRunner().invoke(main, ["profile", str(config.output_directory)])
+
+        assert result.exit_code == 0, result.output
+        assert "Critical path (300ms):" in result.output
+        assert "file_write" in result.output
+
+    def test_profile_command_without_spans(self, tmp_path):
+        result = CliRunner().invoke(main, ["profile", str(tmp_path)])
+
+        assert result.exit_code == 1
@@ -0,0 +1,137 @@
+"""Tests for the structured JSONL event log."""
+
+import json
+import logging
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.logging import (
+    JsonlEventHandler,
+    LogFilter,
+    close_log_file,
+    iter_events,
+    log_event,
+    setup_rich_logging,
+)
+from threat_composer_ai.logging.event_log import get_event_logger
+from threat_composer_ai.logging.pipeline import unwrap_handler
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = AppConfig.create(
+        working_directory=tmp_path, output_directory=tmp_path / "output"
+    )
+    register_global_config(config)
+    return config
+
+
+@pytest.fixture
+def event_log(config):
+    """Event log set up the way WorkflowRunner sets it up."""
+    logs_dir = config.output_directory / config.logs_output_sub_dir
+    setup_rich_logging(
+        log_file_path=logs_dir,
+        log_filename=config.log_filename,
+        event_log_filename=config.event_log_filename,
+    )
+    path = logs_dir / config.event_log_filename
+    yield path
+    close_log_file(logs_dir / config.log_filename)
+    close_log_file(path)
+
+
+class TestLogEvent:
+    """Tests for log_event."""
+
+    def test_event_fields(self, config, event_log):
+        log_event("tool_use", agent="threat_agent", tool="file_read", path=None)
+        close_log_file(event_log)
+
+        [event] = list(iter_events(event_log))
+        assert event["event"] == "tool_use"
+        assert event["agent"] == "threat_agent"
+        assert event["tool"] == "file_read"
+        assert event["level"] == "INFO"
+        assert event["session_id"] == config.output_directory.name
+        assert "path" not in event
+
+    def test_events_stay_out_of_text_log(self, config, event_log):
+        log_event("node_start", agent="threat_agent")
+        logs_dir = config.output_directory / config.logs_output_sub_dir
+        close_log_file(logs_dir / config.log_filename)
+        assert "node_start" not in (logs_dir / config.log_filename).read_text()
+
+    def test_other_workflow_events_are_not_written(self, tmp_path, event_log):
+        register_global_config(
+            AppConfig.create(
+                working_directory=tmp_path, output_directory=tmp_path / "other"
+            )
+        )
+        log_event("node_start", agent="threat_agent")
+        close_log_file(event_log)
+        assert list(iter_events(event_log)) == []
+
+    def test_close_removes_handler(self, event_log):
+        close_log_file(event_log)
+        assert not any(
+            isinstance(unwrap_handler(handler), JsonlEventHandler)
+            for handler in get_event_logger().handlers
+        )
+
+
+class TestJsonlEventHandler:
+    """Tests for buffered writes of JsonlEventHandler."""
+
+    def make_record(self, level=logging.INFO):
+        return logging.LogRecord("events", level, "", 0, "tick", (), None)
+
+    def test_writes_are_buffered_until_threshold(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        handler = JsonlEventHandler(path, flush_records=3, flush_interval=3600)
+        handler.emit(self.make_record())
+        handler.emit(self.make_record())
+        assert path.read_text() == ""
+        handler.emit(self.make_record())
+        assert len(path.read_text().splitlines()) == 3
+        handler.close()
+
+    def test_warnings_flush_immediately(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        handler = JsonlEventHandler(path, flush_records=100, flush_interval=3600)
+        handler.emit(self.make_record(logging.WARNING))
+        assert json.loads(path.read_text())["level"] == "WARNING"
+        handler.close()
+
+    def test_close_flushes(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        handler = JsonlEventHandler(path, flush_records=100, flush_interval=3600)
+        handler.emit(self.make_record())
+        handler.close()
+        assert json.loads(path.read_text())["event"] == "tick"
+
+
+class TestEventLines:
+    """Tests for reading event log lines."""
+
+    def test_log_filter_matches_event_lines(self):
+        lines = [
+            json.dumps({"level": "INFO", "agent": "threat_agent", "event": "a"}),
+            json.dumps({"level": "ERROR", "agent": "system", "event": "b"}),
+            json.dumps({"level": "INFO", "event": "c"}),
+        ]
+        assert [
+            line for line in lines if LogFilter(agent="THREAT_AGENT").matches(line)
+        ] == lines[:1]
+        assert [line for line in lines if LogFilter(agent="system").matches(line)] == (
+            lines[1:]
+        )
+        assert [line for line in lines if LogFilter(level="error").matches(line)] == (
+            lines[1:2]
+        )
+
+    def test_iter_events_skips_malformed_lines(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text('{"event": "a"}\n{"event": \n[1]\n{"event": "b"}\n')
+        assert [event["event"] for event in iter_events(path)] == ["a", "b"]
@@ -0,0 +1,173 @@
+"""Tests for tailing and incrementally reading workflow log files."""
+
+import logging
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.logging import (
+    LogFilter,
+    close_log_file,
+    log_reader,
+    read_log,
+    setup_rich_logging,
+    tail_log,
+)
+
+LINES = [
+    "2025-01-02 03:04:05 - INFO - 🔧 SYSTEM | 📋 STEP: start",
+    "2025-01-02 03:04:06 - DEBUG - 🤖 THREAT_AGENT | 🔍 thinking",
+    "2025-01-02 03:04:07 - WARNING - 🤖 THREAT_AGENT | ⚠️ slow tool",
+    "2025-01-02 03:04:08 - ERROR - 🔧 SYSTEM | ❌ failed",
+    "2025-01-02 03:04:09 - INFO - 🤖 MITIGATION_AGENT | ⚡ done",
+]
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """A log file read in blocks smaller than its lines."""
+    monkeypatch.setattr(log_reader, "_BLOCK_SIZE", 16)
+    path = tmp_path / "threat-composer.log"
+    path.write_text("".join(f"{line}\n" for line in LINES), encoding="utf-8")
+    return path
+
+
+class TestTailLog:
+    """Tests for tail_log."""
+
+    def test_last_lines(self, log_file):
+        chunk = tail_log(log_file, 2)
+        assert chunk.lines == LINES[-2:]
+        assert chunk.cursor == log_file.stat().st_size
+
+    def test_more_lines_than_file(self, log_file):
+        assert tail_log(log_file, 100).lines == LINES
+
+    def test_partial_last_line_is_left_out(self, log_file):
+        size = log_file.stat().st_size
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("2025-01-02 03:04:10 - INFO - 🔧 SYSTEM | par")
+        chunk = tail_log(log_file, 1)
+        assert chunk.lines == LINES[-1:]
+        assert chunk.cursor == size
+
+    def test_filtered_lines_are_counted(self, log_file):
+        chunk = tail_log(log_file, 2, LogFilter(level="warning"))
+        assert chunk.lines == [LINES[2], LINES[3]]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_text("")
+        assert tail_log(path, 5).lines == []
+
+
+class TestReadLog:
+    """Tests for read_log."""
+
+    def test_only_new_lines_after_cursor(self, log_file):
+        first = read_log(log_file)
+        assert first.lines == LINES
+        assert read_log(log_file, first.cursor).lines == []
+
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write("2025-01-02 03:04:10 - INFO - 🔧 SYSTEM | next\n")
+            f.write("2025-01-02 03:04:11 - INFO - 🔧 SYSTEM | part")
+        second = read_log(log_file, first.cursor)
+        assert second.lines == ["2025-01-02 03:04:10 - INFO - 🔧 SYSTEM | next"]
+        assert second.cursor < log_file.stat().st_size
+
+    def test_max_bytes_splits_reads_on_line_boundaries(self, log_file):
+        chunk = read_log(log_file, max_bytes=len(LINES[0].encode()) + 10)
+        assert chunk.lines == LINES[:1]
+        assert chunk.more is True
+
+        lines = list(chunk.lines)
+        while chunk.more:
+            chunk = read_log(log_file, chunk.cursor, max_bytes=200)
+            lines += chunk.lines
+        assert lines == LINES
+
+    def test_rewritten_file_is_read_from_start(self, log_file):
+        cursor = read_log(log_file).cursor
+        log_file.write_text(f"{LINES[0]}\n", encoding="utf-8")
+        assert read_log(log_file, cursor).lines == LINES[:1]
+
+
+class TestLogFilter:
+    """Tests for LogFilter."""
+
+    def test_agent_filter(self):
+        log_filter = LogFilter(agent="threat_agent")
+        assert [line for line in LINES if log_filter.matches(line)] == LINES[1:3]
+
+    def test_system_agent(self):
+        log_filter = LogFilter(agent="system")
+        assert [line for line in LINES if log_filter.matches(line)] == [
+            LINES[0],
+            LINES[3],
+        ]
+
+    def test_lines_without_level_only_pass_without_filter(self):
+        old_line = "2025-01-02 03:04:05 - 🔧 SYSTEM | message"
+        assert LogFilter().matches(old_line)
+        assert not LogFilter(level="INFO").matches(old_line)
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError, match="Unknown log level"):
+            LogFilter(level="LOUD")
+
+
+class TestLoggedException:
+    """Tests for filtering records continued by a traceback."""
+
+    @pytest.fixture
+    def exception_log(self, tmp_path):
+        """A log with an exception logged between two info lines."""
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / "output"
+        )
+        register_global_config(config)
+        logs_dir = config.output_directory / config.logs_output_sub_dir
+        setup_rich_logging(log_file_path=logs_dir, log_filename=config.log_filename)
+        logger = logging.getLogger("threat_composer_ai.tests")
+        logger.info("before")
+        try:
+            raise ValueError("bad input")
+        except ValueError:
+            logger.exception("parsing failed")
+        logger.info("after")
+        log_file = logs_dir / config.log_filename
+        close_log_file(log_file)
+        return log_file
+
+    def test_traceback_is_kept_with_error(self, exception_log):
+        lines = read_log(exception_log, log_filter=LogFilter(level="ERROR")).lines
+
+        assert "- ERROR -" in lines[0] and "parsing failed" in lines[0]
+        assert lines[1] == "Traceback (most recent call last):"
+        assert lines[-1] == "ValueError: bad input"
+        assert not any("before" in line or "after" in line for line in lines)
+
+    def test_traceback_is_dropped_with_filtered_record(self, exception_log):
+        lines = read_log(exception_log, log_filter=LogFilter(level="INFO")).lines
+        assert len(lines) == len(exception_log.read_text().splitlines())
+
+        lines = read_log(exception_log, log_filter=LogFilter(agent="other")).lines
+        assert lines == []
+
+    def test_tail_returns_whole_record(self, exception_log):
+        lines = tail_log(exception_log, 1, LogFilter(level="ERROR")).lines
+
+        assert "parsing failed" in lines[0]
+        assert lines[-1] == "ValueError: bad input"
+
+    def test_read_after_cursor_within_record(self, exception_log):
+        header_end = exception_log.read_bytes().index(b"Traceback")
+        error_filter = LogFilter(level="ERROR")
+
+        lines = read_log(exception_log, header_end, error_filter).lines
+        assert lines[0] == "Traceback (most recent call last):"
+        assert lines[-1] == "ValueError: bad input"
+
+        lines = read_log(exception_log, header_end, LogFilter(agent="other")).lines
+        assert lines == []
@@ -0,0 +1,244 @@
+"""Tests for the background log pipeline."""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.logging import (
+    AsyncHandler,
+    BufferedFileHandler,
+    LogPipeline,
+    clear_agent_context,
+    close_log_file,
+    get_agent_context,
+    set_agent_context,
+    setup_rich_logging,
+)
+from threat_composer_ai.logging.strands_handler import StrandsRichHandler
+
+
+class RecordingHandler(logging.Handler):
+    """Handler that keeps the records it handles and the thread handling them."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+        self.flushes = 0
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+    def flush(self):
+        self.flushes += 1
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline()
+    yield pipeline
+    pipeline.stop()
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("threat_composer_ai.tests.pipeline")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+
+
+class TestAsyncHandler:
+    """Tests for AsyncHandler and LogPipeline."""
+
+    def test_records_are_written_on_writer_thread(self, pipeline, logger):
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+
+        for i in range(10):
+            logger.info("message %d", i)
+        pipeline.flush()
+
+        assert [record.getMessage() for record in target.records] == [
+            f"message {i}" for i in range(10)
+        ]
+        assert target.threads == {"log-writer"}
+
+    def test_records_are_handled_in_batches(self, logger):
+        pipeline = LogPipeline(batch_size=100)
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+        try:
+            for i in range(50):
+                logger.info("message %d", i)
+            pipeline.flush()
+        finally:
+            pipeline.stop()
+
+        assert len(target.records) == 50
+        # Flushed once per batch, not once per record
+        assert target.flushes < 50
+
+    def test_message_is_formatted_when_logged(self, pipeline, logger):
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+        values = ["before"]
+
+        logger.info("value %s", values)
+        values[0] = "after"
+        pipeline.flush()
+
+        assert target.records[0].getMessage() == "value ['before']"
+
+    def test_agent_context_is_captured_when_logged(self, pipeline, logger):
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+
+        set_agent_context("threat_agent")
+        try:
+            logger.info("from agent")
+        finally:
+            clear_agent_context()
+        logger.info("from system")
+        pipeline.flush()
+
+        assert [record.agent for record in target.records] == [
+            "threat_agent",
+            "system",
+        ]
+
+    def test_agent_context_is_kept_per_task(self, pipeline, logger):
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+
+        async def job(agent: str, started: asyncio.Event, other: asyncio.Event):
+            set_agent_context(agent)
+            started.set()
+            # Log only after the other job set its own context
+            await other.wait()
+            logger.info(f"from {agent}")
+
+        async def main():
+            first, second = asyncio.Event(), asyncio.Event()
+            await asyncio.gather(
+                job("threat_agent", first, second),
+                job("mitigation_agent", second, first),
+            )
+
+        asyncio.run(main())
+        pipeline.flush()
+
+        assert {(r.getMessage(), r.agent) for r in target.records} == {
+            ("from threat_agent", "threat_agent"),
+            ("from mitigation_agent", "mitigation_agent"),
+        }
+        assert get_agent_context() is None
+
+    def test_strands_handler_sets_context_where_agent_runs(self):
+        handler = StrandsRichHandler(agent_name="threat_agent")
+        clear_agent_context()
+        seen = []
+
+        def run_agent():
+            handler(data="")
+            seen.append(get_agent_context())
+
+        thread = threading.Thread(target=run_agent)
+        thread.start()
+        thread.join()
+
+        assert seen == ["threat_agent"]
+        assert get_agent_context() is None
+
+    def test_session_id_is_captured_when_logged(self, tmp_path, pipeline, logger):
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / "session-a"
+        )
+        register_global_config(config)
+        target = RecordingHandler()
+        logger.addHandler(AsyncHandler(target, pipeline))
+
+        logger.info("message")
+        pipeline.flush()
+
+        assert target.records[0].session_id == config.output_directory.name
+
+    def test_close_writes_queued_records(self, pipeline):
+        target = RecordingHandler()
+        handler = AsyncHandler(target, pipeline)
+
+        handler.handle(logging.makeLogRecord({"msg": "queued"}))
+        handler.close()
+
+        assert [record.getMessage() for record in target.records] == ["queued"]
+
+
+class TestBufferedFileHandler:
+    """Tests for BufferedFileHandler."""
+
+    def _record(self, level=logging.INFO):
+        return logging.makeLogRecord({"msg": "line", "levelno": level})
+
+    def test_writes_are_buffered_until_threshold(self, tmp_path):
+        path = tmp_path / "test.log"
+        handler = BufferedFileHandler(path, flush_records=3, flush_interval=3600)
+        try:
+            handler.handle(self._record())
+            handler.handle(self._record())
+            assert path.read_text() == ""
+            handler.handle(self._record())
+            assert path.read_text() == "line\n" * 3
+        finally:
+            handler.close()
+
+    def test_flush_buffer_writes_immediately(self, tmp_path):
+        path = tmp_path / "test.log"
+        handler = BufferedFileHandler(path, flush_records=100, flush_interval=3600)
+        try:
+            handler.handle(self._record())
+            handler.flush_buffer()
+            assert path.read_text() == "line\n"
+        finally:
+            handler.close()
+
+
+class TestSetupRichLogging:
+    """Tests for the pipeline as set up by setup_rich_logging."""
+
+    def test_workflow_logs_are_routed_by_logging_thread(self, tmp_path):
+        configs = [
+            AppConfig.create(
+                working_directory=tmp_path, output_directory=tmp_path / name
+            )
+            for name in ("a", "b")
+        ]
+        log_files = []
+        for config in configs:
+            logs_dir = config.output_directory / config.logs_output_sub_dir
+            setup_rich_logging(log_file_path=logs_dir, log_filename=config.log_filename)
+            log_files.append(logs_dir / config.log_filename)
+
+        def run(config, name):
+            register_global_config(config)
+            logging.getLogger("threat_composer_ai.tests").info(f"from {name}")
+
+        threads = [
+            threading.Thread(target=run, args=(config, name))
+            for config, name in zip(configs, ("a", "b"), strict=True)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for log_file in log_files:
+            close_log_file(log_file)
+
+        text_a, text_b = (log_file.read_text() for log_file in log_files)
+        assert "from a" in text_a and "from b" not in text_a
+        assert "from b" in text_b and "from a" not in text_b
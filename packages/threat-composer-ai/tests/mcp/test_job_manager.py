@@ -0,0 +1,217 @@
+"""Tests for the MCP server's workflow job manager."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from threat_composer_ai.config import (
+    AppConfig,
+    get_global_config,
+    register_global_config,
+)
+from threat_composer_ai.mcp.job_manager import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    JobManager,
+)
+
+
+class FakeRunner:
+    """Runner whose two-node workflow runs until released."""
+
+    node_count = 2
+
+    def __init__(self, config: AppConfig, session_id: str, error: str | None = None):
+        self.config = config
+        self.session_manager = SimpleNamespace(session_id=session_id)
+        self.release = asyncio.Event()
+        self.error = error
+        self.seen_config = None
+
+    async def execute_async(self, on_node_event=None):
+        self.seen_config = get_global_config()
+        on_node_event("start", "first")
+        on_node_event("stop", "first")
+        on_node_event("start", "second")
+        await self.release.wait()
+        if self.error:
+            raise RuntimeError(self.error)
+        on_node_event("stop", "second")
+
+
+@pytest.fixture(autouse=True)
+def _lock_home(tmp_path, monkeypatch):
+    """Directory lock files are created below a temporary home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+
+@pytest.fixture
+def make_runner(tmp_path):
+    """Create runners analyzing a named directory."""
+
+    def make(directory: str, session_id: str, error: str | None = None):
+        working_directory = tmp_path / directory
+        working_directory.mkdir(exist_ok=True)
+        config = AppConfig.create(
+            working_directory=working_directory,
+            output_directory=tmp_path / directory / "output" / session_id,
+        )
+        return FakeRunner(config, session_id, error)
+
+    return make
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+class TestJobManager:
+    """Tests for JobManager."""
+
+    async def test_concurrency_limit_and_fifo_queue(self, make_runner):
+        manager = JobManager(max_concurrent=1)
+        runners = [make_runner(f"dir{i}", f"session{i}") for i in range(3)]
+        jobs = [manager.submit(runner) for runner in runners]
+
+        assert [job.status for job in jobs] == [RUNNING, QUEUED, QUEUED]
+        assert manager.queue_position(jobs[2]) == 2
+
+        runners[0].release.set()
+        await wait_for(lambda: jobs[1].status == RUNNING)
+        assert jobs[0].status == COMPLETED
+        assert jobs[2].status == QUEUED
+
+        runners[1].release.set()
+        runners[2].release.set()
+        await wait_for(lambda: jobs[2].status == COMPLETED)
+
+    async def test_same_directory_does_not_block_other_directories(self, make_runner):
+        manager = JobManager(max_concurrent=2)
+        first = make_runner("shared", "first")
+        second = make_runner("shared", "second")
+        other = make_runner("other", "other")
+        jobs = [manager.submit(runner) for runner in (first, second, other)]
+
+        assert [job.status for job in jobs] == [RUNNING, QUEUED, RUNNING]
+
+        first.release.set()
+        await wait_for(lambda: jobs[1].status == RUNNING)
+        for runner in (second, other):
+            runner.release.set()
+        await wait_for(lambda: all(job.status == COMPLETED for job in jobs))
+
+    async def test_each_job_sees_its_own_config(self, make_runner):
+        manager = JobManager(max_concurrent=2)
+        runners = [make_runner("a", "a"), make_runner("b", "b")]
+        jobs = [manager.submit(runner) for runner in runners]
+        for runner in runners:
+            runner.release.set()
+        await wait_for(lambda: all(job.status == COMPLETED for job in jobs))
+
+        assert [runner.seen_config for runner in runners] == [
+            runner.config for runner in runners
+        ]
+
+    async def test_jobs_with_the_same_session_id_are_kept_apart(self, make_runner):
+        manager = JobManager(max_concurrent=2)
+        runners = [make_runner("a", "20261019-0559"), make_runner("b", "20261019-0559")]
+        first, second = (manager.submit(runner) for runner in runners)
+
+        assert first.job_id != second.job_id
+        assert first.session_id == second.session_id == "20261019-0559"
+        assert manager.get(first.job_id) is first
+        assert manager.get(second.job_id) is second
+        assert manager.list_jobs() == [first, second]
+
+        manager.cancel(first.job_id)
+        await wait_for(lambda: first.status == CANCELLED)
+        assert second.status == RUNNING
+        runners[1].release.set()
+        await wait_for(lambda: second.status == COMPLETED)
+
+    async def test_cancel_queued_and_running_jobs(self, make_runner):
+        manager = JobManager(max_concurrent=1)
+        running = manager.submit(make_runner("a", "running"))
+        queued = manager.submit(make_runner("b", "queued"))
+
+        assert manager.cancel(queued.job_id).status == CANCELLED
+        assert manager.queue_position(queued) is None
+
+        manager.cancel(running.job_id)
+        await wait_for(lambda: running.status == CANCELLED)
+        assert manager.cancel("unknown") is None
+
+    async def test_failed_job_records_error_and_frees_slot(self, make_runner):
+        manager = JobManager(max_concurrent=1)
+        failing = make_runner("a", "failing", error="boom")
+        failing.release.set()
+        job = manager.submit(failing)
+        await wait_for(lambda: job.status == FAILED)
+        assert job.to_dict()["error"] == "boom"
+
+        follow_up = make_runner("b", "next")
+        follow_up.release.set()
+        next_job = manager.submit(follow_up)
+        await wait_for(lambda: next_job.status == COMPLETED)
+
+    async def test_cancel_before_task_starts(self, make_runner):
+        manager = JobManager(max_concurrent=1)
+        job = manager.submit(make_runner("a", "a"))
+        manager.cancel(job.job_id)
+        await wait_for(lambda: job.status == CANCELLED)
+
+        follow_up = make_runner("b", "next")
+        follow_up.release.set()
+        next_job = manager.submit(follow_up)
+        await wait_for(lambda: next_job.status == COMPLETED)
+
+    async def test_progress_and_wait_for_update(self, make_runner):
+        manager = JobManager(max_concurrent=1)
+        runner = make_runner("a", "a")
+        job = manager.submit(runner)
+        await wait_for(lambda: job.progress_message == "Running second")
+
+        progress = job.to_dict()["progress"]
+        assert progress == {
+            "completed_nodes": 1,
+            "total_nodes": 2,
+            "message": "Running second",
+        }
+        assert await manager.wait_for_update(job, timeout=0.05) is False
+
+        runner.release.set()
+        assert await manager.wait_for_update(job, timeout=5) is True
+        await wait_for(lambda: job.status == COMPLETED)
+        assert job.completed_nodes == 2
+
+    async def test_run_blocking_sees_callers_config(self, make_runner):
+        manager = JobManager()
+        config = make_runner("a", "a").config
+        register_global_config(config)
+
+        def blocking():
+            return threading.current_thread(), get_global_config()
+
+        thread, seen = await manager.run_blocking(blocking)
+        assert thread is not threading.current_thread()
+        assert seen is config
+
+
+class TestJobManagerFromEnv:
+    """Tests for JobManager.from_env."""
+
+    def test_max_concurrent_from_env(self, monkeypatch):
+        monkeypatch.setenv("THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS", "4")
+        assert JobManager.from_env().max_concurrent == 4
+        monkeypatch.setenv("THREAT_COMPOSER_MAX_CONCURRENT_WORKFLOWS", "many")
+        assert JobManager.from_env().max_concurrent == 2
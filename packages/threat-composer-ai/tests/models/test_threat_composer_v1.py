@@ -4,6 +4,7 @@ import pytest
 from pydantic import ValidationError
 
 from threat_composer_ai.models.threat_composer_v1 import (
+    Assumption,
     CommentsMetadata,
     CustomMetadata,
     PriorityMetadata,
@@ -200,6 +201,32 @@ class TestThreatMetadataUnion:
         assert type(t.metadata[1]).__name__ == "PriorityMetadata"
         assert type(t.metadata[2]).__name__ == "CommentsMetadata"
 
+    def test_invalid_value_reports_only_the_keyed_model(self):
+        """An invalid item is validated against the model selected by its key."""
+        with pytest.raises(ValidationError) as exc_info:
+            Threat(
+                id="08249a15-c2e3-430b-b175-16ecc91f3eb3",
+                numericId=1,
+                metadata=[{"key": "STRIDE", "value": "S"}],
+            )
+        assert [e["loc"] for e in exc_info.value.errors()] == [
+            ("metadata", 0, "StrideMetadata", "value")
+        ]
+
+    def test_unknown_key_is_rejected(self):
+        """Keys not accepted by the entity give a single error naming valid keys."""
+        with pytest.raises(ValidationError) as exc_info:
+            Assumption(
+                id="08249a15-c2e3-430b-b175-16ecc91f3eb3",
+                numericId=1,
+                content="An assumption",
+                metadata=[{"key": "Priority", "value": "High"}],
+            )
+        [error] = exc_info.value.errors()
+        assert error["type"] == "metadata_key_invalid"
+        assert error["loc"] == ("metadata", 0)
+        assert "'Comments'" in error["msg"]
+
 
 class TestFullModelValidation:
     """Test full ThreatComposerV1Model validation."""
@@ -0,0 +1,173 @@
+"""
+Tests for assembling threat models from component files.
+
+Validates that the assembled model is written section by section with the
+same content as a single json.dumps of the model, that diagrams are embedded,
+and that an invalid section leaves no output behind.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from threat_composer_ai.config import (
+    AppConfig,
+    get_global_config,
+    register_global_config,
+)
+from threat_composer_ai.tools.threat_composer_assemble_tc_v1_model import (
+    SECTION_ORDER,
+    threat_composer_assemble_tc_v1_model,
+)
+from threat_composer_ai.validation import validate_tc_section_json
+
+THREAT_ID = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+MITIGATION_ID = "5f3bd1c4-7f5a-4d8b-9a57-1f2e8c0d4b6a"
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect/></svg>'
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    config = AppConfig.create(
+        working_directory=tmp_path, output_directory=tmp_path / ".threat-composer"
+    )
+    register_global_config(config)
+    config.output_directory.mkdir(parents=True)
+    return config.output_directory
+
+
+@pytest.fixture
+def config(output_dir):
+    return get_global_config()
+
+
+@pytest.fixture
+def components(output_dir):
+    """Write a minimal set of component files and return the tool arguments."""
+    files = {
+        "application_info_path": {
+            "applicationInfo": {"name": "App", "description": "An app\nwith lines"}
+        },
+        "architecture_description_path": {"architecture": {"description": "Arch"}},
+        "dataflow_description_path": {"dataflow": {"description": "Flow"}},
+        "threats_path": {
+            "threats": [
+                {"id": THREAT_ID, "numericId": 1, "statement": "Threat ü"},
+            ],
+        },
+        "mitigations_path": {
+            "mitigations": [{"id": MITIGATION_ID, "numericId": 1, "content": "Fix"}],
+            "mitigationLinks": [{"mitigationId": MITIGATION_ID, "linkedId": THREAT_ID}],
+        },
+    }
+    arguments = {}
+    for name, content in files.items():
+        path = output_dir / f"{name}.tc.json"
+        path.write_text(json.dumps(content))
+        arguments[name] = str(path)
+    for name in ("architecture_diagram_path", "dataflow_diagram_path"):
+        path = output_dir / f"{name}.svg"
+        path.write_text(SVG)
+        arguments[name] = str(path)
+    arguments["output_path"] = str(output_dir / "threatmodel.tc.json")
+    return arguments
+
+
+class TestAssembleStreaming:
+    """Tests for the section by section writer of the assembler."""
+
+    def test_compact_output_by_default(self, components):
+        result = threat_composer_assemble_tc_v1_model(**components)
+        assert result.startswith("✅"), result
+
+        content = open(components["output_path"], encoding="utf-8").read()
+        model = json.loads(content)
+        assert list(model) == list(SECTION_ORDER)
+        assert content == json.dumps(model, separators=(",", ":"), ensure_ascii=False)
+        assert model["architecture"]["image"].startswith("data:image/svg+xml")
+        assert model["dataflow"]["image"].startswith("data:image/svg+xml")
+        assert model["mitigationLinks"][0]["linkedId"] == THREAT_ID
+
+    def test_pretty_print_matches_json_dumps(self, components):
+        result = threat_composer_assemble_tc_v1_model(**components, pretty_print=True)
+        assert result.startswith("✅"), result
+
+        content = open(components["output_path"], encoding="utf-8").read()
+        model = json.loads(content)
+        assert content == json.dumps(model, indent=2, ensure_ascii=False)
+
+    def test_invalid_section_leaves_no_output(self, components, output_dir):
+        threats = {"threats": [{"id": THREAT_ID, "numericId": "one"}]}
+        with open(components["threats_path"], "w", encoding="utf-8") as f:
+            json.dump(threats, f)
+
+        result = threat_composer_assemble_tc_v1_model(**components)
+        assert result.startswith("❌ Assembled model failed validation")
+        assert "threats.0.numericId" in result
+        assert not any("threatmodel" in p.name for p in output_dir.iterdir())
+
+    def test_missing_diagram_is_written_empty(self, components):
+        components["dataflow_diagram_path"] = components["output_path"] + ".svg"
+        result = threat_composer_assemble_tc_v1_model(**components)
+        assert result.startswith("✅"), result
+
+        model = json.loads(open(components["output_path"], encoding="utf-8").read())
+        assert model["dataflow"] == {"description": "Flow", "image": ""}
+
+
+class TestOutputSizeOptions:
+    """Tests for the output format setting, gzip sidecar and size report."""
+
+    def test_config_selects_pretty_output(self, components, config):
+        config.compact_json_output = False
+        threat_composer_assemble_tc_v1_model(**components)
+
+        content = open(components["output_path"], encoding="utf-8").read()
+        assert content == json.dumps(json.loads(content), indent=2, ensure_ascii=False)
+
+    def test_gzip_sidecar(self, components, config):
+        config.gzip_threat_model = True
+        result = threat_composer_assemble_tc_v1_model(**components)
+
+        with open(components["output_path"], "rb") as f:
+            content = f.read()
+        with gzip.open(components["output_path"] + ".gz", "rb") as f:
+            assert f.read() == content
+        assert "(gzip " in result
+
+    def test_no_gzip_sidecar_by_default(self, components, output_dir):
+        threat_composer_assemble_tc_v1_model(**components)
+        assert not list(output_dir.glob("*.gz"))
+
+    def test_size_report_lists_sections(self, components):
+        result = threat_composer_assemble_tc_v1_model(**components)
+
+        size = len(open(components["output_path"], "rb").read())
+        assert f"📦 Output size: {size:,} B" in result
+        report = result.split("📦", 1)[1].splitlines()[1:]
+        assert {line.split(":")[0].strip(" -") for line in report} == set(SECTION_ORDER)
+        # Sections plus the braces and commas between them make up the file
+        sizes = [
+            int(line.split(": ")[1].split(" B")[0].replace(",", "")) for line in report
+        ]
+        assert sum(sizes) + len(SECTION_ORDER) + 1 == size
+
+
+class TestValidateTcSectionJson:
+    """Tests for validating a single top-level section."""
+
+    def test_valid_section(self):
+        assert validate_tc_section_json("architecture", b'{"description":"x"}') == []
+
+    def test_errors_use_document_locations(self):
+        errors = validate_tc_section_json("threats", b'[{"id":"x","numericId":1}]')
+        assert errors[0]["loc"] == ("threats", 0, "id")
+
+    def test_schema_version_is_limited(self):
+        assert validate_tc_section_json("schema", b"1") == []
+        assert validate_tc_section_json("schema", b"2")[0]["loc"] == ("schema",)
+
+    def test_unknown_section(self):
+        errors = validate_tc_section_json("extra", b"{}")
+        assert errors[0]["type"] == "extra_forbidden"
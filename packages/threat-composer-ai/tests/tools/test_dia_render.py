@@ -0,0 +1,101 @@
+"""
+Tests for the in-process Graphviz rendering backend.
+
+Validates that InProcessDiagram renders through pygraphviz when it is
+available, falls back to the dot subprocess otherwise, and leaves the DOT
+source file in place for Diagram.__exit__ to remove.
+"""
+
+import pytest
+
+from threat_composer_ai.tools import threat_composer_dia_render as dia_render
+from threat_composer_ai.tools.threat_composer_dia_render import (
+    InProcessDiagram,
+    render_dot_source,
+)
+
+
+class FakeAGraph:
+    """Stand-in for pygraphviz.AGraph that writes a marker SVG."""
+
+    def __init__(self, string: str):
+        self.source = string
+
+    def draw(self, path, format, prog):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<svg><!-- {prog} {format} --></svg>")
+
+
+class FailingAGraph(FakeAGraph):
+    """Stand-in for pygraphviz.AGraph whose layout fails."""
+
+    def draw(self, path, format, prog):
+        raise OSError("layout failed")
+
+
+@pytest.fixture
+def diagram(tmp_path, mocker):
+    """Create a diagram writing into tmp_path with the subprocess path mocked."""
+    d = InProcessDiagram(
+        "Test", filename=str(tmp_path / "test"), outformat="svg", show=False
+    )
+    mocker.patch.object(d.dot, "render")
+    return d
+
+
+def use_pygraphviz(mocker, agraph_class):
+    """Patch the pygraphviz loader to return a module exposing agraph_class."""
+    module = mocker.MagicMock(AGraph=agraph_class)
+    mocker.patch.object(dia_render, "load_pygraphviz", return_value=module)
+
+
+class TestRenderDotSource:
+    """Tests for render_dot_source."""
+
+    def test_without_pygraphviz_requests_fallback(self, tmp_path, mocker):
+        mocker.patch.object(dia_render, "load_pygraphviz", return_value=None)
+        out = tmp_path / "out.svg"
+        assert render_dot_source("digraph {}", str(out), "svg") is False
+        assert not out.exists()
+
+    def test_renders_with_pygraphviz(self, tmp_path, mocker):
+        use_pygraphviz(mocker, FakeAGraph)
+        out = tmp_path / "out.svg"
+        assert render_dot_source("digraph {}", str(out), "svg") is True
+        assert out.read_text() == "<svg><!-- dot svg --></svg>"
+
+    def test_rendering_error_requests_fallback(self, tmp_path, mocker):
+        use_pygraphviz(mocker, FailingAGraph)
+        assert (
+            render_dot_source("digraph {}", str(tmp_path / "out.svg"), "svg") is False
+        )
+
+
+class TestInProcessDiagram:
+    """Tests for InProcessDiagram.render."""
+
+    def test_renders_in_process(self, diagram, mocker, tmp_path):
+        use_pygraphviz(mocker, FakeAGraph)
+        diagram.render()
+        assert (tmp_path / "test.svg").exists()
+        assert (tmp_path / "test").exists()
+        diagram.dot.render.assert_not_called()
+
+    def test_falls_back_to_subprocess(self, diagram, mocker, tmp_path):
+        mocker.patch.object(dia_render, "load_pygraphviz", return_value=None)
+        diagram.render()
+        diagram.dot.render.assert_called_once_with(format="svg", view=False, quiet=True)
+        assert (tmp_path / "test").exists()
+
+    def test_show_uses_library_render(self, diagram, mocker):
+        use_pygraphviz(mocker, FakeAGraph)
+        diagram.show = True
+        diagram.render()
+        diagram.dot.render.assert_called_once_with(format="svg", view=True, quiet=True)
+
+    def test_renders_each_format(self, diagram, mocker, tmp_path):
+        use_pygraphviz(mocker, FakeAGraph)
+        diagram.outformat = ["svg", "png"]
+        diagram.render()
+        assert (tmp_path / "test.svg").exists()
+        assert (tmp_path / "test.png").exists()
@@ -0,0 +1,166 @@
+"""
+Tests for allocating IDs in threat composer component files.
+
+Validates that placeholder IDs are replaced with stable UUIDs, numericIds are
+assigned in order, links follow the allocated IDs, and that the file write
+tool applies this to .tc.json files only.
+"""
+
+import json
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.tools.threat_composer_id_allocator import (
+    allocate_ids,
+    derive_uuid4,
+    is_uuid4,
+)
+from threat_composer_ai.tools.threat_composer_workdir_file_write import (
+    threat_composer_workdir_file_write,
+)
+from threat_composer_ai.validation import check_reference_integrity
+
+EXISTING_THREAT = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+
+
+@pytest.fixture
+def threats_file() -> dict:
+    """A threats component as an agent would write it, with placeholders."""
+    return {
+        "schema": 1,
+        "threats": [
+            {"id": "T1", "numericId": 7, "statement": "first"},
+            {"id": "T2", "numericId": 7, "statement": "second"},
+        ],
+        "assumptions": [{"id": "A1", "numericId": 1, "content": "assumed"}],
+        "assumptionLinks": [
+            {"type": "Threat", "assumptionId": "A1", "linkedId": "T2"},
+        ],
+        "mitigations": [],
+        "mitigationLinks": [],
+    }
+
+
+class TestAllocateIds:
+    """Tests for allocate_ids."""
+
+    def test_placeholders_become_uuids(self, threats_file):
+        result = allocate_ids(threats_file, "session/threats.tc.json")
+        ids = [t["id"] for t in result.data["threats"]]
+        assert all(is_uuid4(i) for i in ids)
+        assert len(set(ids)) == 2
+        assert result.allocated_count == 3
+        assert result.allocated["threats"]["T1"] == ids[0]
+
+    def test_allocation_is_deterministic_per_namespace(self, threats_file):
+        first = allocate_ids(threats_file, "session/threats.tc.json")
+        again = allocate_ids(threats_file, "session/threats.tc.json")
+        other = allocate_ids(threats_file, "session/mitigations.tc.json")
+        assert first.data == again.data
+        assert first.data["threats"][0]["id"] != other.data["threats"][0]["id"]
+
+    def test_sections_do_not_share_placeholders(self):
+        assert derive_uuid4("ns", "threats", "1") != derive_uuid4(
+            "ns", "assumptions", "1"
+        )
+
+    def test_numeric_ids_are_sequential(self, threats_file):
+        result = allocate_ids(threats_file, "ns")
+        assert [t["numericId"] for t in result.data["threats"]] == [1, 2]
+        assert result.renumbered == 2
+
+    def test_links_follow_allocated_ids(self, threats_file):
+        result = allocate_ids(threats_file, "ns")
+        link = result.data["assumptionLinks"][0]
+        assert link["assumptionId"] == result.data["assumptions"][0]["id"]
+        assert link["linkedId"] == result.data["threats"][1]["id"]
+        assert check_reference_integrity(result.data, complete=True).issues == []
+
+    def test_existing_uuids_are_kept(self):
+        mitigations_file = {
+            "mitigations": [{"id": "M1", "numericId": 1}],
+            "mitigationLinks": [{"mitigationId": "M1", "linkedId": EXISTING_THREAT}],
+        }
+        result = allocate_ids(mitigations_file, "ns")
+        link = result.data["mitigationLinks"][0]
+        assert link["linkedId"] == EXISTING_THREAT
+        assert link["mitigationId"] == result.data["mitigations"][0]["id"]
+
+        again = allocate_ids(result.data, "other")
+        assert again.data == result.data
+        assert again.allocated_count == 0
+
+    def test_input_is_not_modified(self, threats_file):
+        snapshot = json.loads(json.dumps(threats_file))
+        allocate_ids(threats_file, "ns")
+        assert threats_file == snapshot
+
+    def test_unknown_link_targets_are_left_alone(self, threats_file):
+        threats_file["assumptionLinks"].append(
+            {"type": "Mitigation", "assumptionId": "A9", "linkedId": "T1"}
+        )
+        link = allocate_ids(threats_file, "ns").data["assumptionLinks"][1]
+        assert link == {"type": "Mitigation", "assumptionId": "A9", "linkedId": "T1"}
+
+
+class TestFileWriteAllocation:
+    """Tests for ID allocation in the file write tool."""
+
+    @pytest.fixture
+    def output_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BYPASS_TOOL_CONSENT", "true")
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / ".threat-composer"
+        )
+        register_global_config(config)
+        config.output_directory.mkdir(parents=True)
+        return config.output_directory
+
+    def write(self, path, content):
+        return threat_composer_workdir_file_write(
+            {"toolUseId": "t", "input": {"path": str(path), "content": content}}
+        )
+
+    def test_component_file_gets_ids(self, output_dir, threats_file):
+        path = output_dir / "threats.tc.json"
+        result = self.write(path, json.dumps(threats_file))
+
+        written = json.loads(path.read_text())
+        assert all(is_uuid4(t["id"]) for t in written["threats"])
+        assert "threats: T1=" in result["content"][-1]["text"]
+
+    def test_sessions_with_the_same_id_get_different_ids(
+        self, tmp_path, monkeypatch, threats_file
+    ):
+        monkeypatch.setenv("BYPASS_TOOL_CONSENT", "true")
+        monkeypatch.setattr(
+            AppConfig,
+            "_generate_session_id",
+            staticmethod(lambda base: "20261019-0559"),
+        )
+        ids = []
+        for repo in ("repo-a", "repo-b"):
+            config = AppConfig.create(
+                working_directory=tmp_path / repo,
+                output_directory=tmp_path / repo / ".threat-composer",
+            )
+            register_global_config(config)
+            config.output_directory.mkdir(parents=True)
+            assert config.output_directory.name == "20261019-0559"
+            path = config.output_directory / "threats.tc.json"
+            self.write(path, json.dumps(threats_file))
+            ids.append([t["id"] for t in json.loads(path.read_text())["threats"]])
+
+        assert not set(ids[0]) & set(ids[1])
+
+    def test_other_files_are_written_verbatim(self, output_dir, threats_file):
+        path = output_dir / "notes.json"
+        content = json.dumps(threats_file)
+        self.write(path, content)
+        assert path.read_text() == content
+
+    def test_malformed_json_is_written_verbatim(self, output_dir):
+        path = output_dir / "threats.tc.json"
+        self.write(path, '{"threats": [')
+        assert path.read_text() == '{"threats": ['
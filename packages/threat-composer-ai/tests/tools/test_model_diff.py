@@ -0,0 +1,207 @@
+"""
+Tests for diffing and merging threat composer documents across sessions.
+
+Validates that matched entities keep their previous IDs and numericIds, that
+changes are reported per section, and that the file write tool keeps an
+unchanged component file byte for byte on incremental reruns.
+"""
+
+import json
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.tools.threat_composer_model_diff import (
+    diff_models,
+    format_model_diff,
+    match_entities,
+    merge_with_previous,
+)
+from threat_composer_ai.tools.threat_composer_workdir_file_write import (
+    threat_composer_workdir_file_write,
+)
+
+OLD_T1 = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+OLD_T2 = "1c8a7f3e-52b4-4d9e-a0c1-6f2d8e9b7a45"
+OLD_M1 = "5f3bd1c4-7f5a-4d8b-9a57-1f2e8c0d4b6a"
+NEW_T1 = "9e1d2c3b-4a5f-4e6d-8c7b-0a1f2e3d4c5b"
+NEW_T2 = "2b3c4d5e-6f70-4182-93a4-b5c6d7e8f901"
+NEW_T3 = "3c4d5e6f-7081-4293-a4b5-c6d7e8f90a12"
+NEW_M1 = "4d5e6f70-8192-43a4-b5c6-d7e8f90a1b23"
+
+SQL = "An attacker can inject SQL through the search form, leading to data loss"
+XSS = "An attacker can store a script in a comment, leading to session theft"
+
+
+@pytest.fixture
+def previous():
+    return {
+        "threats": [
+            {"id": OLD_T1, "numericId": 1, "statement": SQL},
+            {"id": OLD_T2, "numericId": 2, "statement": XSS},
+        ],
+        "mitigations": [{"id": OLD_M1, "numericId": 1, "content": "Use bind params"}],
+        "mitigationLinks": [{"mitigationId": OLD_M1, "linkedId": OLD_T1}],
+    }
+
+
+class TestMatchEntities:
+    """Tests for match_entities."""
+
+    def test_matches_by_id_then_text(self):
+        previous = [{"id": "a", "content": "one"}, {"id": "b", "content": "two"}]
+        current = [{"id": "x", "content": "TWO"}, {"id": "a", "content": "changed"}]
+        assert sorted(match_entities("assumptions", previous, current)) == [
+            (0, 1),
+            (1, 0),
+        ]
+
+    def test_similar_text_matches(self):
+        previous = [{"content": SQL}]
+        current = [{"content": SQL.replace("data loss", "data loss.")}]
+        assert match_entities("assumptions", previous, current) == [(0, 0)]
+
+    def test_dissimilar_text_does_not_match(self):
+        assert (
+            match_entities("assumptions", [{"content": SQL}], [{"content": XSS}]) == []
+        )
+
+    def test_threat_fields_used_without_statement(self):
+        previous = [{"threatSource": "An attacker", "threatAction": "injects SQL"}]
+        current = [{"threatSource": "an  attacker", "threatAction": "injects SQL"}]
+        assert match_entities("threats", previous, current) == [(0, 0)]
+
+
+class TestMergeWithPrevious:
+    """Tests for merge_with_previous."""
+
+    def test_unchanged_rerun_equals_previous(self, previous):
+        current = {
+            "threats": [
+                {"id": NEW_T2, "numericId": 1, "statement": XSS},
+                {"id": NEW_T1, "numericId": 2, "statement": SQL},
+            ],
+            "mitigations": [
+                {"id": NEW_M1, "numericId": 1, "content": "Use bind params"}
+            ],
+            "mitigationLinks": [{"mitigationId": NEW_M1, "linkedId": NEW_T1}],
+        }
+        result = merge_with_previous(previous, current)
+        assert result.data == previous
+        assert not result.diff.has_changes
+        assert result.id_map[NEW_T1] == OLD_T1
+
+    def test_added_removed_and_modified(self, previous):
+        current = {
+            "threats": [
+                {"id": NEW_T1, "numericId": 1, "statement": SQL + " and outage"},
+                {"id": NEW_T3, "numericId": 2, "statement": "Something new"},
+            ],
+            "mitigations": [],
+            "mitigationLinks": [],
+        }
+        result = merge_with_previous(previous, current)
+        threats = result.data["threats"]
+        assert threats[0] == {
+            "id": OLD_T1,
+            "numericId": 1,
+            "statement": SQL + " and outage",
+        }
+        assert threats[1]["id"] == NEW_T3
+        assert threats[1]["numericId"] == 3
+
+        diff = result.diff.sections["threats"]
+        assert diff.modified == [OLD_T1]
+        assert diff.added == [NEW_T3]
+        assert diff.removed == [OLD_T2]
+        assert result.diff.sections["mitigations"].removed == [OLD_M1]
+        assert result.diff.links_removed == 1
+
+    def test_sections_missing_from_previous_are_kept(self, previous):
+        current = {"assumptions": [{"id": NEW_T1, "numericId": 1, "content": "x"}]}
+        result = merge_with_previous(previous, current)
+        assert result.data == current
+        assert result.diff.sections == {}
+
+    def test_inputs_are_not_modified(self, previous):
+        current = {"threats": [{"id": NEW_T1, "numericId": 5, "statement": SQL}]}
+        snapshot = json.dumps([previous, current])
+        merge_with_previous(previous, current)
+        assert json.dumps([previous, current]) == snapshot
+
+    def test_diff_summary(self, previous):
+        diff = diff_models(previous, {"threats": [previous["threats"][0]]})
+        assert format_model_diff(diff) == (
+            "threats: 0 added, 1 removed, 0 modified, 1 unchanged"
+        )
+
+
+class TestFileWriteMerge:
+    """Tests for merging component files with the previous session on write."""
+
+    @pytest.fixture
+    def sessions(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BYPASS_TOOL_CONSENT", "true")
+        previous_dir = tmp_path / "previous"
+        (previous_dir / "components").mkdir(parents=True)
+        config = AppConfig.create(
+            working_directory=tmp_path,
+            output_directory=tmp_path / ".threat-composer",
+            previous_session_path=previous_dir,
+        )
+        register_global_config(config)
+        (config.output_directory / "components").mkdir(parents=True)
+        return previous_dir, config.output_directory
+
+    def write(self, path, data):
+        return threat_composer_workdir_file_write(
+            {
+                "toolUseId": "t",
+                "input": {"path": str(path), "content": json.dumps(data)},
+            }
+        )
+
+    def test_unchanged_file_keeps_previous_bytes(self, sessions, previous):
+        previous_dir, output_dir = sessions
+        previous_content = json.dumps(previous, indent=4)
+        (previous_dir / "components" / "threats.tc.json").write_text(previous_content)
+
+        regenerated = {
+            "threats": [
+                {"id": "T1", "numericId": 1, "statement": SQL},
+                {"id": "T2", "numericId": 2, "statement": XSS},
+            ],
+            "mitigations": [{"id": "M1", "numericId": 1, "content": "Use bind params"}],
+            "mitigationLinks": [{"mitigationId": "M1", "linkedId": "T1"}],
+        }
+        path = output_dir / "components" / "threats.tc.json"
+        result = self.write(path, regenerated)
+
+        assert path.read_text() == previous_content
+        assert (
+            "No changes compared with the previous session"
+            in (result["content"][-1]["text"])
+        )
+
+    def test_changed_file_reports_diff_and_keeps_ids(self, sessions, previous):
+        previous_dir, output_dir = sessions
+        (previous_dir / "components" / "threats.tc.json").write_text(
+            json.dumps(previous)
+        )
+
+        regenerated = {"threats": [{"id": "T1", "numericId": 1, "statement": SQL}]}
+        path = output_dir / "components" / "threats.tc.json"
+        result = self.write(path, regenerated)
+
+        assert json.loads(path.read_text())["threats"] == [previous["threats"][0]]
+        summary = result["content"][-1]["text"]
+        assert f"threats: T1={OLD_T1}" in summary
+        assert "threats: 0 added, 1 removed, 0 modified, 1 unchanged" in summary
+
+    def test_without_previous_file_only_ids_are_allocated(self, sessions):
+        _, output_dir = sessions
+        path = output_dir / "components" / "threats.tc.json"
+        result = self.write(path, {"threats": [{"id": "T1", "statement": SQL}]})
+
+        assert json.loads(path.read_text())["threats"][0]["numericId"] == 1
+        assert "previous session" not in result["content"][-1]["text"]
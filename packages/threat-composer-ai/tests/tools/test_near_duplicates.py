@@ -0,0 +1,244 @@
+"""
+Tests for near-duplicate threat and mitigation detection.
+
+Validates shingling and MinHash clustering, merging of duplicate entities
+with link rewriting, and the deduplication node that applies it to the
+component files.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from threat_composer_ai.agents.deduplication import (
+    DeduplicationNode,
+    merge_near_duplicate_components,
+)
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.tools.threat_composer_near_duplicates import (
+    deduplicate_documents,
+    find_near_duplicates,
+    format_deduplication_summary,
+    minhash_signature,
+    shingles,
+)
+
+T1 = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+T2 = "1c8a7f3e-52b4-4d9e-a0c1-6f2d8e9b7a45"
+T3 = "2b3c4d5e-6f70-4182-93a4-b5c6d7e8f901"
+M1 = "5f3bd1c4-7f5a-4d8b-9a57-1f2e8c0d4b6a"
+M2 = "4d5e6f70-8192-43a4-b5c6-d7e8f90a1b23"
+
+SQL = (
+    "An external attacker with network access can inject SQL through the "
+    "search form, which leads to disclosure of customer records stored in the "
+    "orders database"
+)
+SQL_PARAPHRASE = (
+    "An external attacker with network access can inject SQL through the "
+    "search form, which leads to disclosure of customer records stored in the "
+    "orders table"
+)
+XSS = (
+    "An authenticated user can store a script in a comment, which leads to "
+    "theft of other users' session cookies"
+)
+
+
+@pytest.fixture
+def documents():
+    return {
+        "threats.tc.json": {
+            "threats": [
+                {"id": T1, "numericId": 1, "statement": SQL, "tags": ["db"]},
+                {"id": T2, "numericId": 2, "statement": XSS},
+                {
+                    "id": T3,
+                    "numericId": 3,
+                    "statement": SQL_PARAPHRASE,
+                    "tags": ["web"],
+                },
+            ],
+        },
+        "mitigations.tc.json": {
+            "mitigations": [
+                {"id": M1, "numericId": 1, "content": "Use parameterized queries"},
+                {"id": M2, "numericId": 2, "content": "Use parameterized queries."},
+            ],
+            "mitigationLinks": [
+                {"mitigationId": M1, "linkedId": T1},
+                {"mitigationId": M2, "linkedId": T3},
+                {"mitigationId": M1, "linkedId": T2},
+            ],
+        },
+    }
+
+
+class TestFindNearDuplicates:
+    """Tests for shingling and clustering."""
+
+    def test_shingles(self):
+        assert shingles("The quick, brown fox") == {
+            "the quick",
+            "quick brown",
+            "brown fox",
+        }
+        assert shingles("Fox") == {"fox"}
+        assert shingles("") == set()
+
+    def test_signature_is_stable(self):
+        assert minhash_signature({"a b", "b c"}) == minhash_signature({"b c", "a b"})
+
+    def test_paraphrases_are_clustered(self):
+        assert find_near_duplicates([SQL, XSS, SQL_PARAPHRASE]) == [[0, 2]]
+
+    def test_distinct_texts_are_not_clustered(self):
+        assert find_near_duplicates([SQL, XSS, ""]) == []
+
+    def test_threshold(self):
+        assert find_near_duplicates([SQL, SQL_PARAPHRASE], threshold=1.0) == []
+
+    def test_distinct_threats_from_one_template_are_not_clustered(self):
+        template = (
+            "An external attacker with network access can inject SQL through "
+            "the search form, which leads to {}, negatively impacting {}"
+        )
+        texts = [
+            template.format("disclosure of customer records", "the orders database"),
+            template.format("modification of customer records", "the orders database"),
+            template.format("disclosure of customer records", "the audit log"),
+        ]
+        assert find_near_duplicates(texts) == []
+
+    def test_clusters_are_not_chained(self):
+        words = [f"w{i}" for i in range(40)]
+        first = " ".join(words)
+        second = " ".join([*words[:36], "x1", "x2", "x3", "x4"])
+        third = " ".join([*words[:32], "x1", "x2", "x3", "x4", "y1", "y2", "y3", "y4"])
+        assert find_near_duplicates([first, second, third], threshold=0.8) == [[0, 1]]
+
+    def test_incompatible_texts_are_not_clustered(self):
+        texts = [SQL, SQL_PARAPHRASE, SQL]
+        assert find_near_duplicates(
+            texts, compatible=lambda first, second: {first, second} != {0, 1}
+        ) == [[0, 2]]
+
+
+class TestDeduplicateDocuments:
+    """Tests for deduplicate_documents."""
+
+    def test_duplicates_are_merged_and_links_rewritten(self, documents):
+        result = deduplicate_documents(documents)
+
+        threats = result.documents["threats.tc.json"]["threats"]
+        assert [t["id"] for t in threats] == [T1, T2]
+        assert threats[0]["tags"] == ["db", "web"]
+
+        mitigations = result.documents["mitigations.tc.json"]
+        assert [m["id"] for m in mitigations["mitigations"]] == [M1]
+        assert mitigations["mitigationLinks"] == [
+            {"mitigationId": M1, "linkedId": T1},
+            {"mitigationId": M1, "linkedId": T2},
+        ]
+        assert result.merged == {"threats": {T3: T1}, "mitigations": {M2: M1}}
+        assert result.links_removed == 1
+
+    def test_differently_classified_threats_are_not_merged(self, documents):
+        threats = documents["threats.tc.json"]["threats"]
+        threats[0]["metadata"] = [{"key": "STRIDE", "value": ["I"]}]
+        threats[2]["metadata"] = [{"key": "STRIDE", "value": ["T"]}]
+        assert deduplicate_documents(documents).merged == {"mitigations": {M2: M1}}
+
+        threats[2]["metadata"] = [{"key": "STRIDE", "value": ["I"]}]
+        threats[0]["impactedAssets"] = ["orders database"]
+        threats[2]["impactedAssets"] = ["audit log"]
+        assert deduplicate_documents(documents).merged == {"mitigations": {M2: M1}}
+
+    def test_fields_of_duplicates_are_merged(self, documents):
+        threats = documents["threats.tc.json"]["threats"]
+        threats[0].update(
+            impactedGoal=["confidentiality"],
+            status="threatIdentified",
+            metadata=[{"key": "Priority", "value": "Low"}],
+        )
+        threats[2].update(
+            impactedAssets=["orders database"],
+            status="threatResolved",
+            metadata=[
+                {"key": "Priority", "value": "High"},
+                {"key": "STRIDE", "value": ["I"]},
+            ],
+        )
+        result = deduplicate_documents(documents)
+
+        kept = result.documents["threats.tc.json"]["threats"][0]
+        assert kept["impactedAssets"] == ["orders database"]
+        assert kept["impactedGoal"] == ["confidentiality"]
+        assert kept["status"] == "threatIdentified"
+        assert kept["metadata"] == [
+            {"key": "Priority", "value": "High"},
+            {"key": "STRIDE", "value": ["I"]},
+        ]
+        [record] = [m for m in result.merges if m.section == "threats"]
+        assert (record.kept_id, record.removed_id) == (T1, T3)
+        assert record.similarity >= 0.9
+        assert record.dropped == {"Priority": "Low", "status": "threatResolved"}
+
+    def test_inputs_are_not_modified(self, documents):
+        snapshot = json.dumps(documents)
+        deduplicate_documents(documents)
+        assert json.dumps(documents) == snapshot
+
+    def test_summary(self, documents):
+        summary = format_deduplication_summary(deduplicate_documents(documents))
+        assert f"threats: merged 1 near-duplicate(s) ({T3} -> {T1})" in summary
+        assert "links: removed 1 repeated link(s)" in summary
+
+
+class TestMergeNearDuplicateComponents:
+    """Tests for the deduplication graph node."""
+
+    @pytest.fixture
+    def config(self, tmp_path, documents):
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / ".threat-composer"
+        )
+        register_global_config(config)
+        components_dir = config.output_directory / config.components_output_sub_dir
+        components_dir.mkdir(parents=True)
+        for name, document in documents.items():
+            (components_dir / name).write_text(json.dumps(document))
+        return config
+
+    def test_files_and_hashes_are_rewritten(self, config):
+        summary = merge_near_duplicate_components(config)
+        assert "merged 1 near-duplicate(s)" in summary
+
+        components_dir = config.output_directory / config.components_output_sub_dir
+        threats = json.loads((components_dir / "threats.tc.json").read_text())
+        assert len(threats["threats"]) == 2
+        hashes_dir = config.output_directory / config.hashes_output_sub_dir
+        assert (hashes_dir / "threats.tc.json.hash").exists()
+        records = json.loads(
+            (components_dir / config.near_duplicate_merges_filename).read_text()
+        )
+        assert [(r["removedId"], r["keptId"]) for r in records] == [
+            (T3, T1),
+            (M2, M1),
+        ]
+
+        # Merging again finds nothing and leaves the files alone
+        assert merge_near_duplicate_components(config) == (
+            "No near-duplicate threats or mitigations found."
+        )
+
+    def test_node_returns_completed_result(self, config):
+        result = asyncio.run(DeduplicationNode(config).invoke_async("task"))
+        assert result.status.value == "completed"
+        assert "merged 1 near-duplicate(s)" in str(result)
+
+    def test_node_survives_missing_files(self, tmp_path):
+        config = AppConfig.create(working_directory=tmp_path)
+        result = asyncio.run(DeduplicationNode(config).invoke_async("task"))
+        assert "No near-duplicate" in str(result)
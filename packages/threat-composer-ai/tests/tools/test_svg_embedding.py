@@ -0,0 +1,317 @@
+"""
+Tests for embedding diagram icon files into SVG output.
+
+Validates the process-wide icon cache, that embed_images_as_shared_defs
+produces the same result as embedding followed by deduplication, and the
+streaming post-processor used for final diagram output, including
+downscaling icons to the size they are rendered at.
+"""
+
+import base64
+import io
+
+import pytest
+
+from threat_composer_ai.config import AppConfig
+from threat_composer_ai.tools import threat_composer_dia_common as dia_common
+from threat_composer_ai.tools.threat_composer_dia_common import (
+    ICON_RENDER_SCALE,
+    _icon_base64_cache,
+    clear_icon_cache,
+    deduplicate_embedded_images,
+    embed_images_as_base64,
+    embed_images_as_shared_defs,
+    finalize_diagram_svg,
+    load_icon_base64,
+    load_icon_data_uri,
+)
+
+SVG_OPEN = '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+SVG_CLOSE = "</svg>"
+
+
+@pytest.fixture(autouse=True)
+def _clean_icon_cache():
+    """Each test starts with an empty icon cache."""
+    clear_icon_cache()
+    yield
+    clear_icon_cache()
+
+
+@pytest.fixture
+def icons(tmp_path):
+    """Create two small fake PNG icon files."""
+    ec2 = tmp_path / "ec2.png"
+    ec2.write_bytes(b"\x89PNG-ec2")
+    s3 = tmp_path / "s3.png"
+    s3.write_bytes(b"\x89PNG-s3")
+    return ec2, s3
+
+
+def file_image(x: str, y: str, path) -> str:
+    """Helper to create a Graphviz-style <image> element referencing a file."""
+    return (
+        f'<image xlink:href="{path}" width="72px" height="72px" '
+        f'preserveAspectRatio="xMinYMin meet" x="{x}" y="{y}"/>'
+    )
+
+
+def make_svg(*elements: str) -> str:
+    """Helper to wrap elements in a valid SVG document."""
+    return SVG_OPEN + "\n".join(elements) + SVG_CLOSE
+
+
+class TestLoadIconBase64:
+    """Tests for the icon cache."""
+
+    def test_encodes_png(self, icons):
+        ec2, _ = icons
+        assert load_icon_base64(str(ec2)) == base64.b64encode(b"\x89PNG-ec2").decode()
+
+    def test_caches_per_path(self, icons):
+        ec2, _ = icons
+        load_icon_base64(str(ec2))
+        load_icon_base64(str(ec2))
+        assert len(_icon_base64_cache) == 1
+
+    def test_changed_file_is_reloaded(self, icons):
+        ec2, _ = icons
+        load_icon_base64(str(ec2))
+        ec2.write_bytes(b"\x89PNG-ec2-updated")
+        assert (
+            load_icon_base64(str(ec2))
+            == base64.b64encode(b"\x89PNG-ec2-updated").decode()
+        )
+
+    def test_missing_or_non_png_returns_none(self, tmp_path):
+        assert load_icon_base64(str(tmp_path / "missing.png")) is None
+        other = tmp_path / "icon.svg"
+        other.write_text("<svg/>")
+        assert load_icon_base64(str(other)) is None
+
+
+class TestEmbedImagesAsSharedDefs:
+    """Tests for single-pass embedding with shared definitions."""
+
+    def test_no_images_returns_unchanged(self):
+        svg = make_svg('<rect x="0" y="0" width="100" height="100"/>')
+        assert embed_images_as_shared_defs(svg) == svg
+
+    def test_single_use_icon_is_inlined(self, icons):
+        ec2, _ = icons
+        result = embed_images_as_shared_defs(make_svg(file_image("10", "20", ec2)))
+        assert "<defs>" not in result
+        assert result.count("data:image/png;base64,") == 1
+        assert str(ec2) not in result
+
+    def test_repeated_icon_defined_once(self, icons):
+        ec2, s3 = icons
+        svg = make_svg(
+            file_image("10", "20", ec2),
+            file_image("30", "40", s3),
+            file_image("50", "60", ec2),
+        )
+        result = embed_images_as_shared_defs(svg)
+
+        ec2_data = base64.b64encode(b"\x89PNG-ec2").decode()
+        assert result.count(f"data:image/png;base64,{ec2_data}") == 1
+        assert result.count("<use ") == 2
+        assert 'x="10"' in result and 'x="50"' in result
+        assert result.strip().endswith("</svg>")
+
+    def test_matches_embed_then_dedup(self, icons):
+        ec2, s3 = icons
+        svg = make_svg(
+            file_image("10", "20", ec2),
+            file_image("30", "40", s3),
+            file_image("50", "60", ec2),
+            file_image("70", "80", s3),
+        )
+        expected = deduplicate_embedded_images(embed_images_as_base64(svg))
+        result = embed_images_as_shared_defs(svg)
+        assert result.count("<use ") == expected.count("<use ")
+        assert result.count("data:image/png;base64,") == expected.count(
+            "data:image/png;base64,"
+        )
+
+    def test_missing_icon_keeps_reference(self, tmp_path):
+        missing = tmp_path / "missing.png"
+        svg = make_svg(file_image("10", "20", missing), file_image("30", "40", missing))
+        assert embed_images_as_shared_defs(svg) == svg
+
+
+GRAPHVIZ_SVG = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
+ "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<!-- Generated by graphviz version 2.43.0 (0)
+ -->
+<!-- Title: Web &amp; API Pages: 1 -->
+<svg width="200pt" height="100pt"
+ viewBox="0.00 0.00 200.00 100.00" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">
+<g id="graph0" class="graph" transform="scale(1 1) rotate(0) translate(4 96)">
+<title>Web &amp; API</title>
+<!-- web -->
+<g id="node1" class="node">
+<title>web</title>
+{image1}
+<text text-anchor="middle" x="36" y="-8" font-size="13.00">web &lt;1&gt;</text>
+</g>
+<g id="node2" class="node">
+<title>api</title>
+{image2}
+<text text-anchor="middle" x="136" y="-8" font-size="13.00"> </text>
+</g>
+</g>
+</svg>
+"""
+
+
+def graphviz_svg(path1, path2) -> str:
+    """Helper to build a Graphviz-shaped SVG with two icon references."""
+    return GRAPHVIZ_SVG.replace("{image1}", file_image("0", "-92", path1)).replace(
+        "{image2}", file_image("100", "-92", path2)
+    )
+
+
+class TestFinalizeDiagramSvg:
+    """Tests for the streaming SVG post-processor."""
+
+    def test_repeated_icon_defined_once(self, icons):
+        ec2, _ = icons
+        result = finalize_diagram_svg(graphviz_svg(ec2, ec2))
+
+        assert result.count("data:image/png;base64,") == 1
+        assert result.count("<use ") == 2
+        assert 'x="100"' in result
+        assert result.startswith("<svg")
+        assert result.endswith("</defs></svg>")
+
+    def test_distinct_icons_each_defined(self, icons):
+        ec2, s3 = icons
+        result = finalize_diagram_svg(graphviz_svg(ec2, s3))
+        assert result.count("data:image/png;base64,") == 2
+        assert "dedup-img-1" in result
+
+    def test_strips_comments_doctype_and_whitespace(self, icons):
+        ec2, s3 = icons
+        result = finalize_diagram_svg(graphviz_svg(ec2, s3))
+        assert "<!--" not in result
+        assert "DOCTYPE" not in result
+        assert ">\n<" not in result
+
+    def test_preserves_text_content_and_escaping(self, icons):
+        ec2, s3 = icons
+        result = finalize_diagram_svg(graphviz_svg(ec2, s3))
+        assert "<title>Web &amp; API</title>" in result
+        assert ">web &lt;1&gt;</text>" in result
+        # Whitespace-only labels are significant inside <text>
+        assert 'font-size="13.00"> </text>' in result
+
+    def test_output_is_well_formed(self, icons):
+        import xml.etree.ElementTree as ET
+
+        ec2, s3 = icons
+        root = ET.fromstring(finalize_diagram_svg(graphviz_svg(ec2, s3)))
+        assert root.tag == "{http://www.w3.org/2000/svg}svg"
+
+    def test_missing_icon_keeps_image_element(self, tmp_path, icons):
+        ec2, _ = icons
+        missing = tmp_path / "missing.png"
+        result = finalize_diagram_svg(graphviz_svg(ec2, missing))
+        assert f'xlink:href="{missing}"' in result
+        assert result.count("<use ") == 1
+
+    def test_malformed_svg_falls_back_to_regex_embedding(self, icons):
+        ec2, _ = icons
+        svg = make_svg(file_image("10", "20", ec2), file_image("30", "40", ec2))
+        broken = svg.replace("</svg>", "")
+        result = finalize_diagram_svg(broken)
+        assert result.count("data:image/png;base64,") == 1
+        assert result.count("<use ") == 2
+
+
+def png_bytes(size: int) -> bytes:
+    """Helper to create a real PNG image of the given square size."""
+    Image = pytest.importorskip("PIL.Image")
+
+    out = io.BytesIO()
+    Image.new("RGBA", (size, size), (200, 80, 20, 255)).save(out, format="PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def large_icon(tmp_path):
+    """Create a 256x256 PNG icon, larger than its rendered size."""
+    path = tmp_path / "large.png"
+    path.write_bytes(png_bytes(256))
+    return path
+
+
+@pytest.fixture
+def icon_config(mocker):
+    """Patch the global config used by the icon optimizer."""
+    config = mocker.MagicMock(optimize_diagram_icons=True, diagram_icon_format="png")
+    mocker.patch(
+        "threat_composer_ai.tools.threat_composer_dia_common.get_global_config",
+        return_value=config,
+    )
+    return config
+
+
+class TestLoadIconDataUri:
+    """Tests for downscaling icons to their rendered size."""
+
+    @staticmethod
+    def decode(data_uri: str):
+        Image = pytest.importorskip("PIL.Image")
+        return Image.open(io.BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+
+    def test_downscales_to_rendered_size(self, large_icon, icon_config):
+        data_uri = load_icon_data_uri(str(large_icon), "36px", "36px")
+        assert data_uri.startswith("data:image/png;base64,")
+        assert self.decode(data_uri).size == (36 * ICON_RENDER_SCALE,) * 2
+
+    def test_points_are_converted_to_pixels(self, large_icon, icon_config):
+        data_uri = load_icon_data_uri(str(large_icon), "54pt", "54pt")
+        assert self.decode(data_uri).size == (144, 144)
+
+    def test_webp_format(self, large_icon, icon_config):
+        icon_config.diagram_icon_format = "webp"
+        data_uri = load_icon_data_uri(str(large_icon), "36px", "36px")
+        assert data_uri.startswith("data:image/webp;base64,")
+
+    def test_disabled_keeps_original(self, large_icon, icon_config):
+        icon_config.optimize_diagram_icons = False
+        data_uri = load_icon_data_uri(str(large_icon), "36px", "36px")
+        assert data_uri == "data:image/png;base64," + load_icon_base64(str(large_icon))
+
+    def test_disabled_by_default(self, large_icon, mocker):
+        mocker.patch(
+            "threat_composer_ai.tools.threat_composer_dia_common.get_global_config",
+            return_value=None,
+        )
+        data_uri = load_icon_data_uri(str(large_icon), "36px", "36px")
+        assert data_uri == "data:image/png;base64," + load_icon_base64(str(large_icon))
+        assert AppConfig.optimize_diagram_icons is False
+
+    def test_unknown_size_keeps_original(self, large_icon, icon_config):
+        data_uri = load_icon_data_uri(str(large_icon), None, "10%")
+        assert self.decode(data_uri).size == (256, 256)
+
+    def test_undecodable_icon_keeps_original(self, icons, icon_config):
+        ec2, _ = icons
+        data_uri = load_icon_data_uri(str(ec2), "36px", "36px")
+        assert data_uri == "data:image/png;base64," + load_icon_base64(str(ec2))
+
+    def test_cached_per_icon_and_size(self, large_icon, icon_config, mocker):
+        spy = mocker.spy(dia_common, "optimize_icon")
+        load_icon_data_uri(str(large_icon), "36px", "36px")
+        load_icon_data_uri(str(large_icon), "36px", "36px")
+        load_icon_data_uri(str(large_icon), "72px", "72px")
+        assert spy.call_count == 2
+
+    def test_finalize_embeds_optimized_icon(self, large_icon, icon_config):
+        result = finalize_diagram_svg(graphviz_svg(large_icon, large_icon))
+        original = load_icon_base64(str(large_icon))
+        assert original not in result
+        assert result.count("data:image/png;base64,") == 1
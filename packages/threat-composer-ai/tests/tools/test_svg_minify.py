@@ -0,0 +1,103 @@
+"""
+Tests for SVG minification before diagrams are encoded as data URLs.
+
+Validates that minify_svg strips markup that does not affect rendering,
+reduces numeric precision without touching embedded data, and that the
+size report reflects each encoding stage.
+"""
+
+import xml.etree.ElementTree as ET
+
+from threat_composer_ai.tools.threat_composer_svg_to_data_url import (
+    minify_svg,
+    svg_size_report,
+    threat_composer_svg_to_data_url,
+)
+
+GRAPHVIZ_SVG = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
+ "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<!-- Generated by graphviz version 2.43.0 (0)
+ -->
+<svg width="260.00pt" height="116.00pt"
+ viewBox="0.00 0.00 260.00 116.00" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">
+<g id="graph0" class="graph" transform="scale(1.0 1.0) rotate(0) translate(4.00 112.00)">
+<!-- web&#45;&gt;api -->
+<g id="edge1" class="edge">
+<path fill="none" stroke="#7b8894" d="M72.34,-54.00C84.44,-54.00 97.56,-54.00 109.66,-54.00"/>
+<polygon fill="#7b8894" stroke="#7b8894" points="109.71,-57.50 119.71,-54.00 109.71,-50.50 109.71,-57.50"/>
+</g>
+<image xlink:href="data:image/png;base64,AAAA1.25BB" width="72px" height="72px" x="0.04" y="-108.00"/>
+<text text-anchor="middle" x="-0.04" y="-8.55" font-size="13.00">v1.25 </text>
+</g>
+</svg>
+"""
+
+
+class TestMinifySvg:
+    """Tests for the minify_svg function."""
+
+    def test_strips_declaration_doctype_and_comments(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        assert result.startswith("<svg ")
+        assert "<!" not in result
+        assert "<?xml" not in result
+
+    def test_removes_layout_whitespace(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        assert "\n" not in result.split(">", 1)[1]
+
+    def test_keeps_significant_text_whitespace(self):
+        svg = '<svg xmlns="http://www.w3.org/2000/svg"><text x="1"> </text></svg>'
+        assert minify_svg(svg) == svg
+
+    def test_rounds_numeric_attributes(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        assert 'viewBox="0 0 260 116"' in result
+        assert 'd="M72.3,-54C84.4,-54 97.6,-54 109.7,-54"' in result
+        assert 'transform="scale(1 1) rotate(0) translate(4 112)"' in result
+        assert 'font-size="13"' in result
+        assert 'width="260pt"' in result
+
+    def test_rounding_avoids_negative_zero(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        assert 'x="0" y="-108"' in result
+        assert 'x="0" y="-8.6"' in result
+
+    def test_leaves_data_uris_and_text_untouched(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        assert "data:image/png;base64,AAAA1.25BB" in result
+        assert ">v1.25 </text>" in result
+
+    def test_class_attributes_dropped_without_stylesheet(self):
+        assert "class=" not in minify_svg(GRAPHVIZ_SVG)
+        styled = '<svg><style>.node{fill:red}</style><g class="node"/></svg>'
+        assert 'class="node"' in minify_svg(styled)
+
+    def test_output_is_well_formed_and_smaller(self):
+        result = minify_svg(GRAPHVIZ_SVG)
+        root = ET.fromstring(result)
+        assert root.tag == "{http://www.w3.org/2000/svg}svg"
+        assert len(result) < len(GRAPHVIZ_SVG)
+
+    def test_is_idempotent(self):
+        once = minify_svg(GRAPHVIZ_SVG)
+        assert minify_svg(once) == once
+
+
+class TestSvgSizeReport:
+    """Tests for the per-diagram size report."""
+
+    def test_reports_each_stage(self):
+        minified = minify_svg(GRAPHVIZ_SVG)
+        data_url = threat_composer_svg_to_data_url(minified)
+        report = svg_size_report(GRAPHVIZ_SVG, minified, data_url)
+
+        assert report["original_bytes"] == len(GRAPHVIZ_SVG.encode("utf-8"))
+        assert report["minified_bytes"] == len(minified.encode("utf-8"))
+        assert report["data_url_bytes"] == len(data_url)
+        assert 0 < report["gzip_estimate_bytes"] < report["minified_bytes"]
+        assert report["minified_reduction_pct"] > 0
+
+    def test_empty_original(self):
+        assert svg_size_report("", "", "")["minified_reduction_pct"] == 0.0
@@ -0,0 +1,113 @@
+"""Tests for validating threat composer JSON with the schema validation helpers."""
+
+import json
+
+import pytest
+
+from threat_composer_ai.config import AppConfig, register_global_config
+from threat_composer_ai.tools.threat_composer_validate_tc_v1_schema import (
+    threat_composer_validate_tc_v1_schema,
+    validate_tc_data_pydantic,
+    validate_tc_json_pydantic,
+)
+from threat_composer_ai.validation import clear_validation_cache
+
+VALID = {
+    "schema": 1,
+    "threats": [
+        {
+            "id": "08249a15-c2e3-430b-b175-16ecc91f3eb3",
+            "numericId": 1,
+            "metadata": [{"key": "Priority", "value": "High"}],
+        }
+    ],
+}
+
+
+class TestValidateTcJsonPydantic:
+    """Tests for validate_tc_json_pydantic."""
+
+    def test_valid(self):
+        assert validate_tc_json_pydantic(json.dumps(VALID).encode()) == (True, "")
+
+    def test_invalid_json(self):
+        is_valid, message = validate_tc_json_pydantic(b'{"schema": 1,')
+        assert is_valid is False
+        assert message.startswith("Invalid JSON format: ")
+
+    def test_schema_errors_are_formatted(self):
+        data = json.loads(json.dumps(VALID))
+        data["threats"][0]["metadata"][0]["value"] = "Critical"
+        is_valid, message = validate_tc_json_pydantic(json.dumps(data).encode())
+        assert is_valid is False
+        assert "Field 'threats.0.metadata.0'" in message
+
+    def test_matches_dict_validation(self):
+        data = json.loads(json.dumps(VALID))
+        data["threats"][0]["numericId"] = "1"
+        assert validate_tc_json_pydantic(json.dumps(data).encode()) == (
+            validate_tc_data_pydantic(data)
+        )
+
+
+class TestErrorFormatting:
+    """Tests for grouping and capping of reported validation errors."""
+
+    def test_unknown_metadata_key_is_one_error(self):
+        data = json.loads(json.dumps(VALID))
+        data["threats"][0]["metadata"][0]["key"] = "Severity"
+        is_valid, message = validate_tc_json_pydantic(json.dumps(data).encode())
+        assert is_valid is False
+        assert message.startswith("Validation failed with 1 error(s):")
+        assert "'Priority'" in message
+
+    def test_reported_errors_are_capped(self):
+        data = json.loads(json.dumps(VALID))
+        data["threats"] = [
+            {"id": 1, "numericId": i, "metadata": [{"key": "Priority"}]}
+            for i in range(1, 101)
+        ]
+        is_valid, message = validate_tc_json_pydantic(json.dumps(data).encode())
+        assert is_valid is False
+        lines = message.splitlines()
+        assert lines[0] == "Validation failed with 200 error(s):"
+        assert len(lines) == 52
+        assert lines[-1] == "... and 150 more error(s) not shown"
+
+
+class TestValidateTool:
+    """Tests for the threat_composer_validate_tc_v1_schema tool."""
+
+    @pytest.fixture
+    def output_dir(self, tmp_path):
+        config = AppConfig.create(
+            working_directory=tmp_path, output_directory=tmp_path / ".threat-composer"
+        )
+        register_global_config(config)
+        config.output_directory.mkdir(parents=True)
+        yield config.output_directory
+        clear_validation_cache()
+
+    def test_dangling_link_is_a_warning(self, output_dir):
+        data = json.loads(json.dumps(VALID))
+        data["mitigations"] = [
+            {
+                "id": "5f3bd1c4-7f5a-4d8b-9a57-1f2e8c0d4b6a",
+                "numericId": 1,
+                "content": "Fix",
+            }
+        ]
+        data["mitigationLinks"] = [
+            {
+                "mitigationId": "5f3bd1c4-7f5a-4d8b-9a57-1f2e8c0d4b6a",
+                "linkedId": "d0000000-0000-4000-8000-000000000001",
+            }
+        ]
+        path = output_dir / "model.tc.json"
+        path.write_text(json.dumps(data))
+
+        result = threat_composer_validate_tc_v1_schema(str(path))
+
+        assert result.startswith("✅ Validation successful!")
+        assert "⚠️ 1 warning(s):" in result
+        assert "mitigationLinks.0.linkedId" in result
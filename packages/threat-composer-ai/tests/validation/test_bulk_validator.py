@@ -0,0 +1,205 @@
+"""Tests for bulk validation of threat composer files and the validate command."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from threat_composer_ai.cli.main import main
+from threat_composer_ai.validation import bulk_validator
+from threat_composer_ai.validation.bulk_validator import (
+    RULES,
+    build_json_report,
+    build_sarif_report,
+    collect_tc_files,
+    validate_tc_files,
+)
+
+THREAT_ID = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+MITIGATION_ID = "3f2b8c1e-7d4a-4e9b-a5c6-1d2e3f4a5b6c"
+UNKNOWN_ID = "d0000000-0000-4000-8000-000000000001"
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+# Workspaces shipped with the Threat Composer app and its workshops
+EXAMPLE_DIRS = [
+    REPO_ROOT / "packages/threat-composer/src/data/workspaceExamples",
+    REPO_ROOT / "workshop-examples",
+]
+
+VALID_DOCUMENT = {
+    "schema": 1,
+    "threats": [{"id": THREAT_ID, "numericId": 1, "statement": "Threat 1"}],
+    "mitigations": [{"id": MITIGATION_ID, "numericId": 1, "content": "Fix"}],
+    "mitigationLinks": [{"mitigationId": MITIGATION_ID, "linkedId": THREAT_ID}],
+}
+
+
+@pytest.fixture
+def threat_models(tmp_path):
+    """A directory with a valid, a schema-invalid and a dangling-link model."""
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (tmp_path / "valid.tc.json").write_text(json.dumps(VALID_DOCUMENT))
+    (nested / "invalid.tc.json").write_text(
+        json.dumps({"schema": 1, "threats": [{"id": 1}]})
+    )
+    dangling = {
+        **VALID_DOCUMENT,
+        "mitigationLinks": [{"mitigationId": MITIGATION_ID, "linkedId": UNKNOWN_ID}],
+    }
+    (nested / "dangling.tc.json").write_text(json.dumps(dangling))
+    (tmp_path / "notes.json").write_text("{}")
+    return tmp_path
+
+
+class TestCollectTcFiles:
+    """Tests for collect_tc_files."""
+
+    def test_collects_recursively_and_sorted(self, threat_models):
+        files = collect_tc_files([threat_models])
+        assert [f.relative_to(threat_models).as_posix() for f in files] == [
+            "nested/dangling.tc.json",
+            "nested/invalid.tc.json",
+            "valid.tc.json",
+        ]
+
+    def test_explicit_files_are_kept_once(self, threat_models):
+        valid = threat_models / "valid.tc.json"
+        assert collect_tc_files([valid, threat_models, valid]).count(valid) == 1
+
+
+class TestValidateTcFiles:
+    """Tests for validate_tc_files."""
+
+    def test_reports_schema_and_reference_issues(self, threat_models):
+        report = validate_tc_files(collect_tc_files([threat_models]), max_workers=1)
+        dangling, invalid, valid = report.results
+
+        assert valid.issues == []
+        assert {issue.rule for issue in invalid.issues} == {"schema"}
+        assert "threats.0.id" in {issue.location for issue in invalid.issues}
+        assert [(i.severity, i.rule, i.location) for i in dangling.issues] == [
+            ("warning", "dangling_reference", "mitigationLinks.0.linkedId")
+        ]
+        assert not report.is_valid
+        assert report.invalid_files == [invalid]
+
+    def test_strict_references(self, threat_models):
+        report = validate_tc_files(
+            collect_tc_files([threat_models]), max_workers=1, strict_references=True
+        )
+        dangling, _, _ = report.results
+        assert [issue.severity for issue in dangling.issues] == ["error"]
+        assert len(report.invalid_files) == 2
+
+    @pytest.mark.skipif(
+        not all(path.is_dir() for path in EXAMPLE_DIRS),
+        reason="example workspaces are not available",
+    )
+    def test_bundled_example_workspaces_are_valid(self):
+        report = validate_tc_files(collect_tc_files(EXAMPLE_DIRS))
+        assert report.results
+        assert [result.path for result in report.invalid_files] == []
+
+    def test_malformed_json(self, tmp_path):
+        path = tmp_path / "broken.tc.json"
+        path.write_text("{")
+        [result] = validate_tc_files([path]).results
+        assert [issue.rule for issue in result.issues] == ["invalid-json"]
+
+    def test_process_pool_matches_in_process_results(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bulk_validator, "MIN_FILES_FOR_POOL", 2)
+        for index in range(6):
+            document = VALID_DOCUMENT if index % 2 else {"schema": 99}
+            (tmp_path / f"model{index}.tc.json").write_text(json.dumps(document))
+        files = collect_tc_files([tmp_path])
+
+        pooled = validate_tc_files(files, max_workers=2)
+        in_process = validate_tc_files(files, max_workers=1)
+
+        assert pooled.results == in_process.results
+        assert [r.is_valid for r in pooled.results] == [False, True] * 3
+
+
+class TestReports:
+    """Tests for the JSON and SARIF reports."""
+
+    def test_json_report(self, threat_models):
+        report = validate_tc_files(collect_tc_files([threat_models]))
+        document = build_json_report(report, threat_models)
+        assert document["summary"]["files"] == 3
+        assert document["summary"]["invalidFiles"] == 1
+        assert document["files"][2] == {
+            "path": "valid.tc.json",
+            "valid": True,
+            "issues": [],
+        }
+
+    def test_sarif_report(self, threat_models):
+        report = validate_tc_files(collect_tc_files([threat_models]))
+        log = build_sarif_report(report, threat_models)
+
+        assert log["version"] == "2.1.0"
+        assert "$schema" in log
+        [run] = log["runs"]
+        rules = run["tool"]["driver"]["rules"]
+        assert [rule["id"] for rule in rules] == list(RULES)
+
+        result = run["results"][0]
+        assert result["ruleId"] == "dangling_reference"
+        assert rules[result["ruleIndex"]]["id"] == "dangling_reference"
+        # "warning" is the SARIF default level, so it is omitted
+        assert "level" not in result
+        [location] = result["locations"]
+        assert location["physicalLocation"]["artifactLocation"]["uri"] == (
+            "nested/dangling.tc.json"
+        )
+        assert location["logicalLocations"] == [
+            {"fullyQualifiedName": "mitigationLinks.0.linkedId"}
+        ]
+        # Defaults such as the result kind are omitted
+        assert "kind" not in result
+
+    def test_sarif_uris_outside_base_are_absolute(self, threat_models, tmp_path):
+        report = validate_tc_files(collect_tc_files([threat_models]))
+        log = build_sarif_report(report, tmp_path / "elsewhere")
+
+        [run] = log["runs"]
+        [location] = run["results"][0]["locations"]
+        uri = location["physicalLocation"]["artifactLocation"]["uri"]
+        assert uri == (threat_models / "nested" / "dangling.tc.json").resolve().as_uri()
+        assert uri.startswith("file:///")
+
+
+class TestValidateCommand:
+    """Tests for the validate CLI subcommand."""
+
+    def test_exit_code_and_output_file(self, threat_models, tmp_path):
+        output = tmp_path / "report.sarif"
+        result = CliRunner().invoke(
+            main,
+            ["validate", str(threat_models), "--format", "sarif", "-o", str(output)],
+        )
+        assert result.exit_code == 1
+        log = json.loads(output.read_text())
+        assert len(log["runs"][0]["results"]) > 1
+
+    def test_strict_references_flag(self, threat_models):
+        dangling = str(threat_models / "nested" / "dangling.tc.json")
+        assert CliRunner().invoke(main, ["validate", dangling]).exit_code == 0
+        result = CliRunner().invoke(main, ["validate", dangling, "--strict-references"])
+        assert result.exit_code == 1
+
+    def test_valid_files_exit_zero(self, threat_models):
+        result = CliRunner().invoke(
+            main, ["validate", str(threat_models / "valid.tc.json")]
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["summary"]["invalidFiles"] == 0
+
+    def test_analyze_is_the_default_command(self):
+        result = CliRunner().invoke(main, ["--verbose", "/does/not/exist"])
+        assert result.exit_code == 2
+        assert "DIRECTORY_PATH" in result.output
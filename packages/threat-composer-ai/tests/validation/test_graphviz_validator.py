@@ -0,0 +1,39 @@
+"""Tests for the Graphviz installation check."""
+
+import subprocess
+
+import pytest
+
+from threat_composer_ai.validation import graphviz_validator
+from threat_composer_ai.validation.graphviz_validator import (
+    validate_graphviz_installation,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_validation(monkeypatch):
+    """Each test starts with Graphviz not yet validated."""
+    monkeypatch.setattr(graphviz_validator, "_graphviz_validated", False)
+
+
+class TestValidateGraphvizInstallation:
+    """Tests for validate_graphviz_installation."""
+
+    def test_success_is_remembered(self, mocker):
+        mocker.patch("shutil.which", return_value="/usr/bin/dot")
+        run = mocker.patch(
+            "subprocess.run",
+            return_value=subprocess.CompletedProcess(
+                ["dot", "-V"], 0, stdout="", stderr="dot - graphviz version 2.43.0"
+            ),
+        )
+        assert validate_graphviz_installation() is True
+        assert validate_graphviz_installation() is True
+        run.assert_called_once()
+
+    def test_missing_graphviz_exits_every_time(self, mocker):
+        which = mocker.patch("shutil.which", return_value=None)
+        for _ in range(2):
+            with pytest.raises(SystemExit):
+                validate_graphviz_installation()
+        assert which.call_count == 2
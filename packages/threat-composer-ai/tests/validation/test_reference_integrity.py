@@ -0,0 +1,159 @@
+"""Tests for cross-reference integrity checks."""
+
+import json
+
+import pytest
+
+from threat_composer_ai.validation import clear_validation_cache
+from threat_composer_ai.validation.reference_integrity import (
+    check_reference_integrity,
+    check_reference_integrity_json,
+    format_reference_issues,
+)
+
+ASSUMPTION = "a0000000-0000-4000-8000-000000000001"
+MITIGATION = "b0000000-0000-4000-8000-000000000001"
+THREAT = "c0000000-0000-4000-8000-000000000001"
+UNKNOWN = "d0000000-0000-4000-8000-000000000001"
+
+
+@pytest.fixture
+def model() -> dict:
+    """A complete model where every link resolves."""
+    return {
+        "schema": 1,
+        "assumptions": [{"id": ASSUMPTION, "numericId": 1}],
+        "mitigations": [{"id": MITIGATION, "numericId": 1}],
+        "threats": [{"id": THREAT, "numericId": 1}],
+        "assumptionLinks": [
+            {"type": "Threat", "assumptionId": ASSUMPTION, "linkedId": THREAT},
+            {"type": "Mitigation", "assumptionId": ASSUMPTION, "linkedId": MITIGATION},
+        ],
+        "mitigationLinks": [{"mitigationId": MITIGATION, "linkedId": THREAT}],
+    }
+
+
+def issue_types(result) -> list[tuple[str, str]]:
+    return [(issue.issue_type, issue.location) for issue in result.issues]
+
+
+class TestCheckReferenceIntegrity:
+    """Tests for check_reference_integrity."""
+
+    def test_consistent_model(self, model):
+        result = check_reference_integrity(model, complete=True)
+        assert result.issues == []
+        assert result.is_valid
+
+    def test_duplicate_ids_across_sections(self, model):
+        model["threats"].append({"id": MITIGATION, "numericId": 2})
+        result = check_reference_integrity(model, complete=True)
+        assert issue_types(result) == [("duplicate_id", "threats.1.id")]
+        assert "mitigations.0" in result.errors[0].message
+
+    def test_dangling_links_are_warnings(self, model):
+        model["mitigationLinks"][0]["linkedId"] = UNKNOWN
+        model["assumptionLinks"][0]["assumptionId"] = UNKNOWN
+        result = check_reference_integrity(model, complete=True)
+        assert result.is_valid
+        assert issue_types(result) == [
+            ("dangling_reference", "assumptionLinks.0.assumptionId"),
+            ("dangling_reference", "mitigationLinks.0.linkedId"),
+        ]
+
+    def test_strict_dangling_links_are_errors(self, model):
+        model["mitigationLinks"][0]["linkedId"] = UNKNOWN
+        result = check_reference_integrity(model, complete=True, strict_references=True)
+        assert not result.is_valid
+        assert issue_types(result) == [
+            ("dangling_reference", "mitigationLinks.0.linkedId")
+        ]
+
+    def test_link_type_mismatch(self, model):
+        model["assumptionLinks"][0]["linkedId"] = MITIGATION
+        result = check_reference_integrity(model, complete=True)
+        assert issue_types(result) == [
+            ("link_type_mismatch", "assumptionLinks.0.linkedId")
+        ]
+
+    def test_duplicate_link_is_warning(self, model):
+        model["mitigationLinks"].append(dict(model["mitigationLinks"][0]))
+        result = check_reference_integrity(model, complete=True)
+        assert result.is_valid
+        assert issue_types(result) == [("duplicate_link", "mitigationLinks.1")]
+
+    def test_orphan_mitigation_is_warning(self, model):
+        model["mitigations"].append({"id": UNKNOWN, "numericId": 2})
+        result = check_reference_integrity(model, complete=True)
+        assert result.is_valid
+        assert issue_types(result) == [("orphan", "mitigations.1")]
+
+    def test_partial_file_skips_absent_sections(self):
+        component = {
+            "schema": 1,
+            "threats": [],
+            "mitigations": [{"id": MITIGATION, "numericId": 1}],
+            "mitigationLinks": [{"mitigationId": MITIGATION, "linkedId": THREAT}],
+        }
+        assert check_reference_integrity(component).issues == []
+        complete = check_reference_integrity(component, complete=True)
+        assert issue_types(complete) == [
+            ("dangling_reference", "mitigationLinks.0.linkedId")
+        ]
+
+    def test_ignores_malformed_entries(self):
+        data = {"threats": ["not an entry", {"numericId": 1}], "mitigationLinks": 3}
+        assert check_reference_integrity(data).issues == []
+
+
+def test_format_reference_issues(model):
+    model["mitigationLinks"][0]["linkedId"] = UNKNOWN
+    messages = format_reference_issues(check_reference_integrity(model).warnings)
+    assert messages == [
+        f"Field 'mitigationLinks.0.linkedId' - {UNKNOWN} does not match any "
+        "threat or assumption"
+    ]
+
+
+class TestCheckReferenceIntegrityJson:
+    """Tests for check_reference_integrity_json and its result cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        clear_validation_cache()
+        yield
+        clear_validation_cache()
+
+    def test_matches_dict_check(self, model):
+        model["mitigationLinks"][0]["linkedId"] = UNKNOWN
+        content = json.dumps(model).encode()
+        assert check_reference_integrity_json(
+            content, complete=True
+        ) == check_reference_integrity(model, complete=True)
+
+    def test_unchanged_content_reuses_result(self, model):
+        content = json.dumps(model).encode()
+        first = check_reference_integrity_json(content, cache_key="model")
+        assert check_reference_integrity_json(content, cache_key="model") is first
+
+    def test_changed_content_or_options_are_checked_again(self, model):
+        content = json.dumps(model).encode()
+        first = check_reference_integrity_json(content, cache_key="model")
+        model["mitigationLinks"][0]["linkedId"] = UNKNOWN
+        changed = json.dumps(model).encode()
+
+        result = check_reference_integrity_json(changed, cache_key="model")
+        assert result is not first
+        assert issue_types(result) == [
+            ("dangling_reference", "mitigationLinks.0.linkedId")
+        ]
+        strict = check_reference_integrity_json(
+            changed, cache_key="model", strict_references=True
+        )
+        assert len(strict.errors) == 1
+
+    def test_clear_validation_cache_clears_results(self, model):
+        content = json.dumps(model).encode()
+        first = check_reference_integrity_json(content, cache_key="model")
+        clear_validation_cache("model")
+        assert check_reference_integrity_json(content, cache_key="model") is not first
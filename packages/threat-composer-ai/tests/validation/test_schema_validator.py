@@ -0,0 +1,192 @@
+"""Tests for incremental, section-level schema validation."""
+
+import copy
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from threat_composer_ai.models import ThreatComposerV1Model
+from threat_composer_ai.validation import schema_validator
+from threat_composer_ai.validation.schema_validator import (
+    clear_validation_cache,
+    get_entry_adapter,
+    validate_tc_data_incremental,
+    validate_tc_json_bytes,
+)
+
+THREAT_ID = "08249a15-c2e3-430b-b175-16ecc91f3eb3"
+MITIGATION_ID = "3f2b8c1e-7d4a-4e9b-a5c6-1d2e3f4a5b6c"
+
+
+def make_threat(numeric_id: int, priority: str = "High") -> dict:
+    """Helper to create a threat entry with distinct content."""
+    return {
+        "id": THREAT_ID,
+        "numericId": numeric_id,
+        "statement": f"Threat {numeric_id}",
+        "metadata": [{"key": "Priority", "value": priority}],
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clean_validation_cache():
+    """Each test starts without remembered entry results."""
+    clear_validation_cache()
+    yield
+    clear_validation_cache()
+
+
+@pytest.fixture
+def document() -> dict:
+    """A valid document with several list sections."""
+    return {
+        "schema": 1,
+        "applicationInfo": {"name": "Test App"},
+        "threats": [make_threat(i) for i in range(1, 6)],
+        "mitigations": [{"id": MITIGATION_ID, "numericId": 1, "content": "Fix"}],
+        "mitigationLinks": [{"mitigationId": MITIGATION_ID, "linkedId": THREAT_ID}],
+    }
+
+
+def full_model_locs(data) -> set[tuple]:
+    """Error locations reported by validating the whole model at once."""
+    try:
+        ThreatComposerV1Model.model_validate(data)
+    except ValidationError as e:
+        return {error["loc"] for error in e.errors()}
+    return set()
+
+
+def incremental_locs(data, cache_key=None) -> set[tuple]:
+    return {error["loc"] for error in validate_tc_data_incremental(data, cache_key)}
+
+
+class TestValidateTcDataIncremental:
+    """Tests for validate_tc_data_incremental."""
+
+    def test_valid_document(self, document):
+        assert validate_tc_data_incremental(document) == []
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda d: d["threats"][2]["metadata"].append(
+                {"key": "Priority", "value": "Critical"}
+            ),
+            lambda d: d["threats"][4].update(id="not-a-uuid"),
+            lambda d: d["mitigations"][0].update(unexpected=True),
+            lambda d: d["mitigationLinks"][0].pop("linkedId"),
+            lambda d: d.update(schema=2),
+            lambda d: d.update(threats="not a list"),
+            lambda d: d.update(extra={}),
+        ],
+        ids=[
+            "metadata",
+            "uuid",
+            "extra-entry-field",
+            "missing-link-field",
+            "schema",
+            "section-type",
+            "extra-top-level",
+        ],
+    )
+    def test_errors_match_full_model(self, document, mutate):
+        mutate(document)
+        assert incremental_locs(document) == full_model_locs(document)
+        assert incremental_locs(document)
+
+    def test_non_dict_document(self):
+        assert incremental_locs([1, 2]) == full_model_locs([1, 2])
+
+    def test_entry_adapters_are_built_once(self):
+        assert get_entry_adapter("threats") is get_entry_adapter("threats")
+
+
+class TestIncrementalCache:
+    """Tests for revalidating only changed entries of a file."""
+
+    @pytest.fixture
+    def validated_entries(self, mocker):
+        """Record which entries are validated against their adapter."""
+        return mocker.spy(schema_validator, "_validate_entry")
+
+    def test_unchanged_entries_are_not_revalidated(self, document, validated_entries):
+        validate_tc_data_incremental(document, cache_key="threats.tc.json")
+        assert validated_entries.call_count == 7
+
+        document["threats"][1]["statement"] = "Edited"
+        validate_tc_data_incremental(document, cache_key="threats.tc.json")
+        assert validated_entries.call_count == 8
+
+    def test_cached_errors_are_reported_at_current_index(self, document):
+        document["threats"][3]["metadata"][0]["value"] = "Critical"
+        validate_tc_data_incremental(document, cache_key="threats.tc.json")
+
+        bad = document["threats"].pop(3)
+        document["threats"].insert(0, bad)
+        errors = validate_tc_data_incremental(document, cache_key="threats.tc.json")
+        assert {e["loc"][:2] for e in errors} == {("threats", 0)}
+
+    def test_fixed_entry_clears_error(self, document):
+        document["threats"][0]["metadata"][0]["value"] = "Critical"
+        assert validate_tc_data_incremental(document, cache_key="threats.tc.json")
+
+        document["threats"][0]["metadata"][0]["value"] = "Low"
+        assert validate_tc_data_incremental(document, cache_key="threats.tc.json") == []
+
+    def test_cache_keys_are_independent(self, document, validated_entries):
+        validate_tc_data_incremental(document, cache_key="a.tc.json")
+        validate_tc_data_incremental(copy.deepcopy(document), cache_key="b.tc.json")
+        assert validated_entries.call_count == 14
+
+    def test_without_cache_key_everything_is_validated(
+        self, document, validated_entries
+    ):
+        validate_tc_data_incremental(document)
+        validate_tc_data_incremental(document)
+        assert validated_entries.call_count == 14
+
+    def test_clear_validation_cache(self, document, validated_entries):
+        validate_tc_data_incremental(document, cache_key="threats.tc.json")
+        clear_validation_cache("threats.tc.json")
+        validate_tc_data_incremental(document, cache_key="threats.tc.json")
+        assert validated_entries.call_count == 14
+
+
+class TestValidateTcJsonBytes:
+    """Tests for validating documents straight from their bytes."""
+
+    def test_valid_document(self, document):
+        assert validate_tc_json_bytes(json.dumps(document).encode()) == []
+
+    def test_malformed_json(self):
+        errors = validate_tc_json_bytes(b'{"schema": 1,')
+        assert [e["type"] for e in errors] == ["json_invalid"]
+
+    def test_strict_types(self, document):
+        document["threats"][0]["numericId"] = "1"
+        errors = validate_tc_json_bytes(json.dumps(document).encode())
+        assert [e["loc"] for e in errors] == [("threats", 0, "numericId")]
+
+    def test_errors_match_full_model(self, document):
+        document["threats"][2]["metadata"][0]["value"] = "Critical"
+        document["schema"] = 2
+        errors = validate_tc_json_bytes(json.dumps(document).encode())
+        assert {e["loc"] for e in errors} == full_model_locs(document)
+
+    def test_unchanged_valid_file_is_not_revalidated(self, document, mocker):
+        spy = mocker.spy(schema_validator, "_validate_model_json")
+        content = json.dumps(document).encode()
+        validate_tc_json_bytes(content, cache_key="threats.tc.json")
+        validate_tc_json_bytes(content, cache_key="threats.tc.json")
+        assert spy.call_count == 1
+
+    def test_invalid_file_warms_entry_cache(self, document, mocker):
+        document["threats"][0]["metadata"][0]["value"] = "Critical"
+        validate_tc_json_bytes(json.dumps(document).encode(), cache_key="t.tc.json")
+
+        spy = mocker.spy(schema_validator, "_validate_entry")
+        document["threats"][1]["statement"] = "Edited"
+        validate_tc_json_bytes(json.dumps(document).encode(), cache_key="t.tc.json")
+        assert spy.call_count == 1